@@ -362,9 +362,14 @@ def run_single_evaluation(trial_num, params, output_dir):
 
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing
+from glayout.util.result_store import ProgressMeter, ResultStore
 # Parallelized
-def run_dataset_generation(parameters, output_dir, max_workers=1):
-    """Run the dataset generation for all parameters (in parallel, per-trial isolation)."""
+def run_dataset_generation(parameters, output_dir, max_workers=1, resume=True, retry_failed=False):
+    """Run the dataset generation for all parameters (in parallel, per-trial isolation).
+
+    Every finished trial is appended to ``tg_results.jsonl`` right away, keyed by a hash of its parameters.
+    With ``resume`` a rerun skips the parameters already stored there (``retry_failed`` reruns the failed ones).
+    """
     n_samples = len(parameters)
     logger.info(f"🚀 Starting Transmission Gate Dataset Generation for {n_samples} samples")
 
@@ -378,37 +383,39 @@ def run_dataset_generation(parameters, output_dir, max_workers=1):
     with open(out_dir / "tg_parameters.json", 'w') as f:
         json.dump(parameters, f, indent=2)
 
-    results = []
+    store = ResultStore(out_dir / "tg_results.jsonl")
+    if not resume:
+        store.clear()
+    pending = store.pending(parameters, retry=(lambda result: not result.get("success")) if retry_failed else None)
+    if len(pending) < n_samples:
+        logger.info(f"♻️ Resuming: {n_samples - len(pending)} samples already stored in {store.path}, {len(pending)} to run")
+
     total_start = time.time()
-    logger.info(f"📊 Processing {n_samples} transmission gate samples in parallel...")
+    progress = ProgressMeter(n_samples, done=n_samples - len(pending))
+    logger.info(f"📊 Processing {len(pending)} transmission gate samples in parallel...")
     logger.info(f"Using {max_workers} parallel workers")
 
-    futures = []
+    futures = {}
     with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        for i, params in enumerate(parameters, start=1):
-            futures.append(executor.submit(run_single_evaluation, i, params, output_dir))
+        for index, params in pending:
+            # sample ids follow the parameter order so resumed runs reuse the same sample directories
+            futures[executor.submit(run_single_evaluation, index + 1, params, output_dir)] = params
 
         completed = 0
+        succeeded = 0
         for future in as_completed(futures):
-            result = future.result()
-            results.append(result)
+            result = make_json_serializable(future.result())
+            store.add(futures[future], result)
             completed += 1
+            succeeded += bool(result.get("success"))
+            progress.update()
 
             # Progress logging similar to your sequential version
             if completed % 10 == 0 or completed < 5:
-                success_rate = (
-                    sum(1 for r in results if r.get("success")) / len(results) * 100
-                    if results else 0.0
-                )
-                elapsed = time.time() - total_start
-                avg_time = elapsed / completed
-                eta = avg_time * (n_samples - completed)
-                logger.info(
-                    f"📈 Progress: {completed}/{n_samples} "
-                    f"({completed/n_samples*100:.1f}%) - "
-                    f"Success: {success_rate:.1f}% - "
-                    f"Elapsed: {elapsed/60:.1f}m - ETA: {eta/60:.1f}m"
-                )
+                success_rate = succeeded / completed * 100
+                logger.info(f"📈 Progress: {progress} - Success: {success_rate:.1f}%")
+
+    results = store.results(parameters)
 
     # Final summary (unchanged)
     total_time = time.time() - total_start
@@ -446,12 +453,11 @@ def run_dataset_generation(parameters, output_dir, max_workers=1):
         for error, count in sorted(error_counts.items(), key=lambda x: x[1], reverse=True):
             logger.info(f"   {count}x: {error}")
 
-    # Persist results/summary (same as before)
+    # Persist results/summary (every trial is already in tg_results.jsonl, these are the complete views)
     results_file = out_dir / "tg_results.json"
     try:
-        serializable_results = make_json_serializable(results)
         with open(results_file, 'w') as f:
-            json.dump(serializable_results, f, indent=2)
+            json.dump(results, f, indent=2)
         logger.info(f"📄 Results saved to: {results_file}")
     except Exception as e:
         logger.error(f"Failed to save JSON results: {e}")
@@ -474,6 +480,8 @@ def main():
     parser.add_argument("--n_cores",    type=int, default=1,        help="Number of CPU cores to use") # Number of CPU cores to use, default=1
     parser.add_argument("--output_dir", type=str, default="result", help="Output directory for the generated dataset")
     parser.add_argument("-y", "--yes", action="store_true", help="Automatic yes to prompts")
+    parser.add_argument("--no_resume", action="store_true", help="Ignore results stored by an earlier run and start over")
+    parser.add_argument("--retry_failed", action="store_true", help="Rerun samples which failed in an earlier run")
     args = parser.parse_args()
     json_file = Path(args.json_file).resolve()
     output_dir = args.output_dir
@@ -526,7 +534,7 @@ def main():
     
     # Generate dataset
     print(f"\nStarting generation of {n_samples} transmission gate samples...")
-    success, passed, total = run_dataset_generation(parameters, output_dir, max_workers=n_cores)
+    success, passed, total = run_dataset_generation(parameters, output_dir, max_workers=n_cores, resume=not args.no_resume, retry_failed=args.retry_failed)
     
     if success:
         print(f"\n🎉 Transmission gate dataset generation completed successfully!")
@@ -1,78 +1,108 @@
 """
 Glayout - A PDK-agnostic layout automation framework for analog circuit design
+
+The public API is loaded lazily (PEP 562): `import glayout` only defines the names below, gdsfactory, the PDKs and
+the generators are imported the first time one of them is used, e.g. `from glayout import nmos, sky130`.
 """
 
-try:
-    from .pdk.mappedpdk import MappedPDK
-except Exception as e:
-    print(f"[WARN] gdsfactory import failed - switching to a minimal DummyPdk ({e})")
-    print("[INFO] Switching to a minimal DummyPdk for limited functionality.")
-
-    class DummyPdk:
-        """Minimal fallback to keep flow running if gdsfactory isn't installed."""
-
-        def activate(self):
-            print("[INFO] DummyPdk active. Limited functionality only.")
-
-    MappedPDK = DummyPdk()
-
-# Other PDKs
-try:
-    from .pdk.sky130_mapped import sky130_mapped_pdk as sky130
-except Exception:
-    sky130 = None
-try:
-    from .pdk.gf180_mapped import gf180_mapped_pdk as gf180
-except Exception:
-    gf180 = None
-try:
-    from .pdk.ihp130_mapped import ihp130_mapped_pdk as ihp130
-except Exception:
-    ihp130 = None
-
-# Primitive components
-from .primitives.via_gen import via_stack, via_array
-from .primitives.fet import nmos, pmos, multiplier
-from .primitives.guardring import tapring
-from .primitives.mimcap import mimcap, mimcap_array
-from .primitives.resistor import resistor
-
-# SPICE and utils
-from .spice import Netlist
-
-from .util.port_utils import (
-    PortTree, parse_direction, proc_angle, ports_inline, ports_parallel,
-    rename_component_ports, rename_ports_by_list, rename_ports_by_orientation,
-    remove_ports_with_prefix, add_ports_perimeter, get_orientation,
-    assert_port_manhattan, assert_ports_perpindicular, set_port_orientation,
-    set_port_width, print_ports, create_private_ports, print_port_tree_all_cells
-)
-
-from .util.comp_utils import (
-    move, movex, movey, align_comp_to_port, evaluate_bbox, center_to_edge_distance,
-    to_float, to_decimal, prec_array, prec_center, prec_ref_center,
-    get_padding_points_cc, get_primitive_rectangle
-)
-
-from .util.snap_to_grid import component_snap_to_grid
-
-# Routing
-from .routing.c_route import c_route
-from .routing.L_route import L_route
-from .routing.straight_route import straight_route
-from .routing.smart_route import smart_route
-
-# Placement
-from .placement.common_centroid_ab_ba import common_centroid_ab_ba
-from .placement.four_transistor_interdigitized import generic_4T_interdigitzed
-from .placement.two_transistor_interdigitized import (
-    two_transistor_interdigitized, two_pfet_interdigitized,
-    two_nfet_interdigitized, macro_two_transistor_interdigitized
-)
-from .placement.two_transistor_place import two_transistor_place
+from importlib import import_module
 
 __version__ = "0.1.1"
 
+# public name -> (module, attribute)
+_LAZY_ATTRS = {
+    "MappedPDK": (".pdk.mappedpdk", "MappedPDK"),
+    # Other PDKs
+    "sky130": (".pdk.sky130_mapped", "sky130_mapped_pdk"),
+    "gf180": (".pdk.gf180_mapped", "gf180_mapped_pdk"),
+    "ihp130": (".pdk.ihp130_mapped", "ihp130_mapped_pdk"),
+    # Primitive components
+    "via_stack": (".primitives.via_gen", "via_stack"),
+    "via_array": (".primitives.via_gen", "via_array"),
+    "nmos": (".primitives.fet", "nmos"),
+    "pmos": (".primitives.fet", "pmos"),
+    "multiplier": (".primitives.fet", "multiplier"),
+    "tapring": (".primitives.guardring", "tapring"),
+    "mimcap": (".primitives.mimcap", "mimcap"),
+    "mimcap_array": (".primitives.mimcap", "mimcap_array"),
+    "resistor": (".primitives.resistor", "resistor"),
+    # SPICE and utils
+    "Netlist": (".spice", "Netlist"),
+    **{
+        name: (".util.port_utils", name)
+        for name in (
+            "PortTree", "parse_direction", "proc_angle", "ports_inline", "ports_parallel",
+            "rename_component_ports", "rename_ports_by_list", "rename_ports_by_orientation",
+            "remove_ports_with_prefix", "add_ports_perimeter", "get_orientation",
+            "assert_port_manhattan", "assert_ports_perpindicular", "set_port_orientation",
+            "set_port_width", "print_ports", "create_private_ports", "print_port_tree_all_cells",
+        )
+    },
+    **{
+        name: (".util.comp_utils", name)
+        for name in (
+            "move", "movex", "movey", "align_comp_to_port", "evaluate_bbox", "center_to_edge_distance",
+            "to_float", "to_decimal", "prec_array", "prec_center", "prec_ref_center",
+            "get_padding_points_cc", "get_primitive_rectangle",
+        )
+    },
+    "component_snap_to_grid": (".util.snap_to_grid", "component_snap_to_grid"),
+    # Routing
+    "c_route": (".routing.c_route", "c_route"),
+    "L_route": (".routing.L_route", "L_route"),
+    "straight_route": (".routing.straight_route", "straight_route"),
+    "smart_route": (".routing.smart_route", "smart_route"),
+    # Placement
+    "common_centroid_ab_ba": (".placement.common_centroid_ab_ba", "common_centroid_ab_ba"),
+    "generic_4T_interdigitzed": (".placement.four_transistor_interdigitized", "generic_4T_interdigitzed"),
+    "two_transistor_interdigitized": (".placement.two_transistor_interdigitized", "two_transistor_interdigitized"),
+    "two_pfet_interdigitized": (".placement.two_transistor_interdigitized", "two_pfet_interdigitized"),
+    "two_nfet_interdigitized": (".placement.two_transistor_interdigitized", "two_nfet_interdigitized"),
+    "macro_two_transistor_interdigitized": (".placement.two_transistor_interdigitized", "macro_two_transistor_interdigitized"),
+    "two_transistor_place": (".placement.two_transistor_place", "two_transistor_place"),
+}
+
+# names which fall back to a placeholder when they can not be imported (e.g. missing PDK files)
+_PDK_ATTRS = ("sky130", "gf180", "ihp130")
+
+
+class DummyPdk:
+    """Minimal fallback to keep flow running if gdsfactory isn't installed."""
+
+    def activate(self):
+        print("[INFO] DummyPdk active. Limited functionality only.")
+
+
+def _load(name: str):
+    module_name, attr = _LAZY_ATTRS[name]
+    if name == "MappedPDK":
+        try:
+            return getattr(import_module(module_name, __name__), attr)
+        except Exception as e:
+            print(f"[WARN] gdsfactory import failed - switching to a minimal DummyPdk ({e})")
+            print("[INFO] Switching to a minimal DummyPdk for limited functionality.")
+            return DummyPdk()
+    if name in _PDK_ATTRS:
+        try:
+            return getattr(import_module(module_name, __name__), attr, None)
+        except Exception:
+            return None
+    return getattr(import_module(module_name, __name__), attr)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _load(name)
+    # cache it, later lookups do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
 __all__ = [
     "Netlist",
     "mimcap",
@@ -114,8 +144,8 @@ __all__ = [
     "straight_route",
     "via_stack",
     "via_array",
-    "nmos", 
-    "pmos", 
+    "nmos",
+    "pmos",
     "multiplier",
     "tapring",
     "PortTree",
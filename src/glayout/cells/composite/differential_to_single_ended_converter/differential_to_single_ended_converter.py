@@ -1,5 +1,5 @@
 from gdsfactory.cell import cell, clear_cache
-from glayout import MappedPDK, sky130,gf180
+from glayout.pdk.mappedpdk import MappedPDK
 from glayout.routing import c_route,L_route,straight_route
 from gdsfactory.component import Component, copy
 from gdsfactory.component_reference import ComponentReference
@@ -100,7 +100,7 @@ def __route_sharedgatecomps(pdk: MappedPDK, shared_gate_comps, via_location, pto
     shared_gate_comps << route_quad(LRdrainsPorts[4],LRdrainsPorts[7],layer=LRdrainsPorts[0].layer)
     shared_gate_comps << route_quad(LRsourcesPorts[0],LRsourcesPorts[-1],layer=LRsourcesPorts[0].layer)
     pcomps_2L_2R_sourcevia = shared_gate_comps << via_stack(pdk,pdk.layer_to_glayer(LRsourcesPorts[0].layer), "met4")
-    pcomps_2L_2R_sourcevia.movey(evaluate_bbox(pcomps_2L_2R_sourcevia.parent.extract(layers=[LRsourcesPorts[0].layer,]))[1]/2 + LRsourcesPorts[0].center[1])
+    pcomps_2L_2R_sourcevia.movey(evaluate_bbox(pcomps_2L_2R_sourcevia.parent, layer=LRsourcesPorts[0].layer)[1]/2 + LRsourcesPorts[0].center[1])
     shared_gate_comps.add_ports(pcomps_2L_2R_sourcevia.get_ports_list(),prefix="2L2Rsrcvia_")
     # short all the gates
     shared_gate_comps << route_quad(LRgatePorts[0],LRgatePorts[-1],layer=pdk.get_glayer("met2"))
@@ -177,6 +177,8 @@ def differential_to_single_ended_converter(pdk: MappedPDK, rmult: int, half_ploa
 
 # Create and evaluate a dse instance
 if __name__ == "__main__":
+    from glayout import sky130
+
     dse = differential_to_single_ended_converter(
         pdk=sky130, 
         rmult=4, 
@@ -2,7 +2,7 @@ from gdsfactory.cell import cell, clear_cache
 from gdsfactory.component import Component, copy
 from gdsfactory.component_reference import ComponentReference
 from gdsfactory.components.rectangle import rectangle
-from glayout import MappedPDK, sky130,gf180
+from glayout.pdk.mappedpdk import MappedPDK
 from glayout.routing import c_route,L_route,straight_route
 from typing import Optional, Union
 from glayout.cells.elementary.diff_pair import diff_pair
@@ -1,5 +1,4 @@
 from glayout.pdk.mappedpdk import MappedPDK
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
 from gdsfactory import Component
 from gdsfactory.cell import cell
 from gdsfactory.component_reference import ComponentReference
@@ -41,6 +41,8 @@ import argparse
 from glayout.pdk.sky130_mapped import sky130_mapped_pdk as pdk
 from itertools import count, repeat
 from glayout.util.component_array_create import write_component_matrix
+from glayout.util.sweep import SweepRunner, link_shared_tree
+from glayout.util.spice_reader import iter_spice_statements
 import re
 import pickle
 import tempfile
@@ -438,43 +440,36 @@ def get_sim_results(acpath: Union[str,Path], dcpath: Union[str,Path], noisepath:
     return return_dict
 
 
+_PARASITIC_PARAMS = re.compile(r"(?:ad|as|ps|pd)=\S*")
+
 def process_netlist_subckt(netlist: Union[str,Path], sim_model: Literal["normal model", "cryo model"], cload: float=80.0, noparasitics: bool=False):
     netlist = Path(netlist).resolve()
     if not netlist.is_file():
         raise ValueError("netlist is not a valid file")
     hints = [".subckt","vout","inp","inm","avdd","avss","nb_10u","nbc_10u"]
-    subckt_lines = list()
-    with open(netlist, "r") as spice_net:
-        subckt_lines = spice_net.readlines()
-        for i,line in enumerate(subckt_lines):
-            #print(f"Processing line {i}: {line.strip()}")
-            line = line.strip().lower()
-            if (i+1)<len(subckt_lines) and len(line) and len(subckt_lines[i+1]) and (subckt_lines[i+1][0]=="+" or line[-1]=="+"):
-                subckt_lines[i+1] = subckt_lines[i+1].replace("+","").strip()
-                subckt_lines[i] = line.rstrip("+") + " " + subckt_lines[i+1] + "\n"
-                subckt_lines[i+1] = ""
-                line = subckt_lines[i]
+    # statements are streamed into a temporary file which replaces the netlist
+    rewritten = netlist.with_name(netlist.name + ".tmp")
+    with open(rewritten, "w") as out:
+        for statement in iter_spice_statements(netlist, keep_comments=True):
+            line = statement.lower()
             if "cryo" in sim_model and len(line)>1:
-                subckt_lines[i] = subckt_lines[i].replace("sky130_fd_pr__nfet_01v8_lvt","nshortlvth")
-                subckt_lines[i] = subckt_lines[i].replace("sky130_fd_pr__pfet_01v8_lvt","pshort")
-                subckt_lines[i] = subckt_lines[i].replace("sky130_fd_pr__nfet_01v8","nshort")
-                if ("nshort" in subckt_lines[i]) or ("pshort" in subckt_lines[i]) or ("nshortlvth" in subckt_lines[i]):
-                    subckt_lines[i] = "M" + subckt_lines[i][1:]
+                statement = statement.replace("sky130_fd_pr__nfet_01v8_lvt","nshortlvth")
+                statement = statement.replace("sky130_fd_pr__pfet_01v8_lvt","pshort")
+                statement = statement.replace("sky130_fd_pr__nfet_01v8","nshort")
+                if ("nshort" in statement) or ("pshort" in statement) or ("nshortlvth" in statement):
+                    statement = "M" + statement[1:]
             if all([hint in line for hint in hints]):
-                print(f"Line matches hints: {line.strip()}")
+                print(f"Line matches hints: {line}")
                 headerstr = ".subckt ota AVSS INM INP VOUT AVDD NBC_10U NB_10U"
-                subckt_lines[i] = headerstr+"\nCload VOUT AVSS " + str(cload) +"p\n"
-                print(f"Updated line: {subckt_lines[i]}")
-            if ("floating" in line) or (noparasitics and len(line) and (line[0]=="c" or line[0]=="r")):
-                subckt_lines[i] = "* "+ subckt_lines[i]
+                statement = headerstr+"\nCload VOUT AVSS " + str(cload) +"p"
+                print(f"Updated line: {statement}")
+            if ("floating" in line) or (noparasitics and (line[0]=="c" or line[0]=="r")):
+                statement = "* "+ statement
             if noparasitics:
-                subckt_lines[i] = re.sub(r"ad=(\S*)","",subckt_lines[i])
-                subckt_lines[i] = re.sub(r"as=(\S*)","",subckt_lines[i])
-                subckt_lines[i] = re.sub(r"ps=(\S*)","",subckt_lines[i])
-                subckt_lines[i] = re.sub(r"pd=(\S*)","",subckt_lines[i])
-    with open(netlist, "w") as spice_net:
-        print(f"Writing updated netlist to: {netlist}")
-        spice_net.writelines(subckt_lines)
+                statement = _PARASITIC_PARAMS.sub("", statement)
+            out.write(statement + "\n")
+    print(f"Writing updated netlist to: {netlist}")
+    rename(rewritten, netlist)
 
 
 def process_spice_testbench(testbench: Union[str,Path], temperature_info: tuple[int,str]=(25,"normal model")):
@@ -525,7 +520,8 @@ def __run_single_brtfrc(index, parameters_ele, save_gds_dir, temperature_info: t
                 extraction_script.write(extractbash_template)
             #copyfile("extract.bash",str(tmpdirname)+"/extract.bash")
             copyfile(str(_TAPEOUT_AND_RL_DIR_PATH_)+"/ota_perf_eval.sp",str(tmpdirname)+"/ota_perf_eval.sp")
-            copytree(str(_TAPEOUT_AND_RL_DIR_PATH_)+"/sky130A",str(tmpdirname)+"/sky130A")
+            # the pdk/model dir is only read, share it instead of copying it for every sample
+            link_shared_tree(str(_TAPEOUT_AND_RL_DIR_PATH_)+"/sky130A",str(tmpdirname)+"/sky130A")
             # extract layouti
             Popen(["bash","extract.bash", tmp_gds_path, ota_v.name],cwd=tmpdirname).wait()
             print("Running simulation at temperature: " + str(temperature_info[0]) + "C")
@@ -561,12 +557,43 @@ def __run_single_brtfrc(index, parameters_ele, save_gds_dir, temperature_info: t
     return results
 
 
-def brute_force_full_layout_and_PEXsim(sky130pdk: MappedPDK, parameter_list: np.array, temperature_info: tuple[int,str]=(25,"normal model"), cload: float=80.0, noparasitics: bool=False, saverawsims: bool=False) -> np.array:
+def _init_sweep_worker():
+    """runs once in every sweep worker: disable adding NPC layer (same as in the parent)"""
+    global pdk
+    pdk.default_decorator = None
+    pdk.activate()
+
+
+def _sweep_single_build_and_simulation(*args):
+    """single_build_and_simulation for a warm sweep worker, failures are logged and return empty results"""
+    try:
+        return single_build_and_simulation(*args)
+    except Exception:
+        results = ota_results_serializer()
+        with open('get_training_data_ERRORS.log', 'a') as errlog:
+            errlog.write("\nota run "+str(args[6])+" with the following params failed: \n"+str(args[0]))
+        return results
+    finally:
+        # cells are cached per process, drop them so workers do not grow with every sample
+        clear_cache()
+
+
+def _sweep_lost_sample(args) -> np.array:
+    """a sample whose sweep worker died (crash, out of memory kill) or timed out gets empty results"""
+    with open('get_training_data_ERRORS.log', 'a') as errlog:
+        errlog.write("\nota run "+str(args[6])+" did not finish (worker died or timed out) with the following params: \n"+str(args[0]))
+    return ota_results_serializer()
+
+
+def brute_force_full_layout_and_PEXsim(sky130pdk: MappedPDK, parameter_list: np.array, temperature_info: tuple[int,str]=(25,"normal model"), cload: float=80.0, noparasitics: bool=False, saverawsims: bool=False, max_workers: Optional[int]=None, max_tasks_per_child: Optional[int]=20, sample_timeout: Optional[float]=3600) -> np.array:
     """runs the brute force testing of parameters by
     1-constructing the ota layout specfied by parameters
     2-extracting the netlist for the ota
     3-running simulations on the ota
     returns the results from ota simulations as nparray
+    samples run on a SweepRunner (warm workers, sized from cpu count and memory unless max_workers is given,
+    replaced every max_tasks_per_child samples). a sample whose worker dies or which runs longer than sample_timeout
+    seconds (None = no limit) gets empty results
     """
     if sky130pdk.name != "sky130":
         raise ValueError("this is for sky130 only")
@@ -582,11 +609,10 @@ def brute_force_full_layout_and_PEXsim(sky130pdk: MappedPDK, parameter_list: np.
     # pass pdk as global var to avoid pickling issues
     global pdk
     pdk = sky130pdk
-    with Pool(128) as cores:
-        if saverawsims:
-            results = np.array(cores.starmap(safe_single_build_and_simulation, zip(parameter_list, repeat(temperature_info[0]), count(0), repeat(cload), repeat(noparasitics),repeat(False), count(0), repeat(save_gds_dir), repeat(False))),np.float64)
-        else:
-            results = np.array(cores.starmap(safe_single_build_and_simulation, zip(parameter_list, repeat(temperature_info[0]), repeat(None), repeat(cload), repeat(noparasitics),repeat(False), count(0), repeat(save_gds_dir), repeat(False))),np.float64)
+    output_dirs = count(0) if saverawsims else repeat(None)
+    samples = zip(parameter_list, repeat(temperature_info[0]), output_dirs, repeat(cload), repeat(noparasitics),repeat(False), count(0), repeat(save_gds_dir), repeat(False))
+    with SweepRunner(max_workers=max_workers, max_tasks_per_child=max_tasks_per_child, initializer=_init_sweep_worker, timeout=sample_timeout, on_failure=_sweep_lost_sample) as runner:
+        results = np.array(list(runner.starmap(_sweep_single_build_and_simulation, samples)),np.float64)
     # undo pdk modification
     sky130pdk.default_decorator = add_npc_decorator
     return results
@@ -1,5 +1,4 @@
 from glayout.pdk.mappedpdk import MappedPDK
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
 from gdsfactory.component import Component
 from gdsfactory.component_reference import ComponentReference
 from gdsfactory.cell import cell
@@ -18,7 +17,6 @@ from glayout.spice.netlist import Netlist
 from glayout.cells.elementary.FVF.fvf import fvf_netlist, flipped_voltage_follower  # Import from local ATLAS fvf.py
 from glayout.primitives.via_gen import via_stack
 from typing import Optional
-from glayout.verification.evaluator_wrapper import run_evaluation
 
 
 def add_lvcm_labels(lvcm_in: Component,
@@ -191,6 +189,9 @@ def  low_voltage_cmirror(
     return component
 
 if __name__=="__main__":
+    from glayout.pdk.sky130_mapped import sky130_mapped_pdk
+    from glayout.verification.evaluator_wrapper import run_evaluation
+
     #low_voltage_current_mirror = low_voltage_current_mirror(sky130_mapped_pdk)
     low_voltage_current_mirror = add_lvcm_labels(low_voltage_cmirror(sky130_mapped_pdk),sky130_mapped_pdk)
     low_voltage_current_mirror.show()
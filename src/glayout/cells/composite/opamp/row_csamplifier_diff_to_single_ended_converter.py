@@ -16,6 +16,7 @@ from glayout.util.comp_utils import evaluate_bbox, prec_ref_center, movex, movey
 from glayout.util.port_utils import rename_ports_by_orientation, rename_ports_by_list, add_ports_perimeter, print_ports, set_port_orientation, rename_component_ports
 from glayout.routing.straight_route import straight_route
 from glayout.util.snap_to_grid import component_snap_to_grid
+from glayout.util.layer_bbox import layer_bbox
 from pydantic import validate_arguments
 from glayout.placement.two_transistor_interdigitized import two_nfet_interdigitized
 from glayout.spice import Netlist
@@ -92,7 +93,7 @@ def row_csamplifier_diff_to_single_ended_converter(pdk: MappedPDK, diff_to_singl
         __connect_cs_netlist(pmos_comps, halfMultp)
 
     # add npadding and add ports
-    nwellbbox = pmos_comps.extract(layers=[pdk.get_glayer("poly"),pdk.get_glayer("active_diff"),pdk.get_glayer("active_tap"), pdk.get_glayer("nwell"),pdk.get_glayer("dnwell")]).bbox
+    nwellbbox = layer_bbox(pmos_comps, [pdk.get_glayer("poly"),pdk.get_glayer("active_diff"),pdk.get_glayer("active_tap"), pdk.get_glayer("nwell"),pdk.get_glayer("dnwell")])
     nwellspacing = pdk.get_grule("nwell", "active_tap")["min_enclosure"]
     nwell_points = get_padding_points_cc(nwellbbox, default=nwellspacing, pdk_for_snap2xgrid=pdk)
     pmos_comps.add_polygon(nwell_points, layer=pdk.get_glayer("nwell"))
@@ -1,4 +1,4 @@
-from glayout import MappedPDK, sky130,gf180
+from glayout.pdk.mappedpdk import MappedPDK
 from gdsfactory.cell import cell, clear_cache
 from gdsfactory.component import Component, copy
 from gdsfactory.component_reference import ComponentReference
@@ -55,6 +55,8 @@ def stacked_nfet_current_mirror(pdk: MappedPDK, half_common_source_nbias: tuple[
 
 # Create and evaluate a current mirror instance
 if __name__ == "__main__":
+    from glayout import sky130
+
     cm = stacked_nfet_current_mirror(
         pdk=sky130,
         half_common_source_nbias=(0.5, 0.15, 4, 4),
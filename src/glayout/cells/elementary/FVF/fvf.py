@@ -1,5 +1,4 @@
 from glayout.pdk.mappedpdk import MappedPDK
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
 from gdsfactory.cell import cell
 from gdsfactory.component import Component
 from gdsfactory import Component
@@ -15,11 +14,6 @@ from glayout.util.port_utils import add_ports_perimeter
 from glayout.spice.netlist import Netlist
 from glayout.primitives.via_gen import via_stack
 from gdsfactory.components import text_freetype, rectangle
-try:
-    from glayout.verification.evaluator_wrapper import run_evaluation
-except ImportError:
-    print("Warning: evaluator_wrapper not found. Evaluation will be skipped.")
-    run_evaluation = None
 
 def get_component_netlist(component):
     """Helper function to get netlist object from component info, compatible with all gdsfactory versions"""
@@ -203,6 +197,9 @@ def  flipped_voltage_follower(
     return component
 
 if __name__=="__main__":
+    from glayout.pdk.sky130_mapped import sky130_mapped_pdk
+    from glayout.verification.evaluator_wrapper import run_evaluation
+
     fvf = sky130_add_fvf_labels(flipped_voltage_follower(sky130_mapped_pdk, width=(2,1), sd_rmult=3))
     fvf.show()
     fvf.name = "fvf"
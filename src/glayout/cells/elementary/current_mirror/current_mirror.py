@@ -13,12 +13,6 @@ from glayout.util.comp_utils import evaluate_bbox, prec_center, prec_ref_center,
 from typing import Optional, Union 
 from glayout.primitives.via_gen import via_stack
 from gdsfactory.components import text_freetype, rectangle
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
-try:
-    from glayout.verification.evaluator_wrapper import run_evaluation
-except ImportError:
-    print("Warning: evaluator_wrapper not found. Evaluation will be skipped.")
-    run_evaluation = None
 
 
 def add_cm_labels(cm_in: Component,
@@ -219,6 +213,13 @@ def current_mirror(
     return top_level
 
 if __name__=="__main__":
+    from glayout.pdk.sky130_mapped import sky130_mapped_pdk
+    try:
+        from glayout.verification.evaluator_wrapper import run_evaluation
+    except ImportError:
+        print("Warning: evaluator_wrapper not found. Evaluation will be skipped.")
+        run_evaluation = None
+
     cm = add_cm_labels(current_mirror(sky130_mapped_pdk, device='pfet'),sky130_mapped_pdk)
     cm.show()
     cm.name = "CMIRROR"
@@ -24,13 +24,7 @@ from glayout.routing.c_route import c_route
 from glayout.routing.smart_route import smart_route
 from glayout.routing.straight_route import straight_route
 from glayout.spice import Netlist
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
 from gdsfactory.components import text_freetype
-try:
-    from glayout.verification.evaluator_wrapper import run_evaluation
-except ImportError:
-    print("Warning: evaluator_wrapper not found. Evaluation will be skipped.")
-    run_evaluation = None
 
 
 def add_df_labels(df_in: Component,
@@ -260,6 +254,9 @@ def diff_pair_generic(
 	return diffpair
 
 if __name__=="__main__":
+	from glayout.pdk.sky130_mapped import sky130_mapped_pdk
+	from glayout.verification.evaluator_wrapper import run_evaluation
+
 	diff_pair = add_df_labels(diff_pair(sky130_mapped_pdk),sky130_mapped_pdk)
 	#diff_pair = diff_pair(sky130_mapped_pdk)
 	diff_pair.show()
@@ -1,4 +1,4 @@
-from glayout import MappedPDK, sky130,gf180
+from glayout.pdk.mappedpdk import MappedPDK
 from gdsfactory.cell import cell
 from gdsfactory.component import Component
 from gdsfactory import Component
@@ -14,11 +14,6 @@ from glayout.util.port_utils import add_ports_perimeter
 from glayout.spice.netlist import Netlist
 from glayout.primitives.via_gen import via_stack
 from gdsfactory.components import text_freetype, rectangle
-try:
-    from glayout.verification.evaluator_wrapper import run_evaluation
-except ImportError:
-    print("Warning: evaluator_wrapper not found. Evaluation will be skipped.")
-    run_evaluation = None
 
 def add_tg_labels(tg_in: Component,
                         pdk: MappedPDK
@@ -217,6 +212,9 @@ def  transmission_gate(
 
     return component
 if __name__ == "__main__":
+    from glayout import sky130
+    from glayout.verification.evaluator_wrapper import run_evaluation
+
     # OLD EVAL CODE
     # comp = transmission_gate(sky130)
     # # comp.pprint_ports()
@@ -2,23 +2,33 @@
 
 Importing the package should not hard-fail when local PDK files are absent.
 The concrete mapped PDK objects remain ``None`` until their environments are
-available.
+available. They are only loaded on first access, so importing
+``glayout.pdk.mappedpdk`` does not pay for building every PDK.
 """
 
-try:
-    from .gf180_mapped.gf180_mapped import gf180_mapped_pdk
-except Exception:
-    gf180_mapped_pdk = None
+from importlib import import_module
 
-try:
-    from .ihp130_mapped.ihp130_mapped import ihp130_mapped_pdk
-except Exception:
-    ihp130_mapped_pdk = None
+_PDK_MODULES = {
+    "gf180_mapped_pdk": ".gf180_mapped.gf180_mapped",
+    "ihp130_mapped_pdk": ".ihp130_mapped.ihp130_mapped",
+    "sky130_mapped_pdk": ".sky130_mapped.sky130_mapped",
+}
+
+
+def __getattr__(name: str):
+    if name not in _PDK_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        pdk = getattr(import_module(_PDK_MODULES[name], __name__), name)
+    except Exception:
+        pdk = None
+    globals()[name] = pdk
+    return pdk
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PDK_MODULES))
 
-try:
-    from .sky130_mapped.sky130_mapped import sky130_mapped_pdk
-except Exception:
-    sky130_mapped_pdk = None
 
 __all__ = [
     "gf180_mapped_pdk",
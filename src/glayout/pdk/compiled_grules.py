@@ -0,0 +1,98 @@
+"""
+usage: from glayout.pdk.compiled_grules import CompiledGRules
+build-once, read-only index over the grules graph of a MappedPDK
+"""
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional, Union
+
+
+def _to_decimal_rule(value: Any) -> Any:
+    """converts numeric rule values to Decimal, leaves everything else (e.g. layer tuples) as is"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    return Decimal(str(value))
+
+
+class CompiledGRules:
+    """Frozen, symmetric (glayer1, glayer2) index of the design rules in a grules dict.
+    grules is only walked once (at construction); lookups are a single dict access and skip all validation.
+    Both directions of every layer pair are stored, preferring grules[glayer1][glayer2] over grules[glayer2][glayer1]
+    the same way MappedPDK.get_grule does. Every entry is kept in a float view (values as written in grules)
+    and in a Decimal view (numeric values converted with Decimal(str(value))).
+    Returned rule dicts are read only (MappingProxyType).
+    """
+
+    __slots__ = ("_float_rules", "_decimal_rules", "_valid_glayers")
+
+    def __init__(
+        self,
+        grules: Mapping[str, Mapping[str, Optional[Mapping[str, Any]]]],
+        valid_glayers: Optional[Iterable[str]] = None,
+    ):
+        glayers = list(grules.keys())
+        for glayer_rules in grules.values():
+            glayers += [glayer for glayer in (glayer_rules or {}) if glayer not in glayers]
+        float_rules = dict()
+        decimal_rules = dict()
+        for glayer1 in glayers:
+            for glayer2 in glayers:
+                rules_dict = (grules.get(glayer1) or {}).get(glayer2)
+                if not rules_dict:
+                    rules_dict = (grules.get(glayer2) or {}).get(glayer1)
+                if not rules_dict:
+                    continue
+                float_rules[(glayer1, glayer2)] = MappingProxyType(dict(rules_dict))
+                decimal_rules[(glayer1, glayer2)] = MappingProxyType(
+                    {rule: _to_decimal_rule(value) for rule, value in rules_dict.items()}
+                )
+        self._float_rules = MappingProxyType(float_rules)
+        self._decimal_rules = MappingProxyType(decimal_rules)
+        self._valid_glayers = frozenset(valid_glayers) if valid_glayers is not None else frozenset(glayers)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_valid_glayers"):
+            raise AttributeError("CompiledGRules is immutable")
+        object.__setattr__(self, name, value)
+
+    def __len__(self) -> int:
+        return len(self._float_rules)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._float_rules
+
+    def get(
+        self, glayer1: str, glayer2: Optional[str] = None, return_decimal: bool = False
+    ) -> Mapping[str, Union[float, Decimal]]:
+        """Returns the (read only) rules between glayer1 and glayer2, or the intra layer rules of glayer1 if glayer2 is None
+        raises the same exceptions as MappedPDK.get_grule"""
+        key = (glayer1, glayer1 if glayer2 is None else glayer2)
+        try:
+            return (self._decimal_rules if return_decimal else self._float_rules)[key]
+        except KeyError:
+            pass
+        # error path only, keep the messages of MappedPDK.get_grule
+        for glayer in key:
+            if glayer not in self._valid_glayers:
+                raise ValueError("get_grule, " + str(glayer) + " not valid glayer")
+        raise NotImplementedError(
+            "no rules found between " + str(key[0]) + " and " + str(key[1])
+        )
+
+
+# id(grules) -> (grules, table). grules is kept alive so its id cannot be reused
+_compiled_grules_cache: dict[int, tuple[Mapping, CompiledGRules]] = dict()
+
+
+def compile_grules(
+    grules: Mapping[str, Mapping[str, Optional[Mapping[str, Any]]]],
+    valid_glayers: Optional[Iterable[str]] = None,
+) -> CompiledGRules:
+    """Returns the CompiledGRules for this grules object, building it on first use.
+    Tables are cached per grules object, so a new table is only built if grules is replaced
+    ****NOTE: in place edits of an already compiled grules dict are not picked up"""
+    entry = _compiled_grules_cache.get(id(grules))
+    if entry is None or entry[0] is not grules:
+        entry = (grules, CompiledGRules(grules, valid_glayers))
+        _compiled_grules_cache[id(grules)] = entry
+    return entry[1]
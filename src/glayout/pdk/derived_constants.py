@@ -0,0 +1,157 @@
+"""
+usage: from glayout.pdk.derived_constants import DerivedConstants
+per PDK table of the geometry constants generators derive from the design rules (via stack layer sizes, via pitch,
+max metal separations, min device dims, tap width). Entries are computed on first use and kept
+"""
+from typing import Any, Callable, Hashable, Iterable, Literal
+
+from ..util.dbu import to_dbu, to_um
+
+
+LayerDimMode = Literal["both", "above", "below"]
+
+
+def glayer_level(glayer: str) -> int:
+    """routing level of a routable glayer, 0 for poly / active layers, n for metn"""
+    return int(glayer[-1]) if "met" in glayer else 0
+
+
+class DerivedConstants:
+    """Lazily filled, per MappedPDK table of constants derived from the grules.
+    Every entry is computed (with the same arithmetic the generators used) the first time it is asked for,
+    later lookups are a dict access. Use MappedPDK.derived_constants, which rebuilds the table if the grules
+    or the grid of the pdk are replaced.
+    """
+
+    def __init__(self, pdk):
+        self._pdk = pdk
+        self._memo: dict[Hashable, Any] = dict()
+
+    def _memoized(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+    def __len__(self) -> int:
+        return len(self._memo)
+
+    def layer_dim(self, glayer: str, mode: LayerDimMode = "both") -> float:
+        """Returns the required dimension of a routable layer in a via stack
+        mode (both, above or below) specifies the vias whose enclosure rules are considered,
+        via1<->met2<->via2 for both, via1<->met2 for below, met2<->via2 for above (below is ignored for poly / active)
+        """
+        return self._memoized(("layer_dim", glayer, mode), lambda: self._layer_dim(glayer, mode))
+
+    def _layer_dim(self, glayer: str, mode: LayerDimMode) -> float:
+        if not self._pdk.is_routable_glayer(glayer):
+            raise ValueError("layer_dim: glayer must be a routable layer")
+        rules = self._pdk.get_grule_fast
+        consider_above = mode == "both" or mode == "above"
+        consider_below = mode == "both" or mode == "below"
+        is_lvl0 = any([hint in glayer for hint in ["poly", "active"]])
+        layer_dim = 0
+        if consider_below and not is_lvl0:
+            via_below = "mcon" if glayer == "met1" else "via" + str(int(glayer[-1]) - 1)
+            layer_dim = rules(via_below)["width"] + 2 * rules(via_below, glayer)["min_enclosure"]
+        if consider_above:
+            via_above = "mcon" if is_lvl0 else "via" + str(glayer[-1])
+            layer_dim = max(layer_dim, rules(via_above)["width"] + 2 * rules(via_above, glayer)["min_enclosure"])
+        return max(layer_dim, rules(glayer)["min_width"])
+
+    def via_stack_layers(self, glayer1: str, glayer2: str, assume_bottom_via: bool = False) -> tuple[tuple[str, float], ...]:
+        """(glayer, size) of every square of the via stack between glayer1 and glayer2 (bottom to top, vias included)
+        as via_stack lays them without fullbottom / fulltop
+        """
+        key = ("via_stack_layers", glayer1, glayer2, assume_bottom_via)
+        return self._memoized(key, lambda: self._via_stack_layers(glayer1, glayer2, assume_bottom_via))
+
+    def _via_stack_layers(self, glayer1: str, glayer2: str, assume_bottom_via: bool) -> tuple[tuple[str, float], ...]:
+        if glayer_level(glayer1) > glayer_level(glayer2):
+            glayer1, glayer2 = glayer2, glayer1
+        level1, level2 = glayer_level(glayer1), glayer_level(glayer2)
+        layers = list()
+        for level in range(level1, level2 + 1):
+            layer_name = glayer1 if level == 0 else "met" + str(level)
+            mode = "below" if level == level2 else ("above" if level == level1 else "both")
+            mode = "both" if assume_bottom_via and level == level1 else mode
+            if level != level2:
+                via_name = "mcon" if level == 0 else "via" + str(level)
+                layers.append((via_name, self._pdk.get_grule_fast(via_name)["width"]))
+            layers.append((layer_name, self.layer_dim(layer_name, mode)))
+        return tuple(layers)
+
+    def via_stack_size(self, glayer1: str, glayer2: str) -> float:
+        """side of the (square) bounding box of via_stack(pdk, glayer1, glayer2), glayer1 and glayer2 on different levels"""
+        def compute() -> float:
+            if glayer_level(glayer1) == glayer_level(glayer2):
+                raise ValueError("via_stack_size: glayer1 and glayer2 are on the same level")
+            return to_um(max(to_dbu(size) for _, size in self.via_stack_layers(glayer1, glayer2)))
+        return self._memoized(("via_stack_size", glayer1, glayer2), compute)
+
+    def via_stack_min_separation(self, glayer1: str, glayer2: str) -> tuple[float, float]:
+        """(min spacing between via stacks in a via array, 2 * enclosure of the top via by the top metal)
+        for the via stack from glayer1 (bottom) to glayer2 (top)
+        """
+        key = ("via_stack_min_separation", glayer1, glayer2)
+        return self._memoized(key, lambda: self._via_stack_min_separation(glayer1, glayer2))
+
+    def _via_stack_min_separation(self, glayer1: str, glayer2: str) -> tuple[float, float]:
+        pdk = self._pdk
+        level1, level2 = glayer_level(glayer1), glayer_level(glayer2)
+        sizes = dict(self.via_stack_layers(glayer1, glayer2))
+        via_spacing = [] if level1 else [pdk.get_grule_fast("mcon")["min_separation"] + sizes["mcon"]]
+        top_enclosure = 0
+        for level in range(level1 if level1 else 1, level2):
+            met_glayer = "met" + str(level)
+            via_glayer = "via" + str(level)
+            via_spacing.append(pdk.get_grule_fast(met_glayer)["min_separation"] + sizes[met_glayer])
+            via_spacing.append(pdk.get_grule_fast(via_glayer)["min_separation"] + sizes[via_glayer])
+            if level == (level2 - 1):
+                top_enclosure = pdk.get_grule_fast(glayer2, via_glayer)["min_enclosure"]
+        via_spacing = pdk.snap_to_2xgrid(max(via_spacing), return_type="float")
+        top_enclosure = pdk.snap_to_2xgrid(top_enclosure, return_type="float")
+        return tuple(pdk.snap_to_2xgrid([via_spacing, 2 * top_enclosure], return_type="float"))
+
+    def max_separation(self, glayers: Iterable[str], snapped: bool = True) -> float:
+        """max of the min_separation rules of glayers (snapped to 2xgrid, as util_max_metal_seperation returns it, if snapped)"""
+        glayers = tuple(glayers)
+
+        def compute() -> float:
+            max_sep = max(self._pdk.get_grule_fast(glayer)["min_separation"] for glayer in glayers)
+            return self._pdk.snap_to_2xgrid(max_sep) if snapped else max_sep
+        return self._memoized(("max_separation", glayers, snapped), compute)
+
+    @property
+    def min_fet_length(self) -> float:
+        """min (gate) length of a multiplier, the poly min width"""
+        return self._memoized("min_fet_length", lambda: self._pdk.get_grule_fast("poly")["min_width"])
+
+    @property
+    def min_fet_width(self) -> float:
+        """min width of a multiplier, at least the min length and the min width of active_diff"""
+        return self._memoized("min_fet_width", lambda: max(self.min_fet_length, self._pdk.get_grule_fast("active_diff")["min_width"]))
+
+    @property
+    def tap_width(self) -> float:
+        """width of the active_tap ring of tapring, the min width or a contact and its enclosure"""
+        def compute() -> float:
+            rules = self._pdk.get_grule_fast
+            return max(rules("active_tap")["min_width"], 2 * rules("active_tap", "mcon")["min_enclosure"] + rules("mcon")["width"])
+        return self._memoized("tap_width", compute)
+
+
+# id(pdk) -> (pdk, grules, grid_size, table). the pdk is kept alive so its id cannot be reused
+_derived_constants_cache: dict[int, tuple[Any, Any, float, DerivedConstants]] = dict()
+
+
+def derived_constants(pdk) -> DerivedConstants:
+    """Returns the DerivedConstants of pdk, creating the (empty) table on first use.
+    A new table is created if the grules or the grid_size of pdk were reassigned
+    ****NOTE: in place edits of the grules dict are not picked up (as with compile_grules)"""
+    entry = _derived_constants_cache.get(id(pdk))
+    if entry is None or entry[0] is not pdk or entry[1] is not pdk.grules or entry[2] != pdk.grid_size:
+        entry = (pdk, pdk.grules, pdk.grid_size, DerivedConstants(pdk))
+        _derived_constants_cache[id(pdk)] = entry
+    return entry[3]
@@ -7,13 +7,18 @@ from gdsfactory.typings import Component, PathType, Layer
 from pydantic import validator, StrictStr, ValidationError
 from typing import ClassVar, Optional, Any, Union, Literal, Iterable, TypedDict
 from pathlib import Path
-from decimal import Decimal, ROUND_UP
+from decimal import Decimal
 import tempfile
 import subprocess
 from decimal import Decimal
-from pydantic import validate_arguments
-import xml.etree.ElementTree as ET
+from ..util.validation import validate_arguments
 import pathlib, shutil, os, sys
+from .compiled_grules import CompiledGRules, compile_grules
+from .derived_constants import DerivedConstants, derived_constants
+from ..util.drc_reports import summarize_lyrdb, summarize_magic_drc_report
+from ..util.verification_cache import get_verification_cache, verification_cache_enabled, verification_cache_key
+from ..util.dbu import snap_up, snap_up_array, to_dbu, to_dbu_up, to_dbu_up_array, to_um, to_um_array, to_um_decimal
+import numpy as np
 
 class SetupPDKFiles:
     """Class to setup the PDK files required for DRC and LVS checks.
@@ -233,6 +238,233 @@ X8    t4    A    VGND    VGND  sky130_fd_pr__nfet_01v8 m=1 mult=1 w=180000u l=15
         return pdk_files
         
 
+def magic_drc_setup_commands() -> str:
+    """returns the gds read settings used by the magic DRC script"""
+    return """
+gds flatglob *$$*
+gds flatglob *VIA*
+gds flatglob *CDNS*
+gds flatglob *capacitor_test_nf*
+"""
+
+
+def magic_drc_report_proc() -> str:
+    """returns the tcl proc custom_drc_save_report {cellname} {outfile} which runs drc check on cellname and writes the report"""
+    return f"""proc custom_drc_save_report {{{{cellname ""}} {{outfile ""}}}} {{
+
+if {{$outfile == ""}} {{set outfile "drc.out"}}
+
+set fout [open $outfile w]
+set oscale [cif scale out]
+if {{$cellname == ""}} {{
+    select top cell
+    set cellname [cellname list self]
+    set origname ""
+}} else {{
+    set origname [cellname list self]
+    puts stdout "\[INFO\]: Loading $cellname\n"
+    flush stdout
+
+    load $cellname
+    select top cell
+}}
+
+drc check
+set count [drc list count]
+
+puts $fout "$cellname count: $count"
+puts $fout "----------------------------------------"
+set drcresult [drc listall why]
+foreach {{errtype coordlist}} $drcresult {{
+    puts $fout $errtype
+    puts $fout "----------------------------------------"
+    foreach coord $coordlist {{
+        set bllx [expr {{$oscale * [lindex $coord 0]}}]
+        set blly [expr {{$oscale * [lindex $coord 1]}}]
+        set burx [expr {{$oscale * [lindex $coord 2]}}]
+        set bury [expr {{$oscale * [lindex $coord 3]}}]
+        set coords [format " %.3fum %.3fum %.3fum %.3fum" $bllx $blly $burx $bury]
+        puts $fout "$coords"
+    }}
+puts $fout "----------------------------------------"
+}}
+puts $fout ""
+
+if {{$origname != ""}} {{
+    load $origname
+}}
+
+close $fout
+puts "\[INFO\]: DONE with $outfile\n"
+}}
+
+"""
+
+
+def magic_drc_commands() -> str:
+    """returns the magic_commands.tcl script used by MappedPDK.drc_magic
+    the script reads DESIGN_NAME, RESULTS_DIR and REPORTS_DIR from the environment"""
+    return (
+        magic_drc_setup_commands()
+        + """
+gds read $::env(RESULTS_DIR)/$::env(DESIGN_NAME).gds
+
+"""
+        + magic_drc_report_proc()
+        + "custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAME).rpt\n"
+    )
+
+
+LVS_EXTRACTION_LEVELS = ("lvs", "lvs+sim", "pex")
+"""extraction levels of MappedPDK.lvs_netgen: lvs = LVS netlist only, lvs+sim = also the .sim netlist, pex = also the parasitic extracted netlist"""
+
+
+def magic_lvs_script(
+    design_name: str,
+    gds_path: PathType,
+    lvsmag_path: PathType,
+    sim_path: PathType,
+    pex_path: PathType,
+    extraction_level: Literal["lvs", "lvs+sim", "pex"] = "pex",
+) -> str:
+    """returns the magic script used by MappedPDK.lvs_netgen
+    the LVS netlist is always extracted, the sim and pex (flatten + extresist) passes only for the extraction levels that need them"""
+    if extraction_level not in LVS_EXTRACTION_LEVELS:
+        raise ValueError(f"extraction_level must be one of {LVS_EXTRACTION_LEVELS}, got {extraction_level!r}")
+    script = f"""
+drc off            
+gds flatglob *\\$\\$*
+gds read {gds_path}
+
+# LVS Netlist
+load {design_name}
+select top cell
+
+extract all
+ext2resist all
+
+ext2spice lvs
+ext2spice extresist on
+ext2spice -o {str(lvsmag_path)}
+"""
+    if extraction_level in ("lvs+sim", "pex"):
+        script += f"""
+# Sim Netlist
+load {design_name}
+extract all
+ext2sim cthresh 0
+ext2sim -o {str(sim_path)}
+"""
+    if extraction_level == "pex":
+        script += f"""
+# Pex Netlist
+flatten {design_name}
+load {design_name}
+select top cell
+
+extract do local
+extract all
+
+ext2sim labels on
+ext2sim
+extresist tolerance 10
+extresist
+
+ext2spice lvs
+ext2spice cthresh 0
+ext2spice extresist on
+ext2spice -o {str(pex_path)}
+"""
+    return script + "exit\n"
+
+
+def magic_drc_cache_key(pdk_name: str, design_name: str, gds_path: PathType, magicrc_file: PathType) -> str:
+    """verification cache key of a magic DRC run (gds bytes, magicrc and the DRC script)"""
+    return verification_cache_key("drc_magic", pdk_name, design_name, gds_path, rule_files=[magicrc_file], extra=[magic_drc_commands()])
+
+
+def lvs_netgen_cache_key(
+    pdk_name: str,
+    design_name: str,
+    gds_path: PathType,
+    spice_path: PathType,
+    rule_files: Iterable[PathType],
+    extraction_level: Literal["lvs", "lvs+sim", "pex"] = "pex",
+) -> str:
+    """verification cache key of a magic extraction + netgen LVS run (gds bytes, spice netlist, setup files and the magic script)"""
+    with open(spice_path, 'r') as f:
+        netlist = f.read()
+    magic_script = magic_lvs_script(
+        design_name, f"{design_name}.gds", f"{design_name}_lvsmag.spice", f"{design_name}_sim.spice", f"{design_name}_pex.spice", extraction_level
+    )
+    return verification_cache_key("lvs_netgen", pdk_name, design_name, gds_path, netlist=netlist, rule_files=rule_files, extra=[magic_script])
+
+
+def extract_design_name_from_netlist(file_path: str):
+    """ Extracts the design name from the netlist file (found after the final .ends statement in the netlist file)"""
+    with open(file_path, 'r') as file:
+        lines = file.readlines()
+    last_ends_line = None
+    for line in lines:
+        if line.strip().startswith(".ends"):
+            last_ends_line = line.strip()
+
+    if last_ends_line:
+        parts = last_ends_line.split()
+        if len(parts) > 1:
+            return parts[1]
+        else:
+            return None
+
+def modify_design_name_in_cdl(netlist, design_name):
+    design_name_from_cdl = extract_design_name_from_netlist(netlist)
+    if design_name_from_cdl is not None:
+        if design_name_from_cdl == design_name:
+            print(f"Design name from CDL file: {design_name_from_cdl} matches the design name: {design_name}")
+        else:
+            # replace all occurences of design_name_from_cdl with design_name in the cdl file
+            with open(netlist, 'r') as file:
+                filedata = file.read()
+            newdata = filedata.replace(design_name_from_cdl, design_name)
+            with open(netlist, 'w') as file:
+                file.write(newdata)
+    else:
+        print("Warning: Design name not found in the netlist file")
+
+# Function to add 'u' (micron unit label) to w= and l= values in the netlist
+# Hacky way to get it working with GF180 PDK and Netgen
+def add_u_to_wl(line):
+    # Only add 'u' if the value is not already followed by a unit
+    line = re.sub(r'(w=)([0-9.]+)(\s|$)', r'\1\2u\3', line)
+    line = re.sub(r'(l=)([0-9.]+)(\s|$)', r'\1\2u\3', line)
+    return line
+
+def write_spice(pdk_name: str, input_cdl, output_spice, lvs_schematic_ref_file):
+    # create {design_name}.spice
+    if pdk_name == 'sky130':
+        with open(input_cdl, 'r') as file:
+            lines = file.readlines()
+            with open(output_spice, 'w') as file2:
+                sky130_spice_path = Path(lvs_schematic_ref_file).resolve()
+                file2.write(f".include {sky130_spice_path}\n")
+                # write the rest of the lines
+                for line in lines:
+                    file2.write(line)
+
+    elif pdk_name.lower() == 'gf180':
+        # For GF180 PDK, we need to add 'u' to w= and l= values in the netlist
+        with open(input_cdl, 'r') as file:
+            lines = file.readlines()
+            with open(output_spice, 'w') as file2:
+                sky130_spice_path = Path(lvs_schematic_ref_file).resolve()
+                file2.write(f".include {sky130_spice_path}\n")
+                # write the rest of the lines
+                for line in lines:
+                    file2.write(add_u_to_wl(line))
+    else:
+        raise NotImplementedError("LVS only supported for gf180 and sky130 PDKs")
+
+
 class MappedPDK(Pdk):
     """Inherits everything from the pdk class but also requires mapping to glayers
     glayers are generic layers which can be returned with get_glayer(name: str)
@@ -321,10 +553,12 @@ class MappedPDK(Pdk):
         self,
         layout: Component | PathType,
         output_dir_or_file: Optional[PathType] = None,
+        use_cache: Optional[bool] = None,
     ):
         """Returns true if the layout is DRC clean and false if not
         Also saves detailed results to output_dir_or_file location as lyrdb
-        layout can be passed as a file path or gdsfactory component"""
+        layout can be passed as a file path or gdsfactory component
+        use_cache reuses the report of an earlier run on identical gds bytes and rule deck (None = GLAYOUT_VERIFICATION_CACHE, on by default)"""
         if not self.pdk_files['klayout_drc_file']:
             raise NotImplementedError("no drc script for this pdk")
         # find layout gds file path
@@ -352,46 +586,54 @@ class MappedPDK(Pdk):
         #if not report_path.is_file():
         #    raise ValueError("report_path must be file or dir")
 
-        ##################### Checking for Klayout version ##################################
-        res = subprocess.run(["klayout", "-v"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        # KLayout prints version to stdout (e.g., "KLayout 0.29.8 (2023-...)" or "0.29.8")
-        out = (res.stdout or "").strip() or (res.stderr or "").strip()
+        cache = get_verification_cache() if verification_cache_enabled(use_cache) else None
+        cache_key = verification_cache_key("klayout_drc", self.name, layout_path.stem, layout_path, rule_files=[self.pdk_files['klayout_drc_file']]) if cache else None
+        cached = cache.get(cache_key) if cache else None
+        if cached is not None and cache.restore(cached, report_dir):
+            print("using cached klayout drc result")
+        else:
+            ##################### Checking for Klayout version ##################################
+            res = subprocess.run(["klayout", "-v"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            # KLayout prints version to stdout (e.g., "KLayout 0.29.8 (2023-...)" or "0.29.8")
+            out = (res.stdout or "").strip() or (res.stderr or "").strip()
         
-        # Extract first version-like token (e.g., 0.29.8)
-        m = re.search(r"\b(\d+\.\d+(?:\.\d+)?)\b", out)
-        kver = m.group(1) if m else out  # fallback to the raw line if pattern not found
-        print("KLayout version:", kver)
+            # Extract first version-like token (e.g., 0.29.8)
+            m = re.search(r"\b(\d+\.\d+(?:\.\d+)?)\b", out)
+            kver = m.group(1) if m else out  # fallback to the raw line if pattern not found
+            print("KLayout version:", kver)
         
-        # Convert to tuple for proper version comparison
-        version_tuple = tuple(map(int, kver.split('.')))
+            # Convert to tuple for proper version comparison
+            version_tuple = tuple(map(int, kver.split('.')))
         
-        # run klayout drc
-        if version_tuple <= (0, 29):
-            drc_args = [
-                "klayout",
-                "-b",
-                "-r",
-                str(self.pdk_files['klayout_drc_file']),
-                "-rd",
-                "input=" + str(layout_path),
-                "-rd",
-                "report=" + str(report_path),
-            ]
-        elif version_tuple > (0, 29):
-            drc_args = [
-                "klayout",
-                "-b",                      # batch mode
-                "-r",  str(self.pdk_files['klayout_drc_file']),  # DRC runset (relies on implicit default layout)
-                "-rd", f"report_file={str(report_path)}",  # variable the runset reads for report(...)
-                "-rd", f"in_gds={str(layout_path)}"
-            ]
-        else:
-            raise RuntimeError("klayout version not recognised!")
+            # run klayout drc
+            if version_tuple <= (0, 29):
+                drc_args = [
+                    "klayout",
+                    "-b",
+                    "-r",
+                    str(self.pdk_files['klayout_drc_file']),
+                    "-rd",
+                    "input=" + str(layout_path),
+                    "-rd",
+                    "report=" + str(report_path),
+                ]
+            elif version_tuple > (0, 29):
+                drc_args = [
+                    "klayout",
+                    "-b",                      # batch mode
+                    "-r",  str(self.pdk_files['klayout_drc_file']),  # DRC runset (relies on implicit default layout)
+                    "-rd", f"report_file={str(report_path)}",  # variable the runset reads for report(...)
+                    "-rd", f"in_gds={str(layout_path)}"
+                ]
+            else:
+                raise RuntimeError("klayout version not recognised!")
         
                 
-        rtr_code = subprocess.Popen(drc_args).wait()
-        if rtr_code:
-            raise RuntimeError("error running klayout DRC")
+            rtr_code = subprocess.Popen(drc_args).wait()
+            if rtr_code:
+                raise RuntimeError("error running klayout DRC")
+            if cache:
+                cache.put(cache_key, {}, files=[report_path])
         
         # clean up and return
         if tempdir:
@@ -403,14 +645,8 @@ class MappedPDK(Pdk):
         print(f"DRC report saved at: {report_path}")
         print("Use Tools -> Marker Browser in KLayout to view the violations.")
         
-        # Open DRC output XML file
-        drc_tree = ET.parse(report_path.resolve())
-        drc_root = drc_tree.getroot()
-        if drc_root.tag != "report-database":
-            raise TypeError("DRC report file is not a valid report-database")
-        # Check if DRC passed
-        drc_error_count = len(drc_root[7])
-        return (drc_error_count == 0)
+        # Check if DRC passed, the report is streamed and reading stops at the first violation
+        return summarize_lyrdb(report_path.resolve(), error_budget=0)["is_pass"]
 
     @validate_arguments
     def drc_magic(
@@ -419,7 +655,8 @@ class MappedPDK(Pdk):
         design_name: str, 
         pdk_root: Optional[PathType] = None, 
         magic_drc_file: Optional[PathType] = None, 
-        output_file: Optional[PathType] = None 
+        output_file: Optional[PathType] = None,
+        use_cache: Optional[bool] = None
     ) -> dict:
         """Runs DRC using magic on the either the component or the gds file path provided. Requires the design name and the pdk_root to be specified, handles importing the required magicrc and other setup files, if not specified. Accepts overriden magic_commands_file and magic_drc_file.
 
@@ -438,6 +675,9 @@ class MappedPDK(Pdk):
                 - The .rpt file to save the DRC report.
                 - The report will written to regression/drc/{design_name}/{file_name}
                 - Defaults to None.
+            - use_cache (Optional[bool], optional):
+                - Reuse the result of an earlier run on identical gds bytes and magicrc (see glayout.util.verification_cache).
+                - Defaults to None (enabled unless GLAYOUT_VERIFICATION_CACHE=0).
 
         Raises:
             - ValueError: 
@@ -445,6 +685,9 @@ class MappedPDK(Pdk):
                 - Please either provide a PDK root or the following files: 
                     - a file containing magic commands to be executed for DRC (magic_commands.tcl) 
                     - the .magicrc file for your PDK of choice
+
+        Returns:
+            dict: the result string, the subprocess code and the parsed report (summary, see parse_drc_report)
         """
         if self.name == 'ihp130':
             raise NotImplementedError("LVS not implemented yet for IHP-130 PDK")
@@ -452,64 +695,7 @@ class MappedPDK(Pdk):
         def create_magic_commands_file(temp_dir):
             # magic commands file creation
             print("Defaulting to stale magic_commands.tcl")
-            magic_commands_file_str = f"""
-gds flatglob *$$*
-gds flatglob *VIA*
-gds flatglob *CDNS*
-gds flatglob *capacitor_test_nf*
-
-gds read $::env(RESULTS_DIR)/$::env(DESIGN_NAME).gds
-
-proc custom_drc_save_report {{{{cellname ""}} {{outfile ""}}}} {{
-
-if {{$outfile == ""}} {{set outfile "drc.out"}}
-
-set fout [open $outfile w]
-set oscale [cif scale out]
-if {{$cellname == ""}} {{
-    select top cell
-    set cellname [cellname list self]
-    set origname ""
-}} else {{
-    set origname [cellname list self]
-    puts stdout "\[INFO\]: Loading $cellname\n"
-    flush stdout
-
-    load $cellname
-    select top cell
-}}
-
-drc check
-set count [drc list count]
-
-puts $fout "$cellname count: $count"
-puts $fout "----------------------------------------"
-set drcresult [drc listall why]
-foreach {{errtype coordlist}} $drcresult {{
-    puts $fout $errtype
-    puts $fout "----------------------------------------"
-    foreach coord $coordlist {{
-        set bllx [expr {{$oscale * [lindex $coord 0]}}]
-        set blly [expr {{$oscale * [lindex $coord 1]}}]
-        set burx [expr {{$oscale * [lindex $coord 2]}}]
-        set bury [expr {{$oscale * [lindex $coord 3]}}]
-        set coords [format " %.3fum %.3fum %.3fum %.3fum" $bllx $blly $burx $bury]
-        puts $fout "$coords"
-    }}
-puts $fout "----------------------------------------"
-}}
-puts $fout ""
-
-if {{$origname != ""}} {{
-    load $origname
-}}
-
-close $fout
-puts "\[INFO\]: DONE with $outfile\n"
-}}
-
-custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAME).rpt
-"""
+            magic_commands_file_str = magic_drc_commands()
                 
             new_path = temp_dir / "magic_commands.tcl"
             with open(str(new_path.resolve()), 'w') as f:
@@ -543,43 +729,59 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
                 shutil.copy(layout, gds_path)
             
             magicrc_file = self.pdk_files['magic_drc_file'] if magic_drc_file is None else magic_drc_file
-            magic_cmd_file = create_magic_commands_file(temp_dir_path)
-            cmd = f'bash -c "magic -rcfile {magicrc_file} -noconsole -dnull {magic_cmd_file} < /dev/null"'
-            
-            subp = subprocess.Popen(
-                cmd, 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
-            )
-            
-            subp.wait()
-            print(subp.stdout.read().decode('utf-8'))
-            
-            subproc_code = subp.returncode
-            result_str = "magic drc script passed" if subproc_code == 0 else "magic drc script failed"
-            # print errors
-            
-            errors = subp.stderr.read().decode('utf-8')
-            if errors:
-                print(f"Soft errors: \n{errors}")
-            
             report_path = f'{str(temp_dir_path)}/{design_name}.rpt'
+            cache = get_verification_cache() if verification_cache_enabled(use_cache) else None
+            cache_key = magic_drc_cache_key(self.name, design_name, gds_path, magicrc_file) if cache else None
+            cached = cache.get(cache_key) if cache else None
+            # the report is only copied back when it is published
+            if cached is not None and output_file is not None and not cache.restore(cached, temp_dir_path):
+                cached = None
+            if cached is not None:
+                print("using cached magic drc result")
+                subproc_code = cached["result"]["subproc_code"]
+                summary = cached["result"]["summary"]
+                result_str = "magic drc script passed" if subproc_code == 0 else "magic drc script failed"
+                result_str += "\nNo errors found in DRC report" if summary["is_pass"] else "\nErrors found in DRC report"
+            else:
+                magic_cmd_file = create_magic_commands_file(temp_dir_path)
+                cmd = f'bash -c "magic -rcfile {magicrc_file} -noconsole -dnull {magic_cmd_file} < /dev/null"'
+                
+                subp = subprocess.Popen(
+                    cmd, 
+                    shell=True, 
+                    stdout=subprocess.PIPE, 
+                    stderr=subprocess.PIPE
+                )
+                
+                subp.wait()
+                print(subp.stdout.read().decode('utf-8'))
+                
+                subproc_code = subp.returncode
+                # print errors
+                
+                errors = subp.stderr.read().decode('utf-8')
+                if errors:
+                    print(f"Soft errors: \n{errors}")
+                
+                result_str = "magic drc script passed" if subproc_code == 0 else "magic drc script failed"
             
-            if Path(report_path).is_file():
-                with open(report_path, 'r') as f:
-                    num_lines = len(f.readlines())
-                    if num_lines > 3:
-                        result_str = result_str + "\nErrors found in DRC report"
-                        f.seek(0)
-                        for line in f.readlines():
-                            print(line)    
-                    else:
-                        result_str = result_str + "\nNo errors found in DRC report"
-            else: 
-                raise ValueError("DRC report file not found")
+                if Path(report_path).is_file():
+                    with open(report_path, 'r') as f:
+                        num_lines = len(f.readlines())
+                        if num_lines > 3:
+                            result_str = result_str + "\nErrors found in DRC report"
+                            f.seek(0)
+                            for line in f.readlines():
+                                print(line)    
+                        else:
+                            result_str = result_str + "\nNo errors found in DRC report"
+                else: 
+                    raise ValueError("DRC report file not found")
+                summary = summarize_magic_drc_report(report_path)
+                if cache and subproc_code == 0:
+                    cache.put(cache_key, {"subproc_code": subproc_code, "summary": summary}, files=[report_path])
                     
-            ret_dict = {"result_str": result_str, "subproc_code": subproc_code}
+            ret_dict = {"result_str": result_str, "subproc_code": subproc_code, "summary": summary}
             if ret_dict is None:
                 raise ValueError('Something weird happened')
                     
@@ -611,6 +813,8 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
         output_file_path: Optional[PathType] = None, 
         copy_intermediate_files: Optional[bool] = False,
         show_scripts: Optional[bool] = False,
+        use_cache: Optional[bool] = None,
+        extraction_level: Literal["lvs", "lvs+sim", "pex"] = "pex",
     ) -> dict:
         """ Runs LVS using netgen on the either the component or the gds file path provided. Requires the design name and the pdk_root to be specified, handles importing the required magicrc and other setup files, if not specified. Accepts overriden lvs_setup_tcl_file, lvs_schematic_ref_file, and magic_drc_file.
 
@@ -641,6 +845,13 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
             - copy_intermediate_files (Optional[bool], optional): 
                 - If True, copies intermediate files to the currenty working directory (lvsmag, pex spice, prepex spice).
                 - Defaults to False.
+            - use_cache (Optional[bool], optional):
+                - Reuse the result of an earlier run on identical gds bytes, netlist and setup files (see glayout.util.verification_cache).
+                - Defaults to None (enabled unless GLAYOUT_VERIFICATION_CACHE=0).
+            - extraction_level (Literal["lvs", "lvs+sim", "pex"], optional):
+                - Which netlists magic extracts. "lvs" only extracts the netlist netgen compares (fastest),
+                - "lvs+sim" also writes the .sim netlist, "pex" also flattens and runs extresist for the parasitic netlist.
+                - Defaults to "pex".
 
         Raises:
             - NotImplementedError:
@@ -656,8 +867,10 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
                 - If the path to the netlist file is not a file!
 
         Returns:
-            dict: a dictionary containing the result string and the subprocess code
+            dict: a dictionary containing the result string, the subprocess codes and the parsed report (summary, see parse_lvs_report)
         """
+        from glayout.verification.verification import parse_lvs_report
+
         if self.name == 'ihp130':
             raise NotImplementedError("LVS not implemented yet for IHP-130 PDK")
         
@@ -669,75 +882,11 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
             check_suffix = str(netlist).endswith(cdl_suffix) or str(netlist).endswith(spice_suffix)
             return check_suffix # True for cdl and spice, False if net passed
         
-        def extract_design_name_from_netlist(file_path: str):
-            """ Extracts the design name from the netlist file (found after the final .ends statement in the netlist file)"""
-            with open(file_path, 'r') as file:
-                lines = file.readlines()
-            last_ends_line = None
-            for line in lines:
-                if line.strip().startswith(".ends"):
-                    last_ends_line = line.strip()
-
-            if last_ends_line:
-                parts = last_ends_line.split()
-                if len(parts) > 1:
-                    return parts[1]
-                else:
-                    return None
-                
         def check_command_exists(command: str):
             """ Check if a command exists in the system """
             result = subprocess.run(f"command -v {command}", shell=True, capture_output=True, text=True)
             return result.returncode == 0
         
-        def modify_design_name_in_cdl(netlist, design_name):
-            design_name_from_cdl = extract_design_name_from_netlist(netlist)
-            if design_name_from_cdl is not None:
-                if design_name_from_cdl == design_name:
-                    print(f"Design name from CDL file: {design_name_from_cdl} matches the design name: {design_name}")
-                else:
-                    # replace all occurences of design_name_from_cdl with design_name in the cdl file
-                    with open(netlist, 'r') as file:
-                        filedata = file.read()
-                    newdata = filedata.replace(design_name_from_cdl, design_name)
-                    with open(netlist, 'w') as file:
-                        file.write(newdata)
-            else:
-                print("Warning: Design name not found in the netlist file")
-        
-        # Function to add 'u' (micron unit label) to w= and l= values in the netlist
-        # Hacky way to get it working with GF180 PDK and Netgen
-        def add_u_to_wl(line):
-            # Only add 'u' if the value is not already followed by a unit
-            line = re.sub(r'(w=)([0-9.]+)(\s|$)', r'\1\2u\3', line)
-            line = re.sub(r'(l=)([0-9.]+)(\s|$)', r'\1\2u\3', line)
-            return line
-
-        def write_spice(input_cdl, output_spice, lvs_schematic_ref_file):
-        # create {design_name}.spice
-            if self.name == 'sky130':
-                with open(input_cdl, 'r') as file:
-                    lines = file.readlines()
-                    with open(output_spice, 'w') as file2:
-                        sky130_spice_path = Path(lvs_schematic_ref_file).resolve()
-                        file2.write(f".include {sky130_spice_path}\n")
-                        # write the rest of the lines
-                        for line in lines:
-                            file2.write(line)
-                
-            elif self.name.lower() == 'gf180':
-                # For GF180 PDK, we need to add 'u' to w= and l= values in the netlist
-                with open(input_cdl, 'r') as file:
-                    lines = file.readlines()
-                    with open(output_spice, 'w') as file2:
-                        sky130_spice_path = Path(lvs_schematic_ref_file).resolve()
-                        file2.write(f".include {sky130_spice_path}\n")
-                        # write the rest of the lines
-                        for line in lines:
-                            file2.write(add_u_to_wl(line))
-            else:
-                raise NotImplementedError("LVS only supported for gf180 and sky130 PDKs")
-            
         if not check_command_exists("netgen"):
             raise RuntimeError("Netgen not found in the system")
         if not check_command_exists("magic"):
@@ -794,49 +943,9 @@ custom_drc_save_report $::env(DESIGN_NAME) $::env(REPORTS_DIR)/$::env(DESIGN_NAM
             modify_design_name_in_cdl(str(netlist_from_comp), design_name)    
             lvsschemref_file = self.pdk_files['lvs_schematic_ref_file'] if lvs_schematic_ref_file is None else lvs_schematic_ref_file
         
-            write_spice(str(netlist_from_comp), str(spice_path), lvsschemref_file)
+            write_spice(self.name, str(netlist_from_comp), str(spice_path), lvsschemref_file)
             
-            magic_script_content = f"""
-drc off            
-gds flatglob *\\$\\$*
-gds read {gds_path}
-
-# LVS Netlist
-load {design_name}
-select top cell
-
-extract all
-ext2resist all
-
-ext2spice lvs
-ext2spice extresist on
-ext2spice -o {str(lvsmag_path)}
-
-# Sim Netlist
-load {design_name}
-extract all
-ext2sim cthresh 0
-ext2sim -o {str(sim_path)}
-
-# Pex Netlist
-flatten {design_name}
-load {design_name}
-select top cell
-
-extract do local
-extract all
-
-ext2sim labels on
-ext2sim
-extresist tolerance 10
-extresist
-
-ext2spice lvs
-ext2spice cthresh 0
-ext2spice extresist on
-ext2spice -o {str(pex_path)}
-exit
-"""
+            magic_script_content = magic_lvs_script(design_name, gds_path, lvsmag_path, sim_path, pex_path, extraction_level)
             if show_scripts:
                 print("Creating magic script for LVS...")
                 # Print the magic script content to the terminal instead of writing to a file
@@ -854,47 +963,70 @@ exit
             try:
                 
                 magicrc_file = self.pdk_files['magic_drc_file'] if magic_drc_file is None else magic_drc_file
-                magic_cmd = f"bash -c 'magic -rcfile {magicrc_file} -noconsole -dnull < {magic_script_path}'",
-                magic_subproc = subprocess.run(
-                    magic_cmd, 
-                    shell=True,
-                    check=True,
-                    capture_output=True
-                )
+                lvssetup_file = self.pdk_files['lvs_setup_tcl_file'] if lvs_setup_tcl_file is None else lvs_setup_tcl_file 
+                cache = get_verification_cache() if verification_cache_enabled(use_cache) else None
+                cache_key = lvs_netgen_cache_key(self.name, design_name, gds_path, spice_path, [magicrc_file, lvssetup_file, lvsschemref_file], extraction_level) if cache else None
+                cached = cache.get(cache_key) if cache else None
+                summary = None
+                # the report and netlists are only copied back when they are published
+                if cached is not None and output_file_path is not None and not cache.restore(cached, temp_dir_path):
+                    cached = None
+                if cached is not None:
+                    print("using cached LVS result")
+                    magic_subproc_code = cached["result"]["magic_subproc_code"]
+                    netgen_subproc_code = cached["result"]["netgen_subproc_code"]
+                    summary = cached["result"]["summary"]
+                else:
+                    magic_cmd = f"bash -c 'magic -rcfile {magicrc_file} -noconsole -dnull < {magic_script_path}'",
+                    magic_subproc = subprocess.run(
+                        magic_cmd, 
+                        shell=True,
+                        check=True,
+                        capture_output=True
+                    )
                 
-                magic_subproc_code = magic_subproc.returncode
-                magic_subproc_out = magic_subproc.stdout.decode('utf-8')
-                print(magic_subproc_out)
+                    magic_subproc_code = magic_subproc.returncode
+                    magic_subproc_out = magic_subproc.stdout.decode('utf-8')
+                    print(magic_subproc_out)
                 
-                if show_scripts:
-                    with open(lvsmag_path, 'r') as f:
-                        content = f.read()
-                        print("==== LVS MAG BEGIN ====")
-                        print(content)
-                        print("==== LVS MAG END ====")
-
-                    with open(spice_path, 'r') as f:
-                        content = f.read()
-                        print("==== SPICE MAG BEGIN ====")
-                        print(content)
-                        print("==== SPICE MAG END ====")
+                    if show_scripts:
+                        with open(lvsmag_path, 'r') as f:
+                            content = f.read()
+                            print("==== LVS MAG BEGIN ====")
+                            print(content)
+                            print("==== LVS MAG END ====")
+
+                        with open(spice_path, 'r') as f:
+                            content = f.read()
+                            print("==== SPICE MAG BEGIN ====")
+                            print(content)
+                            print("==== SPICE MAG END ====")
                     
-                lvssetup_file = self.pdk_files['lvs_setup_tcl_file'] if lvs_setup_tcl_file is None else lvs_setup_tcl_file 
-                netgen_command = f'netgen -batch lvs "{str(lvsmag_path)} {design_name}" "{str(spice_path)} {design_name}" {lvssetup_file} {str(report_path)}'
-                print(f"Running netgen command: {netgen_command.strip()}")
-                netgen_subproc = subprocess.run(
-                    netgen_command,
-                    shell=True,
-                    check=True, 
-                    capture_output=True
-                )
-                netgen_subproc_code = netgen_subproc.returncode
-                netgen_subproc_out = netgen_subproc.stdout.decode('utf-8')
-                print(netgen_subproc_out)
+                    netgen_command = f'netgen -batch lvs "{str(lvsmag_path)} {design_name}" "{str(spice_path)} {design_name}" {lvssetup_file} {str(report_path)}'
+                    print(f"Running netgen command: {netgen_command.strip()}")
+                    netgen_subproc = subprocess.run(
+                        netgen_command,
+                        shell=True,
+                        check=True, 
+                        capture_output=True
+                    )
+                    netgen_subproc_code = netgen_subproc.returncode
+                    netgen_subproc_out = netgen_subproc.stdout.decode('utf-8')
+                    print(netgen_subproc_out)
+                    if report_path.is_file():
+                        summary = parse_lvs_report(report_path.read_text())
+                    if cache and summary is not None:
+                        cache.put(
+                            cache_key,
+                            {"magic_subproc_code": magic_subproc_code, "netgen_subproc_code": netgen_subproc_code, "summary": summary},
+                            files=[report_path, lvsmag_path, sim_path, pex_path],
+                        )
                 
                 result_str = "LVS run succeeded" if netgen_subproc_code == 0 and magic_subproc_code == 0 else "LVS run failed"
 
-                if report_path.is_file():
+                if cached is not None:
+                    result_str += "\nNo errors found in LVS report" if summary["is_pass"] else "\nErrors found in LVS report"
+                elif report_path.is_file():
                     with open(report_path, 'r') as f:
                         num_lines = len(f.readlines())
                         if num_lines > 3:
@@ -940,13 +1072,16 @@ exit
                         sim_dest    = path_to_dir / f"{design_name}_sim.spice"
                         pex_dest    = path_to_dir / f"{design_name}_pex.spice"
                         shutil.copy(lvsmag_path, lvsmag_dest)
-                        shutil.copy(sim_path, sim_dest)
-                        shutil.copy(pex_path, pex_dest)
+                        # sim and pex netlists only exist for the extraction levels that write them
+                        if sim_path.is_file():
+                            shutil.copy(sim_path, sim_dest)
+                        if pex_path.is_file():
+                            shutil.copy(pex_path, pex_dest)
                         print(f"Copied intermediate files to {path_to_dir}")
                         # shutil.copy(lvsmag_path, str(Path.cwd() / f"{design_name}_lvsmag.spice"))  
                         # shutil.copy(sim_path, str(Path.cwd() / f"{design_name}_sim.spice"))
             
-        return {'magic_subproc_code': magic_subproc_code, 'netgen_subproc_code': netgen_subproc_code, 'result_str': result_str}
+        return {'magic_subproc_code': magic_subproc_code, 'netgen_subproc_code': netgen_subproc_code, 'result_str': result_str, 'summary': summary}
                     
     
     @validate_arguments
@@ -1004,29 +1139,28 @@ exit
         self, glayer1: str, glayer2: Optional[str] = None, return_decimal = False
     ) -> dict[StrictStr, Union[float,Decimal]]:
         """Returns a dictionary describing the relationship between two layers
-        If one layer is specified, returns a dictionary with all intra layer rules"""
-        if glayer1 not in MappedPDK.valid_glayers:
-            raise ValueError("get_grule, " + str(glayer1) + " not valid glayer")
-        # decide if two or one inputs and set rules_dict accordingly
-        rules_dict = None
-        if glayer2 is not None:
-            if glayer2 not in MappedPDK.valid_glayers:
-                raise ValueError("get_grule, " + str(glayer2) + " not valid glayer")
-            rules_dict = self.grules.get(glayer1, dict()).get(glayer2)
-            if rules_dict is None or rules_dict == {}:
-                rules_dict = self.grules.get(glayer2, dict()).get(glayer1)
-        else:
-            glayer2 = glayer1
-            rules_dict = self.grules.get(glayer1, dict()).get(glayer1)
-        # error check, convert type, and return
-        if rules_dict is None or rules_dict == {}:
-            raise NotImplementedError(
-                "no rules found between " + str(glayer1) + " and " + str(glayer2)
-            )
-        for rule in rules_dict:
-            if type(rule) == float and return_decimal:
-                rules_dict[rule] = Decimal(str(rule))
-        return rules_dict
+        If one layer is specified, returns a dictionary with all intra layer rules
+        The returned dictionary is read only (see compiled_grules)"""
+        return self.compiled_grules.get(glayer1, glayer2, return_decimal)
+
+    def get_grule_fast(
+        self, glayer1: str, glayer2: Optional[str] = None, return_decimal: bool = False
+    ) -> dict[StrictStr, Union[float,Decimal]]:
+        """same as get_grule but skips argument validation.
+        Use in generators that look up rules many times per cell"""
+        return self.compiled_grules.get(glayer1, glayer2, return_decimal)
+
+    @property
+    def compiled_grules(self) -> CompiledGRules:
+        """frozen symmetric (glayer1, glayer2) rule table built from grules on first use
+        the table is rebuilt if grules is reassigned"""
+        return compile_grules(self.grules, MappedPDK.valid_glayers)
+
+    @property
+    def derived_constants(self) -> DerivedConstants:
+        """table of constants derived from the grules (via stack sizes, via pitch, max separations, min device dims)
+        each entry is computed on first use, the table is rebuilt if grules or grid_size is reassigned"""
+        return derived_constants(self)
 
     @classmethod
     def is_routable_glayer(cls, glayer: StrictStr):
@@ -1094,10 +1228,7 @@ exit
             raise ValueError("metal levels cannot be empty list")
         if type(metal_levels[0])==int:
             metal_levels = [f"met{i}" for i in metal_levels]
-        sep_rules = list()
-        for met in metal_levels:
-            sep_rules.append(self.get_grule(met)["min_separation"])
-        return self.snap_to_2xgrid(max(sep_rules))
+        return self.derived_constants.max_separation(metal_levels)
 
     @validate_arguments
     def snap_to_2xgrid(self, dims: Union[list[Union[float,Decimal]], Union[float,Decimal]], return_type: Literal["decimal","float","same"]="float", snap4: bool=False) -> Union[list[Union[float,Decimal]], Union[float,Decimal]]:
@@ -1111,18 +1242,27 @@ exit
         """
         dims = dims if isinstance(dims, Iterable) else [dims]
         dimtype_in = type(dims[0])
-        dims = [Decimal(str(dim)) for dim in dims] # process in decimals
-        grid = 2 * Decimal(str(self.grid_size))
-        grid = grid if grid else Decimal('0.001')
-        grid = 2*grid if snap4 else grid
-        # snap dims to grid
-        snapped_dims = list()
-        for dim in dims:
-            snapped_dim = grid * (dim / grid).quantize(1, rounding=ROUND_UP)
-            snapped_dims.append(snapped_dim)
+        # process in integer dbu, rounding away from zero (ROUND_UP)
+        grid = self._snap_grid_dbu(snap4)
+        snapped_dims = [snap_up(to_dbu_up(dim), grid) for dim in dims]
         # convert to correct type
         if return_type=="float" or (return_type=="same" and dimtype_in==float):
-            snapped_dims = [float(snapped_dim) for snapped_dim in snapped_dims]
+            snapped_dims = [to_um(snapped_dim) for snapped_dim in snapped_dims]
+        else:
+            snapped_dims = [to_um_decimal(snapped_dim) for snapped_dim in snapped_dims]
         # correctly return list or single element
         return snapped_dims[0] if len(snapped_dims)==1 else snapped_dims
 
+    def snap_to_2xgrid_array(self, dims, snap4: bool=False) -> np.ndarray:
+        """batch snap_to_2xgrid: snaps every number of dims (numpy array, or nested list / tuple of numbers such as a
+        list of points) to double the grid size at once, with the same rounding (away from zero) as snap_to_2xgrid.
+        returns a float array with the shape of dims
+        snap4: snap to 4xgrid (Defualt false)
+        """
+        return to_um_array(snap_up_array(to_dbu_up_array(dims), self._snap_grid_dbu(snap4)))
+
+    def _snap_grid_dbu(self, snap4: bool=False) -> int:
+        """grid of snap_to_2xgrid in dbu, 2xgrid (or 4xgrid), at least 1nm"""
+        grid = 2 * to_dbu(self.grid_size) or 1
+        return 2*grid if snap4 else grid
+
@@ -1,64 +1,92 @@
+import gdstk
+import numpy as np
 from gdsfactory.component import Component
-from gdsfactory.polygon import Polygon
-from gdsfactory.geometry.boolean import boolean
+
+# npc enclosure of licon and the center distance below which two npc rectangles are joined (0.27+0.37)
+NPC_ENCLOSURE = 0.1
+NPC_MERGE_DISTANCE = 0.64
+# neighbour grid cells visited from every cell, each pair of cells is visited once
+_HALF_NEIGHBOURHOOD = ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def _boxes(polygons: list) -> np.ndarray:
+	"""(n, 4) array of xmin, ymin, xmax, ymax of the polygons"""
+	if not polygons:
+		return np.zeros((0, 4))
+	return np.array([(*points.min(axis=0), *points.max(axis=0)) for points in polygons], dtype=float)
+
+
+def npc_neighbour_pairs(centers: np.ndarray, distance: float = NPC_MERGE_DISTANCE) -> tuple[np.ndarray, np.ndarray]:
+	"""indices (i, j), i < j, of the centers closer than distance in x and in y.
+	centers are hashed into a uniform grid of pitch distance, so only the 3x3 cells around a center can hold a
+	neighbour and the search is linear in the number of centers (plus the number of pairs)"""
+	if len(centers) < 2:
+		return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+	cells = np.floor(centers / distance).astype(np.int64)
+	cells -= cells.min(axis=0) - 1
+	stride = int(cells[:, 1].max()) + 2
+	keys = cells[:, 0] * stride + cells[:, 1]
+	order = np.argsort(keys, kind="stable")
+	sorted_keys = keys[order]
+	firsts, seconds = [], []
+	for dx, dy in _HALF_NEIGHBOURHOOD:
+		target = sorted_keys + dx * stride + dy
+		lo = np.searchsorted(sorted_keys, target, side="left")
+		hi = np.searchsorted(sorted_keys, target, side="right")
+		if (dx, dy) == (0, 0):
+			# same cell: only the entries after this one
+			lo = np.arange(1, len(sorted_keys) + 1)
+		counts = np.maximum(hi - lo, 0)
+		total = int(counts.sum())
+		if total == 0:
+			continue
+		first = np.repeat(np.arange(len(sorted_keys)), counts)
+		# lo[first] + position of the pair within the run of its first entry
+		offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+		firsts.append(first)
+		seconds.append(lo[first] + offsets)
+	if not firsts:
+		return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+	first, second = order[np.concatenate(firsts)], order[np.concatenate(seconds)]
+	close = np.all(np.abs(centers[first] - centers[second]) < distance, axis=1)
+	first, second = first[close], second[close]
+	return np.minimum(first, second), np.maximum(first, second)
+
+
+def npc_polygons(licon_over_poly: list) -> list:
+	"""npc polygons (arrays of points) covering licon_over_poly (arrays of points) with the enclosure. npc rectangles
+	closer than NPC_MERGE_DISTANCE are joined by their bounding box, all rectangles are then merged into polygons
+	(fractured to at most 199 points, as gdsfactory booleans do)"""
+	boxes = _boxes(licon_over_poly)
+	if len(boxes) == 0:
+		return list()
+	boxes[:, :2] -= NPC_ENCLOSURE
+	boxes[:, 2:] += NPC_ENCLOSURE
+	# use the fact that all npc polys have the same width (at this point)
+	first, second = npc_neighbour_pairs((boxes[:, :2] + boxes[:, 2:]) / 2)
+	joins = np.concatenate((np.minimum(boxes[first, :2], boxes[second, :2]), np.maximum(boxes[first, 2:], boxes[second, 2:])), axis=1)
+	rectangles = [gdstk.rectangle(tuple(box[:2]), tuple(box[2:])) for box in np.concatenate((boxes, joins))]
+	merged = gdstk.boolean(rectangles, [], "or", precision=1e-4)
+	return [piece.points for polygon in merged for piece in polygon.fracture(precision=1e-4)]
 
 
 def sky130_add_npc(comp: Component) -> Component:
 	"""To keep with the generic generator structure,
 	we do NOT add nitride poly cut layer in the generic generators (npc is specfic to sky130).
-	Because it is easy to add idenpedently, 
+	Because it is easy to add idenpedently,
 	we implement this as a function wrapper to correctly lay npc
 	returns the modified component"""
 	# extract licon polygons which are over poly (using booleans)
-	licon_comp = comp.extract(layers=[(66,44)])
-	poly_comp = comp.extract(layers=[(66,20)])
-	existing_npc = comp.extract(layers=[(95,20)])
+	licon = comp.get_polygons(by_spec=(66,44))
+	poly = comp.get_polygons(by_spec=(66,20))
+	existing_npc = comp.get_polygons(by_spec=(95,20))
 	# TODO: see about an implemtation using gdsfactory component metadata
-	if len(licon_comp.get_polygons()) < 2 and len(poly_comp.get_polygons()) < 2:
+	if len(licon) < 2 and len(poly) < 2:
 		return comp
-	liconANDpoly = boolean(licon_comp, poly_comp, layer=(1,2), operation="and")
-	if len(existing_npc.get_polygons()) > 1:
-		liconANDpoly = boolean(liconANDpoly, existing_npc, layer=(1,2), operation="A-B")
-	licon_polygons = liconANDpoly.get_polygons(as_array=False)
-	# iterate through all licon and create npc (ignore merges for now)
-	npc_polygons = list()
-	for licon_polygon in licon_polygons:
-		bbox = licon_polygon.bounding_box()
-		licon_polygonxmin = bbox[0][0]
-		licon_polygonymin = bbox[0][1]
-		licon_polygonxmax = bbox[1][0]
-		licon_polygonymax = bbox[1][1]
-		padding_points = [
-			[licon_polygonxmin - 0.1, licon_polygonymin - 0.1],
-			[licon_polygonxmax + 0.1, licon_polygonymin - 0.1],
-			[licon_polygonxmax + 0.1, licon_polygonymax + 0.1],
-			[licon_polygonxmin - 0.1, licon_polygonymax + 0.1],
-		]
-		npc_polygons.append(Polygon(padding_points, layer=(95,20)))
-	# determine which npc polygons should be merged 
-	# also merge them by adding a polygon over them 
-	# naive approach, n^2 complexity
-	npc_merged_polygons = list()
-	for i, npc_polygon in enumerate(npc_polygons):
-		for j, other_polygon in enumerate(npc_polygons):
-			# use the fact that all npc polys have the same width (at this point)
-			yviolation = abs(npc_polygon.center[1] - other_polygon.center[1]) < 0.64#0.27+0.37
-			xviolation = abs(npc_polygon.center[0] - other_polygon.center[0]) < 0.64
-			if i==j:#skip same polygon
-				continue
-			elif (xviolation and yviolation):
-				nxmax = max(npc_polygon.xmax, other_polygon.xmax)
-				nxmin = min(npc_polygon.xmin, other_polygon.xmin)
-				nymax = max(npc_polygon.ymax, other_polygon.ymax)
-				nymin = min(npc_polygon.ymin, other_polygon.ymin)
-				points = [
-					[nxmin,nymin],
-					[nxmax,nymin],
-					[nxmax,nymax],
-					[nxmin,nymax],
-				]
-				npc_merged_polygons.append(Polygon(points=points,layer=(95,20)))
-	# add npc and return
-	npc_polygons_to_add = npc_polygons + npc_merged_polygons
-	comp.add(npc_polygons_to_add)
+	licon_over_poly = gdstk.boolean(licon, poly, "and", precision=1e-4) if licon and poly else []
+	if len(existing_npc) > 1 and licon_over_poly:
+		licon_over_poly = gdstk.boolean(licon_over_poly, existing_npc, "not", precision=1e-4)
+	# npc around every licon, rectangles closer than NPC_MERGE_DISTANCE are joined (grid hashed neighbour search)
+	for points in npc_polygons([polygon.points for polygon in licon_over_poly]):
+		comp.add_polygon(points, layer=(95,20))
 	return comp
@@ -12,8 +12,6 @@ from glayout.primitives.guardring import tapring
 from glayout.util.port_utils import add_ports_perimeter
 from gdsfactory.cell import clear_cache
 from typing import Literal, Optional, Union
-from glayout.pdk.sky130_mapped import sky130_mapped_pdk
-from glayout.pdk.gf180_mapped import gf180_mapped_pdk
 from glayout.spice.netlist import Netlist
 from gdsfactory.components import text_freetype, rectangle
 from glayout.primitives.via_gen import via_stack
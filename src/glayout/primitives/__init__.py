@@ -1,12 +1,37 @@
 """
 Glayout primitives module for basic circuit components.
+
+The primitives are loaded on first access, importing one primitive module (e.g. glayout.primitives.via_gen) does
+not import the others. This keeps routing -> via_gen -> fet -> routing free of import cycles.
 """
 
-from .via_gen import via_stack, via_array
-from .fet import nmos, pmos, multiplier, fet_netlist
-from .guardring import tapring
-from .mimcap import mimcap, mimcap_array
-from .resistor import resistor
+from importlib import import_module
+
+_LAZY_ATTRS = {
+    'via_stack': '.via_gen',
+    'via_array': '.via_gen',
+    'nmos': '.fet',
+    'pmos': '.fet',
+    'multiplier': '.fet',
+    'fet_netlist': '.fet',
+    'tapring': '.guardring',
+    'mimcap': '.mimcap',
+    'mimcap_array': '.mimcap',
+    'resistor': '.resistor',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     'via_stack',
@@ -19,4 +44,4 @@ __all__ = [
     'mimcap',
     'mimcap_array',
     'resistor'
-] 
\ No newline at end of file
+]
@@ -2,7 +2,7 @@ from pydantic import validate_arguments
 from sys import prefix
 import numpy as np
 from typing import Any, Optional, Union
-from glayout import MappedPDK, sky130 , gf180
+from glayout.pdk.mappedpdk import MappedPDK
 from glayout.primitives.guardring import tapring
 from glayout.routing import c_route
 from glayout.util.pattern import check_pattern_level, check_pattern_size, get_cols_positions, transpose_pattern
@@ -406,7 +406,7 @@ def multiplier(
                     (multiplier.ports["E_N"].center[1]+multiplier.ports["E_S"].center[1])/2)
         evia = rename_ports_by_list(via_stack(pdk,
                                               "met1",
-                                              emitter_route_topmet),
+                                              emitter_route_topmet).copy(),
                                      [("top_met_","emitter_")])
         evia_ref = move(evia.ref(),destination=ecenter)
         multiplier.add(evia_ref)
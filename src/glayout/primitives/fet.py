@@ -7,11 +7,13 @@ from typing import Optional, Union
 from glayout.primitives.via_gen import via_array, via_stack
 from glayout.primitives.guardring import tapring
 from pydantic import validate_arguments
-from glayout.util.comp_utils import evaluate_bbox, to_float, to_decimal, prec_array, prec_center, prec_ref_center, movey, align_comp_to_port
+from glayout.util.comp_utils import evaluate_bbox, to_float, to_decimal, prec_array, prec_center, prec_ref_center, movex, movey, align_comp_to_port
 from glayout.util.port_utils import rename_ports_by_orientation, rename_ports_by_list, add_ports_perimeter, print_ports
 from glayout.routing.c_route import c_route
 from glayout.routing.L_route import L_route
 from glayout.util.snap_to_grid import component_snap_to_grid
+from glayout.util.port_visibility import add_public_ports, keep_lazy_ports, materialize_ports
+from glayout.util.dbu import to_dbu, to_um
 from decimal import Decimal
 from glayout.routing.straight_route import straight_route
 from glayout.spice import Netlist
@@ -25,43 +27,50 @@ def __gen_fingers_macro(pdk: MappedPDK, rmult: int, fingers: int, length: float,
     poly_height = pdk.snap_to_2xgrid(poly_height)
     sizing_ref_viastack = via_stack(pdk, "active_diff", "met1")
     # figure out poly (gate) spacing: s/d metal doesnt overlap transistor, s/d min seperation criteria is met
-    sd_viaxdim = rmult*evaluate_bbox(via_stack(pdk, "active_diff", "met1"))[0]
-    poly_spacing = 2 * pdk.get_grule("poly", "mcon")["min_separation"] + pdk.get_grule("mcon")["width"]
+    sd_viaxdim = rmult*pdk.derived_constants.via_stack_size("active_diff", "met1")
+    poly_spacing = 2 * pdk.get_grule_fast("poly", "mcon")["min_separation"] + pdk.get_grule_fast("mcon")["width"]
     poly_spacing = max(sd_viaxdim, poly_spacing)
-    met1_minsep = pdk.get_grule("met1")["min_separation"]
+    met1_minsep = pdk.get_grule_fast("met1")["min_separation"]
     poly_spacing += met1_minsep if length < met1_minsep else 0
     # create a single finger
     finger = Component("finger")
     gate = finger << rectangle(size=(length, poly_height), layer=pdk.get_glayer("poly"), centered=True)
-    sd_viaarr = via_array(pdk, "active_diff", "met1", size=(sd_viaxdim, width), minus1=True, lay_bottom=False).copy()
+    sd_viaarr_cell = via_array(pdk, "active_diff", "met1", size=(sd_viaxdim, width), minus1=True, lay_bottom=False)
+    sd_viaarr = keep_lazy_ports(sd_viaarr_cell, sd_viaarr_cell.copy())
     interfinger_correction = via_array(pdk,"met1",inter_finger_topmet, size=(None, width),lay_every_layer=True, num_vias=(1,None))
     sd_viaarr << interfinger_correction
     sd_viaarr_ref = finger << sd_viaarr
     sd_viaarr_ref.movex((poly_spacing+length) / 2)
     finger.add_ports(gate.get_ports_list(),prefix="gate_")
-    finger.add_ports(sd_viaarr_ref.get_ports_list(),prefix="rightsd_")
+    add_public_ports(finger, sd_viaarr_ref, prefix="rightsd_")
     # create finger array
     fingerarray = prec_array(finger, columns=fingers, rows=1, spacing=(poly_spacing+length, 1),absolute_spacing=True)
     sd_via_ref_left = fingerarray << sd_viaarr
     sd_via_ref_left.movex(0-(poly_spacing+length)/2)
-    fingerarray.add_ports(sd_via_ref_left.get_ports_list(),prefix="leftsd_")
+    add_public_ports(fingerarray, sd_via_ref_left, prefix="leftsd_")
     # center finger array and add ports
     centered_farray = Component()
     fingerarray_ref_center = prec_ref_center(fingerarray)
     centered_farray.add(fingerarray_ref_center)
-    centered_farray.add_ports(fingerarray_ref_center.get_ports_list())
+    add_public_ports(centered_farray, fingerarray_ref_center)
     # create diffusion and +doped region
     multiplier = rename_ports_by_orientation(centered_farray)
-    diff_extra_enc = 2 * pdk.get_grule("mcon", "active_diff")["min_enclosure"]
+    diff_extra_enc = 2 * pdk.get_grule_fast("mcon", "active_diff")["min_enclosure"]
     diff_dims =(diff_extra_enc + evaluate_bbox(multiplier)[0], width)
     diff = multiplier << rectangle(size=diff_dims,layer=pdk.get_glayer("active_diff"),centered=True)
-    sd_diff_ovhg = pdk.get_grule(sdlayer, "active_diff")["min_enclosure"]
+    sd_diff_ovhg = pdk.get_grule_fast(sdlayer, "active_diff")["min_enclosure"]
     sdlayer_dims = [dim + 2*sd_diff_ovhg for dim in diff_dims]
     sdlayer_ref = multiplier << rectangle(size=sdlayer_dims, layer=pdk.get_glayer(sdlayer),centered=True)
     multiplier.add_ports(sdlayer_ref.get_ports_list(),prefix="plusdoped_")
     multiplier.add_ports(diff.get_ports_list(),prefix="diff_")
     return component_snap_to_grid(rename_ports_by_orientation(multiplier))
 
+def __add_row(custom_comp: Component, row_comp: Component, origin, count: int, pitch: int) -> None:
+    """internal use: adds count copies of row_comp to custom_comp with one array reference,
+    the first copy moved to origin and the next ones pitch (dbu) apart along x"""
+    row_ref = custom_comp.add_array(row_comp, columns=count, rows=1, spacing=(to_um(pitch), 0))
+    row_ref.move(tuple(origin))
+
 def fet_netlist(
     pdk: MappedPDK,
     circuit_name: str,
@@ -92,7 +101,7 @@ def fet_netlist(
         num_dummies = 2
 
     if length is None:
-        length = pdk.get_grule('poly')['min_width']
+        length = pdk.get_grule_fast('poly')['min_width']
         
     ltop = length
     wtop = width
@@ -172,6 +181,7 @@ def multiplier(
     plusdoped_...all edges (area of p+s/d or n+s/d layer)
     diff_...all edges (diffusion region)
     rowx_coly_...all ports associated with finger array include gate_... and array_ (array includes all ports of the viastacks in the array)
+    ****NOTE: array_ ports are private, with set_port_visibility("public") they are resolved by glayout.util.port_visibility.get_port
     leftsd_...all ports associated with the left most via array
     dummy_L,R_N,E,S,W ports if dummy_routes=True
     """
@@ -191,13 +201,13 @@ def multiplier(
     if fingers < 1:
         raise ValueError("number of fingers must be positive int")
     # argument parsing and rule setup
-    min_length = pdk.get_grule("poly")["min_width"]
+    min_length = pdk.derived_constants.min_fet_length
     length = min_length if (length or min_length) <= min_length else length
     length = pdk.snap_to_2xgrid(length)
-    min_width = max(min_length, pdk.get_grule("active_diff")["min_width"])
+    min_width = pdk.derived_constants.min_fet_width
     width = min_width if (width or min_width) <= min_width else width
     width = pdk.snap_to_2xgrid(width)
-    poly_height = width + 2 * pdk.get_grule("poly", "active_diff")["overhang"]
+    poly_height = width + 2 * pdk.get_grule_fast("poly", "active_diff")["overhang"]
     # call finger array
     multiplier = __gen_fingers_macro(pdk, interfinger_rmult, fingers, length, width, poly_height, sdlayer, inter_finger_topmet)
     # route all drains/ gates/ sources
@@ -205,31 +215,39 @@ def multiplier(
         # place vias, then straight route from top port to via-botmet_N
         sd_N_port = multiplier.ports["leftsd_top_met_N"]
         sdvia = via_stack(pdk, "met1", sd_route_topmet)
-        sdmet_hieght = sd_rmult*evaluate_bbox(sdvia)[1]
-        sdroute_minsep = pdk.get_grule(sd_route_topmet)["min_separation"]
-        sdvia_ports = list()
-        for finger in range(fingers+1):
+        sdmet_hieght = sd_rmult*pdk.derived_constants.via_stack_size("met1", sd_route_topmet)
+        sdroute_minsep = pdk.get_grule_fast(sd_route_topmet)["min_separation"]
+        # the fingers (and the fingers+1 s/d regions) are pitch apart, so the vias and routes are built once for the
+        # first two s/d regions (the via extension alternates) and the first gate, then repeated with array references
+        pitch = to_dbu(multiplier.ports["row0_col0_rightsd_top_met_N"].center[0]) - to_dbu(sd_N_port.center[0])
+        sdvia_refs = list()
+        for finger in range(2):
             diff_top_port = movey(sd_N_port,destination=width/2)
             # place sdvia such that metal does not overlap diffusion
             big_extension = sdroute_minsep + sdroute_minsep + sdmet_hieght/2 + sdmet_hieght
             sdvia_extension = big_extension if finger % 2 else sdroute_minsep + (sdmet_hieght)/2
             sdvia_ref = align_comp_to_port(sdvia,diff_top_port,alignment=('c','t'))
-            multiplier.add(sdvia_ref.movey(sdvia_extension + pdk.snap_to_2xgrid(sd_route_extension)))
-            multiplier << straight_route(pdk, diff_top_port, sdvia_ref.ports["bottom_met_N"])
-            sdvia_ports += [sdvia_ref.ports["top_met_W"], sdvia_ref.ports["top_met_E"]]
-            # get the next port (break before this if last iteration because port D.N.E. and num gates=fingers)
-            if finger==fingers:
-                break
-            sd_N_port = multiplier.ports[f"row0_col{finger}_rightsd_top_met_N"]
-            # route gates
-            gate_S_port = multiplier.ports[f"row0_col{finger}_gate_S"]
-            metal_seperation = pdk.util_max_metal_seperation()
-            psuedo_Ngateroute = movey(gate_S_port.copy(),0-metal_seperation-gate_route_extension)
-            psuedo_Ngateroute.y = pdk.snap_to_2xgrid(psuedo_Ngateroute.y)
-            multiplier << straight_route(pdk,gate_S_port,psuedo_Ngateroute)
+            sdvia_ref.movey(sdvia_extension + pdk.snap_to_2xgrid(sd_route_extension))
+            # every other s/d region, from this one to the last
+            count = (fingers - finger) // 2 + 1
+            __add_row(multiplier, sdvia, sdvia_ref.origin, count, 2*pitch)
+            __add_row(multiplier, straight_route(pdk, diff_top_port, sdvia_ref.ports["bottom_met_N"]), (0,0), count, 2*pitch)
+            sdvia_refs.append(sdvia_ref)
+            sd_N_port = multiplier.ports["row0_col0_rightsd_top_met_N"]
+        last_sdvia_E = sdvia_refs[fingers % 2].ports["top_met_E"]
+        sdvia_ports = [sdvia_refs[0].ports["top_met_W"], sdvia_refs[0].ports["top_met_E"], sdvia_refs[1].ports["top_met_W"]]
+        sdvia_ports.append(movex(last_sdvia_E, to_um((fingers - fingers % 2) * pitch)))
+        # route gates
+        gate_S_port = multiplier.ports["row0_col0_gate_S"]
+        metal_seperation = pdk.util_max_metal_seperation()
+        psuedo_Ngateroute = movey(gate_S_port.copy(),0-metal_seperation-gate_route_extension)
+        psuedo_Ngateroute.y = pdk.snap_to_2xgrid(psuedo_Ngateroute.y)
+        __add_row(multiplier, straight_route(pdk,gate_S_port,psuedo_Ngateroute), (0,0), fingers, pitch)
         # place route met: gate
-        gate_width = gate_S_port.center[0] - multiplier.ports["row0_col0_gate_S"].center[0] + gate_S_port.width
-        gate = rename_ports_by_list(via_array(pdk,"poly",gate_route_topmet, size=(gate_width,None),num_vias=(None,gate_rmult), no_exception=True, fullbottom=True),[("top_met_","gate_")])
+        gate_width = to_um((fingers - 1) * pitch) + gate_S_port.width
+        gate_viaarr = via_array(pdk,"poly",gate_route_topmet, size=(gate_width,None),num_vias=(None,gate_rmult), no_exception=True, fullbottom=True)
+        # the gate_ ports are picked among every top_met port of the via array (the vias included), so its lazy ports are needed
+        gate = rename_ports_by_list(materialize_ports(keep_lazy_ports(gate_viaarr, gate_viaarr.copy())),[("top_met_","gate_")])
         gate_ref = align_comp_to_port(gate.copy(), psuedo_Ngateroute, alignment=(None,'b'),layer=pdk.get_glayer("poly"))
         multiplier.add(gate_ref)
         # place route met: source, drain
@@ -255,7 +273,7 @@ def multiplier(
         dummy << L_route(pdk,dummyvia.ports["top_met_W"],dummy.ports["leftsd_top_met_S"])
         dummy << L_route(pdk,dummyvia.ports["top_met_E"],dummy.ports["row0_col0_rightsd_top_met_S"])
         dummy.add_ports(dummyvia.get_ports_list(),prefix="gsdcon_")
-        dummy_space = pdk.get_grule(sdlayer)["min_separation"] + dummy.xmax
+        dummy_space = pdk.get_grule_fast(sdlayer)["min_separation"] + dummy.xmax
         sides = list()
         if dummyl:
             sides.append((-1,"dummy_L_"))
@@ -264,7 +282,7 @@ def multiplier(
         for side, name in sides:
             dummy_ref = multiplier << dummy
             dummy_ref.movex(side * (dummy_space + multiplier.xmax))
-            multiplier.add_ports(dummy_ref.get_ports_list(),prefix=name)
+            add_public_ports(multiplier, dummy_ref, prefix=name)
     # ensure correct port names and return
     return component_snap_to_grid(rename_ports_by_orientation(multiplier))
 
@@ -309,7 +327,7 @@ def __mult_array_macro(
         interfinger_rmult=interfinger_rmult,
         dummy_routes=dummy_routes
     )
-    _max_metal_seperation_ps = max([pdk.get_grule("met"+str(i))["min_separation"] for i in range(1,5)])
+    _max_metal_seperation_ps = pdk.derived_constants.max_separation(["met"+str(i) for i in range(1,5)], snapped=False)
     multiplier_separation = (
         to_decimal(_max_metal_seperation_ps)
         + evaluate_bbox(multiplier_comp, True)[1]
@@ -318,12 +336,10 @@ def __mult_array_macro(
         row_displacment = rownum * multiplier_separation - (multiplier_separation/2 * (multipliers-1))
         row_ref = multiplier_arr << multiplier_comp
         row_ref.movey(to_float(row_displacment))
-        multiplier_arr.add_ports(
-            row_ref.get_ports_list(), prefix="multiplier_" + str(rownum) + "_"
-        )
+        add_public_ports(multiplier_arr, row_ref, prefix="multiplier_" + str(rownum) + "_")
     # TODO: fix extension (both extension are broken. IDK src extension and drain extension IDK metal layer)
     src_extension = to_decimal(0.6)
-    drain_extension = src_extension + 3*to_decimal(pdk.get_grule("met4")["min_separation"])
+    drain_extension = src_extension + 3*to_decimal(pdk.get_grule_fast("met4")["min_separation"])
     sd_side = "W" if sd_route_left else "E"
     gate_side = "E" if sd_route_left else "W"
     if routing and multipliers > 1:
@@ -360,7 +376,7 @@ def __mult_array_macro(
     marrref = final_arr << multiplier_arr
     correctionxy = prec_center(marrref)
     marrref.movex(correctionxy[0]).movey(correctionxy[1])
-    final_arr.add_ports(marrref.get_ports_list())
+    add_public_ports(final_arr, marrref)
     return component_snap_to_grid(rename_ports_by_orientation(final_arr))
 
 
@@ -436,14 +452,14 @@ def nmos(
     )
     multiplier_arr_ref = multiplier_arr.ref()
     nfet.add(multiplier_arr_ref)
-    nfet.add_ports(multiplier_arr_ref.get_ports_list())
+    add_public_ports(nfet, multiplier_arr_ref)
     # add tie if tie
     if with_tie:
         tap_separation = max(
             pdk.util_max_metal_seperation(),
-            pdk.get_grule("active_diff", "active_tap")["min_separation"],
+            pdk.get_grule_fast("active_diff", "active_tap")["min_separation"],
         )
-        tap_separation += pdk.get_grule("p+s/d", "active_tap")["min_enclosure"]
+        tap_separation += pdk.get_grule_fast("p+s/d", "active_tap")["min_enclosure"]
         tap_encloses = (
             2 * (tap_separation + nfet.xmax),
             2 * (tap_separation + nfet.ymax),
@@ -455,7 +471,7 @@ def nmos(
             horizontal_glayer=tie_layers[0],
             vertical_glayer=tie_layers[1],
         )
-        nfet.add_ports(tiering_ref.get_ports_list(), prefix="tie_")
+        add_public_ports(nfet, tiering_ref, prefix="tie_")
         for row in range(multipliers):
             for dummyside,tieside in [("L","W"),("R","E")]:
                 try:
@@ -465,18 +481,18 @@ def nmos(
     # add pwell
     nfet.add_padding(
         layers=(pdk.get_glayer("pwell"),),
-        default=pdk.get_grule("pwell", "active_tap")["min_enclosure"],
+        default=pdk.get_grule_fast("pwell", "active_tap")["min_enclosure"],
     )
     nfet = add_ports_perimeter(nfet,layer=pdk.get_glayer("pwell"),prefix="well_")
     # add dnwell if dnwell
     if with_dnwell:
         nfet.add_padding(
             layers=(pdk.get_glayer("dnwell"),),
-            default=pdk.get_grule("pwell", "dnwell")["min_enclosure"],
+            default=pdk.get_grule_fast("pwell", "dnwell")["min_enclosure"],
         )
     # add substrate tap if with_substrate_tap
     if with_substrate_tap:
-        substrate_tap_separation = pdk.get_grule("dnwell", "active_tap")[
+        substrate_tap_separation = pdk.get_grule_fast("dnwell", "active_tap")[
             "min_separation"
         ]
         substrate_tap_encloses = (
@@ -491,9 +507,9 @@ def nmos(
             vertical_glayer=substrate_tap_layers[1],
         )
         tapring_ref = nfet << ringtoadd
-        nfet.add_ports(tapring_ref.get_ports_list(),prefix="guardring_")
+        add_public_ports(nfet, tapring_ref, prefix="guardring_")
 
-    component = rename_ports_by_orientation(nfet).flatten()
+    component = keep_lazy_ports(nfet, rename_ports_by_orientation(nfet).flatten())
 
     component.info['netlist'] = fet_netlist(
         pdk,
@@ -581,15 +597,15 @@ def pmos(
     )
     multiplier_arr_ref = multiplier_arr.ref()
     pfet.add(multiplier_arr_ref)
-    pfet.add_ports(multiplier_arr_ref.get_ports_list())
+    add_public_ports(pfet, multiplier_arr_ref)
     # add tie if tie
     if with_tie:
         tap_separation = max(
-            pdk.get_grule("met2")["min_separation"],
-            pdk.get_grule("met1")["min_separation"],
-            pdk.get_grule("active_diff", "active_tap")["min_separation"],
+            pdk.get_grule_fast("met2")["min_separation"],
+            pdk.get_grule_fast("met1")["min_separation"],
+            pdk.get_grule_fast("active_diff", "active_tap")["min_separation"],
         )
-        tap_separation += pdk.get_grule("n+s/d", "active_tap")["min_enclosure"]
+        tap_separation += pdk.get_grule_fast("n+s/d", "active_tap")["min_enclosure"]
         tap_encloses = (
             2 * (tap_separation + pfet.xmax),
             2 * (tap_separation + pfet.ymax),
@@ -601,7 +617,7 @@ def pmos(
             horizontal_glayer=tie_layers[0],
             vertical_glayer=tie_layers[1],
         )
-        pfet.add_ports(tapring_ref.get_ports_list(),prefix="tie_")
+        add_public_ports(pfet, tapring_ref, prefix="tie_")
         for row in range(multipliers):
             for dummyside,tieside in [("L","W"),("R","E")]:
                 try:
@@ -612,12 +628,12 @@ def pmos(
     nwell_glayer = "dnwell" if dnwell else "nwell"
     pfet.add_padding(
         layers=(pdk.get_glayer(nwell_glayer),),
-        default=pdk.get_grule("active_tap", nwell_glayer)["min_enclosure"],
+        default=pdk.get_grule_fast("active_tap", nwell_glayer)["min_enclosure"],
     )
     pfet = add_ports_perimeter(pfet,layer=pdk.get_glayer(nwell_glayer),prefix="well_")
     # add substrate tap if with_substrate_tap
     if with_substrate_tap:
-        substrate_tap_separation = pdk.get_grule("dnwell", "active_tap")[
+        substrate_tap_separation = pdk.get_grule_fast("dnwell", "active_tap")[
             "min_separation"
         ]
         substrate_tap_encloses = (
@@ -631,7 +647,7 @@ def pmos(
             horizontal_glayer=substrate_tap_layers[0],
             vertical_glayer=substrate_tap_layers[1],
         )
-    component =  rename_ports_by_orientation(pfet).flatten()
+    component = keep_lazy_ports(pfet, rename_ports_by_orientation(pfet).flatten())
 
     component.info['netlist'] = fet_netlist(
         pdk,
@@ -8,6 +8,7 @@ from typing import Optional
 from glayout.util.comp_utils import to_decimal, to_float, evaluate_bbox
 from glayout.util.port_utils import print_ports
 from glayout.util.snap_to_grid import component_snap_to_grid
+from glayout.util.port_visibility import add_public_ports
 from glayout.routing.L_route import L_route
 
 
@@ -46,15 +47,11 @@ def tapring(
     if not "met" in horizontal_glayer or not "met" in vertical_glayer:
         raise ValueError("both horizontal and vertical glayers should be metals")
     # check that ring is not too small
-    min_gap_tap = pdk.get_grule("active_tap")["min_separation"]
+    min_gap_tap = pdk.get_grule_fast("active_tap")["min_separation"]
     if enclosed_rectangle[0] < min_gap_tap:
         raise ValueError("ptapring must be larger than " + str(min_gap_tap))
     # create active tap
-    tap_width = max(
-        pdk.get_grule("active_tap")["min_width"],
-        2 * pdk.get_grule("active_tap", "mcon")["min_enclosure"]
-        + pdk.get_grule("mcon")["width"],
-    )
+    tap_width = pdk.derived_constants.tap_width
     ptapring << rectangular_ring(
         enclosed_size=enclosed_rectangle,
         width=tap_width,
@@ -62,7 +59,7 @@ def tapring(
         layer=pdk.get_glayer("active_tap"),
     )
     # create p plus area
-    pp_enclosure = pdk.get_grule("active_tap", sdlayer)["min_enclosure"]
+    pp_enclosure = pdk.get_grule_fast("active_tap", sdlayer)["min_enclosure"]
     pp_width = 2 * pp_enclosure + tap_width
     pp_enclosed_rectangle = [dim - 2 * pp_enclosure for dim in enclosed_rectangle]
     ptapring << rectangular_ring(
@@ -72,7 +69,7 @@ def tapring(
         layer=pdk.get_glayer(sdlayer),
     )
     # create via arrs
-    via_width_horizontal = evaluate_bbox(via_stack(pdk, "active_tap", horizontal_glayer))[0]
+    via_width_horizontal = pdk.derived_constants.via_stack_size("active_tap", horizontal_glayer)
     arr_size_horizontal = enclosed_rectangle[0]
     horizontal_arr = via_array(
         pdk,
@@ -82,7 +79,7 @@ def tapring(
         minus1=True,
         lay_every_layer=True
     )
-    via_width_vertical = evaluate_bbox(via_stack(pdk, "active_tap", vertical_glayer))[1]
+    via_width_vertical = pdk.derived_constants.via_stack_size("active_tap", vertical_glayer)
     arr_size_vertical = enclosed_rectangle[1]
     vertical_arr = via_array(
         pdk,
@@ -125,7 +122,7 @@ def tapring(
         refs_prefixes += [(brvia,"br_")]
     # add ports, flatten and return
     for ref_, prefix in refs_prefixes:
-        ptapring.add_ports(ref_.get_ports_list(),prefix=prefix)
+        add_public_ports(ptapring, ref_, prefix=prefix)
     return component_snap_to_grid(ptapring)
 
 
@@ -6,6 +6,7 @@ from typing import Optional
 from glayout.primitives.via_gen import via_array
 from glayout.util.comp_utils import prec_array, to_decimal, to_float
 from glayout.util.port_utils import rename_ports_by_orientation, add_ports_perimeter, print_ports
+from glayout.util.snap_to_grid import component_snap_to_grid, get_preserve_hierarchy
 from pydantic import validate_arguments
 from glayout.routing.straight_route import straight_route
 from decimal import ROUND_UP, Decimal
@@ -131,6 +132,9 @@ def mimcap_array(pdk: MappedPDK, rows: int, columns: int, size: tuple[float,floa
 	# add netlist
 	mimcap_arr.info['netlist'] = __generate_mimcap_array_netlist(mimcap_single.info['netlist'], rows * columns)
 
+	# keep the array reference of the caps (a GDS AREF) if hierarchy is preserved
+	if get_preserve_hierarchy():
+		return component_snap_to_grid(mimcap_arr)
 	return mimcap_arr.flatten()
 
 
@@ -9,7 +9,6 @@ from glayout.util.comp_utils import evaluate_bbox, add_ports_perimeter
 from gdsfactory.component import Component
 from gdsfactory.cell import cell 
 from typing import Optional
-from glayout import sky130
 from glayout.spice import Netlist
 from glayout.primitives.fet import fet_netlist
 
@@ -198,6 +197,7 @@ def resistor(
     return toplvl
     
 if __name__ == "__main__":
+    from glayout import sky130
 
     # Create layout
     res = resistor(
@@ -8,13 +8,15 @@ except ModuleNotFoundError:
 
 from gdsfactory.component import Component
 from gdsfactory.components.rectangle import rectangle
-from pydantic import validate_arguments
+from glayout.util.validation import validate_arguments
 from glayout.pdk.mappedpdk import MappedPDK
 from math import floor
 from typing import Optional, Union
 from glayout.util.comp_utils import evaluate_bbox, prec_array, to_float, move, prec_ref_center, to_decimal
 from glayout.util.port_utils import rename_ports_by_orientation, print_ports
 from glayout.util.snap_to_grid import component_snap_to_grid
+from glayout.util.component_cache import pdk_cached
+from glayout.util.port_visibility import add_private_ports, keep_lazy_ports
 from decimal import Decimal
 from typing import Literal
 
@@ -43,59 +45,7 @@ def __error_check_order_layers(
     return ((level1,level2),(glayer1,glayer2))
 
 
-@validate_arguments
-def __get_layer_dim(pdk: MappedPDK, glayer: str, mode: Literal["both","above","below"]="both") -> float:
-	"""Returns the required dimension of a routable layer in a via stack
-	glayer is the routable glayer
-	mode is one of [both,below,above]
-	This specfies the vias to consider. (layer dims may be made smaller if its possible to ignore top/bottom vias)
-	****enclosure rules of the via above and below are considered by default, via1<->met2<->via2
-	****using below specfier only considers the enclosure rules for the via below, via1<->met2
-	****using above specfier only considers the enclosure rules for the via above, met2<->via2
-	****specfying both or below for active/poly layer is valid, function knows to ignore below
-	"""
-	# error checking
-	if not pdk.is_routable_glayer(glayer):
-		raise ValueError("__get_layer_dim: glayer must be a routable layer")
-	# split into above rules and below rules
-	consider_above = (mode=="both" or mode=="above")
-	consider_below = (mode=="both" or mode=="below")
-	is_lvl0 = any([hint in glayer for hint in ["poly","active"]])
-	layer_dim=0
-	if consider_below and not is_lvl0:
-		via_below = "mcon" if glayer=="met1" else "via"+str(int(glayer[-1])-1)
-		layer_dim = pdk.get_grule(via_below)["width"] + 2*pdk.get_grule(via_below,glayer)["min_enclosure"]
-	if consider_above:
-		via_above = "mcon" if is_lvl0 else "via"+str(glayer[-1])
-		layer_dim = max(layer_dim, pdk.get_grule(via_above)["width"] + 2*pdk.get_grule(via_above,glayer)["min_enclosure"])
-	layer_dim = max(layer_dim, pdk.get_grule(glayer)["min_width"])
-	return layer_dim
-
-
-@validate_arguments
-def __get_viastack_minseperation(pdk: MappedPDK, viastack: Component, ordered_layer_info) -> tuple[float,float]:
-    """internal use: return absolute via separation and top_enclosure (top via to top met enclosure)"""
-    get_sep = lambda _pdk, rule, _lay_, comp : (rule+2*comp.extract(layers=[_pdk.get_glayer(_lay_)]).xmax)
-    level1, level2 = ordered_layer_info[0]
-    glayer1, glayer2 = ordered_layer_info[1]
-    mcon_rule = pdk.get_grule("mcon")["min_separation"]
-    via_spacing = [] if level1 else [get_sep(pdk,mcon_rule,"mcon",viastack)]
-    level1_met = level1 if level1 else level1 + 1
-    top_enclosure = 0
-    for level in range(level1_met, level2):
-        met_glayer = "met" + str(level)
-        via_glayer = "via" + str(level)
-        mrule = pdk.get_grule(met_glayer)["min_separation"]
-        vrule = pdk.get_grule(via_glayer)["min_separation"]
-        via_spacing.append(get_sep(pdk, mrule,met_glayer,viastack))
-        via_spacing.append(get_sep(pdk, vrule,via_glayer,viastack))
-        if level == (level2-1):
-            top_enclosure = pdk.get_grule(glayer2,via_glayer)["min_enclosure"]
-    via_spacing = pdk.snap_to_2xgrid(max(via_spacing),return_type="float")
-    top_enclosure = pdk.snap_to_2xgrid(top_enclosure,return_type="float")
-    return pdk.snap_to_2xgrid([via_spacing, 2*top_enclosure], return_type="float")
-
-
+@pdk_cached
 @cell
 def via_stack(
     pdk: MappedPDK,
@@ -129,6 +79,9 @@ def via_stack(
     bottom_via_...all edges
     bottom_met_...all edges
     bottom_layer_...all edges (may be different than bottom met if on diff/poly)
+
+    ****NOTE: results are cached per pdk (see glayout.util.component_cache), the returned component is shared.
+    reference it or copy it before modifying
     """
     ordered_layer_info = __error_check_order_layers(pdk, glayer1, glayer2)
     level1, level2 = ordered_layer_info[0]
@@ -138,7 +91,7 @@ def via_stack(
     if level1 == level2:
         if same_layer_behavior=="lay_nothing":
             return viastack
-        min_square = viastack << rectangle(size=2*[pdk.get_grule(glayer1)["min_width"]],layer=pdk.get_glayer(glayer1), centered=centered)
+        min_square = viastack << rectangle(size=2*[pdk.get_grule_fast(glayer1)["min_width"]],layer=pdk.get_glayer(glayer1), centered=centered)
         # update ports
         if level1==0:# both poly or active
             viastack.add_ports(min_square.get_ports_list(),prefix="bottom_layer_")
@@ -153,10 +106,10 @@ def via_stack(
             # get layer sizing
             mode = "below" if level==level2 else ("above" if level==level1 else "both")
             mode = "both" if assume_bottom_via and level==level1 else mode
-            layer_dim = __get_layer_dim(pdk, layer_name, mode=mode)
+            layer_dim = pdk.derived_constants.layer_dim(layer_name, mode)
             # place met/via, do not place via if on top layer
             if level != level2:
-                via_dim = pdk.get_grule(via_name)["width"]
+                via_dim = pdk.get_grule_fast(via_name)["width"]
                 via_ref = viastack << rectangle(size=[via_dim,via_dim],layer=pdk.get_glayer(via_name), centered=True)
             lay_ref = viastack << rectangle(size=[layer_dim,layer_dim],layer=pdk.get_glayer(layer_name), centered=True)
             # update ports
@@ -184,6 +137,7 @@ def via_stack(
     return rename_ports_by_orientation(viastack.flatten())
 
 
+@pdk_cached
 @cell
 def via_array(
     pdk: MappedPDK,
@@ -222,6 +176,9 @@ def via_array(
     top_met_...all edges
     bottom_lay_...all edges (only if lay_bottom is specified)
     array_...all ports associated with via array
+
+    ****NOTE: results are cached per pdk (see glayout.util.component_cache), the returned component is shared.
+    reference it or copy it before modifying
     """
     # setup
     ordered_layer_info = __error_check_order_layers(pdk, glayer1, glayer2)
@@ -233,8 +190,8 @@ def via_array(
         return viaarray
     # figure out min space between via stacks
     viastack = via_stack(pdk, glayer1, glayer2)
-    viadim = evaluate_bbox(viastack)[0]
-    via_abs_spacing, top_enclosure = __get_viastack_minseperation(pdk, viastack, ordered_layer_info)
+    viadim = pdk.derived_constants.via_stack_size(glayer1, glayer2)
+    via_abs_spacing, top_enclosure = pdk.derived_constants.via_stack_min_separation(glayer1, glayer2)
     # error check size and determine num_vias, cnum_vias[0]=x, cnum_vias[1]=y
     cnum_vias = 2*[None]
     for i in range(2):
@@ -250,9 +207,9 @@ def via_array(
         else:
             raise ValueError("give at least 1: num_vias or size for each dim")
     # create array
-    viaarray_ref = prec_ref_center(prec_array(viastack, columns=cnum_vias[0], rows=cnum_vias[1], spacing=2*[via_abs_spacing],absolute_spacing=True))
+    viaarray_ref = prec_ref_center(prec_array(viastack, columns=cnum_vias[0], rows=cnum_vias[1], spacing=2*[via_abs_spacing],absolute_spacing=True,private_ports=True))
     viaarray.add(viaarray_ref)
-    viaarray.add_ports(viaarray_ref.get_ports_list(),prefix="array_")
+    add_private_ports(viaarray, viaarray_ref, prefix="array_")
     # find the what should be used as full dims
     viadims = evaluate_bbox(viaarray)
     if not size:
@@ -261,18 +218,18 @@ def via_array(
     size = [viadims[i] if viadims[i]>size[i] else size[i] for i in range(2)]
     # place bottom layer and add bot_lay_ ports
     if lay_bottom or fullbottom or lay_every_layer:
-        bdims = evaluate_bbox(viaarray.extract(layers=[pdk.get_glayer(glayer1)]))
+        bdims = evaluate_bbox(viaarray, layer=pdk.get_glayer(glayer1))
         bref = viaarray << rectangle(size=(size if fullbottom else bdims), layer=pdk.get_glayer(glayer1), centered=True)
         viaarray.add_ports(bref.get_ports_list(), prefix="bottom_lay_")
     else:
-        viaarray = viaarray.remove_layers(layers=[pdk.get_glayer(glayer1)])
+        viaarray = keep_lazy_ports(viaarray, viaarray.remove_layers(layers=[pdk.get_glayer(glayer1)]))
     # place top met
     tref = viaarray << rectangle(size=size, layer=pdk.get_glayer(glayer2), centered=True)
     viaarray.add_ports(tref.get_ports_list(), prefix="top_met_")
     # place every layer in between if lay_every_layer
     if lay_every_layer:
         for i in range(level1+1,level2):
-            bdims = evaluate_bbox(viaarray.extract(layers=[pdk.get_glayer(f"met{i}")]))
+            bdims = evaluate_bbox(viaarray, layer=pdk.get_glayer(f"met{i}"))
             viaarray << rectangle(size=bdims, layer=pdk.get_glayer(f"met{i}"), centered=True)
     return component_snap_to_grid(rename_ports_by_orientation(viaarray))
 
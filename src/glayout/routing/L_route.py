@@ -6,6 +6,7 @@ from typing import Optional, Union
 from glayout.primitives.via_gen import via_stack, via_array
 from glayout.util.comp_utils import evaluate_bbox, align_comp_to_port, to_decimal, to_float, prec_ref_center, get_primitive_rectangle
 from glayout.util.port_utils import rename_ports_by_orientation, rename_ports_by_list, print_ports, assert_port_manhattan, assert_ports_perpindicular
+from glayout.util.port_visibility import add_public_ports, keep_lazy_ports
 from decimal import Decimal
 
 
@@ -103,7 +104,7 @@ def L_route(
 		viayofs = viayofs if viaoffset[1] else 0
 		h_to_v_via_ref.movex(viaxofs).movey(viayofs)
 	# add ports and return
-	Lroute.add_ports(h_to_v_via_ref.get_ports_list())
-	return rename_ports_by_orientation(Lroute.flatten())
+	add_public_ports(Lroute, h_to_v_via_ref)
+	return rename_ports_by_orientation(keep_lazy_ports(Lroute, Lroute.flatten()))
 
 
@@ -1,8 +1,99 @@
 from os.path import join, dirname
-from typing import Union, Optional
-from copy import deepcopy
+from typing import Union, Optional, TextIO
+from io import StringIO
 
-import re
+class _Nets:
+	"""Union-find of the nets of a netlist.
+
+	The elements are the nodes of the sub-netlists and the top-level nodes. A net is named after the top-level node or the wire it is connected to, nets without a name keep the node name of the sub-netlist.
+	"""
+
+	def __init__(self):
+		self.parents: list[int] = []
+		self.sizes: list[int] = []
+		self.names: dict[int, str] = {}
+		"""Name of every named net, by root element."""
+		self.top_level_nodes: dict[str, int] = {}
+		"""Element of every connected top-level node."""
+		self.moved: dict[int, int] = {}
+		"""Element that replaced every moved element (see `move`)."""
+
+	def copy(self) -> '_Nets':
+		nets = _Nets()
+		nets.parents = self.parents.copy()
+		nets.sizes = self.sizes.copy()
+		nets.names = self.names.copy()
+		nets.top_level_nodes = self.top_level_nodes.copy()
+		nets.moved = self.moved.copy()
+		return nets
+
+	def add(self, count: int) -> int:
+		"""Adds `count` unconnected elements and returns the first one."""
+		first = len(self.parents)
+		self.parents.extend(range(first, first + count))
+		self.sizes.extend([1] * count)
+		return first
+
+	def top_level_node(self, name: str) -> int:
+		"""Returns the element of a top-level node."""
+		element = self.top_level_nodes.get(name)
+		if element is None:
+			element = self.add(1)
+			self.top_level_nodes[name] = element
+			self.names[element] = name
+		return element
+
+	def move(self, element: int):
+		"""Takes `element` out of its net: it is replaced by a new unconnected element, the rest of the net is unchanged."""
+		self.moved[element] = self.add(1)
+
+	def find(self, element: int) -> int:
+		"""Returns the root element of the net of `element`."""
+		element = self.moved.get(element, element)
+		parents = self.parents
+		root = element
+		while parents[root] != root:
+			root = parents[root]
+		# path compression
+		while parents[element] != root:
+			parents[element], element = root, parents[element]
+		return root
+
+	def union(self, element1: int, element2: int) -> int:
+		"""Merges the nets of two elements and returns the root of the merged net.
+
+		The merged net keeps the name of the first net, unless only the second one is connected to a top-level node. Nets connected to two different top-level nodes are not merged, a ValueError is raised instead.
+		"""
+		root1 = self.find(element1)
+		root2 = self.find(element2)
+		if root1 == root2:
+			return root1
+
+		name1 = self.names.get(root1)
+		name2 = self.names.get(root2)
+		if name1 in self.top_level_nodes and name2 in self.top_level_nodes:
+			raise ValueError(f"Connecting the top-level nodes {name1} and {name2} would short them")
+		self.names.pop(root1, None)
+		self.names.pop(root2, None)
+		if name1 is None or (name2 in self.top_level_nodes and name1 not in self.top_level_nodes):
+			name1 = name2
+
+		if self.sizes[root1] < self.sizes[root2]:
+			root1, root2 = root2, root1
+		self.parents[root2] = root1
+		self.sizes[root1] += self.sizes[root2]
+
+		if name1 is not None:
+			self.names[root1] = name1
+		return root1
+
+	def name(self, element: int, default: str) -> str:
+		"""Returns the name of the net of `element`, `default` if the net has no name."""
+		return self.names.get(self.find(element), default)
+
+	def is_top_level(self, element: int) -> bool:
+		"""True if the net of `element` is connected to a top-level node."""
+		return self.names.get(self.find(element)) in self.top_level_nodes
 
 class Netlist:
 	"""Represents a SPICE netlist/subcircuit."""
@@ -26,11 +117,19 @@ class Netlist:
 
 	sub_netlists: list['Netlist']
 	"""List of the sub-netlists."""
-	netlist_connections: list[list[str]]
-	"""2D matrix of interconnections of the sub-netlists.
 
-	The row and column number in the matrix represent the indices of the connected sub-netlists. The value represents the name of the wire connecting the nodes.
-	"""
+	_nets: _Nets
+	"""Interconnections of the sub-netlists. The nodes of sub-netlist `i` are the elements starting at `_slot_offsets[i]`."""
+	_slot_offsets: list[int]
+	"""First element in `_nets` of the nodes of every sub-netlist."""
+	_slot_names: list[list[str]]
+	"""Node names of every sub-netlist, as they were when it was added."""
+	_slot_indices: list[dict[str, int]]
+	"""Index of every node name of every sub-netlist."""
+	_instances: list['Netlist']
+	"""Every object in `_instance_indices`: the sub-netlists as they were added and the copies `_detach` put in `sub_netlists`. Keeping them alive keeps their `id` unique."""
+	_instance_indices: dict[int, int]
+	"""Index of every added sub-netlist and of every copy of it, by `id`."""
 
 	# Variable to determine how many wires were created
 	wire_index: int = 0
@@ -42,6 +141,12 @@ class Netlist:
 	parameters: dict = {}
 	"""Dictionary of the high-level parameters."""
 
+	_copy_on_write: bool = False
+	"""True while the containers (nodes, parameters, sub-netlists, connections) are shared with a copy made by `connect_netlist`.
+
+	Both netlists keep reading the shared state, the first one to be modified copies it (see `_detach`).
+	"""
+
 	def __init__(self, source_netlist: str = '', nodes: list[str] = [], circuit_name: Union[str, None] = None, instance_format: Optional[str] = None, parameters: dict = {}, sub_netlists: list['Netlist'] = []):
 		"""Initializes a Netlist object.
 
@@ -50,7 +155,12 @@ class Netlist:
 		self.parameters = {**self.parameters, **parameters}
 
 		self.sub_netlists = []
-		self.netlist_connections = []
+		self._nets = _Nets()
+		self._slot_offsets = []
+		self._slot_names = []
+		self._slot_indices = []
+		self._instances = []
+		self._instance_indices = {}
 		self.source_netlist = source_netlist
 		self.nodes = nodes
 
@@ -64,6 +174,41 @@ class Netlist:
 
 		self.add_netlists(sub_netlists)
 
+	def _share(self) -> 'Netlist':
+		"""Returns a copy of the netlist which shares its state with the original until either of them is modified."""
+		shared = object.__new__(type(self))
+		shared.__dict__.update(self.__dict__)
+		self._copy_on_write = True
+		shared._copy_on_write = True
+		return shared
+
+	def _detach(self):
+		"""Gives the netlist its own containers before it is modified.
+
+		Only one level is copied, the sub-netlists are replaced by shared copies which detach themselves when they are modified.
+		"""
+		if not self._copy_on_write:
+			return
+
+		self.nodes = self.nodes.copy()
+		self.parameters = self.parameters.copy()
+		self.sub_netlists = [netlist._share() for netlist in self.sub_netlists]
+		self._instances = self._instances + self.sub_netlists
+		self._instance_indices = self._instance_indices.copy()
+		# the copies can be passed to connect_subnets / connect_node as well
+		self._instance_indices.update((id(netlist), index) for index, netlist in enumerate(self.sub_netlists))
+		self._nets = self._nets.copy()
+		self._slot_offsets = self._slot_offsets.copy()
+		self._slot_names = self._slot_names.copy()
+		self._slot_indices = self._slot_indices.copy()
+		self._copy_on_write = False
+
+	def _detach_all(self):
+		"""Detaches the netlist and every sub-netlist below it, so the whole tree can be modified (e.g. renamed) without touching the copies it shares state with."""
+		self._detach()
+		for netlist in self.sub_netlists:
+			netlist._detach_all()
+
 	def extract_subckt_name(self, netlist: str) -> str:
 		"""Extracts the subcircuit name from the source SPICE."""
 		for line in netlist.split('\n'):
@@ -98,6 +243,34 @@ class Netlist:
 		self.source_netlist = open(join(self.designs_dir, netlist_src)).read()
 		return self.source_netlist
 
+	@property
+	def netlist_connections(self) -> list[list[str]]:
+		"""2D matrix of interconnections of the sub-netlists.
+
+		The row and column number in the matrix represent the indices of the connected sub-netlists. The value represents the name of the wire connecting the nodes.
+		"""
+		return [self._instance_connections(i) for i in range(len(self.sub_netlists))]
+
+	def _instance_connections(self, index: int) -> list[str]:
+		"""Names of the nets connected to the nodes of a sub-netlist."""
+		offset = self._slot_offsets[index]
+		return [self._nets.name(offset + i, node) for i, node in enumerate(self._slot_names[index])]
+
+	def _instance_index(self, net: Union[int, 'Netlist']) -> int:
+		if type(net) == int:
+			return net
+		try:
+			return self._instance_indices[id(net)]
+		except KeyError:
+			raise ValueError(f"{net.circuit_name} is not a sub-netlist of {self.circuit_name}") from None
+
+	def _slot(self, index: int, node: str) -> int:
+		"""Element in `_nets` of a node of a sub-netlist."""
+		try:
+			return self._slot_offsets[index] + self._slot_indices[index][node]
+		except KeyError:
+			raise ValueError(f"{node} is not a node of {self.sub_netlists[index].circuit_name}") from None
+
 	def connect_subnets(
 		self,
 		net1: Union[int, 'Netlist'],
@@ -110,35 +283,27 @@ class Netlist:
 			- `net1`: The netlist to connect. Either a reference to the Netlist object or it's index in the `sub_netlists` list.
 			- `net2`: The netlist to connect to. Either a reference to the Netlist object or it's index in the `sub_netlists` list.
 			- `node_mapping`: A list of 2-element tuples representing the connections between nodes of the netlists. The first element in the tuple is the name of the node of `net1` and the second value is the name of the node in `net2` to connect to.
-		"""
-		for mapping in node_mapping:
-			node1, node2 = mapping
-
-			net1_index = net1 if type(net1) == int else self.sub_netlists.index(net1)
-			net2_index = net2 if type(net2) == int else self.sub_netlists.index(net2)
-
-			netlist1 = self.sub_netlists[net1_index]
-			netlist2 = self.sub_netlists[net2_index]
-
-			node1_index = netlist1.nodes.index(node1)
-			node2_index = netlist2.nodes.index(node2)
 
-			connection_wire = ""
-			# if one of the nodes is already connected, then use that wire instead of creating a new wire
-			if re.match("^wire[\d]+$", self.netlist_connections[net1_index][node1_index]):
-				connection_wire = self.netlist_connections[net1_index][node1_index]
-
-			elif re.match("^wire[\d]+$", self.netlist_connections[net2_index][node2_index]):
-				connection_wire = self.netlist_connections[net2_index][node2_index]
-
-			else:
-				connection_wire = f"wire{self.wire_index}"
+		Nodes which are already connected to wires are merged with everything they are connected to, the merged net keeps the wire of `net1`'s node. A node connected to a top-level node is moved to the wire of the other node (a new wire if the other node is not connected), unless both nodes are connected to the same top-level node. Connecting nodes of two different top-level nodes raises a ValueError.
+		"""
+		self._detach()
+		net1_index = self._instance_index(net1)
+		net2_index = self._instance_index(net2)
+
+		for node1, node2 in node_mapping:
+			element1 = self._slot(net1_index, node1)
+			element2 = self._slot(net2_index, node2)
+			top_level1 = self._nets.is_top_level(element1)
+			top_level2 = self._nets.is_top_level(element2)
+			if top_level1 != top_level2:
+				# as connect_subnets always did, the pair is connected with a wire
+				self._nets.move(element1 if top_level1 else element2)
+			root = self._nets.union(element1, element2)
+
+			if root not in self._nets.names:
+				self._nets.names[root] = f"wire{self.wire_index}"
 				self.wire_index += 1
 
-			self.netlist_connections[net1_index][node1_index] = connection_wire
-			self.netlist_connections[net2_index][node2_index] = connection_wire
-
-
 	def connect_node(
 		self,
 		net: Union[int, 'Netlist'],
@@ -150,15 +315,11 @@ class Netlist:
 		- `net`: The sub-netlist to connect. Either a reference to the Netlist object or it's index in the `sub_netlists` list.
 		- `node_mapping`: A list of 2-element tuples representing the connections between the netlist nodes and the top-level nodes. The first element in the tuple is the name of the node of `net` and the second value is the name of the top-level to connect to.
 		"""
-		net_index = net if type(net) == int else self.sub_netlists.index(net)
-
-		for mapping in node_mapping:
-			net_node, top_level_node = mapping
-
-			net = self.sub_netlists[net_index]
-			node_index = net.nodes.index(net_node)
+		self._detach()
+		net_index = self._instance_index(net)
 
-			self.netlist_connections[net_index][node_index] = top_level_node
+		for net_node, top_level_node in node_mapping:
+			self._nets.union(self._nets.top_level_node(top_level_node), self._slot(net_index, net_node))
 
 	def add_netlists(self, netlists: list['Netlist']):
 		"""Adds sub-netlists.
@@ -166,9 +327,18 @@ class Netlist:
 		Parameters:
 		- `netlists`: A list of Netlist objects to add.
 		"""
+		self._detach()
 		for netlist in netlists:
+			nodes = netlist.nodes.copy()
+
+			self._instance_indices.setdefault(id(netlist), len(self.sub_netlists))
+			self._instances.append(netlist)
 			self.sub_netlists.append(netlist)
-			self.netlist_connections.append(netlist.nodes.copy())
+
+			self._slot_offsets.append(self._nets.add(len(nodes)))
+			self._slot_names.append(nodes)
+			# the first node wins if a name is used twice
+			self._slot_indices.append({node: i for i, node in reversed(list(enumerate(nodes)))})
 
 	def connect_netlist(self, netlist: 'Netlist', node_mapping: list[tuple[str, str]]) -> int:
 		"""Adds a sub-netlist and connects it to top-level nodes.
@@ -176,8 +346,10 @@ class Netlist:
 		Parameters:
 		- `netlist`: The netlist object to add.
 		- `node_mapping`: A list of 2-element tuples representing the connections between the netlist nodes and the top-level nodes. The first element in the tuple is the name of the node of `netlist` and the second value is the name of the top-level to connect to.
+
+		The netlist is not copied, the added sub-netlist shares its state with `netlist` until either of them is modified (copy on write).
 		"""
-		self.add_netlists([deepcopy(netlist)])
+		self.add_netlists([netlist._share()])
 		netlist_index = len(self.sub_netlists) - 1
 
 		self.connect_node(net=netlist_index, node_mapping=node_mapping)
@@ -203,47 +375,71 @@ class Netlist:
 
 		elif len(self.sub_netlists) > 0:
 			if with_pins:
-				main_circuit = f".subckt {generated_circuit_name} {' '.join(self.nodes)}\n"
+				lines = [f".subckt {generated_circuit_name} {' '.join(self.nodes)}"]
 			else:
-				main_circuit = f".subckt {generated_circuit_name}\n"
-    
+				lines = [f".subckt {generated_circuit_name}"]
+
 			for i, netlist in enumerate(self.sub_netlists):
-				main_circuit += netlist.generate_instance(str(i), self.netlist_connections[i]) + "\n"
+				lines.append(netlist.generate_instance(str(i), self._instance_connections(i)))
 
-			main_circuit += f".ends {generated_circuit_name}"
+			lines.append(f".ends {generated_circuit_name}")
 
-			return main_circuit
+			return '\n'.join(lines)
 
 		else:
 			return ""
 
-	def get_subcircuits_netlist_map(self, sub_netlists_only = False) -> dict[str, list['Netlist']]:
-		"""Generates a list of all the unique SPICE subcircuits directives used in the netlist."""
-		subcircuits = dict()
+	def _subcircuit_key(self) -> Union[str, tuple]:
+		"""Fingerprint of the subcircuit directive: two netlists with the same key generate the same directive.
 
-		# Get sub netlists' subcircuits
-		for netlist in self.sub_netlists:
-			subnetlist_subcircuits = netlist.get_subcircuits_netlist_map()
+		Only the netlist itself is rendered (its source or the instance lines of its sub-netlists), never the directives of the sub-netlists.
+		"""
+		if self.source_netlist != "":
+			return self.source_netlist.format(**self.generate_source_netlist_params())
+
+		if len(self.sub_netlists) == 0:
+			return ""
 
-			# For each subnetlists' subcircuit
-			for subckt in subnetlist_subcircuits:
-				subckt_netlists = subnetlist_subcircuits[subckt]
+		return (
+			self.circuit_name,
+			' '.join(self.nodes),
+			tuple(netlist.generate_instance(str(i), self._instance_connections(i)) for i, netlist in enumerate(self.sub_netlists))
+		)
 
-				if subckt not in subcircuits:
-					# If it is unique, create an entry in the dict
-					subcircuits[subckt] = [*subckt_netlists]
-				else:
-					# If it is not unique, append the netlists to the dict
-					subcircuits[subckt] += subckt_netlists
+	def _unique_subcircuits(self, sub_netlists_only: bool = False) -> dict[Union[str, tuple], list['Netlist']]:
+		"""Groups the netlists of the hierarchy by `_subcircuit_key` in a single depth-first pass.
 
+		The groups are ordered by first occurrence in post-order. A netlist is left out of its group if one of its own sub-netlists already has the same key.
+		"""
+		subcircuits = dict()
+		# post-order index of the last netlist seen with each key
+		last_seen = dict()
+		index = 0
+
+		def visit(netlist: 'Netlist'):
+			nonlocal index
+			first = index
+			for sub_netlist in netlist.sub_netlists:
+				visit(sub_netlist)
+
+			key = netlist._subcircuit_key()
+			if last_seen.get(key, -1) < first:
+				subcircuits.setdefault(key, []).append(netlist)
+			last_seen[key] = index
+			index += 1
 
-		if not sub_netlists_only:
-			self_subckt = self.__generate_self_subcircuit()
-			if self_subckt not in subcircuits:
-				subcircuits[self_subckt] = [self]
+		for netlist in (self.sub_netlists if sub_netlists_only else [self]):
+			visit(netlist)
 
 		return subcircuits
 
+	def get_subcircuits_netlist_map(self, sub_netlists_only = False) -> dict[str, list['Netlist']]:
+		"""Generates a list of all the unique SPICE subcircuits directives used in the netlist."""
+		return {
+			netlists[0].__generate_self_subcircuit(): netlists
+			for netlists in self._unique_subcircuits(sub_netlists_only).values()
+		}
+
 	def get_global_nodes_list(self) -> set[str]:
 		"""Generates a list of unique global nodes used in the netlist."""
 		global_nodes = set()
@@ -263,11 +459,26 @@ class Netlist:
 		Parameters:
 		- `only_subcircuits`: Only generates the subcircuit directives if set to `True`. (Default: `False`)
 		"""
+		stream = StringIO()
+		self.write_netlist(stream, only_subcircuits=only_subcircuits, with_pins=with_pins)
+
+		self.spice_netlist = stream.getvalue()
+		return self.spice_netlist
+
+	def write_netlist(self, stream: TextIO, only_subcircuits: bool = False, with_pins: bool = True):
+		"""Writes the final SPICE netlist for the design to a text stream (e.g. an open file). See `generate_netlist`.
+
+		Every unique subcircuit directive is generated once and written as soon as it is generated.
+		"""
+
+		# the sub-netlists get renamed below, make sure none of them is shared with another netlist
+		self._detach_all()
 
 		# GENERATE UNIQUE SUBCIRCUIT DiRECTIVES
-		subcircuits_netlist_map = self.get_subcircuits_netlist_map(sub_netlists_only=True)
+		subcircuits_netlist_map = self._unique_subcircuits(sub_netlists_only=True)
 
 		subcircuit_suffixes = dict()
+		renamed_subcircuits = set()
 		# Get the unique netlists' list and set their suffixes
 		for subckt in subcircuits_netlist_map:
 			netlists = subcircuits_netlist_map[subckt]
@@ -278,30 +489,26 @@ class Netlist:
 				# If a suffix exists, use it and increment it
 				for netlist in netlists: netlist.circuit_name = f"{netlist.circuit_name}_{subcircuit_suffixes[subckt_name]}"
 				subcircuit_suffixes[subckt_name] += 1
+				renamed_subcircuits.add(subckt)
 			else:
 				# If a suffix doesn't exist, create it.
 				subcircuit_suffixes[subckt_name] = 1
-
-		unique_subcircuits_list = []
-		# Generate all the unique subcircuits (generation is done again since suffixes were updated)
-		for subckt in subcircuits_netlist_map:
-			unique_subcircuits_list.append(
-				# Use any one since all will be equal
-				subcircuits_netlist_map[subckt][0].__generate_self_subcircuit()
-			)
 		# /GENERATE UNIQUE SUBCIRCUIT DiRECTIVES
 
-		# GENERATE THE FINAL NETLIST
-		subcircuits = '\n\n'.join(unique_subcircuits_list)
-		main_circuit = self.__generate_self_subcircuit(with_pins=with_pins)
+		# WRITE THE FINAL NETLIST
 		global_nodes = ' '.join(self.get_global_nodes_list())
+		if len(global_nodes) > 0 and not only_subcircuits: stream.write(f".global {global_nodes}\n\n")
+
+		# Generate all the unique subcircuits (generation is done after the suffixes were updated)
+		for i, (subckt, netlists) in enumerate(subcircuits_netlist_map.items()):
+			if i > 0: stream.write("\n\n")
+			if isinstance(subckt, str) and subckt not in renamed_subcircuits:
+				# the key of a source netlist is its directive, unless it was renamed
+				stream.write(subckt)
+			else:
+				# Use any one since all will be equal
+				stream.write(netlists[0].__generate_self_subcircuit())
 
-		self.spice_netlist = "" 
-
-		if len(global_nodes) > 0 and not only_subcircuits: self.spice_netlist += f".global {global_nodes}\n\n"
-
-		self.spice_netlist += subcircuits + "\n\n"
-		self.spice_netlist += main_circuit
-		# /GENERATE THE FINAL NETLIST
-
-		return self.spice_netlist
+		stream.write("\n\n")
+		stream.write(self.__generate_self_subcircuit(with_pins=with_pins))
+		# /WRITE THE FINAL NETLIST
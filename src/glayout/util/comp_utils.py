@@ -1,4 +1,4 @@
-from pydantic import validate_arguments
+from .validation import validate_arguments
 from gdsfactory.snap import snap_to_grid
 from gdsfactory.typings import Component, ComponentReference
 from gdsfactory.components.rectangle import rectangle
@@ -10,17 +10,22 @@ from gdsfactory.functions import move as __gf_move
 from glayout.pdk.mappedpdk import MappedPDK
 from gdstk import rectangle as primitive_rectangle
 from .port_utils import add_ports_perimeter, rename_ports_by_list, parse_direction
+from .layer_bbox import layer_bbox
+from .port_visibility import add_array_ports, add_private_ports, add_public_ports, keep_lazy_ports
+from .snap_to_grid import get_preserve_hierarchy
+from .dbu import active_grid, array_offsets, bbox_dbu, round_div, snap_nearest, snap_nearest_array, to_dbu, to_um, to_um_array, to_um_decimal
 
 
 @validate_arguments
-def evaluate_bbox(custom_comp: Union[Component, ComponentReference], return_decimal: Optional[bool]=False, padding: float=0) -> tuple[Union[float,Decimal],Union[float,Decimal]]:
-	"""returns the length and height of a component like object"""
-	compbbox = custom_comp.bbox
-	width = abs(Decimal(str(compbbox[1][0])) - Decimal(str(compbbox[0][0]))) + 2*Decimal(str(padding))
-	height = abs(Decimal(str(compbbox[1][1])) - Decimal(str(compbbox[0][1]))) + 2*Decimal(str(padding))
+def evaluate_bbox(custom_comp: Union[Component, ComponentReference], return_decimal: Optional[bool]=False, padding: float=0, layer: Optional[tuple[int,int]]=None) -> tuple[Union[float,Decimal],Union[float,Decimal]]:
+	"""returns the length and height of a component like object
+	layer if specified will measure only this layer"""
+	xmin, ymin, xmax, ymax = bbox_dbu(layer_bbox(custom_comp, layer) if layer else custom_comp.bbox)
+	pad = 2 * to_dbu(padding)
+	width, height = abs(xmax - xmin) + pad, abs(ymax - ymin) + pad
 	if return_decimal:
-		return (width,height)
-	return (float(width),float(height))
+		return (to_um_decimal(width),to_um_decimal(height))
+	return (to_um(width),to_um(height))
 
 
 @validate_arguments
@@ -58,16 +63,16 @@ def move(custom_comp: Union[Port, ComponentReference, Component], offsetxy: tupl
 	returns the modified custom_comp
 	"""
 	if layer and isinstance(custom_comp, Component):
-		custom_comp_ext = custom_comp.extract(layers=[layer,])
+		custom_comp_center = layer_bbox(custom_comp, layer).mean(axis=0)
 	elif layer and isinstance(custom_comp, ComponentReference):
 		raise NotImplementedError("layer not implemented for comp ref")
 	elif layer and isinstance(custom_comp,Port):
 		raise TypeError("move:layer option for Port does not exist")
 	else:
-		custom_comp_ext = custom_comp
+		custom_comp_center = custom_comp.center
 	if destination is not None:
-		xoffset = destination[0] - custom_comp_ext.center[0] if destination[0] is not None else 0
-		yoffset = destination[1] - custom_comp_ext.center[1] if destination[1] is not None else 0
+		xoffset = destination[0] - custom_comp_center[0] if destination[0] is not None else 0
+		yoffset = destination[1] - custom_comp_center[1] if destination[1] is not None else 0
 	if isinstance(custom_comp, Port):
 		if destination is None:
 			custom_comp = custom_comp.move_copy(offsetxy)
@@ -129,15 +134,9 @@ def align_comp_to_port(
 	layer = extract this layer from the component and aligns to this layer.
 	rtr_comp_ref = will return a component reference if set true, else return component
 	"""
-	# find center and bbox
-	if isinstance(custom_comp, ComponentReference):
-		comp_type = transformed(custom_comp)
-	else:
-		comp_type = custom_comp
-	if layer:
-		comp_type = comp_type.extract([layer])
-	cbbox = comp_type.bbox
-	ccenter = comp_type.center
+	# find center and bbox (of layer, without extracting it)
+	cbbox = layer_bbox(custom_comp, layer) if layer else custom_comp.bbox
+	ccenter = (cbbox[0] + cbbox[1]) / 2
 	# setup
 	xdim = abs(cbbox[1][0] - cbbox[0][0])
 	ydim = abs(cbbox[1][1] - cbbox[0][1])
@@ -218,44 +217,54 @@ def to_decimal(elements: Union[tuple,list,float,int,str]):
 def to_float(elements: Union[tuple,list,Decimal,float]):
 	"""converts all elements of list like object into floats and snaps to grid
 	or converts single decimal into floats"""
+	grid = active_grid()
 	if not isinstance(elements,Iterable):
-		return snap_to_grid(float(elements))
+		return to_um(snap_nearest(to_dbu(elements), grid))
 	else:
 		elements = list(elements)
 	for i, element in enumerate(elements):
 		if isinstance(element, Union[float,Decimal]):
-			elements[i] = snap_to_grid(float(element))
+			elements[i] = to_um(snap_nearest(to_dbu(element), grid))
 	return elements
 
 @validate_arguments
-def prec_array(custom_comp: Component, rows: int, columns: int, spacing: tuple[Union[float,Decimal],Union[float,Decimal]], absolute_spacing: Optional[bool]=False) -> Component:
+def prec_array(custom_comp: Component, rows: int, columns: int, spacing: tuple[Union[float,Decimal],Union[float,Decimal]], absolute_spacing: Optional[bool]=False, aref: bool=True, private_ports: bool=False) -> Component:
 	"""instead of using the component.add_array function, if you are having grid snapping issues try using this function
-	works the same way as add_array but uses decimals and snaps to grid to mitigate grid snapping issues
+	works the same way as add_array but computes the pitch in integer dbu (exact on grid) to mitigate grid snapping issues
 	args
 	custom_comp: Component type to make an array from
 	columns: num cols in the array
 	rows: num rows in the array
 	absolute_spacing: the spacing mode of spacing variable
 	spacing: IF absolute_spacing spacing BETWEEN elements in the array ELSE spacing BETWEEN ORIGINS of elements in the array
+	aref: if the pitch is on grid, place the elements with one array reference (a GDS AREF) instead of one reference each
+	private_ports: the element ports (row{r}_col{c}_<port>) are private ports (see port_visibility), else public
 	****NOTE do not use negative spacing, instead specify absolute_spacing=True
+	****NOTE the array is flattened unless component_snap_to_grid preserves hierarchy (then the AREF is kept in the gds)
 	"""
-	# make sure to work with decimals
-	precspacing = list(spacing)
-	for i in range(2):
-		if isinstance(spacing[i],Union[int,float]):
-			precspacing[i] = Decimal(str(spacing[i]))
+	# pitch in integer dbu
+	pitch = [to_dbu(spacing[i]) for i in range(2)]
 	if not absolute_spacing:
-		precspacing = [precspacing[i] + evaluate_bbox(custom_comp,True)[i] for i in range(2)]
+		xmin, ymin, xmax, ymax = bbox_dbu(custom_comp.bbox)
+		pitch = [pitch[0] + xmax - xmin, pitch[1] + ymax - ymin]
 	# create array
 	precarray = Component()
-	for colnum in range(columns):
-		coldisp = colnum * precspacing[0]
-		for rownum in range(rows):
-			rowdisp = rownum * precspacing[1]
+	grid = active_grid()
+	if aref and pitch[0] % grid == 0 and pitch[1] % grid == 0:
+		# every element offset is a multiple of the pitch, so exact on grid
+		arrayref = precarray.add_array(custom_comp, columns=columns, rows=rows, spacing=(to_um(pitch[0]), to_um(pitch[1])))
+		add_array_ports(precarray, arrayref, private=private_ports)
+	else:
+		offsets = to_um_array(snap_nearest_array(array_offsets(columns, rows, pitch), grid)).tolist()
+		add_element_ports = add_private_ports if private_ports else add_public_ports
+		for index, (xdisp, ydisp) in enumerate(offsets):
+			colnum, rownum = divmod(index, rows)
 			cref = precarray << custom_comp
-			cref.movex(to_float(coldisp)).movey(to_float(rowdisp))
-			precarray.add_ports(cref.get_ports_list(),prefix=f"row{rownum}_col{colnum}_")
-	return precarray.flatten()
+			cref.movex(xdisp).movey(ydisp)
+			add_element_ports(precarray, cref, prefix=f"row{rownum}_col{colnum}_")
+	if get_preserve_hierarchy():
+		return precarray
+	return keep_lazy_ports(precarray, precarray.flatten())
 
 
 @validate_arguments
@@ -264,12 +273,13 @@ def prec_center(custom_comp: Union[Component,ComponentReference], return_decimal
 	use this function which will return the correct offset to center a component
 	returns (x,y) corrections
 	if return_decimal=True, return in Decimal, otherwise return float"""
-	correctmax = [dim/2 for dim in evaluate_bbox(custom_comp, True)]
-	currentmax = to_decimal((custom_comp.xmax,custom_comp.ymax))
-	correctionxy = [correctmax[i] - currentmax[i] for i in range(2)]
+	xmin, ymin, xmax, ymax = bbox_dbu(custom_comp.bbox)
+	# dim/2 - max = -(min + max)/2
+	twice = [-(xmin + xmax), -(ymin + ymax)]
 	if return_decimal:
-		return correctionxy
-	return to_float(correctionxy)
+		return [to_um_decimal(correction) / 2 for correction in twice]
+	grid = active_grid()
+	return [to_um(round_div(correction, 2 * grid) * grid) for correction in twice]
 
 @validate_arguments
 def prec_ref_center(custom_comp: Union[Component,ComponentReference], destination: Optional[tuple[float,float]]=None, snapmov2grid: bool=False) -> ComponentReference:
@@ -317,8 +327,7 @@ def get_padding_points_cc(
 		[bbox[0][0] - left, bbox[1][1] + top],
 	]
 	if pdk_for_snap2xgrid is not None:
-		for i, ppoint in enumerate(ppoints):
-			ppoints[i] = pdk_for_snap2xgrid.snap_to_2xgrid(ppoint)
+		ppoints = pdk_for_snap2xgrid.snap_to_2xgrid_array(ppoints).tolist()
 	return ppoints
 
 
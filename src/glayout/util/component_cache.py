@@ -0,0 +1,144 @@
+"""
+usage: from glayout.util.component_cache import pdk_cached, get_component_cache, clear_component_cache
+per PDK, content addressed LRU cache for small generator cells (vias) that are built many times with the same args
+"""
+from collections import OrderedDict
+from decimal import Decimal
+from functools import wraps
+from inspect import signature
+from typing import Any, Callable, Hashable, Optional
+
+from gdsfactory.component import Component
+
+
+DEFAULT_MAXSIZE = 2048
+"""default number of cells kept per PDK"""
+
+# kwargs consumed by the gdsfactory @cell decorator. calls using them are not cached
+_CELL_DECORATOR_KWARGS = frozenset(
+	("name", "cache", "flatten", "info", "prefix", "decorator", "autoname", "with_hash", "max_name_length", "include_module", "assert_ports_on_grid")
+)
+
+
+class ComponentCache:
+	"""size bounded LRU map from a hashable key to a shared Component
+	Components stored in the cache are locked and shared between all callers,
+	reference them (comp << cached) or copy them before modifying (cached.copy())
+	"""
+
+	def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+		self.maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries: OrderedDict = OrderedDict()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def __contains__(self, key: Hashable) -> bool:
+		return key in self._entries
+
+	def get(self, key: Hashable) -> Optional[Component]:
+		"""returns the cached Component (and marks it recently used) or None on a miss"""
+		comp = self._entries.get(key)
+		if comp is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		self._entries.move_to_end(key)
+		return comp
+
+	def put(self, key: Hashable, comp: Component) -> Component:
+		"""stores comp under key, evicting the least recently used entries beyond maxsize"""
+		if self.maxsize <= 0:
+			return comp
+		comp.lock()
+		self._entries[key] = comp
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.maxsize:
+			self._entries.popitem(last=False)
+			self.evictions += 1
+		return comp
+
+	def clear(self) -> None:
+		"""drops all entries and resets the counters"""
+		self._entries.clear()
+		self.hits = self.misses = self.evictions = 0
+
+	def stats(self) -> dict:
+		"""returns hits, misses, evictions, current size and maxsize"""
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"size": len(self._entries),
+			"maxsize": self.maxsize,
+		}
+
+
+# id(pdk) -> (pdk, ComponentCache). the pdk is kept alive so its id cannot be reused
+_pdk_caches: dict[int, tuple[Any, ComponentCache]] = dict()
+
+
+def get_component_cache(pdk) -> ComponentCache:
+	"""returns the ComponentCache for pdk (created on first use)"""
+	entry = _pdk_caches.get(id(pdk))
+	if entry is None or entry[0] is not pdk:
+		entry = (pdk, ComponentCache())
+		_pdk_caches[id(pdk)] = entry
+	return entry[1]
+
+
+def clear_component_cache(pdk=None) -> None:
+	"""clears the cache of pdk, or the caches of every pdk if pdk is None"""
+	if pdk is None:
+		for _, cache in _pdk_caches.values():
+			cache.clear()
+	elif id(pdk) in _pdk_caches:
+		_pdk_caches[id(pdk)][1].clear()
+
+
+def _freeze(value: Any) -> Hashable:
+	"""converts an argument into a hashable key part (lists become tuples, Decimals become floats)"""
+	if isinstance(value, (list, tuple)):
+		return tuple(_freeze(element) for element in value)
+	if isinstance(value, Decimal):
+		return float(value)
+	return value
+
+
+def pdk_cached(func: Callable[..., Component]) -> Callable[..., Component]:
+	"""decorator for generators taking pdk as the first argument.
+	Results are cached in the ComponentCache of the pdk, keyed by the generator name,
+	the bound arguments and the active pdk (the @cell decorator applies the active pdk default_decorator).
+	place above @cell so that cache hits skip naming and validation as well as geometry construction.
+	"""
+	from gdsfactory.pdk import get_active_pdk
+
+	sig = signature(func)
+
+	@wraps(func)
+	def _cached(*args, **kwargs):
+		if _CELL_DECORATOR_KWARGS.intersection(kwargs):
+			return func(*args, **kwargs)
+		try:
+			bound = sig.bind(*args, **kwargs)
+		except TypeError:
+			return func(*args, **kwargs)
+		bound.apply_defaults()
+		arguments = bound.arguments
+		pdk = arguments.pop("pdk")
+		try:
+			key = (func.__name__, get_active_pdk().name, tuple((arg, _freeze(value)) for arg, value in arguments.items()))
+			hash(key)
+		except TypeError:
+			return func(*args, **kwargs)
+		cache = get_component_cache(pdk)
+		comp = cache.get(key)
+		if comp is None:
+			comp = cache.put(key, func(*args, **kwargs))
+		return comp
+
+	_cached.cache_for = get_component_cache
+	return _cached
@@ -0,0 +1,112 @@
+"""
+usage: from glayout.util.dbu import to_dbu, to_dbu_up, to_um, snap_up, ...
+integer database unit (dbu) geometry. Coordinates are integers of 1 nm (the unit of the GDS files gdsfactory writes),
+so snapping, centering and array pitches are exact integer arithmetic instead of Decimal(str(x)) conversions. Grids
+(the PDK grid, its double for snap_to_2xgrid) are integers of dbu as well.
+Floats are converted once: to_dbu rounds to the nearest dbu, to_dbu_up rounds away from zero (as Decimal ROUND_UP did
+on the printed value of the float). Every function has a numpy batch variant (*_array) for many coordinates at once.
+"""
+from decimal import Decimal
+from typing import Union
+
+import numpy as np
+from gdsfactory.pdk import get_grid_size
+
+DBU_PER_UM = 1000
+"""database units per um (1 nm dbu)"""
+# digits after the decimal point of a dbu in um
+_DBU_DIGITS = 3
+
+Number = Union[float, int, Decimal, str]
+
+
+def to_dbu(value: Number) -> int:
+	"""value (um) to the nearest dbu, exact halves to even (as gdsfactory snap_to_grid)"""
+	return round(float(value) * DBU_PER_UM)
+
+
+def to_dbu_up(value: Number) -> int:
+	"""value (um) to dbu rounded away from zero. A float is taken as the decimal it prints as, as Decimal(str(value))
+	did: 0.29 is 290 but 0.29000000000000004 is 291"""
+	value = float(value)
+	dbu = round(value * DBU_PER_UM)
+	if dbu / DBU_PER_UM != value and abs(value) > abs(dbu) / DBU_PER_UM:
+		dbu += 1 if value > 0 else -1
+	return dbu
+
+
+def to_um(dbu: int) -> float:
+	"""dbu to um, the closest float to the exact decimal"""
+	return dbu / DBU_PER_UM
+
+
+def to_um_decimal(dbu: int) -> Decimal:
+	"""dbu to um as an exact Decimal"""
+	return Decimal(int(dbu)).scaleb(-_DBU_DIGITS)
+
+
+def snap_up(dbu: int, grid: int) -> int:
+	"""dbu rounded away from zero to a multiple of grid (dbu)"""
+	snapped = -(-abs(dbu) // grid) * grid
+	return snapped if dbu >= 0 else -snapped
+
+
+def round_div(dbu: int, divisor: int) -> int:
+	"""dbu / divisor rounded to the nearest integer, halves to even"""
+	quotient, remainder = divmod(dbu, divisor)
+	if 2 * remainder > divisor or (2 * remainder == divisor and quotient % 2):
+		quotient += 1
+	return quotient
+
+
+def snap_nearest(dbu: int, grid: int) -> int:
+	"""dbu rounded to the nearest multiple of grid (dbu), halves to even (as gdsfactory snap_to_grid)"""
+	return round_div(dbu, grid) * grid
+
+
+def active_grid() -> int:
+	"""grid of the active PDK in dbu, the grid gdsfactory snap_to_grid snaps to"""
+	return to_dbu(get_grid_size())
+
+
+def bbox_dbu(bbox) -> tuple[int, int, int, int]:
+	"""xmin, ymin, xmax, ymax (dbu) of a bbox [[xmin, ymin], [xmax, ymax]] (um)"""
+	(xmin, ymin), (xmax, ymax) = bbox
+	return to_dbu(xmin), to_dbu(ymin), to_dbu(xmax), to_dbu(ymax)
+
+
+def to_dbu_array(values) -> np.ndarray:
+	"""to_dbu of every element, int64 array of the same shape"""
+	return np.rint(np.asarray(values, dtype=float) * DBU_PER_UM).astype(np.int64)
+
+
+def to_dbu_up_array(values) -> np.ndarray:
+	"""to_dbu_up of every element, int64 array of the same shape"""
+	values = np.asarray(values, dtype=float)
+	dbu = np.rint(values * DBU_PER_UM)
+	up = (dbu / DBU_PER_UM != values) & (np.abs(values) > np.abs(dbu) / DBU_PER_UM)
+	return (dbu + up * np.sign(values)).astype(np.int64)
+
+
+def to_um_array(dbu) -> np.ndarray:
+	"""to_um of every element"""
+	return np.asarray(dbu) / DBU_PER_UM
+
+
+def snap_nearest_array(dbu, grid: int) -> np.ndarray:
+	"""snap_nearest of every element"""
+	quotient, remainder = np.divmod(np.asarray(dbu, dtype=np.int64), grid)
+	quotient += (2 * remainder > grid) | ((2 * remainder == grid) & (quotient % 2 == 1))
+	return quotient * grid
+
+
+def snap_up_array(dbu, grid: int) -> np.ndarray:
+	"""snap_up of every element"""
+	dbu = np.asarray(dbu, dtype=np.int64)
+	return np.sign(dbu) * (-(-np.abs(dbu) // grid) * grid)
+
+
+def array_offsets(columns: int, rows: int, pitch: tuple[int, int]) -> np.ndarray:
+	"""(columns * rows, 2) offsets (dbu) of the elements of an array, column major (col0 row0, col0 row1, ...)"""
+	column, row = np.divmod(np.arange(columns * rows), rows)
+	return np.stack((column * pitch[0], row * pitch[1]), axis=1).astype(np.int64)
@@ -0,0 +1,124 @@
+"""
+usage: from glayout.util.drc_reports import summarize_magic_drc_report, summarize_lyrdb
+streaming parsers for magic DRC reports (.rpt) and KLayout report databases (.lyrdb).
+Reports of bad layouts can reach hundreds of MB, so violations are yielded one at a time and the summaries only keep
+per rule counts (and optionally the first max_details violations). error_budget stops reading once more than
+error_budget violations were seen, which is enough for callers that only need pass/fail.
+"""
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from gdsfactory.typings import PathType
+
+
+_MAGIC_SEPARATOR = "----------------------------------------"
+_MAGIC_COUNT_ZERO = re.compile(r"count:\s*0$", re.IGNORECASE)
+
+
+def _lines(report: Union[PathType, Iterable[str]]) -> Iterator[str]:
+	"""lines of a report file (read lazily) or of an iterable of lines"""
+	if isinstance(report, (str, Path)):
+		with open(report, "r") as f:
+			yield from f
+	else:
+		yield from report
+
+
+def iter_magic_drc_violations(report: Union[PathType, Iterable[str]]) -> Iterator[tuple[str, str]]:
+	"""yields (rule, coordinates) for every violation of a magic DRC report written by custom_drc_save_report
+	report is the path to the .rpt file or an iterable of its lines"""
+	rule = ""
+	for line in _lines(report):
+		line = line.strip()
+		if not line or line == _MAGIC_SEPARATOR:
+			continue
+		if line[0].isascii() and line[0].isalpha():
+			rule = line
+		elif "0" <= line[0] <= "9":
+			yield rule, line
+
+
+def summarize_magic_drc_report(
+	report: Union[PathType, Iterable[str]],
+	error_budget: Optional[int] = None,
+	max_details: Optional[int] = None,
+) -> dict:
+	"""streams a magic DRC report and returns {"is_pass", "total_errors", "error_details", "rule_counts", "truncated"}
+	error_budget: stop reading once more than error_budget violations were seen (truncated is then True)
+	max_details: keep at most this many {"rule", "details"} entries in error_details, None = all of them
+	"""
+	last_line = ""
+
+	def track_last_line(lines: Iterable[str]) -> Iterator[str]:
+		nonlocal last_line
+		for line in lines:
+			if line.strip():
+				last_line = line.strip()
+			yield line
+
+	rule_counts = Counter()
+	error_details = list()
+	total_errors = 0
+	truncated = False
+	for rule, details in iter_magic_drc_violations(track_last_line(_lines(report))):
+		total_errors += 1
+		rule_counts[rule] += 1
+		if max_details is None or len(error_details) < max_details:
+			error_details.append({"rule": rule, "details": details})
+		if error_budget is not None and total_errors > error_budget:
+			truncated = True
+			break
+	# a report ending with "count: 0" passes, like parse_drc_report always did
+	is_pass = total_errors == 0 or (not truncated and _MAGIC_COUNT_ZERO.search(last_line) is not None)
+	return {
+		"is_pass": is_pass,
+		"total_errors": total_errors,
+		"error_details": error_details,
+		"rule_counts": dict(rule_counts),
+		"truncated": truncated,
+	}
+
+
+def iter_lyrdb_violations(report: PathType) -> Iterator[tuple[str, str]]:
+	"""yields (category, cell) for every item of a KLayout report database, parsed with iterparse so only
+	one item is held in memory at a time. raises TypeError if the file is not a report-database"""
+	items = None
+	depth = 0
+	for event, elem in ET.iterparse(str(report), events=("start", "end")):
+		if event == "start":
+			depth += 1
+			if depth == 1 and elem.tag != "report-database":
+				raise TypeError("DRC report file is not a valid report-database")
+			if depth == 2 and elem.tag == "items":
+				items = elem
+			continue
+		depth -= 1
+		if items is not None and depth == 2 and elem.tag == "item":
+			yield (elem.findtext("category") or "").strip("'"), (elem.findtext("cell") or "")
+			# the item is complete, drop it (and every earlier one) from the tree
+			items.clear()
+		elif depth == 1 and elem.tag == "items":
+			items = None
+
+
+def summarize_lyrdb(report: PathType, error_budget: Optional[int] = None) -> dict:
+	"""streams a KLayout report database and returns {"is_pass", "total_errors", "rule_counts", "truncated"}
+	error_budget: stop reading once more than error_budget violations were seen (truncated is then True)"""
+	rule_counts = Counter()
+	total_errors = 0
+	truncated = False
+	for category, _ in iter_lyrdb_violations(report):
+		total_errors += 1
+		rule_counts[category] += 1
+		if error_budget is not None and total_errors > error_budget:
+			truncated = True
+			break
+	return {
+		"is_pass": total_errors == 0,
+		"total_errors": total_errors,
+		"rule_counts": dict(rule_counts),
+		"truncated": truncated,
+	}
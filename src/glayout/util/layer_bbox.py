@@ -0,0 +1,143 @@
+"""
+usage: from glayout.util.layer_bbox import layer_bbox, layer_bboxes
+bounding box of one layer of a component or reference, without extracting the layer into a new component.
+The bounding boxes of all layers of a component are computed together and cached per component (weakly, they go away
+with the component). A component's boxes are built from its own polygons and the cached boxes of its children, moved
+by each reference (exact for rotations by multiples of 90 degrees, other references are flattened). The cache entry is
+checked against the number of polygons / paths and the placement of every reference, so adding to or moving things
+in a component invalidates it. For unlocked components the sums of the polygon / path bounding boxes and layers are
+checked too, so editing a polygon in place (points, layer, transform) invalidates it (an edit that keeps these sums,
+e.g. two polygons swapping places, is not seen). Locked (@cell cached) components are taken as unchanged.
+"""
+import math
+from itertools import chain
+from typing import Optional, Union
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from gdsfactory.typings import Component, ComponentReference
+
+_cache: "WeakKeyDictionary[Component, tuple]" = WeakKeyDictionary()
+# (cos, sin) of the rotations by 0, 90, 180 and 270 degrees
+_QUARTER_TURNS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def _polygon_bboxes(polygons: list) -> dict:
+	"""{(layer, datatype): array [[xmin, ymin], [xmax, ymax]]} of gdstk polygons"""
+	boxes = dict()
+	for polygon in polygons:
+		key = (polygon.layer, polygon.datatype)
+		(xmin, ymin), (xmax, ymax) = polygon.bounding_box()
+		box = boxes.get(key)
+		if box is None:
+			boxes[key] = np.array([[xmin, ymin], [xmax, ymax]])
+		else:
+			np.minimum(box[0], (xmin, ymin), out=box[0])
+			np.maximum(box[1], (xmax, ymax), out=box[1])
+	return boxes
+
+
+def _merge(boxes: dict, other: dict) -> dict:
+	"""boxes extended (in place) by the boxes of other"""
+	for key, box in other.items():
+		if key in boxes:
+			boxes[key] = np.array([np.minimum(boxes[key][0], box[0]), np.maximum(boxes[key][1], box[1])])
+		else:
+			boxes[key] = box
+	return boxes
+
+
+def _repetition_key(repetition) -> Optional[tuple]:
+	if repetition.size == 0:
+		return None
+	if repetition.columns is not None:
+		return (repetition.columns, repetition.rows, repetition.spacing, repetition.v1, repetition.v2)
+	return tuple(repetition.get_offsets().ravel())
+
+
+def _transformed(boxes: dict, reference) -> Optional[dict]:
+	"""boxes moved by the gdstk reference (and its repetition), None if the rotation is not a multiple of 90 degrees"""
+	quarters = reference.rotation / (math.pi / 2)
+	if abs(quarters - round(quarters)) > 1e-9:
+		return None
+	cos, sin = _QUARTER_TURNS[round(quarters) % 4]
+	offsets = reference.repetition.get_offsets() if reference.repetition.size else np.zeros((1, 2))
+	shift = np.array([offsets.min(axis=0), offsets.max(axis=0)]) + reference.origin
+	moved = dict()
+	for key, ((xmin, ymin), (xmax, ymax)) in boxes.items():
+		corners = np.array([[xmin, ymin], [xmax, ymax], [xmin, ymax], [xmax, ymin]]) * reference.magnification
+		if reference.x_reflection:
+			corners[:, 1] *= -1
+		corners = corners @ np.array([[cos, sin], [-sin, cos]])
+		moved[key] = np.array([corners.min(axis=0), corners.max(axis=0)]) + shift
+	return moved
+
+
+def _content_key(cell) -> tuple:
+	"""sums of the bounding boxes (xmin, ymin, xmax, ymax) of the polygons / paths of a gdstk cell and of the layers of
+	its polygons"""
+	boxes = chain(
+		(polygon.bounding_box() for polygon in cell.polygons),
+		(path.bounding_box() or ((0, 0), (0, 0)) for path in cell.paths),
+	)
+	sums = np.fromiter(chain.from_iterable(chain.from_iterable(boxes)), float).reshape(-1, 4).sum(axis=0)
+	layers = sum((polygon.layer << 16) + polygon.datatype for polygon in cell.polygons)
+	return (tuple(sums), layers)
+
+
+def _fingerprint(component: Component) -> tuple:
+	"""changes when polygons, paths or references are added to / removed from / edited in component or its unlocked
+	children, or when a reference is moved"""
+	cell = component._cell
+	references = tuple(
+		(
+			ref.parent,
+			None if ref.parent._locked else _fingerprint(ref.parent),
+			tuple(ref._reference.origin),
+			ref._reference.rotation,
+			ref._reference.magnification,
+			ref._reference.x_reflection,
+			_repetition_key(ref._reference.repetition),
+		)
+		for ref in component.references
+	)
+	content = None if component._locked else _content_key(cell)
+	return (len(cell.polygons), len(cell.paths), len(cell.references), content, references)
+
+
+def layer_bboxes(component: Component) -> dict:
+	"""{(layer, datatype): array [[xmin, ymin], [xmax, ymax]]} of every layer of component (with its references)
+	the returned dict is shared, do not modify it"""
+	fingerprint = _fingerprint(component)
+	cached = _cache.get(component)
+	if cached is not None and cached[0] == fingerprint:
+		return cached[1]
+	cell = component._cell
+	# references not made through gdsfactory have no ComponentReference, flatten everything
+	if len(component.references) != len(cell.references):
+		boxes = _polygon_bboxes(cell.get_polygons())
+	else:
+		boxes = _polygon_bboxes(cell.get_polygons(depth=0))
+		for ref in component.references:
+			moved = _transformed(layer_bboxes(ref.parent), ref._reference)
+			_merge(boxes, moved if moved is not None else _polygon_bboxes(ref._reference.get_polygons()))
+	_cache[component] = (fingerprint, boxes)
+	return boxes
+
+
+def layer_bbox(custom_comp: Union[Component, ComponentReference], layer: Union[tuple[int, int], list[tuple[int, int]]]) -> np.ndarray:
+	"""bounding box [[xmin, ymin], [xmax, ymax]] of a layer (or of a list of layers) of a component or reference,
+	the same as custom_comp.extract(layers=[layer]).bbox ([[0, 0], [0, 0]] if there is nothing on the layer)"""
+	layers = [tuple(layer)] if np.ndim(layer[0]) == 0 else [tuple(lay) for lay in layer]
+	if isinstance(custom_comp, ComponentReference):
+		boxes = layer_bboxes(custom_comp.parent)
+		boxes = {lay: boxes[lay] for lay in layers if lay in boxes}
+		moved = _transformed(boxes, custom_comp._reference)
+		if moved is None:
+			moved = _polygon_bboxes(custom_comp._reference.get_polygons())
+	else:
+		moved = layer_bboxes(custom_comp)
+	found = [moved[lay] for lay in layers if lay in moved]
+	if not found:
+		return np.zeros((2, 2))
+	return np.array([np.min([box[0] for box in found], axis=0), np.max([box[1] for box in found], axis=0)])
@@ -1,4 +1,4 @@
-from pydantic import validate_arguments
+from .validation import validate_arguments
 from gdsfactory.typings import Component, ComponentReference
 from gdsfactory.components.rectangle import rectangle
 from gdsfactory.port import Port
@@ -7,6 +7,7 @@ from decimal import Decimal
 from pathlib import Path
 import pickle
 import math
+from .layer_bbox import layer_bbox
 
 try:
 	from PrettyPrint import PrettyPrintTree
@@ -232,7 +233,7 @@ def add_ports_perimeter(custom_comp: Component, layer: tuple[int, int], prefix:
 	"""
 	if "_" not in prefix:
 		raise ValueError("you need underscore char in prefix")
-	compbbox = custom_comp.extract(layers=(layer,)).bbox
+	compbbox = layer_bbox(custom_comp, layer)
 	width = compbbox[1][0] - compbbox[0][0]
 	height = compbbox[1][1] - compbbox[0][1]
 	custom_comp.add_port(name=prefix+"W",width=height,orientation=180,center=(compbbox[0][0],compbbox[0][1]+height/2),layer=layer,port_type="electrical")
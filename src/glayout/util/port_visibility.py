@@ -0,0 +1,271 @@
+"""
+usage: from glayout.util.port_visibility import add_private_ports, add_public_ports, get_port, set_port_visibility
+port visibility of generated cells. Generators copy the ports of their children upward with a prefix, so every
+via of every via array of every finger ends up as a port of the top cell (multiplier_0_row0_col3_rightsd_array_row2_col0_top_met_N).
+public ports are the interface of a cell (gate_E, multiplier_0_source_W, ...) and are always copied into the cell.
+private ports (the elements of arrays) are added with add_private_ports:
+	"all" mode (the default) copies them into the cell as before
+	"public" mode (set_port_visibility("public") or GLAYOUT_PORT_VISIBILITY=public) does not copy them, they stay lazy:
+	the cell keeps a link to the child they belong to and get_port resolves them through the hierarchy on demand
+add_public_ports copies the ports of a child and (in public mode) keeps the lazy ports of the child resolvable, so
+private ports resolve through every cell that was built with it (flatten / copy drop the links, use keep_lazy_ports)
+add_array_ports does the same for every element of an array reference (add_array, a GDS AREF), the ports of an element
+are computed from its row / column index
+"""
+import os
+import re
+from typing import Literal, Optional, Union
+from weakref import WeakKeyDictionary
+
+import numpy as np
+from gdsfactory.component import Component
+from gdsfactory.component_reference import ComponentReference
+from gdsfactory.port import Port, select_ports
+from gdsfactory.snap import snap_to_grid
+from pydantic import validate_arguments
+
+from .dbu import to_dbu, to_um
+
+
+PortVisibility = Literal["all", "public"]
+
+_PORT_VISIBILITY = os.environ.get("GLAYOUT_PORT_VISIBILITY", "all").strip().lower()
+if _PORT_VISIBILITY not in ("all", "public"):
+	raise ValueError(f"GLAYOUT_PORT_VISIBILITY must be all or public, not {_PORT_VISIBILITY!r}")
+
+# component -> list of links (prefix, child component, (origin, rotation, x_reflection), index, private, array) the lazy
+# ports of component come from. index is the number of ports component had when linked (where "all" mode put the ports),
+# private links give all ports of the child, public links (the child ports are copied) only the lazy ports of the child.
+# array is None or (columns, rows, pitch in dbu) for array references, their ports are named row{r}_col{c}_<child port>
+_lazy_sources: WeakKeyDictionary = WeakKeyDictionary()
+
+_ORIENTATION_SUFFIXES = ("N", "E", "S", "W")
+_ELEMENT = re.compile(r"row(\d+)_col(\d+)_(.+)")
+
+
+@validate_arguments
+def set_port_visibility(mode: PortVisibility) -> None:
+	"""sets which ports generators copy into their cells: "all" (copy every port) or "public" (private ports stay lazy)
+	cells built in the other mode have other ports, so this clears the gdsfactory and glayout cell caches
+	"""
+	global _PORT_VISIBILITY
+	if mode == _PORT_VISIBILITY:
+		return
+	from gdsfactory.cell import clear_cache
+	from glayout.util.component_cache import clear_component_cache
+
+	_PORT_VISIBILITY = mode
+	clear_cache()
+	clear_component_cache()
+
+
+def get_port_visibility() -> str:
+	"""returns the current mode, "all" or "public\""""
+	return _PORT_VISIBILITY
+
+
+def _transform_of(ref: ComponentReference) -> tuple:
+	return (tuple(ref.origin), ref.rotation or 0, bool(ref.x_reflection))
+
+
+def _link(custom_comp: Component, prefix: str, child: Component, transform: tuple, private: bool, array: Optional[tuple] = None) -> None:
+	_lazy_sources.setdefault(custom_comp, []).append((prefix, child, transform, len(custom_comp.ports), private, array))
+
+
+def _element_transform(transform: tuple, array: tuple, column: int, row: int) -> tuple:
+	"""transform of one element of an array reference (the array offsets are applied after the reference transform)"""
+	origin, rotation, x_reflection = transform
+	pitch = array[2]
+	return ((origin[0] + to_um(column * pitch[0]), origin[1] + to_um(row * pitch[1])), rotation, x_reflection)
+
+
+def add_private_ports(custom_comp: Component, ref: ComponentReference, prefix: str = "") -> Component:
+	"""adds the ports of ref (a reference in custom_comp) with prefix as private ports of custom_comp
+	copied in "all" mode, resolved lazily by get_port in "public" mode. returns custom_comp
+	"""
+	if _PORT_VISIBILITY == "all":
+		custom_comp.add_ports(ref.get_ports_list(), prefix=prefix)
+	else:
+		_link(custom_comp, prefix, ref.parent, _transform_of(ref), True)
+	return custom_comp
+
+
+def add_public_ports(custom_comp: Component, ref: ComponentReference, prefix: str = "") -> Component:
+	"""custom_comp.add_ports(ref.get_ports_list(), prefix=prefix) that also keeps the lazy ports of ref resolvable
+	through custom_comp. returns custom_comp
+	"""
+	custom_comp.add_ports(ref.get_ports_list(), prefix=prefix)
+	if ref.parent in _lazy_sources:
+		_link(custom_comp, prefix, ref.parent, _transform_of(ref), False)
+	return custom_comp
+
+
+def add_array_ports(custom_comp: Component, ref: ComponentReference, prefix: str = "", private: bool = False) -> Component:
+	"""adds the ports of every element of ref (an array reference in custom_comp, see Component.add_array) to custom_comp
+	named prefix + row{r}_col{c}_<port>, the ports of an element are computed from its row and column index
+	private=True adds them as private ports (lazy in "public" mode), else they are copied as add_public_ports would
+	returns custom_comp
+	"""
+	array = (ref.columns, ref.rows, tuple(to_dbu(pitch) for pitch in ref.spacing))
+	transform = _transform_of(ref)
+	if private and _PORT_VISIBILITY != "all":
+		_link(custom_comp, prefix, ref.parent, transform, True, array)
+		return custom_comp
+	# columns first, each element sorted counter clockwise (as add_ports(element_ref.get_ports_list()) adds them)
+	for column in range(ref.columns):
+		for row in range(ref.rows):
+			element = _element_transform(transform, array, column, row)
+			ports = {name: _transformed(port, element, name, snap=False) for name, port in ref.parent.ports.items()}
+			custom_comp.add_ports(select_ports(ports).values(), prefix=f"{prefix}row{row}_col{column}_")
+	if ref.parent in _lazy_sources:
+		_link(custom_comp, prefix, ref.parent, transform, False, array)
+	return custom_comp
+
+
+def keep_lazy_ports(source: Component, target: Component) -> Component:
+	"""gives target (a flattened or copied source, with the same geometry) the lazy ports of source. returns target"""
+	if source in _lazy_sources and target is not source:
+		_lazy_sources.setdefault(target, []).extend(_lazy_sources[source])
+	return target
+
+
+def has_lazy_ports(custom_comp: Union[Component, ComponentReference]) -> bool:
+	"""True if custom_comp has ports which are not copied into it"""
+	comp = custom_comp.parent if isinstance(custom_comp, ComponentReference) else custom_comp
+	return comp in _lazy_sources
+
+
+def _orientation_suffix(orientation: Optional[float]) -> str:
+	"""the suffix rename_ports_by_orientation gives a port with this orientation"""
+	angle = round(orientation % 360) if orientation is not None else 0
+	if angle <= 45 or angle >= 315:
+		return "E"
+	if angle <= 135:
+		return "N"
+	if angle <= 225:
+		return "W"
+	return "S"
+
+
+def _transformed(port: Port, transform: tuple, name: str, snap: bool = True) -> Port:
+	"""copy of port named name, moved by transform (as ComponentReference ports are) and snapped to grid (if snap)"""
+	origin, rotation, x_reflection = transform
+	center = np.array(port.center, dtype=float)
+	orientation = port.orientation
+	if x_reflection:
+		center[1] = -center[1]
+		orientation = None if orientation is None else -orientation
+	if rotation:
+		angle = np.deg2rad(rotation)
+		cos, sin = np.cos(angle), np.sin(angle)
+		center = np.array((cos * center[0] - sin * center[1], sin * center[0] + cos * center[1]))
+		orientation = None if orientation is None else orientation + rotation
+	center = center + np.asarray(origin, dtype=float)
+	port = port.copy(name=name)
+	port.center = snap_to_grid(center) if snap else center
+	port.orientation = None if orientation is None else orientation % 360
+	return port
+
+
+def _resolve(comp: Component, name: str, lazy_only: bool = False) -> Optional[Port]:
+	"""finds the port name of comp: its own ports first (unless lazy_only), then the lazy ports (latest link first)"""
+	port = None if lazy_only else comp.ports.get(name)
+	if port is not None:
+		return port
+	for prefix, child, transform, _, private, array in reversed(_lazy_sources.get(comp, ())):
+		if not name.startswith(prefix):
+			continue
+		rest = name[len(prefix):]
+		if array is not None:
+			element = _ELEMENT.fullmatch(rest)
+			if element is None or int(element[2]) >= array[0] or int(element[1]) >= array[1]:
+				continue
+			transform = _element_transform(transform, array, int(element[2]), int(element[1]))
+			rest = element[3]
+		head, _, suffix = rest.rpartition("_")
+		turned = transform[1] % 360 or transform[2]
+		if not turned or not head or suffix not in _ORIENTATION_SUFFIXES:
+			child_port = _resolve(child, rest, not private)
+			if child_port is not None:
+				return _transformed(child_port, transform, name)
+			continue
+		# the parent renamed its ports by orientation, so the suffix is the orientation after the transform
+		for candidate in _ORIENTATION_SUFFIXES:
+			child_port = _resolve(child, f"{head}_{candidate}", not private)
+			if child_port is not None:
+				port = _transformed(child_port, transform, name)
+				if _orientation_suffix(port.orientation) == suffix:
+					return port
+	return None
+
+
+def get_port(custom_comp: Union[Component, ComponentReference], name: str) -> Port:
+	"""returns the port name of custom_comp, public or lazy (private ports in "public" mode)
+	works as custom_comp.ports[name], a KeyError is raised if custom_comp has no such port
+	"""
+	if isinstance(custom_comp, ComponentReference):
+		if name in custom_comp.parent.ports:
+			return custom_comp.ports[name]
+		port = _resolve(custom_comp.parent, name)
+		if port is not None:
+			port = _transformed(port, _transform_of(custom_comp), name)
+	else:
+		port = _resolve(custom_comp, name)
+	if port is None:
+		raise KeyError(f"{name!r} is not a port of {custom_comp.name!r}")
+	return port
+
+
+def _link_ports(link: tuple) -> dict[str, Port]:
+	"""ports of a link, moved and named as the parent has them (array elements in the order "all" mode adds them)"""
+	prefix, child, transform, index, private, array = link
+	if array is not None:
+		ports = dict()
+		for column in range(array[0]):
+			for row in range(array[1]):
+				element = (f"{prefix}row{row}_col{column}_", child, _element_transform(transform, array, column, row), index, private, None)
+				ports.update(select_ports(_link_ports(element)))
+		return ports
+	turned = transform[1] % 360 or transform[2]
+	ports = dict()
+	for child_name in (list(child.ports) if private else []) + lazy_port_names(child):
+		port = _transformed(_resolve(child, child_name), transform, child_name)
+		head, _, suffix = child_name.rpartition("_")
+		if turned and head and suffix in _ORIENTATION_SUFFIXES:
+			child_name = f"{head}_{_orientation_suffix(port.orientation)}"
+		port.name = prefix + child_name
+		ports.setdefault(port.name, port)
+	return ports
+
+
+def lazy_port_names(custom_comp: Union[Component, ComponentReference]) -> list[str]:
+	"""names of the lazy ports of custom_comp (every port get_port resolves which is not in custom_comp.ports)"""
+	comp = custom_comp.parent if isinstance(custom_comp, ComponentReference) else custom_comp
+	names = dict()
+	for link in _lazy_sources.get(comp, ()):
+		names.update(dict.fromkeys(_link_ports(link)))
+	return [name for name in names if name not in comp.ports]
+
+
+def materialize_ports(custom_comp: Component) -> Component:
+	"""copies every lazy port of custom_comp into custom_comp.ports, giving the ports "all" mode would have
+	(in the order add_ports would have added them). returns custom_comp
+	"""
+	links = _lazy_sources.pop(custom_comp, None)
+	if not links:
+		return custom_comp
+	eager = list(custom_comp.ports.values())
+	blocks = [list() for _ in range(len(eager) + 1)]
+	added = set(custom_comp.ports)
+	for link in links:
+		ports = {name: port for name, port in _link_ports(link).items() if name not in added}
+		added.update(ports)
+		# add_ports(ref.get_ports_list()) adds the ports sorted counter clockwise (per element for array links)
+		blocks[min(link[3], len(eager))] += (ports if link[5] is not None else select_ports(ports)).values()
+	custom_comp.ports.clear()
+	for index, block in enumerate(blocks):
+		for port in block:
+			custom_comp.add_port(port=port)
+		if index < len(eager):
+			custom_comp.ports[eager[index].name] = eager[index]
+	return custom_comp
@@ -0,0 +1,151 @@
+"""
+usage: from glayout.util.result_store import ResultStore, ProgressMeter
+append only store for long running sweeps / dataset generation.
+Every result is written to a JSONL file as soon as it is available, keyed by a hash of its parameters, so a crashed
+or interrupted run keeps everything finished so far and a restart only runs the parameters which are not stored yet.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from gdsfactory.typings import PathType
+
+
+def _json_default(obj: Any) -> Any:
+	# numpy scalars/arrays and anything else without a json representation
+	if hasattr(obj, "tolist"):
+		return obj.tolist()
+	return str(obj)
+
+
+def parameter_key(params: Any) -> str:
+	"""stable hash of a (json like) parameter set, dict key order does not matter"""
+	encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=_json_default)
+	return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultStore:
+	"""JSONL file with one {"key", "params", "result"} record per finished trial.
+	records are flushed (and fsynced) as they are added, a record cut short by a crash is ignored when the file is
+	opened again. when a key is stored more than once (e.g. a retried trial) the last record wins.
+	"""
+
+	def __init__(self, path: PathType, fsync: bool = True):
+		self.path = Path(path)
+		self.fsync = fsync
+		self._results: dict[str, Any] = dict()
+		self._needs_newline = False
+		if self.path.is_file():
+			with open(self.path, "r") as f:
+				for line in f:
+					self._needs_newline = not line.endswith("\n")
+					try:
+						record = json.loads(line)
+						self._results[record["key"]] = record["result"]
+					except (json.JSONDecodeError, KeyError, TypeError):
+						continue
+
+	def __len__(self) -> int:
+		return len(self._results)
+
+	def __contains__(self, params: Any) -> bool:
+		return parameter_key(params) in self._results
+
+	def get(self, params: Any, default: Any = None) -> Any:
+		"""stored result of params"""
+		return self._results.get(parameter_key(params), default)
+
+	def add(self, params: Any, result: Any) -> str:
+		"""appends the result of params to the file and returns its key"""
+		key = parameter_key(params)
+		line = json.dumps({"key": key, "params": params, "result": result}, default=_json_default)
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		with open(self.path, "a") as f:
+			if self._needs_newline:
+				# the last record was cut short, do not glue the new one to it
+				f.write("\n")
+				self._needs_newline = False
+			f.write(line + "\n")
+			f.flush()
+			if self.fsync:
+				os.fsync(f.fileno())
+		self._results[key] = json.loads(line)["result"]
+		return key
+
+	def pending(self, parameters: Iterable[Any], retry: Optional[Callable[[Any], bool]] = None) -> list[tuple[int, Any]]:
+		"""(index, params) of every parameter set without a stored result.
+		retry: also returns parameter sets whose stored result retry(result) is True (e.g. failed trials)"""
+		pending = list()
+		for index, params in enumerate(parameters):
+			key = parameter_key(params)
+			if key not in self._results or (retry is not None and retry(self._results[key])):
+				pending.append((index, params))
+		return pending
+
+	def results(self, parameters: Optional[Iterable[Any]] = None) -> list:
+		"""stored results in the order of parameters (missing ones are skipped), or in insertion order"""
+		if parameters is None:
+			return list(self._results.values())
+		keys = (parameter_key(params) for params in parameters)
+		return [self._results[key] for key in keys if key in self._results]
+
+	def records(self) -> Iterator[dict]:
+		"""streams every valid record of the file, including superseded ones"""
+		if not self.path.is_file():
+			return
+		with open(self.path, "r") as f:
+			for line in f:
+				try:
+					yield json.loads(line)
+				except json.JSONDecodeError:
+					continue
+
+	def clear(self) -> None:
+		"""deletes every stored result"""
+		self.path.unlink(missing_ok=True)
+		self._results.clear()
+		self._needs_newline = False
+
+
+class ProgressMeter:
+	"""throughput and ETA of a run which may resume earlier work
+	total: number of trials in the whole run, done: trials already finished before this run started
+	only trials finished by this run count towards the throughput"""
+
+	def __init__(self, total: int, done: int = 0):
+		self.total = total
+		self.done = done
+		self.finished = 0
+		self.start = time.monotonic()
+
+	def update(self, n: int = 1) -> str:
+		"""records n finished trials and returns a progress line"""
+		self.finished += n
+		return str(self)
+
+	@property
+	def rate(self) -> float:
+		"""finished trials per second in this run"""
+		elapsed = time.monotonic() - self.start
+		return self.finished / elapsed if elapsed > 0 else 0.0
+
+	@property
+	def eta(self) -> Optional[float]:
+		"""seconds until every trial is finished, None before the first trial finished"""
+		rate = self.rate
+		if rate <= 0:
+			return None
+		return (self.total - self.done - self.finished) / rate
+
+	def __str__(self) -> str:
+		completed = self.done + self.finished
+		percent = completed / self.total * 100 if self.total else 100.0
+		eta = self.eta
+		eta_str = "?" if eta is None else f"{eta / 60:.1f}m"
+		return (
+			f"{completed}/{self.total} ({percent:.1f}%) - {self.rate * 60:.2f}/min - "
+			f"Elapsed: {(time.monotonic() - self.start) / 60:.1f}m - ETA: {eta_str}"
+		)
@@ -1,18 +1,144 @@
+import os
+from typing import Optional
+
+import numpy as np
+from gdsfactory.component_reference import ComponentReference
+from gdsfactory.pdk import get_grid_size
+from gdsfactory.snap import snap_to_grid
 from gdsfactory.typings import Component
-from pydantic import validate_arguments
+from .validation import validate_arguments
+
+from .port_visibility import keep_lazy_ports
+
+
+# default mode of component_snap_to_grid, set GLAYOUT_PRESERVE_HIERARCHY=1 (or call set_preserve_hierarchy) to keep references
+_PRESERVE_HIERARCHY = os.environ.get("GLAYOUT_PRESERVE_HIERARCHY", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def set_preserve_hierarchy(enabled: bool) -> None:
+	"""sets the default mode of component_snap_to_grid
+	enabled = True keeps references to shared cells, False flattens (the original behavior)
+	"""
+	global _PRESERVE_HIERARCHY
+	_PRESERVE_HIERARCHY = bool(enabled)
+
+
+def get_preserve_hierarchy() -> bool:
+	"""returns True if component_snap_to_grid keeps the hierarchy by default"""
+	return _PRESERVE_HIERARCHY
+
+
+def _is_on_grid(values, nm: int) -> bool:
+	"""True if all values (um) are integer multiples of nm (nanometers)"""
+	scaled = np.asarray(values, dtype=float) * (1e3 / nm)
+	return bool(np.all(np.abs(scaled - np.round(scaled)) < 1e-6))
+
+
+class _HierarchySnapper:
+	"""walks a component tree once per unique cell and returns an on grid copy of it.
+	Cells which are already on grid (including everything below them) are reused as is,
+	so shared cells stay shared. Cells with off grid geometry, off grid references or a name already used
+	by another cell in the tree are replaced by a snapped copy with a unique name (gdsfactory keeps only
+	one cell per name when writing gds, so duplicate names would silently drop geometry).
+	"""
+
+	def __init__(self, top_name: str):
+		self.nm = int(round(get_grid_size() * 1000))
+		# id(original cell) -> snapped cell (the original if nothing changed)
+		self.memo: dict[int, Component] = dict()
+		# cell name -> id of the snapped cell using it. None reserves the top level name
+		self.names: dict[str, Optional[int]] = {top_name: None}
+
+	def _unique_name(self, name: str) -> str:
+		if name not in self.names:
+			return name
+		suffix = 1
+		while f"{name}_{suffix}" in self.names:
+			suffix += 1
+		return f"{name}_{suffix}"
+
+	def _keeps_grid(self, ref: ComponentReference) -> bool:
+		"""True if ref maps an on grid cell onto the grid (manhattan rotation, no magnification, on grid array vectors)"""
+		rotation = ref.rotation % 90
+		if ref.magnification not in (None, 1) or not (np.isclose(rotation, 0) or np.isclose(rotation, 90)):
+			return False
+		repetition = ref._reference.repetition
+		if repetition.size <= 1:
+			return True
+		return _is_on_grid(repetition.get_offsets(), self.nm)
+
+	def snap(self, comp: Component, top: bool = False) -> Component:
+		if not top and id(comp) in self.memo:
+			return self.memo[id(comp)]
+		changed = top
+		references = list()
+		absorbed = list()
+		for ref in comp.references:
+			if not self._keeps_grid(ref):
+				absorbed.append(ref)
+				changed = True
+				continue
+			child = self.snap(ref.parent)
+			origin_on_grid = _is_on_grid(ref.origin, self.nm)
+			changed = changed or child is not ref.parent or not origin_on_grid
+			references.append((ref, child, origin_on_grid))
+		polygons = [(polygon, _is_on_grid(polygon.points, self.nm)) for polygon in comp.polygons]
+		changed = changed or not all(on_grid for _, on_grid in polygons)
+		if not changed and self.names.get(comp.name, id(comp)) == id(comp):
+			self.names[comp.name] = id(comp)
+			self.memo[id(comp)] = comp
+			return comp
+		# build the snapped copy
+		snapped = Component()
+		for ref, child, origin_on_grid in references:
+			new_ref = ComponentReference(
+				component=child,
+				origin=ref.origin if origin_on_grid else snap_to_grid(tuple(ref.origin)),
+				rotation=ref.rotation,
+				magnification=ref.magnification,
+				x_reflection=ref.x_reflection,
+				name=ref.name,
+			)
+			new_ref._reference.repetition = ref._reference.repetition
+			snapped.add(new_ref)
+		for ref in absorbed:
+			for polygon in ref.get_polygons(as_array=False):
+				snapped.add_polygon(snap_to_grid(polygon.points), layer=(polygon.layer, polygon.datatype))
+		for polygon, on_grid in polygons:
+			if on_grid:
+				snapped.add_polygon(polygon)
+			else:
+				snapped.add_polygon(snap_to_grid(polygon.points), layer=(polygon.layer, polygon.datatype))
+		for path in comp.paths:
+			snapped.add(path)
+		for label in comp.labels:
+			snapped.add_label(text=label.text, position=snap_to_grid(tuple(label.origin)), layer=(label.layer, label.texttype))
+		snapped.add_ports(comp.ports)
+		snapped.info = comp.info.copy()
+		if top:
+			snapped.name = comp.name
+		else:
+			snapped.name = self._unique_name(comp.name)
+			self.names[snapped.name] = id(snapped)
+			self.memo[id(comp)] = snapped
+		return snapped
 
 
 @validate_arguments
-def component_snap_to_grid(comp: Component) -> Component:
+def component_snap_to_grid(comp: Component, preserve_hierarchy: Optional[bool] = None) -> Component:
 	"""snaps all polygons and ports in component to grid
 	comp = the component to snap to grid
-	NOTE this function will flatten the component
+	preserve_hierarchy = if False flatten the component (default unless set_preserve_hierarchy(True) or GLAYOUT_PRESERVE_HIERARCHY=1)
+	if True keep references to child cells and only replace the cells which are actually off grid (see _HierarchySnapper)
+	NOTE by default this function will flatten the component
 	"""
+	if preserve_hierarchy is None:
+		preserve_hierarchy = _PRESERVE_HIERARCHY
+	if preserve_hierarchy:
+		return keep_lazy_ports(comp, _HierarchySnapper(comp.name).snap(comp, top=True))
 	#return comp.flatten()
 	# flatten the component then copy (snaps polygons and ports to grid)
 	name = comp.name
-	comp = comp.flatten().copy()
-	comp.name = name
-	return comp
-
-
+	snapped = comp.flatten().copy()
+	snapped.name = name
+	return keep_lazy_ports(comp, snapped)
@@ -0,0 +1,222 @@
+"""
+usage: from glayout.util.spice_reader import iter_spice_statements, summarize_parasitics
+streaming reader for SPICE netlists, e.g. the <cell>_pex.spice written by run_pex.sh.
+The netlist is read in blocks of about block_size characters. Continuation lines are joined and comments dropped for a
+whole block at once, so only one block is held in memory. summarize_parasitics extracts every resistor and capacitor
+of a block with one regex scan and adds them to the per net arrays with numpy, memory grows with the number of nets
+and not with the file size.
+"""
+import re
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+import numpy as np
+from gdsfactory.typings import PathType
+
+
+_SI_SCALE = {
+	"t": 1e12, "g": 1e9, "meg": 1e6, "k": 1e3, "mil": 25.4e-6,
+	"m": 1e-3, "u": 1e-6, "n": 1e-9, "p": 1e-12, "f": 1e-15, "a": 1e-18,
+}
+_SUFFIX_SCALE = {suffix: scale for key, scale in _SI_SCALE.items() if len(key) == 1 for suffix in (key, key.upper())}
+_NUMBER = re.compile(r"([+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)(meg|mil|[tgkmunpfa])?", re.IGNORECASE)
+# the block patterns start with the newline before a statement (blocks are scanned with a leading "\n"), a literal
+# prefix lets re skip ahead instead of trying every position
+_INDENT = re.compile(r"\n[ \t]+")
+_COMMENT_LINE = re.compile(r"\n\*[^\n]*")
+_INLINE_COMMENT = re.compile(r"[ \t][$;][^\n]*")
+# a line starting with "+" continues the previous one, so does the line after one ending with "+"
+_LEADING_CONTINUATION = re.compile(r"\n\+[ \t]*")
+_TRAILING_CONTINUATION = re.compile(r"[ \t]*\+[ \t]*\n")
+_PARASITICS = {
+	kind: re.compile(rf"\n[{kind}{kind.upper()}]\S*[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)") for kind in "rc"
+}
+_DEVICE = re.compile(r"\n([^RrCc.\s][^\n]*)")
+# node count by device letter, x instances have every token up to the subcircuit name as a node
+_TERMINALS = {"r": 2, "c": 2, "l": 2, "d": 2, "v": 2, "i": 2, "e": 4, "g": 4, "f": 2, "h": 2, "b": 2, "q": 3, "j": 3, "m": 4}
+
+
+def parse_value(token: str) -> float:
+	"""value of a SPICE number with an optional scale suffix (1.5f, 10MEG, 2.2kohm, r=12, ...), raises ValueError"""
+	token = token.rpartition("=")[2]
+	match = _NUMBER.match(token)
+	if match is None:
+		raise ValueError(f"not a SPICE number: {token!r}")
+	number, suffix = match.groups()
+	return float(number) * (_SI_SCALE[suffix.lower()] if suffix else 1.0)
+
+
+def _value(token: str) -> float:
+	"""parse_value with fast paths for plain numbers and single letter suffixes (0.12f, as magic writes them),
+	nan if token is not a number"""
+	try:
+		last = token[-1]
+		if "0" <= last <= "9":
+			try:
+				return float(token)
+			except ValueError:
+				return parse_value(token)
+		scale = _SUFFIX_SCALE.get(last)
+		if scale is not None and "0" <= token[-2:-1] <= "9":
+			return float(token[:-1]) * scale
+		return parse_value(token)
+	except ValueError:
+		return float("nan")
+
+
+def _values(tokens: list) -> np.ndarray:
+	"""values of the tokens, nan where a token is not a number. plain numbers, or numbers with one common single
+	letter suffix (magic writes every capacitance in fF), are converted by numpy at once"""
+	suffixes = {token[-1] for token in tokens}
+	try:
+		if all("0" <= suffix <= "9" for suffix in suffixes):
+			return np.array(tokens, dtype=float)
+		scale = _SUFFIX_SCALE.get(suffixes.pop()) if len(suffixes) == 1 else None
+		if scale is not None:
+			return np.array([token[:-1] for token in tokens], dtype=float) * scale
+	except ValueError:
+		pass
+	return np.array([_value(token) for token in tokens])
+
+
+def net_of_subnode(node: str) -> str:
+	"""net of a node, magic's extresist splits a net into sub nodes <net>.n<i> (internal) and <net>.t<i> (device
+	terminals)"""
+	net, dot, suffix = node.rpartition(".")
+	if dot and suffix[:1] in ("n", "t") and suffix[1:].isdigit():
+		return net
+	return node
+
+
+def _blocks(netlist: Union[PathType, Iterable[str]], block_size: int) -> Iterator[str]:
+	"""text of a netlist file (read lazily) or of an iterable of lines, in blocks of about block_size characters
+	ending at a line end"""
+	if isinstance(netlist, (str, Path)):
+		with open(netlist, "r") as f:
+			while lines := f.readlines(block_size):
+				yield "".join(lines)
+		return
+	lines, size = [], 0
+	for line in netlist:
+		if not line.endswith("\n"):
+			line += "\n"
+		lines.append(line)
+		size += len(line)
+		if size >= block_size:
+			yield "".join(lines)
+			lines, size = [], 0
+	if lines:
+		yield "".join(lines)
+
+
+def _statement_blocks(netlist: Union[PathType, Iterable[str]], keep_comments: bool, block_size: int) -> Iterator[str]:
+	"""blocks of complete, unindented statements, each one starting with "\n". the last line of a block is held
+	back and prepended to the next block, which may continue it"""
+	carry = ""
+	for block in _blocks(netlist, block_size):
+		text = _INDENT.sub("\n", "\n" + carry + block)
+		if not keep_comments:
+			text = _COMMENT_LINE.sub("", text)
+			if "$" in text or ";" in text:
+				text = _INLINE_COMMENT.sub("", text)
+		text = _LEADING_CONTINUATION.sub(" ", text)
+		if "+" in text:
+			text = _TRAILING_CONTINUATION.sub(" ", text)
+		cut = text.rfind("\n", 0, len(text) - 1)
+		carry = text[cut + 1 :]
+		yield text[:cut]
+	yield "\n" + carry
+
+
+def iter_spice_statements(netlist: Union[PathType, Iterable[str]], keep_comments: bool = False, block_size: int = 2**20) -> Iterator[str]:
+	"""yields the statements of a SPICE netlist (path or iterable of lines) with the continuation lines joined.
+	comment lines (*) and inline comments ($ or ;) are dropped, with keep_comments they are kept in place"""
+	for text in _statement_blocks(netlist, keep_comments, block_size):
+		for line in text.split("\n"):
+			line = line.strip().lstrip("+").lstrip()
+			if line:
+				yield line
+
+
+def device_nodes(tokens: list[str]) -> tuple[list[str], str]:
+	"""(nodes, model) of the tokenized device statement, model is the subcircuit / model name or the device letter"""
+	letter = tokens[0][0].lower()
+	if letter == "x":
+		end = next((i for i, token in enumerate(tokens) if "=" in token), len(tokens)) - 1
+		return tokens[1:end], tokens[end] if end > 0 else "X"
+	if letter == "m" and len(tokens) > 5:
+		return tokens[1:5], tokens[5]
+	return tokens[1 : 1 + _TERMINALS.get(letter, 2)], letter.upper()
+
+
+def _sums(sums: np.ndarray, nets: np.ndarray, values: Optional[np.ndarray], net_count: int) -> np.ndarray:
+	"""sums, grown to net_count entries, plus values (None = 1 each) added at nets"""
+	added = np.bincount(nets, weights=values, minlength=max(net_count, len(sums))).astype(float, copy=False)
+	added[: len(sums)] += sums
+	return added
+
+
+def summarize_parasitics(
+	netlist: Union[PathType, Iterable[str]],
+	net_of: Optional[Callable[[str], str]] = None,
+	block_size: int = 2**20,
+) -> dict:
+	"""streams a (PEX) SPICE netlist and returns
+	{"total_resistance", "total_capacitance", "resistor_count", "capacitor_count", "device_counts", "nets",
+	"resistance", "capacitance", "device_terminals"}
+	nets is the list of net names, resistance / capacitance (ohms / farads of the resistors and capacitors touching
+	the net, a resistor or coupling capacitor counts for both of its nets) and device_terminals (device pins on the net)
+	are numpy arrays in the same order. device_counts counts the other devices by model.
+	net_of: maps a node name to its net, default strips magic's extresist sub node suffix (vout.n3 -> vout)
+	"""
+	net_of = net_of if net_of is not None else net_of_subnode
+	net_index = dict()
+
+	def indices(nodes: list) -> np.ndarray:
+		# net_of runs once per distinct node of the block, nodes are not kept across blocks
+		node_index = {node: net_index.setdefault(net_of(node), len(net_index)) for node in set(nodes)}
+		return np.fromiter(map(node_index.__getitem__, nodes), dtype=np.int64, count=len(nodes))
+
+	sums = {"r": np.zeros(0), "c": np.zeros(0)}
+	totals = {"r": 0.0, "c": 0.0}
+	counts = {"r": 0, "c": 0}
+	terminals = np.zeros(0)
+	device_counts = Counter()
+	for text in _statement_blocks(netlist, False, block_size):
+		for letter, pattern in _PARASITICS.items():
+			elements = pattern.findall(text)
+			if not elements:
+				continue
+			first, second, values = (list(map(itemgetter(column), elements)) for column in range(3))
+			values = _values(values)
+			valid = ~np.isnan(values)
+			values = values[valid]
+			nets = np.concatenate((indices(first)[valid], indices(second)[valid]))
+			totals[letter] += float(values.sum())
+			counts[letter] += len(values)
+			sums[letter] = _sums(sums[letter], nets, np.tile(values, 2), len(net_index))
+		device_terminals = []
+		for statement in _DEVICE.findall(text):
+			tokens = statement.lstrip("+").split()
+			if not tokens:
+				continue
+			nodes, model = device_nodes(tokens)
+			device_counts[model] += 1
+			device_terminals.extend(nodes)
+		if device_terminals:
+			terminals = _sums(terminals, indices(device_terminals), None, len(net_index))
+	net_count = len(net_index)
+	no_nets = np.zeros(0, dtype=np.int64)
+	return {
+		"total_resistance": totals["r"],
+		"total_capacitance": totals["c"],
+		"resistor_count": counts["r"],
+		"capacitor_count": counts["c"],
+		"device_counts": dict(device_counts),
+		"nets": list(net_index),
+		"resistance": _sums(sums["r"], no_nets, None, net_count),
+		"capacitance": _sums(sums["c"], no_nets, None, net_count),
+		"device_terminals": _sums(terminals, no_nets, None, net_count).astype(np.int64),
+	}
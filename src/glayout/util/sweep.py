@@ -0,0 +1,227 @@
+"""
+usage: from glayout.util.sweep import SweepRunner
+process pool for parametric sweeps (build layout -> extract -> simulate for every sample).
+Workers are started once and keep gdsfactory/glayout imported, so a sample costs a function call instead of a new
+python interpreter. Workers are replaced after max_tasks_per_child samples to contain memory leaks (e.g. the
+gdsfactory cell cache) and the pool size is picked from the cpu count and the available memory.
+"""
+import os
+import shutil
+import signal
+import time
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from gdsfactory.typings import PathType
+
+
+def available_memory_bytes() -> Optional[int]:
+	"""memory available to new processes (MemAvailable on linux), None if it can not be determined"""
+	try:
+		with open("/proc/meminfo", "r") as meminfo:
+			for line in meminfo:
+				if line.startswith("MemAvailable:"):
+					return int(line.split()[1]) * 1024
+	except OSError:
+		pass
+	try:
+		return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+	except (ValueError, OSError, AttributeError):
+		return None
+
+
+def default_worker_count(memory_per_worker_gb: float = 2.0) -> int:
+	"""number of workers which fit the machine: the cpu count, limited by available memory / memory_per_worker_gb"""
+	workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+	memory = available_memory_bytes()
+	if memory is not None and memory_per_worker_gb > 0:
+		workers = min(workers, int(memory // (memory_per_worker_gb * 2**30)))
+	return max(workers, 1)
+
+
+def link_shared_tree(src: PathType, dest: PathType) -> Path:
+	"""makes the read only directory src available at dest without copying it (symlink, copy as fallback).
+	use this for PDK and model directories shared by every sample of a sweep"""
+	src = Path(src).resolve()
+	dest = Path(dest)
+	try:
+		dest.symlink_to(src, target_is_directory=True)
+	except OSError:
+		shutil.copytree(src, dest)
+	return dest
+
+
+class SampleLost(RuntimeError):
+	"""a sample returned no result: its worker died (crash, out of memory kill) or the sample ran past the timeout"""
+
+
+# worker side: queue the (sample index, pid) of every sample a worker starts is put on
+_started = None
+
+
+def _init_worker(started, initializer: Optional[Callable], initargs: tuple) -> None:
+	global _started
+	_started = started
+	if initializer is not None:
+		initializer(*initargs)
+
+
+def _run_sample(index: int, func: Callable, sample: Any, star: bool) -> Any:
+	_started.put((index, os.getpid()))
+	return func(*sample) if star else func(sample)
+
+
+def _is_alive(pid: int) -> bool:
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:
+		pass
+	return True
+
+
+class SweepRunner:
+	"""a pool of warm worker processes for parametric sweeps
+	max_workers: number of worker processes, defaults to default_worker_count(memory_per_worker_gb)
+	max_tasks_per_child: samples a worker runs before it is replaced, None = never replace workers
+	initializer, initargs: called once in every worker (e.g. to import and activate the pdk)
+	start_method: multiprocessing start method, None = platform default
+	timeout: seconds a sample may run (from the time a worker starts it) before its worker is killed, None = no limit
+	on_failure: called (in the calling process) with a sample that returned no result because its worker died or
+		it timed out, its return value is used as the result of the sample. None raises SampleLost instead.
+		dead workers are replaced by the pool, the other samples keep running
+
+	with SweepRunner(max_tasks_per_child=20) as runner:
+		results = list(runner.starmap(build_and_simulate, zip(params, count(0))))
+	"""
+
+	# seconds between checks of the running samples, and the time the result of a sample whose worker exited may take to arrive
+	poll_interval = 0.05
+	exit_grace = 1.0
+
+	def __init__(
+		self,
+		max_workers: Optional[int] = None,
+		max_tasks_per_child: Optional[int] = 50,
+		initializer: Optional[Callable] = None,
+		initargs: tuple = (),
+		memory_per_worker_gb: float = 2.0,
+		start_method: Optional[str] = None,
+		timeout: Optional[float] = None,
+		on_failure: Optional[Callable[[Any], Any]] = None,
+	):
+		self.max_workers = max_workers or default_worker_count(memory_per_worker_gb)
+		if self.max_workers < 1:
+			raise ValueError("max_workers must be at least 1")
+		self.max_tasks_per_child = max_tasks_per_child
+		self.timeout = timeout
+		self.on_failure = on_failure
+		# a lost sample stays in the pool cache forever, so the pool is terminated instead of joined
+		self._abandoned = False
+		context = get_context(start_method)
+		self._started = context.SimpleQueue()
+		self._pool = context.Pool(
+			self.max_workers,
+			initializer=_init_worker,
+			initargs=(self._started, initializer, initargs),
+			maxtasksperchild=max_tasks_per_child,
+		)
+
+	def __enter__(self) -> "SweepRunner":
+		return self
+
+	def __exit__(self, exc_type, *exc) -> None:
+		if exc_type is not None:
+			self._pool.terminate()
+			self._pool.join()
+		else:
+			self.close()
+
+	def map(self, func: Callable, samples: Iterable, ordered: bool = True) -> Iterator:
+		"""yields func(sample) for every sample, in sample order if ordered else in completion order.
+		func must be picklable (defined at module level). an exception raised by func is re-raised here,
+		a sample lost to a dead worker or the timeout gives on_failure(sample) (see SweepRunner)"""
+		return self._results(func, samples, ordered, star=False)
+
+	def starmap(self, func: Callable, samples: Iterable[tuple], ordered: bool = True) -> Iterator:
+		"""same as map but calls func(*sample)"""
+		return self._results(func, samples, ordered, star=True)
+
+	def _lost(self, sample: Any, reason: str) -> Callable[[], Any]:
+		self._abandoned = True
+		if self.on_failure is None:
+			def raise_lost():
+				raise SampleLost(f"sample {sample!r} {reason}")
+			return raise_lost
+		return lambda: self.on_failure(sample)
+
+	def _results(self, func: Callable, samples: Iterable, ordered: bool, star: bool) -> Iterator:
+		samples = iter(samples)
+		# index -> (sample, AsyncResult) of submitted samples, index -> [pid, start time, exit time] of started ones
+		pending: dict[int, tuple[Any, Any]] = dict()
+		running: dict[int, list] = dict()
+		# index -> function returning the result (or raising) of finished samples not yet yielded
+		done: dict[int, Callable[[], Any]] = dict()
+		submitted = next_index = 0
+		exhausted = False
+		while True:
+			# keep every worker busy without submitting the whole (possibly lazy) sample iterable at once
+			while not exhausted and len(pending) < 2 * self.max_workers:
+				try:
+					sample = next(samples)
+				except StopIteration:
+					exhausted = True
+					break
+				pending[submitted] = (sample, self._pool.apply_async(_run_sample, (submitted, func, sample, star)))
+				submitted += 1
+			while not self._started.empty():
+				index, pid = self._started.get()
+				if index in pending:
+					running[index] = [pid, time.monotonic(), None]
+			now = time.monotonic()
+			for index, (sample, result) in list(pending.items()):
+				if result.ready():
+					done[index] = result.get
+				elif index in running:
+					pid, start, exited = running[index]
+					if self.timeout is not None and now - start > self.timeout:
+						try:
+							os.kill(pid, signal.SIGKILL)
+						except ProcessLookupError:
+							pass
+						done[index] = self._lost(sample, f"timed out after {self.timeout}s")
+					elif exited is None:
+						if not _is_alive(pid):
+							running[index][2] = now
+					elif now - exited > self.exit_grace:
+						done[index] = self._lost(sample, f"lost its worker (pid {pid})")
+				if index in done:
+					del pending[index]
+					running.pop(index, None)
+			if ordered:
+				while next_index in done:
+					yield done.pop(next_index)()
+					next_index += 1
+			else:
+				for index in list(done):
+					yield done.pop(index)()
+			if exhausted and not pending and not done:
+				return
+			if pending:
+				next(iter(pending.values()))[1].wait(self.poll_interval)
+
+	def close(self) -> None:
+		"""waits for running samples and stops the workers"""
+		if self._abandoned:
+			self._pool.terminate()
+		else:
+			self._pool.close()
+		self._pool.join()
+
+
+def run_sweep(func: Callable, samples: Iterable, star: bool = False, **runner_kwargs) -> list:
+	"""runs func on every sample with a SweepRunner (see SweepRunner for runner_kwargs) and returns the results in order"""
+	with SweepRunner(**runner_kwargs) as runner:
+		return list(runner.starmap(func, samples) if star else runner.map(func, samples))
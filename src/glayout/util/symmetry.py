@@ -0,0 +1,181 @@
+"""
+usage: from glayout.util.symmetry import raster_symmetry
+mirror symmetry of a layout measured on an occupancy raster instead of polygon booleans.
+The layout is mirrored about the y axis (horizontal score) and about the x axis (vertical score) through the origin.
+Polygon vertices are snapped to a lattice of pitch resolution. The raster is not uniform: its columns and rows are cut
+only at the snapped edge coordinates (and at their mirror images, so that a mirrored cell is again a cell), so the cost
+grows with the number of distinct edges and not with the layout extent. Rectilinear polygons on a grid which is a
+multiple of the resolution are measured exactly, other polygons (octagons, rotated shapes, ...) are sampled at the
+lattice pitch. The raster is processed in bands of rows, so memory stays bounded: a coarser resolution is faster, a
+finer one more accurate.
+"""
+import math
+from typing import Optional
+
+import numpy as np
+
+# manufacturing grid of the supported PDKs (um), the default resolution
+GRID = 0.005
+
+
+def _concat(polygons: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+	"""all points of the polygons, index of every point's successor and index of every polygon's first point"""
+	points = np.concatenate([np.asarray(polygon, dtype=float).reshape(-1, 2) for polygon in polygons])
+	lengths = np.array([len(polygon) for polygon in polygons])
+	starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+	successor = np.arange(len(points)) + 1
+	successor[starts + lengths - 1] = starts
+	return points, successor, starts
+
+
+class _Layer:
+	"""vertical edges of the rectilinear polygons of one layer as difference entries on the lattice, and the other polygons"""
+
+	def __init__(self, polygons: list, resolution: float):
+		polygons = [polygon for polygon in polygons if len(polygon) >= 3]
+		self.area = 0.0
+		self.x = self.y = self.weight = np.zeros(0, dtype=np.int64)
+		self.others = []
+		if not polygons:
+			return
+		points, successor, starts = _concat(polygons)
+		cross = points[:, 0] * points[successor, 1] - points[successor, 0] * points[:, 1]
+		signed_area = 0.5 * np.add.reduceat(cross, starts)
+		self.area = float(np.abs(signed_area).sum())
+
+		delta = points[successor] - points
+		rectilinear = np.logical_and.reduceat((delta[:, 0] == 0) | (delta[:, 1] == 0), starts)
+		point_polygon = np.repeat(np.arange(len(polygons)), np.diff(np.append(starts, len(points))))
+
+		lattice = np.rint(points / resolution).astype(np.int64)
+		following = lattice[successor]
+		vertical = rectilinear[point_polygon] & (lattice[:, 0] == following[:, 0]) & (lattice[:, 1] != following[:, 1])
+		# a vertical edge adds -1 (going up) or +1 (going down) to the winding number of the cells right of it,
+		# flipped for clockwise polygons so every polygon counts +1 inside
+		sign = -np.sign(signed_area[point_polygon[vertical]]).astype(np.int64) * np.sign(following[vertical, 1] - lattice[vertical, 1])
+		low = np.minimum(lattice[vertical, 1], following[vertical, 1])
+		high = np.maximum(lattice[vertical, 1], following[vertical, 1])
+		self.x = np.concatenate((lattice[vertical, 0], lattice[vertical, 0]))
+		self.y = np.concatenate((low, high))
+		self.weight = np.concatenate((sign, -sign))
+
+		for index in np.flatnonzero(~rectilinear):
+			self.others.append(np.asarray(polygons[index], dtype=float).reshape(-1, 2) / resolution)
+
+	def cuts(self) -> tuple[np.ndarray, np.ndarray]:
+		"""lattice coordinates the raster must be cut at, every lattice line across the other polygons"""
+		xs, ys = [self.x], [self.y]
+		for polygon in self.others:
+			xs.append(np.arange(math.floor(polygon[:, 0].min()), math.ceil(polygon[:, 0].max()) + 1))
+			ys.append(np.arange(math.floor(polygon[:, 1].min()), math.ceil(polygon[:, 1].max()) + 1))
+		return np.concatenate(xs), np.concatenate(ys)
+
+	def index(self, xs: np.ndarray, ys: np.ndarray) -> None:
+		"""moves the difference entries to the indices of the cut lines xs, ys, sorted by row"""
+		column, row = np.searchsorted(xs, self.x), np.searchsorted(ys, self.y)
+		order = np.argsort(row, kind="stable")
+		self.column, self.row, self.row_weight = column[order], row[order], self.weight[order]
+		self.xs, self.ys = xs, ys
+
+	def raster(self, row0: int, row1: int) -> np.ndarray:
+		"""occupancy of the cell rows row0..row1-1, shape (columns, row1 - row0)"""
+		lines = len(self.xs)
+		first, last = np.searchsorted(self.row, (row0, row1))
+		diff = np.zeros((lines, row1 - row0 + 1), dtype=np.int32)
+		# winding of the rows below the band
+		diff[:, 0] = np.bincount(self.column[:first], weights=self.row_weight[:first], minlength=lines)
+		np.add.at(diff, (self.column[first:last], self.row[first:last] - row0), self.row_weight[first:last])
+		np.cumsum(diff, axis=1, out=diff)
+		np.cumsum(diff, axis=0, out=diff)
+		occupied = diff[: lines - 1, : row1 - row0] > 0
+		for polygon in self.others:
+			_fill_polygon(occupied, polygon, self.xs, self.ys, row0)
+		return occupied
+
+
+def _fill_polygon(occupied: np.ndarray, polygon: np.ndarray, xs: np.ndarray, ys: np.ndarray, row0: int) -> None:
+	"""sets the cells of the band whose center is inside polygon (lattice coordinates, even-odd rule)"""
+	columns, rows = occupied.shape
+	i0, i1 = np.searchsorted(xs, (polygon[:, 0].min(), polygon[:, 0].max()))
+	j0, j1 = np.searchsorted(ys, (polygon[:, 1].min(), polygon[:, 1].max()))
+	i0, i1 = max(i0 - 1, 0), min(i1, columns)
+	j0, j1 = max(j0 - 1, row0), min(j1, row0 + rows)
+	if i0 >= i1 or j0 >= j1:
+		return
+	x, y = np.meshgrid((xs[i0:i1] + xs[i0 + 1 : i1 + 1]) / 2, (ys[j0:j1] + ys[j0 + 1 : j1 + 1]) / 2, indexing="ij")
+	inside = np.zeros(x.shape, dtype=bool)
+	for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+		if y1 == y2:
+			continue
+		crosses = (y1 > y) != (y2 > y)
+		inside ^= crosses & (x < x1 + (y - y1) * (x2 - x1) / (y2 - y1))
+	occupied[i0:i1, j0 - row0 : j1 - row0] |= inside
+
+
+def _mirrored_cuts(coordinates: np.ndarray) -> np.ndarray:
+	"""sorted unique lattice coordinates including 0 and the mirror image of every coordinate"""
+	return np.unique(np.concatenate((coordinates, -coordinates, np.zeros(1, dtype=np.int64))))
+
+
+def _merge(layers: list, resolution: float) -> _Layer:
+	"""all layers as one, the winding numbers add up so a cell is occupied when any layer occupies it"""
+	merged = _Layer([], resolution)
+	merged.area = sum(layer.area for layer in layers)
+	if layers:
+		merged.x = np.concatenate([layer.x for layer in layers])
+		merged.y = np.concatenate([layer.y for layer in layers])
+		merged.weight = np.concatenate([layer.weight for layer in layers])
+	merged.others = [polygon for layer in layers for polygon in layer.others]
+	return merged
+
+
+def _mirror_xor(layer: _Layer, max_band_cells: int) -> tuple[float, float]:
+	"""area (in lattice units) of the layer XOR its mirror image about the y axis and about the x axis"""
+	xs, ys = layer.cuts()
+	xs, ys = _mirrored_cuts(xs), _mirrored_cuts(ys)
+	layer.index(xs, ys)
+	# cell sizes, symmetric: cell k is the mirror image of cell -1 - k
+	widths = np.diff(xs).astype(float)
+	heights = np.diff(ys).astype(float)
+	columns, half = len(widths), len(heights) // 2
+
+	def xor_area(a: np.ndarray, b: np.ndarray, rows: np.ndarray) -> float:
+		return float(widths @ (a ^ b) @ rows)
+
+	xor_x = xor_y = 0.0
+	# bands of the lower half, each one is measured together with its mirror image in the upper half
+	band = max(1, min(half, max_band_cells // max(columns, 1)))
+	for low0 in range(0, half, band):
+		low1 = min(low0 + band, half)
+		rows = heights[low0:low1]
+		low = layer.raster(low0, low1)
+		high = layer.raster(2 * half - low1, 2 * half - low0)[:, ::-1]
+		xor_x += xor_area(low, low[::-1], rows) + xor_area(high, high[::-1], rows)
+		xor_y += 2 * xor_area(low, high, rows)
+	return xor_x, xor_y
+
+
+def raster_symmetry(polygons_by_layer: dict, resolution: Optional[float] = None, max_band_cells: int = 2**21) -> dict:
+	"""symmetry scores (1.0 = symmetric) of polygons_by_layer ({layer: [array of (x, y) points, ...]}, e.g.
+	component.get_polygons(by_spec=True)), per layer and for all layers merged.
+	score = 1 - area(layout XOR mirrored layout) / total polygon area
+	resolution: lattice pitch in um, None = GRID
+	max_band_cells: raster cells held at once, bounds memory
+	returns {"horizontal", "vertical", "area", "resolution", "layers": {layer: {"horizontal", "vertical", "area"}}}
+	"""
+	resolution = GRID if resolution is None else resolution
+	if resolution <= 0:
+		raise ValueError("resolution must be positive")
+	pixel_area = resolution * resolution
+
+	def scores(layer: _Layer) -> dict:
+		if layer.area == 0:
+			return {"horizontal": 1.0, "vertical": 1.0, "area": 0.0}
+		xor_x, xor_y = _mirror_xor(layer, max_band_cells)
+		return {"horizontal": 1.0 - xor_x * pixel_area / layer.area, "vertical": 1.0 - xor_y * pixel_area / layer.area, "area": layer.area}
+
+	layers = {name: _Layer(polygons, resolution) for name, polygons in polygons_by_layer.items()}
+	result = scores(_merge(list(layers.values()), resolution))
+	result["resolution"] = resolution
+	result["layers"] = {name: scores(layer) for name, layer in layers.items()}
+	return result
@@ -0,0 +1,47 @@
+"""
+usage: from glayout.util.validation import validate_arguments
+drop in replacement of pydantic validate_arguments for the hot helpers (comp_utils, port_utils, snap_to_grid, via_gen, mappedpdk).
+Arguments are validated (the default, for debug and tests) unless production mode is on, then the undecorated function is called.
+Set GLAYOUT_PRODUCTION=1 (or call set_production_mode) to turn production mode on.
+****NOTE: in production mode arguments are not coerced either (e.g. an int stays an int where the annotation says float)
+"""
+import functools
+import os
+from typing import Any, Callable, Optional
+
+from pydantic import validate_arguments as pydantic_validate_arguments
+
+
+_PRODUCTION = os.environ.get("GLAYOUT_PRODUCTION", "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+def set_production_mode(enabled: bool) -> None:
+	"""enabled = True skips the argument validation of the helpers, False validates every call (the original behavior)"""
+	global _PRODUCTION
+	_PRODUCTION = bool(enabled)
+
+
+def get_production_mode() -> bool:
+	"""returns True if the helpers skip argument validation"""
+	return _PRODUCTION
+
+
+def validate_arguments(func: Optional[Callable] = None, *, config: Optional[dict] = None) -> Any:
+	"""same as pydantic validate_arguments (with or without config), but the mode is checked on every call,
+	so set_production_mode also applies to functions decorated before it was called.
+	The wrapper keeps the raw_function, validate, model and vd attributes of the pydantic wrapper
+	"""
+	def decorate(function: Callable) -> Callable:
+		validated = pydantic_validate_arguments(function, config=config)
+
+		@functools.wraps(function)
+		def wrapper(*args, **kwargs):
+			if _PRODUCTION:
+				return function(*args, **kwargs)
+			return validated(*args, **kwargs)
+
+		for attr in ("raw_function", "validate", "model", "vd"):
+			setattr(wrapper, attr, getattr(validated, attr))
+		return wrapper
+
+	return decorate if func is None else decorate(func)
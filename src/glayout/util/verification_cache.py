@@ -0,0 +1,220 @@
+"""
+usage: from glayout.util.verification_cache import get_verification_cache, verification_cache_key
+on disk, content addressed cache of DRC/LVS results.
+Entries are keyed by the hash of everything that determines a result (gds bytes, netlist text, pdk name,
+rule deck / magicrc contents and the check being run), so identical cells regenerated across sweeps are only verified once.
+set GLAYOUT_VERIFICATION_CACHE=0 to disable the cache and GLAYOUT_CACHE_DIR to move it (default ~/.cache/glayout)
+"""
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from gdsfactory.typings import PathType
+
+
+DEFAULT_MAX_BYTES = 1 << 30
+"""default size limit of the cache directory (1GiB), least recently used entries are evicted beyond it"""
+EVICT_TO = 0.9
+"""an eviction triggered by a store shrinks the cache to this fraction of max_bytes, so the next stores do not scan again"""
+CACHE_VERSION = 1
+"""bump to invalidate every existing entry (e.g. when the stored result format changes)"""
+
+_RESULT_FILE = "result.json"
+
+
+def verification_cache_enabled(use_cache: Optional[bool] = None) -> bool:
+	"""resolves a use_cache argument, None means use the GLAYOUT_VERIFICATION_CACHE environment variable (on by default)"""
+	if use_cache is not None:
+		return use_cache
+	return os.environ.get("GLAYOUT_VERIFICATION_CACHE", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def default_cache_dir() -> Path:
+	return Path(os.environ.get("GLAYOUT_CACHE_DIR", Path.home() / ".cache" / "glayout")) / "verification"
+
+
+# (resolved path, mtime_ns, size) -> sha256, rule decks are large and rarely change
+_file_hashes: dict[tuple[str, int, int], str] = dict()
+
+
+def hash_file(path: Optional[PathType]) -> str:
+	"""sha256 of the file contents ("" for None). results are memoized per path, mtime and size"""
+	if path is None:
+		return ""
+	path = Path(path).resolve()
+	stat = path.stat()
+	memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+	digest = _file_hashes.get(memo_key)
+	if digest is None:
+		sha = hashlib.sha256()
+		with open(path, "rb") as f:
+			for chunk in iter(lambda: f.read(1 << 20), b""):
+				sha.update(chunk)
+		digest = _file_hashes[memo_key] = sha.hexdigest()
+	return digest
+
+
+def verification_cache_key(
+	check: str,
+	pdk_name: str,
+	design_name: str,
+	gds: PathType,
+	netlist: Optional[str] = None,
+	rule_files: Iterable[Optional[PathType]] = (),
+	extra: Iterable[Any] = (),
+) -> str:
+	"""returns the cache key of one verification run
+	check = name of the check (e.g. "drc_magic", "lvs_netgen")
+	gds = path to the gds file (hashed by content)
+	netlist = netlist text used for LVS
+	rule_files = rule deck, magicrc, lvs setup files... (hashed by content, missing files hash to their path)
+	extra = anything else the result depends on (e.g. the generated tool script)
+	"""
+	sha = hashlib.sha256()
+	for part in (str(CACHE_VERSION), check, pdk_name, design_name, hash_file(gds), netlist or ""):
+		sha.update(part.encode())
+		sha.update(b"\0")
+	for rule_file in rule_files:
+		try:
+			sha.update(hash_file(rule_file).encode())
+		except OSError:
+			sha.update(str(rule_file).encode())
+		sha.update(b"\0")
+	for part in extra:
+		sha.update(str(part).encode())
+		sha.update(b"\0")
+	return sha.hexdigest()
+
+
+class VerificationCache:
+	"""directory of cache entries, one sub directory per key holding result.json and the report files.
+	entries are written to a temporary directory and renamed into place so concurrent runs never see partial entries.
+	the least recently used entries (by result.json mtime, refreshed on hits) are evicted once the cache exceeds max_bytes.
+	the size of the cache is scanned once and then tracked by adding the size of every stored entry, entries stored by other
+	processes are only seen by the next scan (which every eviction does)
+	"""
+
+	def __init__(self, cache_dir: Optional[PathType] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+		self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		# running estimate of the cache size in bytes, None until the first scan
+		self._size_estimate: Optional[int] = None
+
+	def _entry_dir(self, key: str) -> Path:
+		return self.cache_dir / key[:2] / key
+
+	def get(self, key: str) -> Optional[dict]:
+		"""returns {"result": stored result, "files": {name: cached path}} or None on a miss"""
+		entry_dir = self._entry_dir(key)
+		try:
+			with open(entry_dir / _RESULT_FILE, "r") as f:
+				entry = json.load(f)
+			files = {name: entry_dir / name for name in entry["files"]}
+			if not all(path.is_file() for path in files.values()):
+				raise FileNotFoundError(entry_dir)
+			os.utime(entry_dir / _RESULT_FILE)
+		except (OSError, ValueError, KeyError):
+			self.misses += 1
+			return None
+		self.hits += 1
+		return {"result": entry["result"], "files": files}
+
+	def put(self, key: str, result: dict, files: Iterable[PathType] = ()) -> None:
+		"""stores result (must be json serializable) and copies of files under key"""
+		entry_dir = self._entry_dir(key)
+		entry_dir.parent.mkdir(parents=True, exist_ok=True)
+		temp_dir = entry_dir.parent / f".tmp-{uuid.uuid4().hex}"
+		temp_dir.mkdir()
+		try:
+			names = list()
+			for file in files:
+				file = Path(file)
+				if file.is_file():
+					shutil.copy(file, temp_dir / file.name)
+					names.append(file.name)
+			with open(temp_dir / _RESULT_FILE, "w") as f:
+				json.dump({"version": CACHE_VERSION, "result": result, "files": names}, f)
+			entry_size = sum(file.stat().st_size for file in temp_dir.iterdir())
+			if entry_dir.exists():
+				shutil.rmtree(entry_dir, ignore_errors=True)
+			os.rename(temp_dir, entry_dir)
+		except OSError:
+			# another process stored the same key first, keep theirs
+			shutil.rmtree(temp_dir, ignore_errors=True)
+			return
+		if self._size_estimate is None:
+			self._size_estimate = self.size()
+		else:
+			self._size_estimate += entry_size
+		if self._size_estimate > self.max_bytes:
+			self.evict(int(self.max_bytes * EVICT_TO))
+
+	def restore(self, entry: dict, dest_dir: PathType) -> bool:
+		"""copies the files of a cache entry (from get) into dest_dir.
+		returns False (and counts a miss instead of the hit) if the entry was evicted in the meantime, e.g. by another process"""
+		try:
+			for name, path in entry["files"].items():
+				shutil.copy(path, Path(dest_dir) / name)
+		except OSError:
+			self.hits -= 1
+			self.misses += 1
+			return False
+		return True
+
+	def _entries(self) -> list[tuple[float, int, Path]]:
+		entries = list()
+		if not self.cache_dir.is_dir():
+			return entries
+		for entry_dir in self.cache_dir.glob("??/*"):
+			try:
+				mtime = (entry_dir / _RESULT_FILE).stat().st_mtime
+				size = sum(file.stat().st_size for file in entry_dir.iterdir())
+			except OSError:
+				continue
+			entries.append((mtime, size, entry_dir))
+		return entries
+
+	def size(self) -> int:
+		"""total size in bytes of all entries"""
+		return sum(size for _, size, _ in self._entries())
+
+	def evict(self, target_bytes: Optional[int] = None) -> None:
+		"""removes least recently used entries until the cache is at most target_bytes (default max_bytes)"""
+		target_bytes = self.max_bytes if target_bytes is None else target_bytes
+		entries = self._entries()
+		total = sum(size for _, size, _ in entries)
+		for _, size, entry_dir in sorted(entries, key=lambda entry: entry[0]):
+			if total <= target_bytes:
+				break
+			shutil.rmtree(entry_dir, ignore_errors=True)
+			total -= size
+			self.evictions += 1
+		self._size_estimate = total
+
+	def clear(self) -> None:
+		"""removes every entry and resets the counters"""
+		shutil.rmtree(self.cache_dir, ignore_errors=True)
+		self.hits = self.misses = self.evictions = 0
+		self._size_estimate = 0
+
+	def stats(self) -> dict:
+		return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size_bytes": self.size(), "max_bytes": self.max_bytes}
+
+
+_caches: dict[str, VerificationCache] = dict()
+
+
+def get_verification_cache(cache_dir: Optional[PathType] = None) -> VerificationCache:
+	"""returns the shared VerificationCache for cache_dir (default_cache_dir() if None)"""
+	cache_dir = str(Path(cache_dir).resolve() if cache_dir is not None else default_cache_dir().resolve())
+	cache = _caches.get(cache_dir)
+	if cache is None:
+		cache = _caches[cache_dir] = VerificationCache(cache_dir)
+	return cache
@@ -1,11 +1,16 @@
 """Verification helpers for layout checking and feature extraction."""
 
+from glayout.verification.batch import VerificationJob, run_verification_batch
 from glayout.verification.evaluator_wrapper import run_evaluation
+from glayout.verification.magic_session import MagicSessionPool
 from glayout.verification.physical_features import run_physical_feature_extraction
 from glayout.verification.verification import run_verification
 
 __all__ = [
+    "MagicSessionPool",
+    "VerificationJob",
     "run_evaluation",
     "run_physical_feature_extraction",
     "run_verification",
+    "run_verification_batch",
 ]
@@ -0,0 +1,243 @@
+"""
+usage: from glayout.verification.batch import VerificationJob, run_verification_batch
+runs magic DRC and netgen LVS on many designs at once.
+Every job runs in its own temporary directory with its own environment (nothing is written to the
+current working directory and os.environ is never modified), so jobs can safely run concurrently.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from gdsfactory.typings import PathType
+
+from glayout.pdk.mappedpdk import (
+    lvs_netgen_cache_key,
+    magic_drc_cache_key,
+    magic_drc_commands,
+    magic_lvs_script,
+    modify_design_name_in_cdl,
+    write_spice,
+)
+from glayout.util.drc_reports import summarize_magic_drc_report
+from glayout.util.verification_cache import VerificationCache, get_verification_cache, verification_cache_enabled
+from glayout.verification.verification import parse_lvs_report
+
+
+@dataclass(frozen=True)
+class VerificationJob:
+    """one design to verify
+    gds: path to the gds file (the top cell must be named design_name)
+    netlist: path to a .cdl/.spice file or the netlist string, LVS is skipped if None
+    design_name: name of the top cell / subckt
+    timeout: seconds allowed for the whole job (DRC + LVS), overrides the batch timeout
+    """
+    gds: PathType
+    netlist: Optional[Union[PathType, str]]
+    design_name: str
+    timeout: Optional[float] = None
+
+
+class _JobTimeout(Exception):
+    pass
+
+
+def _new_result(report_path: Optional[str] = None) -> dict:
+    return {"status": "not run", "is_pass": False, "report_path": report_path, "summary": {}}
+
+
+def _run_tool(cmd: list, deadline: Optional[float], workdir: Path, env: dict, stdin=subprocess.DEVNULL) -> subprocess.CompletedProcess:
+    """runs cmd inside workdir, killing it if the job deadline is reached"""
+    timeout = None
+    if deadline is not None:
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise _JobTimeout()
+    try:
+        return subprocess.run(cmd, cwd=workdir, env=env, stdin=stdin, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired as e:
+        raise _JobTimeout() from e
+
+
+def _publish_report(report: Path, output_dir: Optional[PathType], kind: str, design_name: str) -> Optional[str]:
+    """copies report to {output_dir}/{kind}/{design_name}/ (same layout as drc_magic and lvs_netgen)"""
+    if output_dir is None or not report.is_file():
+        return None
+    path_to_dir = Path(output_dir).resolve() / kind / design_name
+    path_to_dir.mkdir(parents=True, exist_ok=True)
+    return str(shutil.copy(report, path_to_dir / report.name))
+
+
+def _job_drc(job: VerificationJob, pdk, workdir: Path, env: dict, deadline: Optional[float], magic: str, output_dir: Optional[PathType], cache: Optional[VerificationCache]) -> dict:
+    result = _new_result()
+    gds_path = workdir / f"{job.design_name}.gds"
+    shutil.copy(job.gds, gds_path)
+    report = workdir / f"{job.design_name}.rpt"
+    cache_key = magic_drc_cache_key(pdk.name, job.design_name, gds_path, pdk.pdk_files["magic_drc_file"]) if cache else None
+    cached = cache.get(cache_key) if cache else None
+    if cached is not None and cache.restore(cached, workdir):
+        summary = cached["result"]["summary"]
+    else:
+        magic_cmd_file = workdir / "magic_commands.tcl"
+        magic_cmd_file.write_text(magic_drc_commands())
+        proc = _run_tool([magic, "-rcfile", str(pdk.pdk_files["magic_drc_file"]), "-noconsole", "-dnull", str(magic_cmd_file)], deadline, workdir, env)
+        if not report.is_file():
+            result["status"] = f"error: DRC report file not found (magic exited with {proc.returncode})"
+            return result
+        summary = summarize_magic_drc_report(report)
+        if cache and proc.returncode == 0:
+            cache.put(cache_key, {"subproc_code": proc.returncode, "summary": summary}, files=[report])
+    result.update({"summary": summary, "is_pass": summary["is_pass"], "status": "pass" if summary["is_pass"] else "fail"})
+    result["report_path"] = _publish_report(report, output_dir, "drc", job.design_name)
+    return result
+
+
+def _job_lvs(job: VerificationJob, pdk, workdir: Path, env: dict, deadline: Optional[float], magic: str, netgen: str, output_dir: Optional[PathType], cache: Optional[VerificationCache], extraction_level: str) -> dict:
+    result = _new_result()
+    design_name = job.design_name
+    gds_path = workdir / f"{design_name}.gds"
+    if not gds_path.is_file():
+        shutil.copy(job.gds, gds_path)
+    netlist_cdl = workdir / f"{design_name}.cdl"
+    netlist = str(job.netlist)
+    if netlist.endswith(".cdl") or netlist.endswith(".spice"):
+        shutil.copy(netlist, netlist_cdl)
+    else:
+        netlist_cdl.write_text(netlist)
+    modify_design_name_in_cdl(str(netlist_cdl), design_name)
+    spice_path = workdir / f"{design_name}.spice"
+    write_spice(pdk.name, str(netlist_cdl), str(spice_path), pdk.pdk_files["lvs_schematic_ref_file"])
+    lvsmag_path = workdir / f"{design_name}_lvsmag.spice"
+    sim_path = workdir / f"{design_name}_sim.spice"
+    pex_path = workdir / f"{design_name}_pex.spice"
+    report = workdir / f"{design_name}_lvs.rpt"
+    rule_files = [pdk.pdk_files["magic_drc_file"], pdk.pdk_files["lvs_setup_tcl_file"], pdk.pdk_files["lvs_schematic_ref_file"]]
+    cache_key = lvs_netgen_cache_key(pdk.name, design_name, gds_path, spice_path, rule_files, extraction_level) if cache else None
+    cached = cache.get(cache_key) if cache else None
+    if cached is not None and cache.restore(cached, workdir):
+        summary = cached["result"]["summary"]
+    else:
+        magic_script = workdir / "lvs_magic_script.tcl"
+        magic_script.write_text(magic_lvs_script(design_name, gds_path, lvsmag_path, sim_path, pex_path, extraction_level))
+        with open(magic_script, "r") as stdin:
+            magic_proc = _run_tool([magic, "-rcfile", str(pdk.pdk_files["magic_drc_file"]), "-noconsole", "-dnull"], deadline, workdir, env, stdin=stdin)
+        if magic_proc.returncode != 0:
+            result["status"] = f"error: magic exited with {magic_proc.returncode}"
+            return result
+        netgen_cmd = [netgen, "-batch", "lvs", f"{lvsmag_path} {design_name}", f"{spice_path} {design_name}", str(pdk.pdk_files["lvs_setup_tcl_file"]), str(report)]
+        netgen_proc = _run_tool(netgen_cmd, deadline, workdir, env)
+        if not report.is_file():
+            result["status"] = f"error: LVS report not found (netgen exited with {netgen_proc.returncode})"
+            return result
+        summary = parse_lvs_report(report.read_text())
+        if cache and netgen_proc.returncode == 0:
+            cache.put(
+                cache_key,
+                {"magic_subproc_code": magic_proc.returncode, "netgen_subproc_code": netgen_proc.returncode, "summary": summary},
+                files=[report, lvsmag_path, sim_path, pex_path],
+            )
+    result.update({"summary": summary, "is_pass": summary["is_pass"], "status": "pass" if summary["is_pass"] else "fail"})
+    result["report_path"] = _publish_report(report, output_dir, "lvs", design_name)
+    return result
+
+
+def run_verification_job(
+    job: VerificationJob,
+    pdk,
+    run_drc: bool = True,
+    run_lvs: bool = True,
+    timeout: Optional[float] = None,
+    output_dir: Optional[PathType] = None,
+    magic: str = "magic",
+    netgen: str = "netgen",
+    use_cache: Optional[bool] = None,
+    extraction_level: str = "lvs",
+) -> dict:
+    """runs DRC and LVS for a single job in an isolated temporary directory.
+    returns the same structure as run_verification ({"drc": {...}, "lvs": {...}}) plus the elapsed time in seconds.
+    a job which runs past its timeout has the status "timeout" for the check that was running and every check after it
+    checks already run on identical inputs are answered from the verification cache (see glayout.util.verification_cache)
+    """
+    start = time.monotonic()
+    timeout = job.timeout if job.timeout is not None else timeout
+    deadline = None if timeout is None else start + timeout
+    results = {"drc": _new_result(), "lvs": _new_result()}
+    cache = get_verification_cache() if verification_cache_enabled(use_cache) else None
+    env = dict(os.environ)
+    env.update({"PDK_ROOT": str(pdk.pdk_files["pdk_root"]), "DESIGN_NAME": job.design_name})
+    with tempfile.TemporaryDirectory(prefix=f"glayout_{job.design_name}_") as temp_dir:
+        workdir = Path(temp_dir).resolve()
+        env.update({"REPORTS_DIR": str(workdir), "RESULTS_DIR": str(workdir)})
+        checks = list()
+        if run_drc:
+            checks.append(("drc", lambda: _job_drc(job, pdk, workdir, env, deadline, magic, output_dir, cache)))
+        if run_lvs and job.netlist is not None:
+            checks.append(("lvs", lambda: _job_lvs(job, pdk, workdir, env, deadline, magic, netgen, output_dir, cache, extraction_level)))
+        for i, (check, run_check) in enumerate(checks):
+            try:
+                results[check] = run_check()
+            except _JobTimeout:
+                for remaining, _ in checks[i:]:
+                    results[remaining]["status"] = "timeout"
+                break
+            except Exception as e:
+                results[check]["status"] = f"error: {e}"
+    results["elapsed"] = time.monotonic() - start
+    return results
+
+
+def run_verification_batch(
+    jobs: Iterable[Union[VerificationJob, tuple]],
+    pdk=None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    run_drc: bool = True,
+    run_lvs: bool = True,
+    output_dir: Optional[PathType] = None,
+    magic: str = "magic",
+    netgen: str = "netgen",
+    use_cache: Optional[bool] = None,
+    extraction_level: str = "lvs",
+) -> Iterator[tuple[VerificationJob, dict]]:
+    """runs DRC and LVS on many designs concurrently and yields (job, results) as soon as each job finishes.
+    jobs: VerificationJob or (gds, netlist, design_name) tuples. jobs is consumed lazily, at most 2*max_workers are queued
+    pdk: MappedPDK providing the magicrc, lvs setup and schematic reference files (defaults to sky130)
+    max_workers: number of jobs running at the same time (defaults to the cpu count)
+    timeout: seconds allowed per job, jobs which run past it are killed and reported with status "timeout"
+    output_dir: if provided, reports are copied to {output_dir}/drc/{design_name}/ and {output_dir}/lvs/{design_name}/
+    magic, netgen: executables to run (looked up on PATH)
+    use_cache: reuse results of identical earlier runs, None = GLAYOUT_VERIFICATION_CACHE (on by default)
+    extraction_level: magic extraction for LVS (see MappedPDK.lvs_netgen), only the LVS netlist by default since only the verdict is reported
+    results are in completion order, not submission order
+    """
+    if pdk is None:
+        from glayout import sky130 as pdk
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    job_iter = iter(jobs)
+    pending: dict[Future, VerificationJob] = dict()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit_next() -> bool:
+            job = next(job_iter, None)
+            if job is None:
+                return False
+            if not isinstance(job, VerificationJob):
+                job = VerificationJob(*job)
+            future = executor.submit(run_verification_job, job, pdk, run_drc, run_lvs, timeout, output_dir, magic, netgen, use_cache, extraction_level)
+            pending[future] = job
+            return True
+
+        while len(pending) < 2 * max_workers and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = pending.pop(future)
+                submit_next()
+                yield job, future.result()
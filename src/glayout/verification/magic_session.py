@@ -0,0 +1,265 @@
+"""
+usage: from glayout.verification.magic_session import MagicSessionPool
+keeps magic interpreters running and feeds them DRC checks over stdin, so the tech file and magicrc are loaded
+once per worker instead of once per design (which dominates the runtime of drc_magic on small cells).
+"""
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from gdsfactory.typings import PathType
+
+from glayout.pdk.mappedpdk import magic_drc_cache_key, magic_drc_report_proc, magic_drc_setup_commands
+from glayout.util.drc_reports import summarize_magic_drc_report
+from glayout.util.verification_cache import get_verification_cache, verification_cache_enabled
+from glayout.verification.batch import VerificationJob
+
+
+DONE_MARKER = "__GLAYOUT_DONE__"
+BLANK_CELL = "__glayout_blank__"
+
+
+class MagicSessionError(RuntimeError):
+    """the magic process died or stopped answering, the session is closed and can not be reused"""
+
+
+class MagicSession:
+    """one long running magic -dnull -noconsole process.
+    the magicrc (and with it the tech file) and the report proc are loaded once, then every check() sends
+    gds read / load / drc check for a single design and waits for a marker printed after the commands.
+    cells are deleted between checks so designs with the same cell names do not collide.
+    """
+
+    def __init__(self, magicrc: PathType, pdk_root: Optional[PathType] = None, magic: str = "magic") -> None:
+        self.workdir = Path(tempfile.mkdtemp(prefix="glayout_magic_session_")).resolve()
+        env = dict(os.environ)
+        if pdk_root is not None:
+            env["PDK_ROOT"] = str(pdk_root)
+        self.proc = subprocess.Popen(
+            [magic, "-rcfile", str(magicrc), "-noconsole", "-dnull"],
+            cwd=self.workdir,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self.checks = 0
+        self._count = 0
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+        self._send(magic_drc_setup_commands() + "\n" + magic_drc_report_proc())
+
+    def _read_stdout(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _send(self, commands: str) -> None:
+        try:
+            self.proc.stdin.write(commands)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            self.close()
+            raise MagicSessionError(f"magic exited with {self.proc.poll()}") from e
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def check(self, gds: PathType, design_name: str, report_path: PathType, timeout: Optional[float] = None) -> tuple[bool, str]:
+        """runs DRC on design_name from gds and writes the report to report_path.
+        returns (ok, output) where ok is False if magic reported a tcl error, raises TimeoutError or MagicSessionError
+        (and closes the session) if magic does not answer within timeout seconds or exits
+        """
+        self._count += 1
+        token = f"{os.getpid()}_{id(self)}_{self._count}"
+        self._send(
+            f"""
+load {BLANK_CELL} -silent
+foreach glayout_cell [cellname list allcells] {{
+    if {{$glayout_cell != "{BLANK_CELL}"}} {{catch {{cellname delete $glayout_cell -noprompt}}}}
+}}
+set glayout_status [catch {{
+    gds read {{{gds}}}
+    custom_drc_save_report {{{design_name}}} {{{report_path}}}
+}} glayout_err]
+puts stdout "{DONE_MARKER} {token} $glayout_status"
+flush stdout
+"""
+        )
+        deadline = None if timeout is None else time.monotonic() + timeout
+        output = list()
+        while True:
+            try:
+                line = self._lines.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.close(kill=True)
+                raise TimeoutError(f"magic did not finish {design_name} within {timeout}s")
+            if line is None:
+                self.close(kill=True)
+                raise MagicSessionError(f"magic exited with {self.proc.poll()} while checking {design_name}")
+            if line.startswith(f"{DONE_MARKER} {token} "):
+                self.checks += 1
+                return line.split()[-1] == "0", "".join(output)
+            output.append(line)
+
+    def close(self, kill: bool = False) -> None:
+        """stops magic (kill: without waiting for it to quit) and removes the working directory"""
+        if kill and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write("quit -noprompt\n")
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            except (BrokenPipeError, OSError, ValueError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class MagicSessionPool:
+    """a pool of warm magic sessions for DRC on many designs.
+    pdk: MappedPDK providing the magicrc and pdk_root (defaults to sky130)
+    size: number of magic processes (defaults to the cpu count), started lazily
+    timeout: seconds allowed per design, a session which runs past it is killed and replaced
+    recycle_after: restart a session after this many checks to bound memory growth, None = never
+    magic: executable to run (looked up on PATH)
+    use_cache: reuse results of identical earlier runs, None = GLAYOUT_VERIFICATION_CACHE (on by default)
+
+    with MagicSessionPool(sky130, size=8) as pool:
+        for design_name, result in pool.run([(gds, design_name), ...], output_dir="./reports"):
+            ...
+    """
+
+    def __init__(
+        self,
+        pdk=None,
+        size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        recycle_after: Optional[int] = 500,
+        magic: str = "magic",
+        magicrc: Optional[PathType] = None,
+        use_cache: Optional[bool] = None,
+    ) -> None:
+        if pdk is None:
+            from glayout import sky130 as pdk
+        self.pdk = pdk
+        self.size = size or os.cpu_count() or 1
+        if self.size < 1:
+            raise ValueError("size must be at least 1")
+        self.timeout = timeout
+        self.recycle_after = recycle_after
+        self.magic = magic
+        self.magicrc = magicrc or pdk.pdk_files["magic_drc_file"]
+        self.cache = get_verification_cache() if verification_cache_enabled(use_cache) else None
+        self.restarts = 0
+        self._idle: "queue.LifoQueue[Optional[MagicSession]]" = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)
+        self._sessions: list[MagicSession] = list()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "MagicSessionPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _start_session(self) -> MagicSession:
+        session = MagicSession(self.magicrc, self.pdk.pdk_files["pdk_root"], self.magic)
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def _release(self, session: Optional[MagicSession]) -> None:
+        if session is not None and (not session.alive or (self.recycle_after is not None and session.checks >= self.recycle_after)):
+            session.close()
+            with self._lock:
+                if session in self._sessions:
+                    self._sessions.remove(session)
+            session = None
+        self._idle.put(session)
+
+    def _check(self, gds: PathType, design_name: str, result: dict, report_dest: Path) -> bool:
+        """runs the check in the next free session (starting one if needed) and moves the report to report_dest"""
+        session = self._idle.get()
+        try:
+            if session is None:
+                session = self._start_session()
+            report = session.workdir / f"{design_name}.rpt"
+            report.unlink(missing_ok=True)
+            try:
+                ok, output = session.check(Path(gds).resolve(), design_name, report, self.timeout)
+            except TimeoutError:
+                with self._lock:
+                    self.restarts += 1
+                result["status"] = "timeout"
+                return False
+            except MagicSessionError as e:
+                with self._lock:
+                    self.restarts += 1
+                result["status"] = f"error: {e}"
+                return False
+            if not ok or not report.is_file():
+                result["status"] = f"error: magic could not check {design_name}: {output.strip()[-500:]}"
+                return False
+            shutil.move(report, report_dest)
+            return True
+        finally:
+            self._release(session)
+
+    def drc(self, gds: PathType, design_name: str, output_dir: Optional[PathType] = None) -> dict:
+        """runs DRC on one design in the next free session.
+        returns the same structure as run_verification()["drc"]: status, is_pass, report_path, summary
+        """
+        result = {"status": "not run", "is_pass": False, "report_path": None, "summary": {}}
+        cache_key = magic_drc_cache_key(self.pdk.name, design_name, gds, self.magicrc) if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = Path(temp_dir) / f"{design_name}.rpt"
+            if cached is not None and output_dir is not None and not self.cache.restore(cached, temp_dir):
+                cached = None
+            if cached is not None:
+                summary = cached["result"]["summary"]
+            else:
+                if not self._check(gds, design_name, result, report):
+                    return result
+                summary = summarize_magic_drc_report(report)
+                if self.cache:
+                    self.cache.put(cache_key, {"subproc_code": 0, "summary": summary}, files=[report])
+            result.update({"summary": summary, "is_pass": summary["is_pass"], "status": "pass" if summary["is_pass"] else "fail"})
+            if output_dir is not None and report.is_file():
+                path_to_dir = Path(output_dir).resolve() / "drc" / design_name
+                path_to_dir.mkdir(parents=True, exist_ok=True)
+                result["report_path"] = str(shutil.copy(report, path_to_dir / report.name))
+        return result
+
+    def run(self, designs: Iterable[tuple], output_dir: Optional[PathType] = None) -> Iterator[tuple[str, dict]]:
+        """runs DRC on (gds, design_name) pairs (or VerificationJob) using every session of the pool
+        and yields (design_name, result) in the order of designs
+        """
+        def check(design) -> tuple[str, dict]:
+            gds, design_name = (design.gds, design.design_name) if isinstance(design, VerificationJob) else design
+            return design_name, self.drc(gds, design_name, output_dir)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            yield from executor.map(check, designs)
+
+    def close(self) -> None:
+        """stops every magic process of the pool"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, list()
+        for session in sessions:
+            session.close()
@@ -4,8 +4,11 @@ import re
 import subprocess
 import shutil
 from pathlib import Path
+from typing import Optional
 from gdsfactory.typings import Component
 from gdsfactory.geometry.boolean import boolean
+from glayout.util.spice_reader import summarize_parasitics
+from glayout.util.symmetry import raster_symmetry
 
 # Get the path to run_pex.sh in the evaluator_box directory
 _EVALUATOR_BOX_DIR = Path(__file__).parent
@@ -33,8 +36,21 @@ def _mirror_and_xor(component: Component, axis: str) -> float:
     asymmetry_layout = boolean(A=comp_copy, B=mirrored_ref, operation="xor")
     return float(asymmetry_layout.area())
 
-def calculate_symmetry_scores(component: Component) -> tuple[float, float]:
-    """Calculates horizontal and vertical symmetry scores (1.0 = perfect symmetry)."""
+def calculate_layer_symmetry_scores(component: Component, resolution: Optional[float] = None) -> dict:
+    """Raster symmetry scores of the component, merged and per layer (see glayout.util.symmetry.raster_symmetry)."""
+    return raster_symmetry(component.get_polygons(by_spec=True, as_array=True), resolution)
+
+def calculate_symmetry_scores(component: Component, method: str = "raster", resolution: Optional[float] = None) -> tuple[float, float]:
+    """Calculates horizontal and vertical symmetry scores (1.0 = perfect symmetry).
+
+    method "raster" measures the mirror XOR on a raster snapped to resolution (um, default the 5nm grid),
+    "boolean" uses exact polygon booleans, which get slow on large layouts.
+    """
+    if method == "raster":
+        scores = calculate_layer_symmetry_scores(component, resolution)
+        return scores["horizontal"], scores["vertical"]
+    if method != "boolean":
+        raise ValueError(f"unknown symmetry method {method!r}, use 'raster' or 'boolean'")
     original_area = calculate_area(component)
     if original_area == 0:
         return (1.0, 1.0)
@@ -48,41 +64,22 @@ def calculate_symmetry_scores(component: Component) -> tuple[float, float]:
 
 def _parse_simple_parasitics(component_name: str) -> tuple[float, float]:
     """Parses total parasitic R and C from a SPICE file by simple summation."""
-    total_resistance = 0.0
-    total_capacitance = 0.0
+    summary = _summarize_parasitics(component_name)
+    if summary is None:
+        return 0.0, 0.0
+    return summary["total_resistance"], summary["total_capacitance"]
+
+def _summarize_parasitics(component_name: str) -> Optional[dict]:
+    """Streams the PEX SPICE file of the component (see glayout.util.spice_reader), None if it does not exist."""
     spice_file_path = f"{component_name}_pex.spice"
     if not os.path.exists(spice_file_path):
-        return 0.0, 0.0
-    with open(spice_file_path, 'r') as f:
-        for line in f:
-            orig_line = line.strip()  # Keep original case for capacitor parsing
-            line = line.strip().upper()
-            parts = line.split()
-            orig_parts = orig_line.split()  # Original case parts for capacitor values
-            if not parts: continue
-            
-            name = parts[0]
-            if name.startswith('R') and len(parts) >= 4:
-                try: total_resistance += float(parts[3])
-                except (ValueError): continue
-            elif name.startswith('C') and len(parts) >= 4:
-                try:
-                    cap_str = orig_parts[3]  # Use original case for capacitor value
-                    unit = cap_str[-1]
-                    val_str = cap_str[:-1]
-                    if unit == 'F': cap_value = float(val_str) * 1e-15
-                    elif unit == 'P': cap_value = float(val_str) * 1e-12
-                    elif unit == 'N': cap_value = float(val_str) * 1e-9
-                    elif unit == 'U': cap_value = float(val_str) * 1e-6
-                    elif unit == 'f': cap_value = float(val_str) * 1e-15  # femtofarads
-                    else: cap_value = float(cap_str)
-                    total_capacitance += cap_value
-                except (ValueError): continue
-    return total_resistance, total_capacitance
+        return None
+    return summarize_parasitics(spice_file_path)
 
-def run_physical_feature_extraction(layout_path: str, component_name: str, top_level: Component) -> dict:
+def run_physical_feature_extraction(layout_path: str, component_name: str, top_level: Component, symmetry_resolution: Optional[float] = None) -> dict:
     """
     Runs PEX and calculates geometric features, returning a structured result.
+    symmetry_resolution is the raster pitch (um) of the symmetry scores, None = the 5nm grid.
     """
     physical_results = {
         "pex": {"status": "not run", "total_resistance_ohms": 0.0, "total_capacitance_farads": 0.0},
@@ -101,9 +98,14 @@ def run_physical_feature_extraction(layout_path: str, component_name: str, top_l
         os.chmod(_RUN_PEX_SCRIPT, 0o755)
         subprocess.run([str(_RUN_PEX_SCRIPT), layout_path, component_name], check=True, capture_output=True, text=True)
         physical_results["pex"]["status"] = "PEX Complete"
-        total_res, total_cap = _parse_simple_parasitics(component_name)
-        physical_results["pex"]["total_resistance_ohms"] = total_res
-        physical_results["pex"]["total_capacitance_farads"] = total_cap
+        summary = _summarize_parasitics(component_name)
+        if summary is not None:
+            physical_results["pex"]["total_resistance_ohms"] = summary["total_resistance"]
+            physical_results["pex"]["total_capacitance_farads"] = summary["total_capacitance"]
+            physical_results["pex"]["nets"] = {
+                net: {"resistance_ohms": float(r), "capacitance_farads": float(c), "device_terminals": int(d)}
+                for net, r, c, d in zip(summary["nets"], summary["resistance"], summary["capacitance"], summary["device_terminals"])
+            }
     except subprocess.CalledProcessError as e:
         physical_results["pex"]["status"] = f"PEX Error: {e.stderr}"
     except FileNotFoundError as e:
@@ -114,9 +116,13 @@ def run_physical_feature_extraction(layout_path: str, component_name: str, top_l
     # Geometric Features
     try:
         physical_results["geometric"]["raw_area_um2"] = calculate_area(top_level)
-        sym_h, sym_v = calculate_symmetry_scores(top_level)
-        physical_results["geometric"]["symmetry_score_horizontal"] = sym_h
-        physical_results["geometric"]["symmetry_score_vertical"] = sym_v
+        symmetry = calculate_layer_symmetry_scores(top_level, symmetry_resolution)
+        physical_results["geometric"]["symmetry_score_horizontal"] = symmetry["horizontal"]
+        physical_results["geometric"]["symmetry_score_vertical"] = symmetry["vertical"]
+        physical_results["geometric"]["symmetry_scores_by_layer"] = {
+            f"{layer}/{datatype}": {"horizontal": scores["horizontal"], "vertical": scores["vertical"]}
+            for (layer, datatype), scores in symmetry["layers"].items()
+        }
     except Exception as e:
         print(f"Warning: Could not calculate geometric features. Error: {e}")
 
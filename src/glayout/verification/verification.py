@@ -6,33 +6,16 @@ import shutil
 import tempfile
 import sys
 from pathlib import Path
-from glayout import MappedPDK, sky130,gf180
+from typing import Optional
+from glayout.util.drc_reports import summarize_magic_drc_report
 from gdsfactory.typings import Component
 
 def parse_drc_report(report_content: str) -> dict:
     """
     Parses a Magic DRC report into a machine-readable format.
+    For large report files use glayout.util.drc_reports.summarize_magic_drc_report, which streams the file.
     """
-    errors = []
-    current_rule = ""
-    for line in report_content.strip().splitlines():
-        stripped_line = line.strip()
-        if stripped_line == "----------------------------------------":
-            continue
-        if re.match(r"^[a-zA-Z]", stripped_line):
-            current_rule = stripped_line
-        elif re.match(r"^[0-9]", stripped_line):
-            errors.append({"rule": current_rule, "details": stripped_line})
-    
-    is_pass = len(errors) == 0
-    if not is_pass and re.search(r"count:\s*0\s*$", report_content, re.IGNORECASE):
-        is_pass = True
-
-    return {
-        "is_pass": is_pass,
-        "total_errors": len(errors),
-        "error_details": errors
-    }
+    return summarize_magic_drc_report(report_content.splitlines())
 
 def parse_lvs_report(report_content: str) -> dict:
     """
@@ -130,13 +113,16 @@ def parse_lvs_report(report_content: str) -> dict:
 
     return summary
 
-def run_verification(layout_path: str, component_name: str, top_level: Component) -> dict:
+def run_verification(layout_path: str, component_name: str, top_level: Component, use_cache: Optional[bool] = None) -> dict:
     """
     Runs DRC and LVS checks and returns a structured result dictionary.
+    use_cache: reuse DRC/LVS results of identical earlier runs (None = GLAYOUT_VERIFICATION_CACHE, on by default)
     Note: PDK functions create directory structures:
       - DRC: {output_dir}/drc/{design_name}/{design_name}.rpt
       - LVS: {output_dir}/lvs/{design_name}/{design_name}_lvs.rpt
     """
+    from glayout import sky130
+
     verification_results = {
         "drc": {"status": "not run", "is_pass": False, "report_path": None, "summary": {}},
         "lvs": {"status": "not run", "is_pass": False, "report_path": None, "summary": {}}
@@ -151,12 +137,8 @@ def run_verification(layout_path: str, component_name: str, top_level: Component
         # Clean up existing directory if present
         if os.path.exists(drc_output_dir):
             shutil.rmtree(drc_output_dir)
-        sky130.drc_magic(layout_path, component_name, output_file=drc_output_dir)
-        report_content = ""
-        if os.path.exists(drc_actual_report):
-            with open(drc_actual_report, 'r') as f:
-                report_content = f.read()
-        summary = parse_drc_report(report_content)
+        # drc_magic returns the parsed report (also on a cache hit)
+        summary = sky130.drc_magic(layout_path, component_name, output_file=drc_output_dir, use_cache=use_cache)["summary"]
         verification_results["drc"].update({"summary": summary, "is_pass": summary["is_pass"], "status": "pass" if summary["is_pass"] else "fail"})
     except Exception as e:
         verification_results["drc"]["status"] = f"error: {e}"
@@ -170,12 +152,7 @@ def run_verification(layout_path: str, component_name: str, top_level: Component
         # Clean up existing directory if present
         if os.path.exists(lvs_output_dir):
             shutil.rmtree(lvs_output_dir)
-        sky130.lvs_netgen(layout=top_level, design_name=component_name, output_file_path=lvs_output_dir)
-        report_content = ""
-        if os.path.exists(lvs_actual_report):
-            with open(lvs_actual_report, 'r') as report_file:
-                report_content = report_file.read()
-        lvs_summary = parse_lvs_report(report_content)
+        lvs_summary = sky130.lvs_netgen(layout=top_level, design_name=component_name, output_file_path=lvs_output_dir, use_cache=use_cache)["summary"]
         verification_results["lvs"].update({"summary": lvs_summary, "is_pass": lvs_summary["is_pass"], "status": "pass" if lvs_summary["is_pass"] else "fail"})
     except Exception as e:
         verification_results["lvs"]["status"] = f"error: {e}"
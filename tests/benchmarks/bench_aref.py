@@ -0,0 +1,92 @@
+"""GDS size, stored polygons and write time of via fields and mimcap arrays, flattened versus kept as one AREF.
+
+prec_array places its elements with one array reference (a GDS AREF) when the pitch is on grid. The flattened mode
+(the default) expands it into one polygon per element as before, with GLAYOUT_PRESERVE_HIERARCHY (set_preserve_hierarchy)
+the AREF is written as is. Every cell is built in both modes, written to a temporary GDS and read back: the GDS size,
+the number of polygons stored in the file, the write time and the build time are reported, and the flattened geometry
+of both files is checked to be the same. Cells are built with --port-visibility public by default (the element ports
+stay lazy), with "all" the build time is dominated by copying the ports of every via.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_aref.py [--vias 20 100 300] [--caps 4 10] [--port-visibility public]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+import gdstk
+from gdsfactory.cell import clear_cache
+from glayout import sky130, via_array
+from glayout.primitives.mimcap import mimcap_array
+from glayout.util.component_cache import clear_component_cache
+from glayout.util.port_visibility import set_port_visibility
+from glayout.util.snap_to_grid import set_preserve_hierarchy
+
+MODES = {"flat": False, "aref": True}
+
+
+def measure(function, preserve_hierarchy: bool, directory: str) -> dict:
+    set_preserve_hierarchy(preserve_hierarchy)
+    clear_cache()
+    clear_component_cache()
+    start = time.perf_counter()
+    cell = function()
+    build = time.perf_counter() - start
+    path = os.path.join(directory, f"{cell.name}_{int(preserve_hierarchy)}.gds")
+    start = time.perf_counter()
+    cell.write_gds(path)
+    write = time.perf_counter() - start
+    library = gdstk.read_gds(path)
+    top = library.top_level()[0]
+    digest = hashlib.sha1()
+    for polygon in sorted(tuple(polygon.points.round(4).ravel()) + (polygon.layer, polygon.datatype) for polygon in top.get_polygons()):
+        digest.update(repr(polygon).encode())
+    return {
+        "size": os.path.getsize(path),
+        "polygons": sum(len(library_cell.polygons) for library_cell in library.cells),
+        "build": build,
+        "write": write,
+        "hash": digest.hexdigest(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vias", type=int, nargs="*", default=[20, 100, 300])
+    parser.add_argument("--caps", type=int, nargs="*", default=[4, 10])
+    parser.add_argument("--port-visibility", choices=["all", "public"], default="public")
+    args = parser.parse_args()
+
+    set_port_visibility(args.port_visibility)
+
+    cells = [(f"via field {n}x{n}", lambda n=n: via_array(sky130, "met1", "met2", num_vias=(n, n))) for n in args.vias]
+    cells += [(f"mimcap array {n}x{n}", lambda n=n: mimcap_array(sky130, n, n)) for n in args.caps]
+    print(f"{'cell':<20} {'mode':<5} {'gds size':>11} {'polygons':>9} {'write':>9} {'build':>8}  geometry")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, function in cells:
+            results = dict()
+            for mode, preserve_hierarchy in MODES.items():
+                results[mode] = result = measure(function, preserve_hierarchy, directory)
+                note = "" if mode == "flat" else ("same" if result["hash"] == results["flat"]["hash"] else "DIFFERENT")
+                print(f"{name:<20} {mode:<5} {result['size']:>10}B {result['polygons']:>9} {result['write'] * 1e3:7.1f}ms {result['build']:7.2f}s  {note}")
+    set_preserve_hierarchy(False)
+
+
+if __name__ == "__main__":
+    main()
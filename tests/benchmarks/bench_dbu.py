@@ -0,0 +1,220 @@
+"""Per call cost of the precision helpers (integer dbu kernel versus the old Decimal code) and end to end build time.
+
+The old evaluate_bbox, prec_center, prec_array, to_float and MappedPDK.snap_to_2xgrid are copied below (to_decimal is
+unchanged, its copy is used by the old prec_center).
+Per call costs are measured on the raw functions (without the pydantic wrapper, which costs the same for both) and
+checked to return the same values. The end to end builds (--cells) run in a fresh interpreter each, once with the
+current helpers and once with the old ones patched in, and compare the resulting geometry. The `opamp` of this tree
+does not build (a netlist function is missing an argument), its time to the error is reported.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_dbu.py [--calls 20000] [--cells nmos diff_pair opamp]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from decimal import ROUND_UP, Decimal
+from pathlib import Path
+from typing import Iterable, Union
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+
+def legacy_evaluate_bbox(custom_comp, return_decimal=False, padding=0, layer=None):
+    from glayout.util.layer_bbox import layer_bbox
+
+    compbbox = layer_bbox(custom_comp, layer) if layer else custom_comp.bbox
+    width = abs(Decimal(str(compbbox[1][0])) - Decimal(str(compbbox[0][0]))) + 2*Decimal(str(padding))
+    height = abs(Decimal(str(compbbox[1][1])) - Decimal(str(compbbox[0][1]))) + 2*Decimal(str(padding))
+    if return_decimal:
+        return (width,height)
+    return (float(width),float(height))
+
+
+def legacy_to_decimal(elements):
+    if not isinstance(elements,Iterable):
+        return Decimal(str(elements))
+    else:
+        elements = list(elements)
+    for i, element in enumerate(elements):
+        if isinstance(element,Union[int,float]):
+            elements[i] = Decimal(str(element))
+    return elements
+
+
+def legacy_to_float(elements):
+    from gdsfactory.snap import snap_to_grid
+
+    if not isinstance(elements,Iterable):
+        return snap_to_grid(float(elements))
+    else:
+        elements = list(elements)
+    for i, element in enumerate(elements):
+        if isinstance(element, Union[float,Decimal]):
+            elements[i] = snap_to_grid(float(element))
+    return elements
+
+
+def legacy_prec_array(custom_comp, rows, columns, spacing, absolute_spacing=False, aref=True, private_ports=False):
+    # aref and private_ports (added after this copy) do not change the geometry, they are ignored
+    from gdsfactory.component import Component
+
+    precspacing = list(spacing)
+    for i in range(2):
+        if isinstance(spacing[i],Union[int,float]):
+            precspacing[i] = Decimal(str(spacing[i]))
+    if not absolute_spacing:
+        precspacing = [precspacing[i] + legacy_evaluate_bbox(custom_comp,True)[i] for i in range(2)]
+    precarray = Component()
+    for colnum in range(columns):
+        coldisp = colnum * precspacing[0]
+        for rownum in range(rows):
+            rowdisp = rownum * precspacing[1]
+            cref = precarray << custom_comp
+            cref.movex(legacy_to_float(coldisp)).movey(legacy_to_float(rowdisp))
+            precarray.add_ports(cref.get_ports_list(),prefix=f"row{rownum}_col{colnum}_")
+    return precarray.flatten()
+
+
+def legacy_prec_center(custom_comp, return_decimal=False):
+    correctmax = [dim/2 for dim in legacy_evaluate_bbox(custom_comp, True)]
+    currentmax = legacy_to_decimal((custom_comp.xmax,custom_comp.ymax))
+    correctionxy = [correctmax[i] - currentmax[i] for i in range(2)]
+    if return_decimal:
+        return correctionxy
+    return legacy_to_float(correctionxy)
+
+
+def legacy_snap_to_2xgrid(self, dims, return_type="float", snap4=False):
+    dims = dims if isinstance(dims, Iterable) else [dims]
+    dimtype_in = type(dims[0])
+    dims = [Decimal(str(dim)) for dim in dims]
+    grid = 2 * Decimal(str(self.grid_size))
+    grid = grid if grid else Decimal('0.001')
+    grid = 2*grid if snap4 else grid
+    snapped_dims = list()
+    for dim in dims:
+        snapped_dims.append(grid * (dim / grid).quantize(1, rounding=ROUND_UP))
+    if return_type=="float" or (return_type=="same" and dimtype_in==float):
+        snapped_dims = [float(snapped_dim) for snapped_dim in snapped_dims]
+    return snapped_dims[0] if len(snapped_dims)==1 else snapped_dims
+
+
+def install_legacy() -> None:
+    """patches the old helpers in before any generator module imports them"""
+    from glayout.pdk.mappedpdk import MappedPDK
+    import glayout.util.comp_utils as comp_utils
+
+    MappedPDK.snap_to_2xgrid = legacy_snap_to_2xgrid
+    for name in ("evaluate_bbox", "to_float", "prec_array", "prec_center"):
+        setattr(comp_utils, name, globals()[f"legacy_{name}"])
+
+
+def raw(function):
+    return getattr(function, "raw_function", function)
+
+
+def per_call(calls: int) -> None:
+    import random
+
+    from glayout import nmos, sky130
+    from glayout.pdk.mappedpdk import MappedPDK
+    from glayout.util import comp_utils
+
+    sky130.activate()
+    cell = nmos(sky130, fingers=2)
+    random.seed(0)
+    dims = [round(random.uniform(-20, 20), random.randint(0, 5)) for _ in range(calls)]
+    dims += [0.17 + 0.12 * (i % 9) for i in range(calls)]
+    cases = [
+        ("snap_to_2xgrid", lambda d: raw(MappedPDK.snap_to_2xgrid)(sky130, d), lambda d: legacy_snap_to_2xgrid(sky130, d), dims),
+        ("to_float", raw(comp_utils.to_float), legacy_to_float, dims),
+        ("evaluate_bbox", lambda _: raw(comp_utils.evaluate_bbox)(cell), lambda _: legacy_evaluate_bbox(cell), dims[: calls // 10]),
+        ("prec_center", lambda _: raw(comp_utils.prec_center)(cell), lambda _: legacy_prec_center(cell), dims[: calls // 10]),
+    ]
+    print(f"{'helper':<16} {'calls':>7} {'Decimal':>10} {'dbu':>10} {'speedup':>8}")
+    for name, new, old, inputs in cases:
+        start = time.perf_counter()
+        expected = [old(value) for value in inputs]
+        old_time = time.perf_counter() - start
+        start = time.perf_counter()
+        result = [new(value) for value in inputs]
+        new_time = time.perf_counter() - start
+        assert np.array_equal(np.asarray(result, dtype=float), np.asarray(expected, dtype=float)), name
+        print(f"{name:<16} {len(inputs):>7} {old_time / len(inputs) * 1e6:8.2f}us {new_time / len(inputs) * 1e6:8.2f}us {old_time / new_time:7.1f}x")
+    spacing = (0.34, 0.34)
+    for mode, array in (("Decimal", legacy_prec_array), ("dbu", raw(comp_utils.prec_array))):
+        start = time.perf_counter()
+        array(cell, 4, 4, spacing)
+        print(f"prec_array 4x4 ({mode}) {time.perf_counter() - start:.3f}s")
+
+
+def build(name: str, legacy: bool) -> None:
+    """child process: builds one cell and prints {time, geometry hash} or the error"""
+    if legacy:
+        install_legacy()
+    from glayout import sky130
+
+    start = time.perf_counter()
+    try:
+        if name == "nmos":
+            from glayout import nmos
+
+            cell = nmos(sky130, fingers=8, multipliers=2)
+        elif name == "diff_pair":
+            from glayout.cells.elementary.diff_pair import diff_pair
+
+            cell = diff_pair(sky130)
+        elif name == "opamp":
+            from glayout.cells.composite.opamp.opamp import opamp
+
+            cell = opamp(sky130)
+        else:
+            raise ValueError(f"unknown cell {name!r}")
+    except Exception as error:
+        print(json.dumps({"time": time.perf_counter() - start, "error": f"{type(error).__name__}: {error}"}))
+        return
+    elapsed = time.perf_counter() - start
+    digest = hashlib.sha1()
+    for layer, polygons in sorted(cell.get_polygons(by_spec=True).items()):
+        digest.update(repr((layer, sorted(tuple(p.round(4).ravel().tolist()) for p in polygons))).encode())
+    print(json.dumps({"time": elapsed, "hash": digest.hexdigest()}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--cells", nargs="*", default=["nmos", "diff_pair", "opamp"])
+    parser.add_argument("--build", help=argparse.SUPPRESS)
+    parser.add_argument("--legacy", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build:
+        build(args.build, args.legacy)
+        return
+    per_call(args.calls)
+    print(f"\n{'cell':<12} {'Decimal':>10} {'dbu':>10}  geometry")
+    for name in args.cells:
+        results = []
+        for legacy in (True, False):
+            command = [sys.executable, __file__, "--build", name] + (["--legacy"] if legacy else [])
+            output = subprocess.run(command, capture_output=True, text=True, cwd=REPO_ROOT).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        old, new = results
+        note = new.get("error") or old.get("error") or ("same" if old["hash"] == new["hash"] else "DIFFERENT")
+        print(f"{name:<12} {old['time']:9.2f}s {new['time']:9.2f}s  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Build time of via_stack, via_array, multiplier and tapring with a cold versus a filled derived-constants table.
+
+Every MappedPDK keeps a table of the geometry constants the generators derive from the grules (via stack layer sizes,
+via array pitch, metal separations, min device dims, tap width), filled on first use (MappedPDK.derived_constants).
+For every primitive the component caches are cleared and the cell is built --repeat times, once with the table of
+sky130 dropped before every build (cold, each constant is derived again as the generators did before the table) and
+once with the filled table (warm). The per lookup cost of every table entry against the rule arithmetic / via_stack
+bounding box it replaces is reported after that.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_derived_constants.py [--repeat 20] [--lookups 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+from gdsfactory.cell import clear_cache
+from glayout import sky130, via_array, via_stack
+from glayout.pdk import derived_constants as derived_constants_module
+from glayout.primitives.fet import multiplier
+from glayout.primitives.guardring import tapring
+from glayout.util.comp_utils import evaluate_bbox
+from glayout.util.component_cache import clear_component_cache
+
+PRIMITIVES = {
+    "via_stack": lambda: via_stack(sky130, "poly", "met4"),
+    "via_array": lambda: via_array(sky130, "active_diff", "met3", size=(4, 2)),
+    "multiplier": lambda: multiplier(sky130, "n+s/d", width=3, fingers=4),
+    "tapring": lambda: tapring(sky130, enclosed_rectangle=(6, 4)),
+}
+
+
+def _rules_max_separation() -> float:
+    return sky130.snap_to_2xgrid(max(sky130.get_grule_fast("met" + str(level))["min_separation"] for level in range(1, 6)))
+
+
+def _rules_tap_width() -> float:
+    return max(sky130.get_grule_fast("active_tap")["min_width"], 2 * sky130.get_grule_fast("active_tap", "mcon")["min_enclosure"] + sky130.get_grule_fast("mcon")["width"])
+
+
+# (entry, legacy computation, table lookup)
+LOOKUPS = [
+    ("via_stack_size", lambda: evaluate_bbox(via_stack(sky130, "active_diff", "met1"))[0], lambda: sky130.derived_constants.via_stack_size("active_diff", "met1")),
+    ("max_separation", _rules_max_separation, lambda: sky130.derived_constants.max_separation(["met1", "met2", "met3", "met4", "met5"])),
+    ("min_fet_width", lambda: max(sky130.get_grule_fast("poly")["min_width"], sky130.get_grule_fast("active_diff")["min_width"]), lambda: sky130.derived_constants.min_fet_width),
+    ("tap_width", _rules_tap_width, lambda: sky130.derived_constants.tap_width),
+]
+
+
+def build_time(function, repeat: int, cold: bool) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        clear_cache()
+        clear_component_cache()
+        if cold:
+            derived_constants_module._derived_constants_cache.clear()
+        start = time.perf_counter()
+        function()
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat
+
+
+def lookup_time(function, lookups: int) -> float:
+    start = time.perf_counter()
+    for _ in range(lookups):
+        function()
+    return (time.perf_counter() - start) / lookups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    sky130.activate()
+    for function in PRIMITIVES.values():
+        function()
+    print(f"{'primitive':<12} {'cold':>10} {'warm':>10} {'speedup':>8}")
+    for name, function in PRIMITIVES.items():
+        cold = build_time(function, args.repeat, cold=True)
+        warm = build_time(function, args.repeat, cold=False)
+        print(f"{name:<12} {cold * 1e3:8.2f}ms {warm * 1e3:8.2f}ms {cold / warm:7.2f}x")
+    print(f"\n{'entry':<16} {'rules':>10} {'table':>10} {'speedup':>8}  value")
+    for name, legacy, table in LOOKUPS:
+        if legacy() != table():
+            raise AssertionError(f"{name}: table value {table()} differs from the rules {legacy()}")
+        rules_time = lookup_time(legacy, args.lookups)
+        table_time = lookup_time(table, args.lookups)
+        print(f"{name:<16} {rules_time * 1e6:8.2f}us {table_time * 1e6:8.2f}us {rules_time / table_time:7.1f}x  {table()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare peak memory and runtime of the old whole-file DRC report parsing against the streaming parsers.
+
+Writes a synthetic magic .rpt and KLayout .lyrdb with --violations violations each, then measures
+parse_drc_report(read_text()) vs summarize_magic_drc_report(path) and ET.parse vs summarize_lyrdb (full scan and
+pass/fail only with error_budget=0). Peak memory is measured with tracemalloc.
+Run from the repository root:
+
+    python tests/benchmarks/bench_drc_reports.py [--violations 500000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.drc_reports import summarize_lyrdb, summarize_magic_drc_report
+
+SEPARATOR = "----------------------------------------"
+
+
+def write_magic_report(path: Path, violations: int, rules: int = 20) -> None:
+    with open(path, "w") as f:
+        f.write(f"top count: {violations}\n{SEPARATOR}\n")
+        for rule in range(rules):
+            f.write(f"rule {rule} spacing (m{rule}.1)\n{SEPARATOR}\n")
+            for i in range(violations // rules):
+                f.write(f" {i * 0.001:.3f}um 0.000um {i * 0.001 + 0.1:.3f}um 0.100um\n")
+            f.write(f"{SEPARATOR}\n")
+        f.write("\n")
+
+
+def write_lyrdb(path: Path, violations: int, rules: int = 20) -> None:
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<report-database>\n <description>DRC</description>\n <original-file/>\n')
+        f.write(" <generator/>\n <top-cell>top</top-cell>\n <tags/>\n <categories/>\n <cells/>\n <items>\n")
+        for i in range(violations):
+            f.write(
+                f"  <item><tags/><category>'m{i % rules}.1'</category><cell>top</cell><visited>false</visited>"
+                f"<multiplicity>1</multiplicity><values><value>box: ({i},0;{i + 100},100)</value></values></item>\n"
+            )
+        f.write(" </items>\n</report-database>\n")
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<50} {elapsed:8.2f}s {peak / 2**20:10.1f} MiB  -> {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--violations", type=int, default=500000)
+    args = parser.parse_args()
+    from glayout.verification.verification import parse_drc_report
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rpt = Path(tmpdir) / "top.rpt"
+        lyrdb = Path(tmpdir) / "top.lyrdb"
+        write_magic_report(rpt, args.violations)
+        write_lyrdb(lyrdb, args.violations)
+        print(f"rpt {rpt.stat().st_size / 2**20:.1f} MiB, lyrdb {lyrdb.stat().st_size / 2**20:.1f} MiB")
+        print(f"{'':<50} {'time':>9} {'peak':>14}")
+        measure("rpt: parse_drc_report(read_text())", lambda: parse_drc_report(rpt.read_text())["total_errors"])
+        measure("rpt: summarize_magic_drc_report(max_details=100)", lambda: summarize_magic_drc_report(rpt, max_details=100)["total_errors"])
+        measure("rpt: summarize_magic_drc_report(error_budget=0)", lambda: summarize_magic_drc_report(rpt, error_budget=0)["is_pass"])
+        measure("lyrdb: ET.parse + len(root[7])", lambda: len(ET.parse(lyrdb).getroot()[7]))
+        measure("lyrdb: summarize_lyrdb", lambda: summarize_lyrdb(lyrdb)["total_errors"])
+        measure("lyrdb: summarize_lyrdb(error_budget=0)", lambda: summarize_lyrdb(lyrdb, error_budget=0)["is_pass"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark MappedPDK.get_grule (validated) against the compiled rule table.
+
+Run from the repository root:
+
+    python tests/benchmarks/bench_get_grule.py [--calls N]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+import timeit
+import warnings
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional, Union
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+from pydantic import StrictStr, validate_arguments
+from glayout.pdk.compiled_grules import CompiledGRules
+from glayout.pdk.mappedpdk import MappedPDK
+
+
+GRULES_MODULES = {
+    "sky130": "glayout.pdk.sky130_mapped.sky130_grules",
+    "gf180": "glayout.pdk.gf180_mapped.gf180_grules",
+    "ihp130": "glayout.pdk.ihp130_mapped.ihp130_grules",
+}
+
+# lookups representative of via_stack / multiplier / tapring
+QUERIES = [
+    ("mcon", None),
+    ("mcon", "met1"),
+    ("met1", "via1"),
+    ("via1", "met2"),
+    ("poly", None),
+    ("poly", "active_diff"),
+    ("active_tap", "mcon"),
+    ("met2", None),
+]
+
+
+@validate_arguments
+def legacy_get_grule(
+    pdk: MappedPDK, glayer1: str, glayer2: Optional[str] = None, return_decimal = False
+) -> dict[StrictStr, Union[float,Decimal]]:
+    """MappedPDK.get_grule as it was before the compiled rule table"""
+    if glayer1 not in MappedPDK.valid_glayers:
+        raise ValueError("get_grule, " + str(glayer1) + " not valid glayer")
+    rules_dict = None
+    if glayer2 is not None:
+        if glayer2 not in MappedPDK.valid_glayers:
+            raise ValueError("get_grule, " + str(glayer2) + " not valid glayer")
+        rules_dict = pdk.grules.get(glayer1, dict()).get(glayer2)
+        if rules_dict is None or rules_dict == {}:
+            rules_dict = pdk.grules.get(glayer2, dict()).get(glayer1)
+    else:
+        glayer2 = glayer1
+        rules_dict = pdk.grules.get(glayer1, dict()).get(glayer1)
+    if rules_dict is None or rules_dict == {}:
+        raise NotImplementedError(
+            "no rules found between " + str(glayer1) + " and " + str(glayer2)
+        )
+    for rule in rules_dict:
+        if type(rule) == float and return_decimal:
+            rules_dict[rule] = Decimal(str(rule))
+    return rules_dict
+
+
+def time_per_call(func, queries: list, calls: int) -> float:
+    repeats = max(1, calls // len(queries))
+    elapsed = timeit.timeit(lambda: [func(*query) for query in queries], number=repeats)
+    return elapsed / (repeats * len(queries))
+
+
+def bench_pdk(name: str, calls: int) -> None:
+    grules = importlib.import_module(GRULES_MODULES[name]).grulesobj
+    pdk = MappedPDK(name=name, glayers={}, grules=grules, pdk_files={}, valid_bjt_sizes={})
+    queries = [query for query in QUERIES if query in pdk.compiled_grules or (query[0], query[0]) in pdk.compiled_grules and query[1] is None]
+    build_time = timeit.timeit(lambda: CompiledGRules(grules, MappedPDK.valid_glayers), number=10) / 10
+    print(f"{name}: {len(pdk.compiled_grules)} rule entries, table build {build_time * 1e3:.3f} ms")
+    paths = {
+        "legacy get_grule": lambda *query: legacy_get_grule(pdk, *query),
+        "get_grule": pdk.get_grule,
+        "get_grule_fast": pdk.get_grule_fast,
+    }
+    baseline = None
+    for label, func in paths.items():
+        per_call = time_per_call(func, queries, calls)
+        baseline = baseline or per_call
+        print(f"  {label:<18} {per_call * 1e9:10.1f} ns/call  ({baseline / per_call:7.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+    for name in GRULES_MODULES:
+        bench_pdk(name, args.calls)
+
+
+if __name__ == "__main__":
+    main()
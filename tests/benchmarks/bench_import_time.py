@@ -0,0 +1,57 @@
+"""Startup cost of glayout: `python -c "import glayout"` and the first use of every PDK in a fresh interpreter.
+
+Every measurement starts a new python (min of --repeat runs), the bare interpreter start is reported separately.
+The per-PDK columns are the time to get the PDK object and the time to build a first via stack with it.
+Run from the repository root (PDK_ROOT must be set for the mapped PDKs):
+
+    python tests/benchmarks/bench_import_time.py [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+
+def run(code: str, repeat: int) -> float:
+    env = dict(os.environ, PYTHONPATH=str(SRC_ROOT), PYTHONWARNINGS="ignore")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    interpreter = run("pass", args.repeat)
+    package = run("import glayout", args.repeat)
+    netlist = run("from glayout import Netlist", args.repeat)
+    print(f"{'python -c pass':<34} {interpreter:7.3f}s")
+    print(f"{'import glayout':<34} {package:7.3f}s")
+    print(f"{'from glayout import Netlist':<34} {netlist:7.3f}s")
+    print()
+    print(f"{'pdk':<8} {'from glayout import pdk':>24} {'+ first via_stack':>18}")
+    for pdk in ("sky130", "gf180", "ihp130"):
+        access = run(f"from glayout import {pdk}", args.repeat)
+        try:
+            first_cell = run(f"from glayout import {pdk}, via_stack; via_stack({pdk}, 'met1', 'met2')", args.repeat)
+            first_cell_str = f"{first_cell:17.3f}s"
+        except subprocess.CalledProcessError:
+            first_cell_str = f"{'unavailable':>18}"
+        print(f"{pdk:<8} {access:23.3f}s {first_cell_str}")
+
+
+if __name__ == "__main__":
+    main()
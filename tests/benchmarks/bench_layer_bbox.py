@@ -0,0 +1,85 @@
+"""Layer bounding boxes: Component.extract(layers=[layer]).bbox versus the cached glayout.util.layer_bbox.
+
+The layout is a sky130 nmos (--fingers, --multipliers). Every layer bounding box of the component and of a rotated,
+mirrored reference to it is computed both ways and checked to match (extract once, the cache --repeat times, extract
+on a reference goes through gdsfactory's transformed cell and is slow), then the alignment helpers are timed with a
+layer (align_comp_to_port, move, add_ports_perimeter).
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_layer_bbox.py [--fingers 4 16] [--multipliers 2] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from gdsfactory.component import Component
+from gdsfactory.functions import transformed
+
+from glayout.util.layer_bbox import layer_bbox
+
+
+def legacy_layer_bbox(custom_comp, layer) -> np.ndarray:
+    """how the helpers found a layer bbox before the cache"""
+    if not isinstance(custom_comp, Component):
+        custom_comp = transformed(custom_comp)
+    return custom_comp.extract(layers=[layer]).bbox
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fingers", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--multipliers", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from gdsfactory.port import Port
+
+    from glayout import nmos, sky130
+    from glayout.util.comp_utils import align_comp_to_port, move
+    from glayout.util.port_utils import add_ports_perimeter
+
+    print(f"{'layout':<12} {'layers':>6} {'case':<22} {'extract':>10} {'cached':>10} {'speedup':>8}")
+    for fingers in args.fingers:
+        transistor = nmos(sky130, fingers=fingers, multipliers=args.multipliers)
+        top = Component(f"bench_top_{fingers}")
+        ref = top << transistor
+        ref.rotate(90).mirror_x().movex(1.5)
+        layers = list(transistor.get_polygons(by_spec=True))
+        for target, case in ((transistor, "component, all layers"), (ref, "reference, all layers")):
+            start = time.perf_counter()
+            expected = [legacy_layer_bbox(target, layer) for layer in layers]
+            old = time.perf_counter() - start
+            np.testing.assert_allclose([layer_bbox(target, layer) for layer in layers], expected, atol=1e-9)
+            new = timed(lambda: [layer_bbox(target, layer) for layer in layers], args.repeat)
+            print(f"nmos {fingers:<7} {len(layers):>6} {case:<22} {old * 1e3:8.2f}ms {new * 1e3:8.3f}ms {old / new:7.0f}x")
+        port = Port("bench", center=(0, 0), width=1, orientation=0, layer=(68, 20))
+        met1 = sky130.get_glayer("met1")
+        helpers = {
+            "align_comp_to_port": lambda: align_comp_to_port(ref, port, layer=met1),
+            "move": lambda: move(transistor, destination=(0, 0), layer=met1),
+            "add_ports_perimeter": lambda: add_ports_perimeter(transistor.copy(), layer=met1, prefix="bench_"),
+        }
+        for case, helper in helpers.items():
+            print(f"nmos {fingers:<7} {'':>6} {case:<22} {'':>10} {timed(helper, args.repeat) * 1e3:8.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Count the magic commands and time MappedPDK.lvs_netgen for each extraction level.
+
+magic and netgen are replaced by stub scripts. The magic stub counts the commands it reads and sleeps a fixed,
+synthetic cost per command (extraction and extresist dominate like they do in a real run), so the timings show the
+relative cost of the levels rather than real magic runtimes.
+Run from the repository root (PDK_ROOT must be set for the mapped PDKs):
+
+    python tests/benchmarks/bench_lvs_extraction.py [--pdk sky130] [--repeats 3]
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import stat
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+import glayout
+from glayout.pdk.mappedpdk import LVS_EXTRACTION_LEVELS
+
+
+STUB_MAGIC = """\
+#!{python}
+import os, sys, time
+# synthetic seconds per command
+COST = {{"extract": 0.2, "extresist": 0.4, "flatten": 0.1, "ext2spice": 0.05, "ext2sim": 0.05, "ext2resist": 0.05}}
+commands = [line.split() for line in sys.stdin.read().splitlines() if line.strip() and not line.startswith("#")]
+for command in commands:
+    time.sleep(COST.get(command[0], 0))
+    if command[0] in ("ext2spice", "ext2sim") and "-o" in command:
+        open(command[-1], "w").write("* stub\\n")
+with open(os.environ["STUB_MAGIC_LOG"], "a") as log:
+    log.write(str(len(commands)) + "\\n")
+"""
+
+STUB_NETGEN = """\
+#!{python}
+import sys
+open(sys.argv[-1], "w").write("Circuits match uniquely.\\nNetlists match.\\n")
+"""
+
+
+def write_stub(directory: Path, name: str, source: str) -> None:
+    path = directory / name
+    path.write_text(source.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdk", default="sky130", choices=["gf180", "sky130"])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    pdk = getattr(glayout, args.pdk)
+    if pdk is None:
+        raise SystemExit(f"{args.pdk} is not available (is PDK_ROOT set?)")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        write_stub(tmp, "magic", STUB_MAGIC)
+        write_stub(tmp, "netgen", STUB_NETGEN)
+        os.environ["PATH"] = f"{tmp}{os.pathsep}{os.environ['PATH']}"
+        log = tmp / "magic.log"
+        os.environ["STUB_MAGIC_LOG"] = str(log)
+        gds = glayout.via_stack(pdk, "met1", "met2").write_gds(tmp / "bench_cell.gds")
+        netlist = ".subckt bench_cell A\n.ends bench_cell\n"
+        print(f"{'extraction level':<18} {'magic commands':>15} {'time (s)':>9}")
+        for level in LVS_EXTRACTION_LEVELS:
+            log.write_text("")
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    pdk.lvs_netgen(gds, "bench_cell", netlist=netlist, use_cache=False, extraction_level=level)
+            elapsed = (time.perf_counter() - start) / args.repeats
+            commands = log.read_text().split()[0]
+            print(f"{level:<18} {commands:>15} {elapsed:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare one magic process per design against a pool of warm magic sessions for DRC on many small cells.
+
+magic is replaced by a stub which sleeps --startup seconds when it starts (standing in for loading the tech file
+and magicrc) and --check seconds per design, so the numbers show the share of process startup rather than real
+magic runtimes.
+Run from the repository root:
+
+    python tests/benchmarks/bench_magic_session.py [--cells 200] [--workers 4] [--startup 0.3] [--check 0.01]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import stat
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from types import SimpleNamespace
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+from glayout.verification.batch import run_verification_batch
+from glayout.verification.magic_session import MagicSessionPool
+
+
+STUB_MAGIC = """\
+#!{python}
+import os, re, sys, time
+time.sleep({startup})
+
+
+def save_report(design, report):
+    time.sleep({check})
+    with open(report, "w") as f:
+        f.write(design + " count: 0\\n----------------------------------------\\n\\n")
+
+
+if sys.argv[-1].endswith(".tcl"):
+    save_report(os.environ["DESIGN_NAME"], os.path.join(os.environ["REPORTS_DIR"], os.environ["DESIGN_NAME"] + ".rpt"))
+    sys.exit(0)
+for line in sys.stdin:
+    line = line.strip()
+    match = re.match(r"custom_drc_save_report \\{{(\\S+)\\}} \\{{(\\S+)\\}}$", line)
+    if match:
+        save_report(*match.groups())
+    match = re.match(r'puts stdout "(__GLAYOUT_DONE__ \\S+) \\$glayout_status"', line)
+    if match:
+        print(match.group(1) + " 0", flush=True)
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--startup", type=float, default=0.3, help="synthetic magic startup seconds")
+    parser.add_argument("--check", type=float, default=0.01, help="synthetic DRC seconds per cell")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        magic = tmp / "magic"
+        magic.write_text(STUB_MAGIC.format(python=sys.executable, startup=args.startup, check=args.check))
+        magic.chmod(magic.stat().st_mode | stat.S_IEXEC)
+        pdk = SimpleNamespace(name="bench", pdk_files={"pdk_root": str(tmp), "magic_drc_file": str(tmp / "magicrc")})
+        designs = list()
+        for i in range(args.cells):
+            gds = tmp / f"cell{i}.gds"
+            gds.write_bytes(os.urandom(64))
+            designs.append((gds, f"cell{i}"))
+
+        start = time.perf_counter()
+        jobs = [(gds, None, name) for gds, name in designs]
+        per_process = list(run_verification_batch(jobs, pdk=pdk, max_workers=args.workers, run_lvs=False, magic=str(magic), use_cache=False))
+        per_process_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with MagicSessionPool(pdk, size=args.workers, magic=str(magic), use_cache=False) as pool:
+            pooled = list(pool.run(designs))
+        pooled_s = time.perf_counter() - start
+
+        assert all(result["drc"]["is_pass"] for _, result in per_process)
+        assert all(result["is_pass"] for _, result in pooled)
+        print(f"{args.cells} cells, {args.workers} workers, {args.startup}s startup, {args.check}s per check")
+        print(f"{'one process per design':<24} {per_process_s:8.2f}s")
+        print(f"{'MagicSessionPool':<24} {pooled_s:8.2f}s  ({per_process_s / pooled_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
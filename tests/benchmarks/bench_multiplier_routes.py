@@ -0,0 +1,156 @@
+"""Multiplier construction time over the number of fingers: the per finger routing loop versus array references.
+
+multiplier used to align a via stack and build two straight_route cells for every finger. It now builds the vias and
+routes of the first two source/drain regions and of the first gate once and repeats them along the fingers with array
+references. legacy_multiplier is the old routing loop (dummies left out, multiplier is built with dummy=False too).
+Both are built from empty caches for every finger count and checked to give the same geometry and ports.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_multiplier_routes.py [--fingers 1 10 50 100 250 500] [--port-visibility public]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Optional
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+import numpy as np
+from gdsfactory.cell import cell, clear_cache
+from gdsfactory.component import Component
+from gdsfactory.components.rectangle import rectangle
+
+from glayout import sky130
+from glayout.pdk.mappedpdk import MappedPDK
+from glayout.primitives.fet import __gen_fingers_macro, multiplier
+from glayout.primitives.via_gen import via_array, via_stack
+from glayout.routing.straight_route import straight_route
+from glayout.util.comp_utils import align_comp_to_port, evaluate_bbox, movey
+from glayout.util.component_cache import clear_component_cache
+from glayout.util.port_utils import rename_ports_by_list, rename_ports_by_orientation
+from glayout.util.port_visibility import keep_lazy_ports, materialize_ports, set_port_visibility
+from glayout.util.snap_to_grid import component_snap_to_grid
+
+
+@cell
+def legacy_multiplier(
+    pdk: MappedPDK,
+    sdlayer: str,
+    width: Optional[float] = 3,
+    length: Optional[float] = None,
+    fingers: int = 1,
+    inter_finger_topmet: str = "met2",
+    sd_route_topmet: str = "met2",
+    gate_route_topmet: str = "met2",
+    sd_rmult: int = 1,
+    gate_rmult: int = 1,
+    interfinger_rmult: int = 1,
+    sd_route_extension: float = 0,
+    gate_route_extension: float = 0,
+) -> Component:
+    """multiplier(routing=True, dummy=False) with the per finger routing loop"""
+    # argument parsing and rule setup
+    min_length = pdk.get_grule_fast("poly")["min_width"]
+    length = min_length if (length or min_length) <= min_length else length
+    length = pdk.snap_to_2xgrid(length)
+    min_width = max(min_length, pdk.get_grule_fast("active_diff")["min_width"])
+    width = min_width if (width or min_width) <= min_width else width
+    width = pdk.snap_to_2xgrid(width)
+    poly_height = width + 2 * pdk.get_grule_fast("poly", "active_diff")["overhang"]
+    # call finger array
+    multiplier = __gen_fingers_macro(pdk, interfinger_rmult, fingers, length, width, poly_height, sdlayer, inter_finger_topmet)
+    # route all drains/ gates/ sources
+    # place vias, then straight route from top port to via-botmet_N
+    sd_N_port = multiplier.ports["leftsd_top_met_N"]
+    sdvia = via_stack(pdk, "met1", sd_route_topmet)
+    sdmet_hieght = sd_rmult*evaluate_bbox(sdvia)[1]
+    sdroute_minsep = pdk.get_grule_fast(sd_route_topmet)["min_separation"]
+    sdvia_ports = list()
+    for finger in range(fingers+1):
+        diff_top_port = movey(sd_N_port,destination=width/2)
+        # place sdvia such that metal does not overlap diffusion
+        big_extension = sdroute_minsep + sdroute_minsep + sdmet_hieght/2 + sdmet_hieght
+        sdvia_extension = big_extension if finger % 2 else sdroute_minsep + (sdmet_hieght)/2
+        sdvia_ref = align_comp_to_port(sdvia,diff_top_port,alignment=('c','t'))
+        multiplier.add(sdvia_ref.movey(sdvia_extension + pdk.snap_to_2xgrid(sd_route_extension)))
+        multiplier << straight_route(pdk, diff_top_port, sdvia_ref.ports["bottom_met_N"])
+        sdvia_ports += [sdvia_ref.ports["top_met_W"], sdvia_ref.ports["top_met_E"]]
+        # get the next port (break before this if last iteration because port D.N.E. and num gates=fingers)
+        if finger==fingers:
+            break
+        sd_N_port = multiplier.ports[f"row0_col{finger}_rightsd_top_met_N"]
+        # route gates
+        gate_S_port = multiplier.ports[f"row0_col{finger}_gate_S"]
+        metal_seperation = pdk.util_max_metal_seperation()
+        psuedo_Ngateroute = movey(gate_S_port.copy(),0-metal_seperation-gate_route_extension)
+        psuedo_Ngateroute.y = pdk.snap_to_2xgrid(psuedo_Ngateroute.y)
+        multiplier << straight_route(pdk,gate_S_port,psuedo_Ngateroute)
+    # place route met: gate
+    gate_width = gate_S_port.center[0] - multiplier.ports["row0_col0_gate_S"].center[0] + gate_S_port.width
+    gate_viaarr = via_array(pdk,"poly",gate_route_topmet, size=(gate_width,None),num_vias=(None,gate_rmult), no_exception=True, fullbottom=True)
+    # the gate_ ports are picked among every top_met port of the via array (the vias included), so its lazy ports are needed
+    gate = rename_ports_by_list(materialize_ports(keep_lazy_ports(gate_viaarr, gate_viaarr.copy())),[("top_met_","gate_")])
+    gate_ref = align_comp_to_port(gate.copy(), psuedo_Ngateroute, alignment=(None,'b'),layer=pdk.get_glayer("poly"))
+    multiplier.add(gate_ref)
+    # place route met: source, drain
+    sd_width = sdvia_ports[-1].center[0] - sdvia_ports[0].center[0]
+    sd_route = rectangle(size=(sd_width,sdmet_hieght),layer=pdk.get_glayer(sd_route_topmet),centered=True)
+    source = align_comp_to_port(sd_route.copy(), sdvia_ports[0], alignment=(None,'c'))
+    drain = align_comp_to_port(sd_route.copy(), sdvia_ports[2], alignment=(None,'c'))
+    multiplier.add(source)
+    multiplier.add(drain)
+    # add ports
+    multiplier.add_ports(drain.get_ports_list(), prefix="drain_")
+    multiplier.add_ports(source.get_ports_list(), prefix="source_")
+    multiplier.add_ports(gate_ref.get_ports_list(prefix="gate_"))
+    return component_snap_to_grid(rename_ports_by_orientation(multiplier))
+
+
+def signature(comp: Component) -> tuple[str, str]:
+    geometry = hashlib.sha1()
+    for layer, polygons in sorted(comp.get_polygons(by_spec=True).items()):
+        geometry.update(repr((layer, sorted(tuple(p.round(4).ravel().tolist()) for p in polygons))).encode())
+    ports = hashlib.sha1(repr([(name, np.round(port.center, 4).tolist(), port.orientation) for name, port in comp.ports.items()]).encode())
+    return geometry.hexdigest(), ports.hexdigest()
+
+
+def timed(function) -> tuple[float, Component]:
+    clear_cache()
+    clear_component_cache()
+    start = time.perf_counter()
+    comp = function()
+    return time.perf_counter() - start, comp
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fingers", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500])
+    parser.add_argument("--port-visibility", choices=["all", "public"], default="public")
+    args = parser.parse_args()
+
+    set_port_visibility(args.port_visibility)
+    # warm up (the first cell of a process also activates the pdk)
+    legacy_multiplier(sky130, "n+s/d")
+    multiplier(sky130, "n+s/d", dummy=False)
+    print(f"{'fingers':>7} {'loop':>9} {'arrays':>9} {'speedup':>8}  geometry / ports")
+    for fingers in args.fingers:
+        old, legacy = timed(lambda: legacy_multiplier(sky130, "n+s/d", fingers=fingers))
+        new, current = timed(lambda: multiplier(sky130, "n+s/d", fingers=fingers, dummy=False))
+        note = "same" if signature(legacy) == signature(current) else "DIFFERENT"
+        print(f"{fingers:>7} {old:8.2f}s {new:8.2f}s {old / new:7.1f}x  {note}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Time per connection of Netlist.connect_subnets / connect_node on long series chains.
+
+Builds a chain of --size transistors, like the series chains of resistor() or the columns of the interdigitized
+placements: every transistor is added with connect_netlist, its drain is connected to the source of the previous
+one with connect_subnets (by Netlist reference, which used to be a list scan of sub_netlists) and every tenth
+transistor's gate is tied to the top-level node G with connect_node.
+The time per connection should not grow with the chain length.
+Run from the repository root:
+
+    python tests/benchmarks/bench_netlist_connect.py [--size 1000 4000 16000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.spice import Netlist
+
+
+def fet() -> Netlist:
+    return Netlist(
+        circuit_name="PMOS_UNIT",
+        nodes=["D", "G", "S", "B"],
+        source_netlist=".subckt {circuit_name} {nodes} l=1 w=1 m=1\n.ends {circuit_name}",
+        instance_format="X{name} {nodes} {circuit_name} l=1 w=1 m=1",
+    )
+
+
+def chain(size: int) -> tuple[Netlist, int]:
+    netlist = Netlist(circuit_name="CHAIN", nodes=["P", "N", "G", "B"])
+    unit = fet()
+    netlist.add_netlists([unit._share() for _ in range(size)])
+    instances = list(netlist.sub_netlists)
+    connections = 0
+    netlist.connect_node(0, [("D", "P"), ("B", "B")])
+    for previous, current in zip(instances, instances[1:]):
+        netlist.connect_subnets(previous, current, [("S", "D")])
+        connections += 1
+    for index in range(0, size, 10):
+        netlist.connect_node(index, [("G", "G")])
+        connections += 1
+    netlist.connect_node(size - 1, [("S", "N")])
+    return netlist, connections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, nargs="+", default=[1000, 4000, 16000])
+    args = parser.parse_args()
+    print(f"{'size':>7} {'connect':>9} {'us/connection':>14} {'emit':>9}")
+    for size in args.size:
+        start = time.perf_counter()
+        netlist, connections = chain(size)
+        connect_s = time.perf_counter() - start
+        start = time.perf_counter()
+        netlist.generate_netlist()
+        emit_s = time.perf_counter() - start
+        print(f"{size:>7} {connect_s:>8.3f}s {1e6 * connect_s / connections:>14.2f} {emit_s:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
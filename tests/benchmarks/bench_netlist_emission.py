@@ -0,0 +1,113 @@
+"""SPICE emission time of Netlist.generate_netlist against the old recursive text-keyed deduplication.
+
+The old implementation rendered every subcircuit directive to use it as a dict key and merged the dict of every
+sub-netlist into its parent, which grows with depth x unique subcircuits. The hierarchy used here is --depth levels,
+every level instantiates the level below and --width transistors with level specific sizes, so every level adds
+unique subcircuits. The emitted netlists are checked to be identical.
+Run from the repository root:
+
+    python tests/benchmarks/bench_netlist_emission.py [--depth 50 100 200 400] [--width 4]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.spice import Netlist
+
+
+class LegacyNetlist(Netlist):
+    """generate_netlist as it was before the single pass emission"""
+
+    def get_subcircuits_netlist_map(self, sub_netlists_only=False) -> dict[str, list[Netlist]]:
+        subcircuits = dict()
+        for netlist in self.sub_netlists:
+            subnetlist_subcircuits = LegacyNetlist.get_subcircuits_netlist_map(netlist)
+            for subckt in subnetlist_subcircuits:
+                if subckt not in subcircuits:
+                    subcircuits[subckt] = [*subnetlist_subcircuits[subckt]]
+                else:
+                    subcircuits[subckt] += subnetlist_subcircuits[subckt]
+        if not sub_netlists_only:
+            self_subckt = self._Netlist__generate_self_subcircuit()
+            if self_subckt not in subcircuits:
+                subcircuits[self_subckt] = [self]
+        return subcircuits
+
+    def generate_netlist(self, only_subcircuits: bool = False, with_pins: bool = True) -> str:
+        self._detach_all()
+        subcircuits_netlist_map = self.get_subcircuits_netlist_map(sub_netlists_only=True)
+        subcircuit_suffixes = dict()
+        for netlists in subcircuits_netlist_map.values():
+            subckt_name = netlists[0].circuit_name
+            if subckt_name in subcircuit_suffixes:
+                for netlist in netlists:
+                    netlist.circuit_name = f"{netlist.circuit_name}_{subcircuit_suffixes[subckt_name]}"
+                subcircuit_suffixes[subckt_name] += 1
+            else:
+                subcircuit_suffixes[subckt_name] = 1
+        subcircuits = "\n\n".join(netlists[0]._Netlist__generate_self_subcircuit() for netlists in subcircuits_netlist_map.values())
+        main_circuit = self._Netlist__generate_self_subcircuit(with_pins=with_pins)
+        global_nodes = " ".join(self.get_global_nodes_list())
+        self.spice_netlist = ""
+        if len(global_nodes) > 0 and not only_subcircuits:
+            self.spice_netlist += f".global {global_nodes}\n\n"
+        self.spice_netlist += subcircuits + "\n\n" + main_circuit
+        return self.spice_netlist
+
+
+def fet(level: int, i: int) -> Netlist:
+    return Netlist(
+        circuit_name="NMOS",
+        nodes=["D", "G", "S", "B"],
+        source_netlist=".subckt {circuit_name} {nodes} l=0.15 w={width} m=1\n.ends {circuit_name}",
+        instance_format="X{name} {nodes} {circuit_name} l=0.15 w={width} m=1",
+        parameters={"width": level + i / 10},
+    )
+
+
+def build(depth: int, width: int) -> Netlist:
+    below = None
+    for level in range(depth):
+        cell = Netlist(circuit_name="LEVEL", nodes=["IN", "OUT", "VSS"])
+        if below is not None:
+            cell.connect_netlist(below, [("IN", "IN"), ("OUT", "OUT"), ("VSS", "VSS")])
+        for i in range(width):
+            cell.connect_netlist(fet(level, i), [("G", "IN"), ("D", "OUT"), ("S", "VSS"), ("B", "VSS")])
+        below = cell
+    return below
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--width", type=int, default=4)
+    args = parser.parse_args()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * max(args.depth) + 100))
+    print(f"{'depth':>6} {'netlists':>9} {'legacy':>10} {'single pass':>12} {'speedup':>8}")
+    for depth in args.depth:
+        top = build(depth, args.width)
+        start = time.perf_counter()
+        old = LegacyNetlist.generate_netlist(top)
+        legacy_s = time.perf_counter() - start
+
+        top = build(depth, args.width)
+        start = time.perf_counter()
+        new = top.generate_netlist()
+        new_s = time.perf_counter() - start
+
+        assert old == new, "single pass emission changed the netlist"
+        print(f"{depth:>6} {depth * (args.width + 1):>9} {legacy_s:>9.3f}s {new_s:>11.3f}s {legacy_s / new_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
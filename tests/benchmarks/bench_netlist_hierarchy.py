@@ -0,0 +1,92 @@
+"""Build a 1,000 transistor netlist hierarchy with copy-on-write connect_netlist and with the old deepcopy per connection.
+
+The hierarchy is --leaves transistors per row cell, --rows row cells per block and --blocks blocks in the top cell
+(10 x 10 x 10 = 1,000 transistor instances by default). Build time, emission time and peak memory (tracemalloc) are
+reported for both, and the emitted netlists are checked to be identical.
+Run from the repository root:
+
+    python tests/benchmarks/bench_netlist_hierarchy.py [--leaves 10] [--rows 10] [--blocks 10]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.spice import Netlist
+
+
+class DeepcopyNetlist(Netlist):
+    """connect_netlist as it was before copy on write: every connection deep copies the whole sub-netlist tree"""
+
+    def connect_netlist(self, netlist: Netlist, node_mapping: list[tuple[str, str]]) -> int:
+        self.add_netlists([deepcopy(netlist)])
+        netlist_index = len(self.sub_netlists) - 1
+        self.connect_node(net=netlist_index, node_mapping=node_mapping)
+        return netlist_index
+
+
+def fet(cls, width: float) -> Netlist:
+    return cls(
+        circuit_name="NMOS",
+        nodes=["D", "G", "S", "B"],
+        source_netlist=".subckt {circuit_name} {nodes} l=0.15 w={width} m=1\n.ends {circuit_name}",
+        instance_format="X{name} {nodes} {circuit_name} l=0.15 w={width} m=1",
+        parameters={"width": width},
+    )
+
+
+def build(cls, leaves: int, rows: int, blocks: int) -> Netlist:
+    row = cls(circuit_name="ROW", nodes=["IN", "OUT", "VSS"])
+    refs = [row.connect_netlist(fet(cls, 1 + i % 2), [("G", "IN"), ("B", "VSS")]) for i in range(leaves)]
+    row.connect_node(refs[0], [("S", "VSS")])
+    row.connect_node(refs[-1], [("D", "OUT")])
+    for a, b in zip(refs, refs[1:]):
+        row.connect_subnets(a, b, [("D", "S")])
+    block = cls(circuit_name="BLOCK", nodes=["IN", "OUT", "VSS"])
+    refs = [block.connect_netlist(row, [("IN", "IN"), ("VSS", "VSS")]) for _ in range(rows)]
+    block.connect_node(refs[-1], [("OUT", "OUT")])
+    top = cls(circuit_name="TOP", nodes=["IN", "OUT", "VSS"])
+    refs = [top.connect_netlist(block, [("IN", "IN"), ("VSS", "VSS")]) for _ in range(blocks)]
+    top.connect_node(refs[-1], [("OUT", "OUT")])
+    return top
+
+
+def measure(cls, args) -> str:
+    tracemalloc.start()
+    start = time.perf_counter()
+    top = build(cls, args.leaves, args.rows, args.blocks)
+    built = time.perf_counter()
+    build_peak = tracemalloc.get_traced_memory()[1]
+    spice = top.generate_netlist()
+    done = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{cls.__name__:<16} build {built - start:7.3f}s {build_peak / 2**20:8.2f} MiB   build + emit {done - start:7.3f}s {peak / 2**20:8.2f} MiB")
+    return spice
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leaves", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--blocks", type=int, default=10)
+    args = parser.parse_args()
+    print(f"{args.leaves * args.rows * args.blocks} transistor instances")
+    old = measure(DeepcopyNetlist, args)
+    new = measure(Netlist, args)
+    assert old == new, "copy on write changed the emitted netlist"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""NPC generation: the old pairwise loop of sky130_add_npc versus the grid hashed neighbour search.
+
+The layouts are sky130 nmos transistors (--fingers, flattened, their npc removed) and synthetic rows of poly
+contacts (--contacts, poly strips with a licon pair every 0.48 um, rows 0.9 um apart). Both versions add npc to a
+copy of the same layout, the npc area (union) is checked to match. The old version is skipped above --legacy-max
+licon polygons, it is quadratic.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_npc.py [--fingers 20 100 200] [--contacts 1000 10000 40000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import gdstk
+from gdsfactory.component import Component
+from gdsfactory.geometry.boolean import boolean
+from gdsfactory.polygon import Polygon
+
+from glayout.pdk.sky130_mapped.sky130_add_npc import sky130_add_npc
+
+NPC = (95, 20)
+
+
+def legacy_sky130_add_npc(comp: Component) -> Component:
+    """sky130_add_npc before the grid hashed neighbour search"""
+    licon_comp = comp.extract(layers=[(66,44)])
+    poly_comp = comp.extract(layers=[(66,20)])
+    existing_npc = comp.extract(layers=[(95,20)])
+    if len(licon_comp.get_polygons()) < 2 and len(poly_comp.get_polygons()) < 2:
+        return comp
+    liconANDpoly = boolean(licon_comp, poly_comp, layer=(1,2), operation="and")
+    if len(existing_npc.get_polygons()) > 1:
+        liconANDpoly = boolean(liconANDpoly, existing_npc, layer=(1,2), operation="A-B")
+    licon_polygons = liconANDpoly.get_polygons(as_array=False)
+    npc_polygons = list()
+    for licon_polygon in licon_polygons:
+        bbox = licon_polygon.bounding_box()
+        padding_points = [
+            [bbox[0][0] - 0.1, bbox[0][1] - 0.1],
+            [bbox[1][0] + 0.1, bbox[0][1] - 0.1],
+            [bbox[1][0] + 0.1, bbox[1][1] + 0.1],
+            [bbox[0][0] - 0.1, bbox[1][1] + 0.1],
+        ]
+        npc_polygons.append(Polygon(padding_points, layer=(95,20)))
+    npc_merged_polygons = list()
+    for i, npc_polygon in enumerate(npc_polygons):
+        for j, other_polygon in enumerate(npc_polygons):
+            yviolation = abs(npc_polygon.center[1] - other_polygon.center[1]) < 0.64
+            xviolation = abs(npc_polygon.center[0] - other_polygon.center[0]) < 0.64
+            if i==j:
+                continue
+            elif (xviolation and yviolation):
+                nxmax = max(npc_polygon.xmax, other_polygon.xmax)
+                nxmin = min(npc_polygon.xmin, other_polygon.xmin)
+                nymax = max(npc_polygon.ymax, other_polygon.ymax)
+                nymin = min(npc_polygon.ymin, other_polygon.ymin)
+                points = [[nxmin,nymin],[nxmax,nymin],[nxmax,nymax],[nxmin,nymax]]
+                npc_merged_polygons.append(Polygon(points=points,layer=(95,20)))
+    comp.add(npc_polygons + npc_merged_polygons)
+    return comp
+
+
+def nmos_layout(fingers: int) -> Component:
+    from glayout import nmos, sky130
+
+    layout = nmos(sky130, fingers=fingers).flatten()
+    return layout.remove_layers([NPC])
+
+
+def contact_rows(contacts: int) -> Component:
+    """poly strips with 0.17 um licon pairs at a 0.48 um pitch, about contacts licon in total"""
+    layout = Component(f"contact_rows_{contacts}")
+    per_row = 100
+    for row in range(max(1, contacts // (2 * per_row))):
+        y = row * 0.9
+        layout.add_polygon([(-0.1, y), (per_row * 0.48, y), (per_row * 0.48, y + 0.5), (-0.1, y + 0.5)], layer=(66, 20))
+        for column in range(per_row):
+            x = column * 0.48
+            # two contacts per position, overlapping as the via stacks of a finger do
+            layout.add_polygon([(x, y + 0.165), (x + 0.17, y + 0.165), (x + 0.17, y + 0.335), (x, y + 0.335)], layer=(66, 44))
+            layout.add_polygon([(x, y + 0.165), (x + 0.17, y + 0.165), (x + 0.17, y + 0.335), (x, y + 0.335)], layer=(66, 44))
+    return layout
+
+
+def npc_area(component: Component) -> float:
+    polygons = component.get_polygons(by_spec=NPC)
+    return sum(polygon.area() for polygon in gdstk.boolean(polygons, [], "or", precision=1e-4))
+
+
+def run(add_npc, layout: Component) -> tuple[float, int, float]:
+    """run time, npc polygon count and npc area of add_npc on a copy of layout"""
+    copy = layout.copy()
+    start = time.perf_counter()
+    add_npc(copy)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(copy.get_polygons(by_spec=NPC)), npc_area(copy)
+
+
+def bench(label: str, layout: Component, legacy_max: int) -> None:
+    licon = len(layout.get_polygons(by_spec=(66, 44)))
+    new_time, new_count, new_area = run(sky130_add_npc, layout)
+    line = f"{label:<16} {licon:>7} {new_time:9.3f}s {new_count:>7}"
+    if licon <= legacy_max:
+        old_time, old_count, old_area = run(legacy_sky130_add_npc, layout)
+        assert abs(old_area - new_area) <= 1e-6 * max(old_area, 1.0), (old_area, new_area)
+        line += f" {old_time:9.3f}s {old_count:>7} {old_time / new_time:7.1f}x"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fingers", type=int, nargs="*", default=[20, 100, 200])
+    parser.add_argument("--contacts", type=int, nargs="*", default=[1000, 10000, 40000])
+    parser.add_argument("--legacy-max", type=int, default=3000, help="largest licon count the old version is run on")
+    args = parser.parse_args()
+
+    print(f"{'layout':<16} {'licon':>7} {'grid':>10} {'npc':>7} {'legacy':>10} {'npc':>7} {'speedup':>8}")
+    for contacts in args.contacts:
+        bench(f"rows {contacts}", contact_rows(contacts), args.legacy_max)
+    for fingers in args.fingers:
+        start = time.perf_counter()
+        layout = nmos_layout(fingers)
+        print(f"(nmos fingers={fingers} built in {time.perf_counter() - start:.1f}s)")
+        bench(f"nmos {fingers}", layout, args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Parse time and peak memory of summarize_parasitics against the old line by line PEX total parser.
+
+The PEX netlist is synthetic: --nets nets, each split by magic style sub nodes into a resistor chain with a ground
+and a coupling capacitor per segment, plus one transistor per net, written with continuation lines. The old parser
+only returns the two totals, they are checked to match.
+Run from the repository root:
+
+    python tests/benchmarks/bench_pex_parser.py [--nets 1000 10000 100000] [--segments 8]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.spice_reader import summarize_parasitics
+
+
+def legacy_parse_simple_parasitics(spice_file_path: str) -> tuple[float, float]:
+    """physical_features._parse_simple_parasitics before the streaming reader"""
+    total_resistance = 0.0
+    total_capacitance = 0.0
+    if not os.path.exists(spice_file_path):
+        return 0.0, 0.0
+    with open(spice_file_path, 'r') as f:
+        for line in f:
+            orig_line = line.strip()
+            line = line.strip().upper()
+            parts = line.split()
+            orig_parts = orig_line.split()
+            if not parts: continue
+            name = parts[0]
+            if name.startswith('R') and len(parts) >= 4:
+                try: total_resistance += float(parts[3])
+                except (ValueError): continue
+            elif name.startswith('C') and len(parts) >= 4:
+                try:
+                    cap_str = orig_parts[3]
+                    unit = cap_str[-1]
+                    val_str = cap_str[:-1]
+                    if unit == 'F': cap_value = float(val_str) * 1e-15
+                    elif unit == 'P': cap_value = float(val_str) * 1e-12
+                    elif unit == 'N': cap_value = float(val_str) * 1e-9
+                    elif unit == 'U': cap_value = float(val_str) * 1e-6
+                    elif unit == 'f': cap_value = float(val_str) * 1e-15
+                    else: cap_value = float(cap_str)
+                    total_capacitance += cap_value
+                except (ValueError): continue
+    return total_resistance, total_capacitance
+
+
+def write_pex(path: Path, nets: int, segments: int) -> None:
+    with open(path, "w") as f:
+        f.write("* NGSPICE file created from top.ext - technology: sky130A\n\n.subckt top VDD VSS\n")
+        resistor = capacitor = 0
+        for net in range(nets):
+            f.write(f"X{net} net{net}.t0 net{(net + 1) % nets}.t0 VSS VSS sky130_fd_pr__nfet_01v8 ad=0.29p pd=2.58u\n+ as=0.29p ps=2.58u w=1 l=0.15\n")
+            for segment in range(segments):
+                f.write(f"R{resistor} net{net}.n{segment} net{net}.n{segment + 1} {1.5 + segment % 7}\n")
+                f.write(f"C{capacitor} net{net}.n{segment} VSS {0.12 + segment % 5 * 0.01:.2f}f\n")
+                f.write(f"C{capacitor + 1} net{net}.n{segment} net{(net + 1) % nets}.n{segment} {0.03:.2f}f\n")
+                resistor += 1
+                capacitor += 2
+        f.write(".ends\n")
+
+
+def measure(function):
+    """result, run time and peak traced memory (MiB) of a second run, tracemalloc slows the parsers down"""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nets", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--segments", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'nets':>8} {'MB':>7} {'legacy':>9} {'peak':>9} {'streaming':>10} {'peak':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for nets in args.nets:
+            path = Path(tmp) / f"top{nets}_pex.spice"
+            write_pex(path, nets, args.segments)
+            legacy, legacy_time, legacy_peak = measure(lambda: legacy_parse_simple_parasitics(str(path)))
+            summary, new_time, new_peak = measure(lambda: summarize_parasitics(path))
+            totals = (summary["total_resistance"], summary["total_capacitance"])
+            assert all(abs(a - b) <= 1e-9 * abs(a) for a, b in zip(legacy, totals)), (legacy, totals)
+            # the sub nodes are merged into their nets, plus VSS
+            assert len(summary["nets"]) == nets + 1
+            size = path.stat().st_size / 2**20
+            print(f"{nets:>8} {size:7.1f} {legacy_time:8.2f}s {legacy_peak:7.1f}MB {new_time:9.2f}s {new_peak:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Port count, peak memory and build time of cells with every port copied ("all") versus public ports only ("public").
+
+Every cell is built in a fresh interpreter per mode (GLAYOUT_PORT_VISIBILITY), which reports the number of ports of
+the cell, the number of lazy (private) ports that stay resolvable with get_port, the build time, the peak resident
+memory of the process and a hash of the geometry (which must not depend on the mode). The `opamp` of this tree does
+not build (a netlist function is missing an argument), its time and memory up to the error are reported.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_port_visibility.py [--cells nmos diff_pair fvf opamp] [--fingers 16] [--multipliers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+
+def make(name: str, fingers: int, multipliers: int):
+    from glayout import sky130
+
+    if name == "nmos":
+        from glayout import nmos
+
+        return nmos(sky130, fingers=fingers, multipliers=multipliers, with_substrate_tap=True)
+    if name == "diff_pair":
+        from glayout.cells.elementary.diff_pair import diff_pair
+
+        return diff_pair(sky130, fingers=fingers)
+    if name == "fvf":
+        from glayout.cells.elementary.FVF.fvf import flipped_voltage_follower
+
+        return flipped_voltage_follower(sky130)
+    if name == "opamp":
+        from glayout.cells.composite.opamp.opamp import opamp
+
+        return opamp(sky130)
+    raise ValueError(f"unknown cell {name!r}")
+
+
+def build(name: str, fingers: int, multipliers: int) -> None:
+    """child process: builds one cell and prints its numbers as json"""
+    from glayout.util.port_visibility import lazy_port_names
+
+    start = time.perf_counter()
+    try:
+        cell = make(name, fingers, multipliers)
+    except Exception as error:
+        result = {"error": f"{type(error).__name__}: {error}"}
+    else:
+        digest = hashlib.sha1()
+        for layer, polygons in sorted(cell.get_polygons(by_spec=True).items()):
+            digest.update(repr((layer, sorted(tuple(p.round(4).ravel().tolist()) for p in polygons))).encode())
+        result = {"ports": len(cell.ports), "hash": digest.hexdigest()}
+        result["time"] = time.perf_counter() - start
+        result["lazy"] = len(lazy_port_names(cell))
+    result.setdefault("time", time.perf_counter() - start)
+    result["memory"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", nargs="*", default=["nmos", "diff_pair", "fvf", "opamp"])
+    parser.add_argument("--fingers", type=int, default=16)
+    parser.add_argument("--multipliers", type=int, default=4)
+    parser.add_argument("--build", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build:
+        build(args.build, args.fingers, args.multipliers)
+        return
+    print(f"{'cell':<10} {'mode':<7} {'ports':>7} {'lazy':>7} {'time':>8} {'peak RSS':>10}  geometry")
+    for name in args.cells:
+        results = dict()
+        for mode in ("all", "public"):
+            command = [sys.executable, __file__, "--build", name, "--fingers", str(args.fingers), "--multipliers", str(args.multipliers)]
+            env = dict(os.environ, GLAYOUT_PORT_VISIBILITY=mode)
+            output = subprocess.run(command, capture_output=True, text=True, cwd=REPO_ROOT, env=env).stdout
+            results[mode] = result = json.loads(output.strip().splitlines()[-1])
+            if "error" in result:
+                note = result["error"]
+            elif mode == "public":
+                note = "same" if result["hash"] == results["all"].get("hash") else "DIFFERENT"
+            else:
+                note = ""
+            ports = f"{result['ports']:>7} {result['lazy']:>7}" if "ports" in result else f"{'-':>7} {'-':>7}"
+            print(f"{name:<10} {mode:<7} {ports} {result['time']:7.2f}s {result['memory']:8.0f}MB  {note}")
+
+
+if __name__ == "__main__":
+    main()
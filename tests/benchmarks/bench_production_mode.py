@@ -0,0 +1,146 @@
+"""Build time of cells with pydantic argument validation of the helpers (debug) versus production mode.
+
+The helpers of comp_utils, port_utils, snap_to_grid, via_gen and mappedpdk (move, movex, movey, evaluate_bbox,
+align_comp_to_port, get_glayer, layer_to_glayer, snap_to_2xgrid, ...) validate their arguments with pydantic unless
+production mode is on (GLAYOUT_PRODUCTION=1 or set_production_mode). Every cell is built --repeat times, each in a fresh
+interpreter per mode, and the best time is reported with a hash of the geometry (which must not depend on the mode).
+The `opamp` of this tree does not build (a netlist function is missing an argument), its time up to the error is reported.
+The time per call of the hot helpers in both modes is reported after that.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_production_mode.py [--cells opamp diff_pair fvf] [--repeat 3] [--calls 5000]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+MODES = {"debug": "0", "production": "1"}
+
+
+def make(name: str):
+    from glayout import sky130
+
+    if name == "opamp":
+        from glayout.cells.composite.opamp.opamp import opamp
+
+        return opamp(sky130)
+    if name == "diff_pair":
+        from glayout.cells.elementary.diff_pair import diff_pair
+
+        return diff_pair(sky130, fingers=8)
+    if name == "fvf":
+        from glayout.cells.elementary.FVF.fvf import flipped_voltage_follower
+
+        return flipped_voltage_follower(sky130)
+    raise ValueError(f"unknown cell {name!r}")
+
+
+def build(name: str) -> None:
+    """child process: builds one cell and prints its build time and geometry hash as json"""
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    from glayout import sky130
+
+    # import gdsfactory and the pdk before timing
+    sky130.activate()
+    start = time.perf_counter()
+    try:
+        cell = make(name)
+    except Exception as error:
+        result = {"error": f"{type(error).__name__}: {error}"}
+    else:
+        digest = hashlib.sha1()
+        for layer, polygons in sorted(cell.get_polygons(by_spec=True).items()):
+            digest.update(repr((layer, sorted(tuple(p.round(4).ravel().tolist()) for p in polygons))).encode())
+        result = {"hash": digest.hexdigest()}
+    result["time"] = time.perf_counter() - start
+    print(json.dumps(result))
+
+
+def helper_calls() -> dict:
+    """(helper name -> function calling it once) for the per call timings"""
+    from gdsfactory.component import Component
+    from glayout import sky130, via_stack
+    from glayout.util.comp_utils import align_comp_to_port, evaluate_bbox, move, movex
+
+    sky130.activate()
+    viastack = via_stack(sky130, "met1", "met2")
+    ref = Component() << viastack
+    port = viastack.ports["top_met_N"]
+    return {
+        "move": lambda: move(ref, (0.1, 0)),
+        "movex": lambda: movex(port, 0.1),
+        "evaluate_bbox": lambda: evaluate_bbox(viastack),
+        "align_comp_to_port": lambda: align_comp_to_port(viastack, port),
+        "get_glayer": lambda: sky130.get_glayer("met1"),
+        "layer_to_glayer": lambda: sky130.layer_to_glayer((68, 20)),
+        "snap_to_2xgrid": lambda: sky130.snap_to_2xgrid(0.123),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cells", nargs="*", default=["opamp", "diff_pair", "fvf"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--build", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.build:
+        build(args.build)
+        return
+    print(f"{'cell':<10} {'mode':<11} {'time':>8} {'speedup':>8}  geometry")
+    for name in args.cells:
+        results = dict()
+        for mode, production in MODES.items():
+            runs = list()
+            for _ in range(args.repeat):
+                command = [sys.executable, __file__, "--build", name]
+                env = dict(os.environ, GLAYOUT_PRODUCTION=production)
+                output = subprocess.run(command, capture_output=True, text=True, cwd=REPO_ROOT, env=env).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            results[mode] = result = min(runs, key=lambda run: run["time"])
+            if "error" in result:
+                note = result["error"]
+            elif mode == "production":
+                note = "same" if result["hash"] == results["debug"].get("hash") else "DIFFERENT"
+            else:
+                note = ""
+            speedup = results["debug"]["time"] / result["time"]
+            print(f"{name:<10} {mode:<11} {result['time']:7.2f}s {speedup:7.2f}x  {note}")
+
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    from glayout.util.validation import set_production_mode
+
+    print(f"\n{'helper':<20} {'debug':>10} {'production':>11} {'speedup':>8}")
+    for name, function in helper_calls().items():
+        times = dict()
+        for mode in MODES:
+            set_production_mode(mode == "production")
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                function()
+            times[mode] = (time.perf_counter() - start) / args.calls
+        set_production_mode(False)
+        print(f"{name:<20} {times['debug'] * 1e6:8.2f}us {times['production'] * 1e6:9.2f}us {times['debug'] / times['production']:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
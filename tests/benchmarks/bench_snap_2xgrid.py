@@ -0,0 +1,59 @@
+"""Batch snapping: MappedPDK.snap_to_2xgrid called per point versus one snap_to_2xgrid_array call.
+
+Random points (with the float noise rule arithmetic produces) are snapped with the validated scalar method in a loop,
+as get_padding_points_cc used to, and with the batch method, for --points points, and checked to give the same values.
+get_padding_points_cc itself is timed on a sky130 nmos afterwards.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_snap_2xgrid.py [--points 4 100 10000] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout import nmos, sky130
+from glayout.util.comp_utils import get_padding_points_cc
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, nargs="+", default=[4, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'points':>7} {'per point':>11} {'batch':>11} {'speedup':>8}")
+    for count in args.points:
+        points = [[rng.uniform(-50, 50) + 0.17 + 0.12 * rng.randint(0, 9) for _ in range(2)] for _ in range(count)]
+        expected = [sky130.snap_to_2xgrid(point) for point in points]
+        assert sky130.snap_to_2xgrid_array(points).tolist() == expected
+        repeat = max(1, args.repeat * 100 // count)
+        old = timed(lambda: [sky130.snap_to_2xgrid(point) for point in points], repeat)
+        new = timed(lambda: sky130.snap_to_2xgrid_array(points), repeat)
+        print(f"{count:>7} {old * 1e3:9.3f}ms {new * 1e3:9.3f}ms {old / new:7.1f}x")
+
+    transistor = nmos(sky130, fingers=4)
+    padding = timed(lambda: get_padding_points_cc(transistor, default=1, pdk_for_snap2xgrid=sky130), args.repeat * 10)
+    print(f"\nget_padding_points_cc (nmos, snapped) {padding * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare flattening and hierarchy preserving component_snap_to_grid on large cells.
+
+Reports build time, peak RSS and written GDS size for each cell in both modes.
+Every (cell, mode) pair runs in a fresh interpreter so peak RSS is not shared.
+Run from the repository root (PDK_ROOT must be set for the mapped PDKs):
+
+    python tests/benchmarks/bench_snap_hierarchy.py [--pdk sky130] [--cells opamp super_class_AB_OTA]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+CELLS = {
+    "opamp": "glayout.cells.composite.opamp.opamp:opamp",
+    "super_class_AB_OTA": "glayout.cells.composite.fvf_based_ota.ota:super_class_AB_OTA",
+}
+MODES = {"flatten": False, "hierarchy": True}
+
+
+def run_one(pdk_name: str, cell: str, preserve_hierarchy: bool) -> dict:
+    """builds one cell in this process and returns the measurements"""
+    import importlib
+
+    import glayout
+    from glayout.util.snap_to_grid import set_preserve_hierarchy
+
+    pdk = getattr(glayout, pdk_name)
+    if pdk is None:
+        raise SystemExit(f"{pdk_name} is not available (is PDK_ROOT set?)")
+    module, func = CELLS[cell].split(":")
+    generator = getattr(importlib.import_module(module), func)
+    set_preserve_hierarchy(preserve_hierarchy)
+    start = time.perf_counter()
+    comp = generator(pdk)
+    elapsed = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmpdir:
+        gdspath = comp.write_gds(Path(tmpdir) / f"{cell}.gds")
+        gds_bytes = os.path.getsize(gdspath)
+    return {
+        "time_s": elapsed,
+        # ru_maxrss is in KiB on linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "gds_kb": gds_bytes / 1024,
+        "cells": len(comp.get_dependencies(recursive=True)) + 1,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdk", default="sky130", choices=["gf180", "sky130"])
+    parser.add_argument("--cells", nargs="+", default=list(CELLS), choices=list(CELLS))
+    parser.add_argument("--worker", nargs=2, metavar=("CELL", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        cell, mode = args.worker
+        print(json.dumps(run_one(args.pdk, cell, MODES[mode])))
+        return
+    print(f"{'cell':<20} {'mode':<10} {'time (s)':>9} {'peak RSS (MB)':>14} {'GDS (KB)':>10} {'cells':>6}")
+    for cell in args.cells:
+        for mode in MODES:
+            proc = subprocess.run(
+                [sys.executable, __file__, "--pdk", args.pdk, "--worker", cell, mode],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+                print(f"{cell:<20} {mode:<10} failed: {error}")
+                continue
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"{cell:<20} {mode:<10} {result['time_s']:9.2f} {result['peak_rss_mb']:14.1f}"
+                f" {result['gds_kb']:10.1f} {result['cells']:6d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Per-sample overhead of a fresh python interpreter per sample against warm SweepRunner workers.
+
+Every sample builds a small via stack. The fresh-interpreter mode starts a new python per sample (like
+safe_single_build_and_simulation did) so it pays for importing gdsfactory and glayout every time.
+Run from the repository root (PDK_ROOT must be set for the mapped PDKs):
+
+    python tests/benchmarks/bench_sweep.py [--samples 16] [--workers 4]
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.sweep import SweepRunner
+
+
+def sample(top: int) -> float:
+    """one sweep sample: the imports are only paid once per warm worker"""
+    warnings.filterwarnings("ignore")
+    from gdsfactory.cell import clear_cache
+    from glayout import sky130, via_stack
+
+    area = via_stack(sky130, "met1", f"met{top}").area()
+    clear_cache()
+    return area
+
+
+def fresh_interpreter(top: int) -> None:
+    code = f"import sys; sys.path.insert(0, {str(Path(__file__).parent)!r}); from bench_sweep import sample; print(sample({top}))"
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    tops = [2 + i % 3 for i in range(args.samples)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as executor:
+        list(executor.map(fresh_interpreter, tops))
+    fresh_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with SweepRunner(max_workers=args.workers, max_tasks_per_child=None) as runner:
+        list(runner.map(sample, tops))
+    warm_s = time.perf_counter() - start
+
+    print(f"{args.samples} samples, {args.workers} workers")
+    print(f"{'fresh interpreter per sample':<30} {fresh_s:7.2f}s total {1000 * fresh_s * args.workers / args.samples:9.1f} ms/sample/worker")
+    print(f"{'SweepRunner':<30} {warm_s:7.2f}s total {1000 * warm_s * args.workers / args.samples:9.1f} ms/sample/worker")
+
+
+if __name__ == "__main__":
+    main()
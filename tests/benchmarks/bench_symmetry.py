@@ -0,0 +1,112 @@
+"""Symmetry scoring: polygon booleans (gdsfactory xor) versus the raster in glayout.util.symmetry.
+
+The layout is a sky130 cell (--cell) tiled --tiles x --tiles times around the origin with one tile left out, or a
+GDS file (--gds) for layouts which take long to build (e.g. `opamp`, `super_class_AB_OTA`). Both methods score the
+same component, the raster at every --resolution. Cells which fail to build are reported and skipped.
+Run from the repository root (PDK_ROOT must be set):
+
+    python tests/benchmarks/bench_symmetry.py [--cell diff_pair] [--tiles 1 4 8] [--gds layout.gds ...]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+
+def build_cell(name: str):
+    from glayout import sky130
+
+    if name == "diff_pair":
+        from glayout.cells.elementary.diff_pair import diff_pair
+
+        return diff_pair(sky130)
+    if name == "nmos":
+        from glayout import nmos
+
+        return nmos(sky130, fingers=8, multipliers=2, with_dummy=True)
+    if name == "opamp":
+        from glayout.cells.composite.opamp.opamp import opamp
+
+        return opamp(sky130)
+    if name == "super_class_AB_OTA":
+        from glayout.cells.composite.fvf_based_ota.ota import super_class_AB_OTA
+
+        return super_class_AB_OTA(sky130)
+    raise ValueError(f"unknown cell {name!r}")
+
+
+def tiled(cell, tiles: int):
+    import gdsfactory as gf
+
+    if tiles == 1:
+        return cell
+    top = gf.Component(f"{cell.name}_tiled_{tiles}")
+    pitch_x, pitch_y = cell.xsize + 1.0, cell.ysize + 1.0
+    for i in range(tiles):
+        for j in range(tiles):
+            # one missing tile keeps the layout asymmetric
+            if (i, j) == (tiles - 1, tiles - 1):
+                continue
+            top.add_ref(cell).movex((i - (tiles - 1) / 2) * pitch_x).movey((j - (tiles - 1) / 2) * pitch_y)
+    return top.flatten()
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def bench(label: str, component, resolutions: list[float], skip_boolean: bool) -> None:
+    from glayout.verification.physical_features import calculate_symmetry_scores
+
+    polygons = sum(len(layer) for layer in component.get_polygons(by_spec=True).values())
+    print(f"{label}: {polygons} polygons, {component.xsize:.1f} x {component.ysize:.1f} um")
+    if not skip_boolean:
+        scores, elapsed, peak = measure(lambda: calculate_symmetry_scores(component, method="boolean"))
+        print(f"  {'boolean':<16} {elapsed:8.2f}s {peak:8.1f} MiB  h={scores[0]:.6f} v={scores[1]:.6f}")
+    for resolution in resolutions:
+        scores, elapsed, peak = measure(lambda: calculate_symmetry_scores(component, resolution=resolution))
+        print(f"  {f'raster {resolution}um':<16} {elapsed:8.2f}s {peak:8.1f} MiB  h={scores[0]:.6f} v={scores[1]:.6f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cell", nargs="*", default=["diff_pair"])
+    parser.add_argument("--tiles", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--gds", nargs="*", default=[])
+    parser.add_argument("--resolution", type=float, nargs="+", default=[0.005, 0.02])
+    parser.add_argument("--skip-boolean", action="store_true", help="only run the raster (the boolean can take minutes)")
+    args = parser.parse_args()
+
+    for name in args.cell:
+        start = time.perf_counter()
+        try:
+            cell = build_cell(name)
+        except Exception as error:
+            print(f"{name}: build failed after {time.perf_counter() - start:.1f}s, {type(error).__name__}: {error}")
+            continue
+        for tiles in args.tiles:
+            bench(f"{name} x{tiles * tiles - (tiles > 1)}", tiled(cell, tiles), args.resolution, args.skip_boolean)
+    for path in args.gds:
+        import gdsfactory as gf
+
+        bench(path, gf.import_gds(path), args.resolution, args.skip_boolean)
+
+
+if __name__ == "__main__":
+    main()
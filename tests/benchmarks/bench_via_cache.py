@@ -0,0 +1,57 @@
+"""Benchmark via-heavy cells with the per-PDK via cache enabled and disabled.
+
+Run from the repository root (PDK_ROOT must be set for the mapped PDKs):
+
+    python tests/benchmarks/bench_via_cache.py [--pdk gf180] [--fingers 8]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+warnings.filterwarnings("ignore")
+
+import glayout
+from glayout.util.component_cache import DEFAULT_MAXSIZE, clear_component_cache, get_component_cache
+
+
+def build(pdk, fingers: int) -> float:
+    from glayout.cells import current_mirror, diff_pair
+
+    start = time.perf_counter()
+    glayout.nmos(pdk, fingers=fingers, multipliers=2)
+    glayout.pmos(pdk, fingers=fingers)
+    diff_pair(pdk)
+    current_mirror(pdk)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pdk", default="gf180", choices=["gf180", "sky130"])
+    parser.add_argument("--fingers", type=int, default=8)
+    args = parser.parse_args()
+    pdk = getattr(glayout, args.pdk)
+    if pdk is None:
+        raise SystemExit(f"{args.pdk} is not available (is PDK_ROOT set?)")
+    cache = get_component_cache(pdk)
+    build(pdk, 1)  # warm up imports and pdk activation
+    for label, maxsize in (("cache disabled", 0), ("cache enabled", DEFAULT_MAXSIZE)):
+        clear_component_cache(pdk)
+        cache.maxsize = maxsize
+        elapsed = build(pdk, args.fingers)
+        print(f"{label:<15} {elapsed:8.2f} s  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""rectangle fixtures shared by the regression tests"""
+from __future__ import annotations
+
+import numpy as np
+from gdsfactory.component import Component
+
+
+def rectangle_points(x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+    return np.array([(x0, y0), (x1, y0), (x1, y1), (x0, y1)])
+
+
+def rectangle(size: tuple[float, float], layer=(1, 0), name: str = "rect") -> Component:
+    comp = Component(name)
+    comp.add_polygon(rectangle_points(0, 0, *size), layer=layer)
+    return comp
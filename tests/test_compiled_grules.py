@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from decimal import Decimal
+import importlib
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.pdk.compiled_grules import CompiledGRules, compile_grules
+from glayout.pdk.mappedpdk import MappedPDK
+
+
+GRULES_MODULES = (
+    "glayout.pdk.sky130_mapped.sky130_grules",
+    "glayout.pdk.gf180_mapped.gf180_grules",
+    "glayout.pdk.ihp130_mapped.ihp130_grules",
+)
+
+
+def reference_lookup(grules, glayer1, glayer2=None):
+    if glayer2 is None:
+        return grules.get(glayer1, dict()).get(glayer1)
+    rules_dict = grules.get(glayer1, dict()).get(glayer2)
+    if rules_dict is None or rules_dict == {}:
+        rules_dict = grules.get(glayer2, dict()).get(glayer1)
+    return rules_dict
+
+
+class CompiledGRulesTests(unittest.TestCase):
+    def test_matches_dict_walk_for_every_pair(self) -> None:
+        for module_name in GRULES_MODULES:
+            grules = importlib.import_module(module_name).grulesobj
+            table = CompiledGRules(grules, MappedPDK.valid_glayers)
+            for glayer1 in MappedPDK.valid_glayers:
+                for glayer2 in (None, *MappedPDK.valid_glayers):
+                    expected = reference_lookup(grules, glayer1, glayer2)
+                    if not expected:
+                        with self.assertRaises(NotImplementedError):
+                            table.get(glayer1, glayer2)
+                    else:
+                        self.assertEqual(dict(table.get(glayer1, glayer2)), expected)
+
+    def test_decimal_view(self) -> None:
+        grules = {"met1": {"met1": {"min_width": 0.17, "layer": (68, 20)}}}
+        rules = CompiledGRules(grules).get("met1", return_decimal=True)
+        self.assertEqual(rules["min_width"], Decimal("0.17"))
+        self.assertEqual(rules["layer"], (68, 20))
+
+    def test_table_is_read_only(self) -> None:
+        grules = {"met1": {"met1": {"min_width": 0.17}}}
+        table = CompiledGRules(grules)
+        with self.assertRaises(TypeError):
+            table.get("met1")["min_width"] = 1.0
+        with self.assertRaises(AttributeError):
+            table._float_rules = {}
+        grules["met1"]["met1"]["min_width"] = 1.0
+        self.assertEqual(table.get("met1")["min_width"], 0.17)
+
+    def test_invalid_glayer(self) -> None:
+        table = CompiledGRules({"met1": {"met1": {"min_width": 0.17}}}, MappedPDK.valid_glayers)
+        with self.assertRaises(ValueError):
+            table.get("met9")
+        with self.assertRaises(ValueError):
+            table.get("met1", "met9")
+
+    def test_compile_grules_builds_once(self) -> None:
+        grules = {"met1": {"met1": {"min_width": 0.17}}}
+        self.assertIs(compile_grules(grules), compile_grules(grules))
+        self.assertIsNot(compile_grules(grules), compile_grules(dict(grules)))
+
+
+if __name__ == "__main__":
+    unittest.main()
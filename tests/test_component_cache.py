@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from gdsfactory.component import Component
+from glayout.util.component_cache import ComponentCache, clear_component_cache, get_component_cache, pdk_cached
+
+
+class FakePdk:
+    name = "fake"
+
+
+class ComponentCacheTests(unittest.TestCase):
+    def test_lru_eviction_and_counters(self) -> None:
+        cache = ComponentCache(maxsize=2)
+        a, b, c = Component(), Component(), Component()
+        cache.put("a", a)
+        cache.put("b", b)
+        self.assertIs(cache.get("a"), a)
+        cache.put("c", c)
+        self.assertIsNone(cache.get("b"))
+        self.assertIs(cache.get("c"), c)
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2})
+
+    def test_maxsize_zero_disables(self) -> None:
+        cache = ComponentCache(maxsize=0)
+        cache.put("a", Component())
+        self.assertEqual(len(cache), 0)
+
+    def test_pdk_cached_shares_results(self) -> None:
+        calls = []
+
+        @pdk_cached
+        def generator(pdk, glayer1: str, size: tuple = (1.0, 1.0)):
+            calls.append((glayer1, size))
+            return Component()
+
+        pdk, other_pdk = FakePdk(), FakePdk()
+        first = generator(pdk, "met1", size=[1.0, 1.0])
+        self.assertIs(generator(pdk, glayer1="met1"), first)
+        self.assertIsNot(generator(pdk, "met2"), first)
+        self.assertIsNot(generator(other_pdk, "met1"), first)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(get_component_cache(pdk).stats()["hits"], 1)
+        clear_component_cache(pdk)
+        self.assertEqual(len(get_component_cache(pdk)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
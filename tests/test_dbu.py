@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import sys
+from decimal import ROUND_UP, Decimal
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from glayout.util.comp_utils import to_decimal
+from glayout.util.dbu import (
+    round_div,
+    snap_nearest_array,
+    snap_up,
+    snap_up_array,
+    to_dbu,
+    to_dbu_up,
+    to_dbu_up_array,
+    to_um_decimal,
+)
+
+
+def _values(count: int) -> list[float]:
+    rng = random.Random(0)
+    values = [round(rng.uniform(-50, 50), rng.randint(0, 6)) for _ in range(count)]
+    # sums with float noise, as rule arithmetic produces them (0.17 + 0.12 = 0.29000000000000004)
+    values += [0.17 + 0.12 * rng.randint(0, 9) + 0.06 * rng.randint(0, 9) for _ in range(count)]
+    return values
+
+
+class DbuTests(unittest.TestCase):
+    def test_snap_up_matches_decimal_round_up(self) -> None:
+        for value in _values(2000):
+            for grid in (1, 10, 20):
+                expected = (Decimal(str(value)) * 1000 / grid).quantize(1, rounding=ROUND_UP) * grid
+                self.assertEqual(snap_up(to_dbu_up(value), grid), expected, (value, grid))
+
+    def test_round_div_rounds_halves_to_even(self) -> None:
+        for dbu in range(-60, 61):
+            for divisor in (2, 5, 10):
+                self.assertEqual(round_div(dbu, divisor), int(np.round(dbu / divisor)), (dbu, divisor))
+
+    def test_array_variants_match_scalars(self) -> None:
+        values = _values(500)
+        dbu = to_dbu_up_array(values)
+        self.assertEqual(dbu.tolist(), [to_dbu_up(value) for value in values])
+        self.assertEqual(snap_up_array(dbu, 10).tolist(), [snap_up(int(value), 10) for value in dbu])
+        self.assertEqual(snap_nearest_array(dbu, 5).tolist(), [round_div(int(value), 5) * 5 for value in dbu])
+
+    def test_decimal_round_trip(self) -> None:
+        self.assertEqual(to_um_decimal(to_dbu(2.53)), Decimal("2.53"))
+        self.assertEqual(to_um_decimal(-10), Decimal("-0.01"))
+
+    def test_to_decimal_stays_exact(self) -> None:
+        # to_decimal is not snapped to the dbu
+        self.assertEqual(to_decimal(0.0004), Decimal("0.0004"))
+        self.assertEqual(to_decimal((0.29000000000000004, 2, "x")), [Decimal("0.29000000000000004"), Decimal("2"), "x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout import gf180, sky130
+from glayout.pdk.derived_constants import glayer_level
+from glayout.primitives.via_gen import via_stack
+from glayout.util.comp_utils import evaluate_bbox
+
+BOTTOM_GLAYERS = ("poly", "active_diff", "active_tap", "met1", "met2", "met3", "met4")
+TOP_GLAYERS = ("met1", "met2", "met3", "met4", "met5")
+
+
+def _stacks():
+    for glayer1 in BOTTOM_GLAYERS:
+        for glayer2 in TOP_GLAYERS:
+            if glayer_level(glayer1) < glayer_level(glayer2):
+                yield glayer1, glayer2
+
+
+@unittest.skipUnless(sky130 is not None and gf180 is not None, "needs PDK_ROOT")
+class DerivedConstantsTests(unittest.TestCase):
+    def test_table_matches_the_via_stacks(self) -> None:
+        for pdk in (sky130, gf180):
+            table = pdk.derived_constants
+            for glayer1, glayer2 in _stacks():
+                stack = via_stack(pdk, glayer1, glayer2)
+                self.assertEqual(table.via_stack_size(glayer1, glayer2), evaluate_bbox(stack)[0], (pdk.name, glayer1, glayer2))
+                for glayer, size in table.via_stack_layers(glayer1, glayer2):
+                    # the layer sizes are raw rule arithmetic, via_stack snaps them
+                    self.assertAlmostEqual(size, evaluate_bbox(stack, layer=pdk.get_glayer(glayer))[0], places=6, msg=(pdk.name, glayer1, glayer2, glayer))
+            with self.assertRaises(ValueError):
+                table.via_stack_size("met2", "met2")
+
+    def test_rule_derived_entries(self) -> None:
+        for pdk in (sky130, gf180):
+            table = pdk.derived_constants
+            metals = ["met" + str(level) for level in range(1, 6)]
+            self.assertEqual(table.max_separation(metals), pdk.snap_to_2xgrid(max(pdk.get_grule(met)["min_separation"] for met in metals)))
+            self.assertEqual(pdk.util_max_metal_seperation(), table.max_separation(metals))
+            self.assertEqual(table.min_fet_length, pdk.get_grule("poly")["min_width"])
+            self.assertGreaterEqual(table.min_fet_width, pdk.get_grule("active_diff")["min_width"])
+            self.assertGreaterEqual(table.tap_width, pdk.get_grule("mcon")["width"])
+            spacing, top_enclosure = table.via_stack_min_separation("met1", "met3")
+            sizes = dict(table.via_stack_layers("met1", "met3"))
+            for glayer in ("met1", "via1", "met2", "via2"):
+                self.assertGreaterEqual(spacing, sizes[glayer] + pdk.get_grule(glayer)["min_separation"] - 1e-9)
+            self.assertEqual(top_enclosure, pdk.snap_to_2xgrid(2 * pdk.get_grule("met3", "via2")["min_enclosure"]))
+
+    def test_table_is_filled_once_and_rebuilt_with_the_rules(self) -> None:
+        pdk = sky130.model_copy()
+        table = pdk.derived_constants
+        self.assertIs(pdk.derived_constants, table)
+        self.assertEqual(len(table), 0)
+        size = table.via_stack_size("met1", "met2")
+        filled = len(table)
+        self.assertGreater(filled, 0)
+        self.assertEqual(table.via_stack_size("met1", "met2"), size)
+        self.assertEqual(len(table), filled)
+        # the table of the copy is not the one of sky130
+        self.assertIsNot(sky130.derived_constants, table)
+        grules = {glayer: dict(rules) for glayer, rules in pdk.grules.items()}
+        grules["via1"]["via1"] = dict(grules["via1"]["via1"], width=2 * grules["via1"]["via1"]["width"])
+        pdk.grules = grules
+        self.assertIsNot(pdk.derived_constants, table)
+        self.assertGreater(pdk.derived_constants.via_stack_size("met1", "met2"), size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.drc_reports import iter_magic_drc_violations, summarize_lyrdb, summarize_magic_drc_report
+
+
+SEPARATOR = "----------------------------------------"
+MAGIC_REPORT = f"""top count: 3
+{SEPARATOR}
+Metal1 spacing < 0.14um (met1.2)
+{SEPARATOR}
+ 0.000um 0.000um 0.100um 0.100um
+ 1.000um 1.000um 1.100um 1.100um
+{SEPARATOR}
+Via overlap (via.4a)
+{SEPARATOR}
+ 2.000um 2.000um 2.100um 2.100um
+{SEPARATOR}
+
+"""
+
+LYRDB = """<?xml version="1.0" encoding="utf-8"?>
+<report-database>
+ <description>DRC</description>
+ <original-file/>
+ <generator/>
+ <top-cell>top</top-cell>
+ <tags/>
+ <categories><category><name>m1.1</name></category><category><name>m1.2</name></category></categories>
+ <cells><cell><name>top</name></cell></cells>
+ <items>
+{items}
+ </items>
+</report-database>
+"""
+
+
+def lyrdb_item(category: str) -> str:
+    return f"  <item><tags/><category>'{category}'</category><cell>top</cell><visited>false</visited><multiplicity>1</multiplicity><values><value>box: (0,0;1,1)</value></values></item>"
+
+
+class DRCReportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_magic_report_counts(self) -> None:
+        report = self.root / "top.rpt"
+        report.write_text(MAGIC_REPORT)
+        self.assertEqual(len(list(iter_magic_drc_violations(report))), 3)
+        summary = summarize_magic_drc_report(report)
+        self.assertFalse(summary["is_pass"])
+        self.assertEqual(summary["total_errors"], 3)
+        self.assertEqual(summary["rule_counts"], {"Metal1 spacing < 0.14um (met1.2)": 2, "Via overlap (via.4a)": 1})
+        self.assertEqual(summary["error_details"][2], {"rule": "Via overlap (via.4a)", "details": "2.000um 2.000um 2.100um 2.100um"})
+        self.assertTrue(summarize_magic_drc_report(f"top count: 0\n{SEPARATOR}\n\n".splitlines())["is_pass"])
+
+    def test_magic_report_error_budget(self) -> None:
+        summary = summarize_magic_drc_report(MAGIC_REPORT.splitlines(), error_budget=0, max_details=0)
+        self.assertEqual((summary["is_pass"], summary["total_errors"], summary["truncated"]), (False, 1, True))
+        self.assertEqual(summary["error_details"], [])
+
+    def test_lyrdb(self) -> None:
+        report = self.root / "top.lyrdb"
+        report.write_text(LYRDB.format(items="\n".join(lyrdb_item(rule) for rule in ["m1.1", "m1.2", "m1.1"])))
+        summary = summarize_lyrdb(report)
+        self.assertEqual((summary["is_pass"], summary["total_errors"]), (False, 3))
+        self.assertEqual(summary["rule_counts"], {"m1.1": 2, "m1.2": 1})
+        self.assertEqual(summarize_lyrdb(report, error_budget=0)["total_errors"], 1)
+        report.write_text(LYRDB.format(items=""))
+        self.assertTrue(summarize_lyrdb(report)["is_pass"])
+        report.write_text("<other/>")
+        with self.assertRaises(TypeError):
+            summarize_lyrdb(report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import subprocess
 import sys
 from pathlib import Path
 import unittest
@@ -46,6 +47,24 @@ class ImportPathRegressionTests(unittest.TestCase):
         self.assertIs(blocks.current_mirror, cells.current_mirror)
         self.assertIs(blocks.transmission_gate, cells.transmission_gate)
 
+    def test_package_import_is_lazy(self) -> None:
+        code = (
+            "import sys; import glayout; "
+            "assert 'gdsfactory' not in sys.modules, 'import glayout imported gdsfactory'; "
+            "from glayout import Netlist; "
+            "assert 'gdsfactory' not in sys.modules, 'Netlist imported gdsfactory'; "
+            "assert callable(glayout.nmos) and 'nmos' in dir(glayout)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=SRC_ROOT, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_unknown_attribute(self) -> None:
+        glayout = importlib.import_module("glayout")
+        with self.assertRaises(AttributeError):
+            glayout.not_a_glayout_function
+
 
 if __name__ == "__main__":
     unittest.main()
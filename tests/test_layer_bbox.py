@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from gdsfactory.component import Component
+from gdsfactory.functions import transformed
+from glayout.util.layer_bbox import layer_bbox
+
+
+def _cell(name: str) -> Component:
+    comp = Component(name)
+    comp.add_polygon([(0, 0), (2, 0), (2, 1), (0, 1)], layer=(1, 0))
+    comp.add_polygon([(0.5, -1), (1, -1), (1, 3), (0.5, 3)], layer=(2, 0))
+    return comp
+
+
+class LayerBboxTests(unittest.TestCase):
+    def test_matches_extract_for_moved_references_and_arrays(self) -> None:
+        child = _cell("lb_child")
+        top = Component("lb_top")
+        ref = top << child
+        ref.rotate(90).mirror_x().movex(3.5)
+        top.add_array(child, columns=3, rows=2, spacing=(4, 5))
+        for layer in ((1, 0), (2, 0), (3, 0)):
+            np.testing.assert_allclose(layer_bbox(top, layer), top.extract([layer]).bbox, atol=1e-9)
+            np.testing.assert_allclose(layer_bbox(ref, layer), transformed(ref).extract([layer]).bbox, atol=1e-9)
+        np.testing.assert_allclose(layer_bbox(top, [(1, 0), (2, 0)]), top.bbox)
+
+    def test_changes_invalidate_the_cache(self) -> None:
+        child = _cell("lb_child_mutable")
+        top = Component("lb_top_mutable")
+        ref = top << child
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[0, 0], [2, 1]])
+        ref.movex(10)
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[10, 0], [12, 1]])
+        child.add_polygon([(0, 0), (1, 0), (1, 7), (0, 7)], layer=(1, 0))
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[10, 0], [12, 7]])
+        top.add_polygon([(-1, -1), (0, -1), (0, 0), (-1, 0)], layer=(1, 0))
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[-1, -1], [12, 7]])
+
+    def test_polygons_edited_in_place_invalidate_the_cache(self) -> None:
+        child = _cell("lb_child_edited")
+        top = Component("lb_top_edited")
+        top << child
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[0, 0], [2, 1]])
+        polygon = child._cell.polygons[0]
+        polygon.translate(0, 5)
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), [[0, 5], [2, 6]])
+        polygon.scale(2)
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), top.extract([(1, 0)]).bbox)
+        polygon.layer = 3
+        np.testing.assert_allclose(layer_bbox(top, (1, 0)), np.zeros((2, 2)))
+        np.testing.assert_allclose(layer_bbox(top, (3, 0)), top.extract([(3, 0)]).bbox)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.verification.magic_session import MagicSessionPool
+
+
+# stand-in for an interactive magic: reads commands from stdin until it is closed, answers the done marker.
+# every start is logged, designs named crash_* kill the process and hang_* never answer
+STUB_MAGIC = """\
+#!{python}
+import os, re, sys, time
+with open(os.environ["STUB_MAGIC_LOG"], "a") as log:
+    log.write("start\\n")
+gds = None
+for line in sys.stdin:
+    line = line.strip()
+    match = re.match(r"gds read \\{{(.*)\\}}$", line)
+    if match:
+        gds = match.group(1)
+    match = re.match(r"custom_drc_save_report \\{{(\\S+)\\}} \\{{(\\S+)\\}}$", line)
+    if match:
+        design, report = match.groups()
+        if design.startswith("crash"):
+            sys.exit(3)
+        if design.startswith("hang"):
+            time.sleep(60)
+        errors = open(gds).read().count("bad")
+        with open(report, "w") as f:
+            f.write(design + " count: " + str(errors) + "\\n----------------------------------------\\n")
+            if errors:
+                f.write("spacing\\n----------------------------------------\\n 0.000um 0.000um 1.000um 1.000um\\n")
+    match = re.match(r'puts stdout "(__GLAYOUT_DONE__ \\S+) \\$glayout_status"', line)
+    if match:
+        print(match.group(1) + " 0", flush=True)
+"""
+
+
+class MagicSessionPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.magic = self.root / "magic"
+        self.magic.write_text(STUB_MAGIC.format(python=sys.executable))
+        self.magic.chmod(self.magic.stat().st_mode | stat.S_IEXEC)
+        self.log = self.root / "starts.log"
+        os.environ["STUB_MAGIC_LOG"] = str(self.log)
+        self.pdk = SimpleNamespace(name="sky130", pdk_files={"pdk_root": str(self.root), "magic_drc_file": str(self.root / "magicrc")})
+
+    def tearDown(self) -> None:
+        os.environ.pop("STUB_MAGIC_LOG", None)
+        self.tmp.cleanup()
+
+    def _designs(self, names):
+        designs = list()
+        for name in names:
+            gds = self.root / f"{name}.gds"
+            gds.write_text("bad" if name.startswith("bad") else "good")
+            designs.append((gds, name))
+        return designs
+
+    def _pool(self, **kwargs) -> MagicSessionPool:
+        return MagicSessionPool(self.pdk, magic=str(self.magic), use_cache=False, **kwargs)
+
+    def test_sessions_stay_warm(self) -> None:
+        names = [f"cell{i}" for i in range(12)] + ["bad_cell"]
+        with self._pool(size=2) as pool:
+            results = dict(pool.run(self._designs(names), output_dir=self.root / "out"))
+        self.assertEqual(set(results), set(names))
+        self.assertTrue(all(results[name]["is_pass"] for name in names[:-1]))
+        self.assertEqual(results["bad_cell"]["status"], "fail")
+        self.assertEqual(results["bad_cell"]["summary"]["total_errors"], 1)
+        self.assertTrue((self.root / "out" / "drc" / "cell3" / "cell3.rpt").is_file())
+        self.assertLessEqual(len(self.log.read_text().split()), 2)
+
+    def test_crash_and_timeout_restart_worker(self) -> None:
+        with self._pool(size=1, timeout=2) as pool:
+            results = dict(pool.run(self._designs(["crash_cell", "hang_cell", "after"])))
+        self.assertTrue(results["crash_cell"]["status"].startswith("error"))
+        self.assertEqual(results["hang_cell"]["status"], "timeout")
+        self.assertEqual(results["after"]["status"], "pass")
+        self.assertEqual(pool.restarts, 2)
+        self.assertEqual(len(self.log.read_text().split()), 3)
+
+    def test_recycle_after(self) -> None:
+        with self._pool(size=1, recycle_after=2) as pool:
+            results = dict(pool.run(self._designs(["a", "b", "c", "d", "e"])))
+        self.assertTrue(all(result["is_pass"] for result in results.values()))
+        self.assertEqual(len(self.log.read_text().split()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from glayout import gf180, sky130
+from glayout.primitives.fet import multiplier
+
+
+def _boxes(comp, layer) -> list:
+    return [(polygon[:, 0].min(), polygon[:, 1].min(), polygon[:, 0].max(), polygon[:, 1].max()) for polygon in comp.get_polygons(by_spec=True)[layer]]
+
+
+@unittest.skipUnless(sky130 is not None and gf180 is not None, "needs PDK_ROOT")
+class MultiplierRoutesTests(unittest.TestCase):
+    def test_every_finger_is_routed(self) -> None:
+        for pdk in (sky130, gf180):
+            for fingers in (1, 2, 5):
+                comp = multiplier(pdk, "n+s/d", fingers=fingers, width=2, dummy=False, sd_route_extension=0.2)
+                sd_ports = [comp.ports["leftsd_top_met_N"]] + [comp.ports[f"row0_col{finger}_rightsd_top_met_N"] for finger in range(fingers)]
+                # the (square) met2 pads of the s/d via stacks, above the diffusion, alternating in height
+                pads = [box for box in _boxes(comp, pdk.get_glayer("met2")) if box[1] > 1 and np.isclose(box[2] - box[0], box[3] - box[1])]
+                self.assertEqual(len(pads), fingers + 1, (pdk.name, fingers))
+                pads.sort()
+                for index, (port, pad) in enumerate(zip(sd_ports, pads)):
+                    self.assertAlmostEqual((pad[0] + pad[2]) / 2, port.center[0], places=6)
+                    self.assertAlmostEqual(pad[1], pads[index % 2][1], places=6)
+                self.assertGreater(pads[1][1], pads[0][1])
+                # a met1 route from every s/d region up to its via stack
+                routes = {round((box[0] + box[2]) / 2, 4) for box in _boxes(comp, pdk.get_glayer("met1")) if np.isclose(box[1], 1)}
+                self.assertTrue({round(port.center[0], 4) for port in sd_ports} <= routes, (pdk.name, fingers))
+                # a poly route from every gate down to the gate via array
+                gate_routes = {round((box[0] + box[2]) / 2, 4) for box in _boxes(comp, pdk.get_glayer("poly")) if box[3] < comp.ports["row0_col0_gate_S"].center[1] + 1e-6}
+                gates = {round(comp.ports[f"row0_col{finger}_gate_S"].center[0], 4) for finger in range(fingers)}
+                self.assertTrue(gates <= gate_routes, (pdk.name, fingers))
+                self.assertEqual(comp.ports["source_W"].center[0], pads[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
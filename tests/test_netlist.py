@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.spice import Netlist
+
+
+def _fet() -> Netlist:
+    return Netlist(
+        circuit_name="NMOS",
+        nodes=["D", "G", "S", "B"],
+        source_netlist=".subckt {circuit_name} {nodes} l=0.15 w={width} m=1\n.ends {circuit_name}",
+        instance_format="X{name} {nodes} {circuit_name} l=0.15 w={width} m=1",
+        parameters={"width": 1},
+    )
+
+
+class NetlistCopyOnWriteTests(unittest.TestCase):
+    def test_connected_netlist_is_a_snapshot(self) -> None:
+        cell = Netlist(circuit_name="CELL", nodes=["A", "B"])
+        cell.connect_netlist(_fet(), [("D", "A"), ("S", "B")])
+        top = Netlist(circuit_name="TOP", nodes=["IN", "OUT"])
+        top.connect_netlist(cell, [("A", "IN"), ("B", "OUT")])
+        before = top.generate_netlist()
+
+        cell.connect_netlist(_fet(), [("D", "B"), ("S", "A")])
+        cell.parameters["extra"] = 1
+        self.assertEqual(len(top.sub_netlists[0].sub_netlists), 1)
+        self.assertNotIn("extra", top.sub_netlists[0].parameters)
+        self.assertEqual(top.generate_netlist(), before)
+
+    def test_generate_does_not_touch_the_original(self) -> None:
+        cell = Netlist(circuit_name="CELL", nodes=["A", "B"])
+        cell.connect_netlist(_fet(), [("D", "A"), ("S", "B")])
+        top = Netlist(circuit_name="TOP", nodes=["IN", "OUT"])
+        top.connect_netlist(cell, [("A", "IN"), ("B", "OUT")])
+        top.connect_netlist(cell, [("A", "OUT"), ("B", "IN")])
+        top.generate_netlist()
+        self.assertEqual(cell.sub_netlists[0].circuit_name, "NMOS")
+        self.assertIsNot(top.sub_netlists[0].sub_netlists[0], top.sub_netlists[1].sub_netlists[0])
+
+
+class NetlistEmissionTests(unittest.TestCase):
+    def test_unique_subcircuits_and_suffixes(self) -> None:
+        cell = Netlist(circuit_name="CELL", nodes=["A", "B"])
+        cell.connect_netlist(_fet(), [("D", "A"), ("S", "B")])
+        wide = _fet()
+        wide.parameters["width"] = 2
+        top = Netlist(circuit_name="TOP", nodes=["IN", "OUT"])
+        top.connect_netlist(cell, [("A", "IN")])
+        top.connect_netlist(cell, [("B", "OUT")])
+        top.connect_netlist(wide, [("D", "OUT")])
+        self.assertEqual(
+            top.generate_netlist(),
+            ".subckt NMOS D G S B l=0.15 w=1 m=1\n.ends NMOS\n\n"
+            ".subckt CELL A B\nX0 A G B B NMOS l=0.15 w=1 m=1\n.ends CELL\n\n"
+            ".subckt NMOS_1 D G S B l=0.15 w=2 m=1\n.ends NMOS_1\n\n"
+            ".subckt TOP IN OUT\nX0 IN B CELL\nX1 A OUT CELL\nX2 OUT G S B NMOS_1 l=0.15 w=2 m=1\n.ends TOP",
+        )
+
+    def test_write_netlist_matches_generate(self) -> None:
+        top = Netlist(circuit_name="TOP", nodes=["IN", "OUT"])
+        top.global_nodes = ["VDD"]
+        top.connect_netlist(_fet(), [("D", "OUT"), ("G", "IN")])
+        stream = io.StringIO()
+        top.write_netlist(stream)
+        self.assertEqual(stream.getvalue(), top.generate_netlist())
+        self.assertTrue(stream.getvalue().startswith(".global VDD\n\n"))
+
+
+class NetlistConnectivityTests(unittest.TestCase):
+    def test_connecting_two_wires_merges_them(self) -> None:
+        top = Netlist(circuit_name="TOP", nodes=["IN"])
+        refs = [top.connect_netlist(_fet(), []) for _ in range(4)]
+        top.connect_subnets(refs[0], refs[1], [("D", "S")])
+        top.connect_subnets(refs[2], refs[3], [("D", "S")])
+        top.connect_subnets(refs[1], refs[2], [("S", "D")])
+        connections = top.netlist_connections
+        self.assertEqual({connections[0][0], connections[1][2], connections[2][0], connections[3][2]}, {"wire0"})
+
+    def test_top_level_node_names_the_net(self) -> None:
+        top = Netlist(circuit_name="TOP", nodes=["IN"])
+        first = top.connect_netlist(_fet(), [])
+        second = top.connect_netlist(_fet(), [])
+        top.connect_subnets(first, second, [("G", "G")])
+        top.connect_node(second, [("G", "IN")])
+        self.assertEqual(top.netlist_connections[0][1], "IN")
+        self.assertEqual(top.netlist_connections[1][1], "IN")
+        self.assertEqual(top.netlist_connections[0][0], "D")
+
+    def test_connecting_two_top_level_nodes_raises(self) -> None:
+        top = Netlist(circuit_name="TOP", nodes=["VSS", "X"])
+        first = top.connect_netlist(_fet(), [("S", "VSS")])
+        second = top.connect_netlist(_fet(), [("S", "X")])
+        with self.assertRaises(ValueError):
+            top.connect_subnets(first, second, [("S", "S")])
+        with self.assertRaises(ValueError):
+            top.connect_node(first, [("S", "X")])
+        self.assertEqual(top.netlist_connections[0][2], "VSS")
+        self.assertEqual(top.netlist_connections[1][2], "X")
+        # both nodes on the same top-level node stay on it
+        third = top.connect_netlist(_fet(), [("S", "VSS")])
+        top.connect_subnets(first, third, [("S", "S")])
+        self.assertEqual(top.netlist_connections[2][2], "VSS")
+
+    def test_node_of_a_top_level_node_moves_to_the_wire(self) -> None:
+        top = Netlist(circuit_name="TOP", nodes=["VSS"])
+        first = top.connect_netlist(_fet(), [("D", "VSS")])
+        second = top.connect_netlist(_fet(), [])
+        other = top.connect_netlist(_fet(), [("D", "VSS")])
+        top.connect_subnets(first, second, [("D", "S")])
+        self.assertIn("X0 wire0 G S B NMOS", top.generate_netlist())
+        self.assertEqual(top.netlist_connections[1][2], "wire0")
+        self.assertEqual(top.netlist_connections[other][0], "VSS")
+        # the node of the other side moves when it is the one on the top-level node
+        top.connect_subnets(second, other, [("D", "D")])
+        self.assertEqual(top.netlist_connections[other][0], "wire1")
+
+    def test_connect_by_reference(self) -> None:
+        fet = _fet()
+        cell = Netlist(circuit_name="CELL", nodes=["A"], sub_netlists=[fet, _fet()])
+        Netlist(circuit_name="TOP", nodes=["A"]).connect_netlist(cell, [])
+        cell.connect_subnets(fet, 1, [("D", "D")])
+        cell.connect_node(fet, [("G", "A")])
+        self.assertEqual(cell.netlist_connections[0][:2], ["wire0", "A"])
+        with self.assertRaises(ValueError):
+            cell.connect_node(_fet(), [("G", "A")])
+
+    def test_connect_by_detached_sub_netlist(self) -> None:
+        fet = _fet()
+        cell = Netlist(circuit_name="CELL", nodes=["A"], sub_netlists=[fet, _fet()])
+        Netlist(circuit_name="TOP", nodes=["A"]).connect_netlist(cell, [])
+        # the first change detaches cell, its sub_netlists are copies from then on
+        cell.connect_node(fet, [("G", "A")])
+        detached = cell.sub_netlists[0]
+        self.assertIsNot(detached, fet)
+        cell.connect_subnets(detached, cell.sub_netlists[1], [("D", "D")])
+        cell.connect_node(detached, [("S", "A")])
+        self.assertEqual(cell.netlist_connections[0][:3], ["wire0", "A", "A"])
+        self.assertEqual(cell.netlist_connections[1][0], "wire0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from gdsfactory.component import Component
+from glayout.pdk.sky130_mapped.sky130_add_npc import npc_neighbour_pairs, sky130_add_npc
+
+
+def _square(comp: Component, x: float, y: float, size: float, layer) -> None:
+    comp.add_polygon([(x, y), (x + size, y), (x + size, y + size), (x, y + size)], layer=layer)
+
+
+class NpcTests(unittest.TestCase):
+    def test_neighbour_pairs_match_pairwise_check(self) -> None:
+        centers = np.round(np.random.default_rng(0).uniform(-4, 4, (300, 2)), 3)
+        first, second = npc_neighbour_pairs(centers)
+        close = np.all(np.abs(centers[:, None] - centers[None, :]) < 0.64, axis=2)
+        expected = set(zip(*np.nonzero(np.triu(close, k=1))))
+        self.assertEqual(set(zip(first.tolist(), second.tolist())), expected)
+
+    def test_close_contacts_share_one_npc_polygon(self) -> None:
+        comp = Component("npc_row")
+        comp.add_polygon([(-1, -1), (10, -1), (10, 1), (-1, 1)], layer=(66, 20))
+        # a row of contacts 0.5 apart and one far away
+        for x in (0.0, 0.5, 1.0):
+            _square(comp, x, 0, 0.17, (66, 44))
+        _square(comp, 5.0, 0, 0.17, (66, 44))
+        sky130_add_npc(comp)
+        npc = sorted(comp.get_polygons(by_spec=(95, 20)), key=lambda points: points[:, 0].min())
+
+        self.assertEqual(len(npc), 2)
+        np.testing.assert_allclose(npc[0].min(axis=0), (-0.1, -0.1))
+        np.testing.assert_allclose(npc[0].max(axis=0), (1.27, 0.27))
+        np.testing.assert_allclose(npc[1].min(axis=0), (4.9, -0.1))
+        np.testing.assert_allclose(npc[1].max(axis=0), (5.27, 0.27))
+
+
+if __name__ == "__main__":
+    unittest.main()
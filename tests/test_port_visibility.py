@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from gdsfactory.component import Component
+from glayout import nmos, sky130, via_array
+from glayout.util.port_utils import rename_ports_by_orientation__call
+from glayout.util.port_visibility import (
+    add_private_ports,
+    get_port,
+    get_port_visibility,
+    keep_lazy_ports,
+    lazy_port_names,
+    materialize_ports,
+    set_port_visibility,
+)
+
+
+def _build(mode: str, function):
+    set_port_visibility(mode)
+    return function()
+
+
+def _same_port(port, other) -> bool:
+    return (
+        np.allclose(port.center, other.center)
+        and port.orientation == other.orientation
+        and port.width == other.width
+        and tuple(port.layer) == tuple(other.layer)
+    )
+
+
+def _child() -> Component:
+    child = Component()
+    child.add_polygon([(0, 0), (2, 0), (2, 1), (0, 1)], layer=(1, 0))
+    for name, center, orientation in (("pin_E", (2, 0.5), 0), ("pin_N", (1, 1), 90), ("pin_W", (0, 0.5), 180), ("pin_S", (1, 0), 270)):
+        child.add_port(name=name, center=center, width=1, orientation=orientation, layer=(1, 0))
+    return child
+
+
+class PortVisibilityTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_port_visibility("all")
+
+    @unittest.skipUnless(sky130 is not None, "needs PDK_ROOT")
+    def test_public_mode_keeps_every_port_resolvable(self) -> None:
+        for function in (lambda: via_array(sky130, "met1", "met3", num_vias=(3, 2)), lambda: nmos(sky130, fingers=2, multipliers=2)):
+            full = _build("all", function)
+            public = _build("public", function)
+            self.assertEqual(get_port_visibility(), "public")
+            self.assertLess(len(public.ports), len(full.ports) / 4)
+            self.assertEqual(set(public.ports) | set(lazy_port_names(public)), set(full.ports))
+            for name, port in full.ports.items():
+                self.assertTrue(_same_port(get_port(public, name), port), name)
+            self.assertEqual(public.hash_geometry(), full.hash_geometry())
+        with self.assertRaises(KeyError):
+            get_port(public, "multiplier_0_not_a_port_E")
+
+    @unittest.skipUnless(sky130 is not None, "needs PDK_ROOT")
+    def test_materialize_gives_the_ports_of_all_mode_in_order(self) -> None:
+        function = lambda: via_array(sky130, "poly", "met2", size=(1.2, None), num_vias=(None, 1), no_exception=True, fullbottom=True)
+        full = _build("all", function)
+        public = _build("public", function)
+        # public is a cached (locked) cell, materialize a copy of it
+        materialized = materialize_ports(keep_lazy_ports(public, public.copy()))
+        self.assertEqual(list(materialized.ports), list(full.ports))
+        for name, port in full.ports.items():
+            self.assertTrue(_same_port(materialized.ports[name], port), name)
+
+    def test_turned_references_resolve_by_orientation(self) -> None:
+        set_port_visibility("public")
+        parent = Component()
+        ref = parent << _child()
+        ref.mirror_x().rotate(90).move((3, 1))
+        add_private_ports(parent, ref, prefix="elem_")
+        self.assertEqual(len(parent.ports), 0)
+        # the names rename_ports_by_orientation gives the moved ports
+        expected = Component()
+        for port in ref.ports.values():
+            expected.add_port(name=rename_ports_by_orientation__call("elem_" + port.name, port), port=port)
+        self.assertEqual(sorted(lazy_port_names(parent)), sorted(expected.ports))
+        for name, port in expected.ports.items():
+            self.assertTrue(_same_port(get_port(parent, name), port), name)
+        top = Component()
+        parent_ref, expected_ref = top << parent, top << expected
+        parent_ref.rotate(180).movey(2)
+        expected_ref.rotate(180).movey(2)
+        for name, port in expected_ref.ports.items():
+            self.assertTrue(_same_port(get_port(parent_ref, name), port), name)
+
+
+if __name__ == "__main__":
+    unittest.main()
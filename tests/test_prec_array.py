@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from gdsfactory.cell import clear_cache
+from gdsfactory.component import Component
+from glayout import sky130, via_array
+from glayout.util.comp_utils import prec_array
+from glayout.util.component_cache import clear_component_cache
+from glayout.util.port_visibility import get_port, keep_lazy_ports, lazy_port_names, materialize_ports, set_port_visibility
+from glayout.util.snap_to_grid import set_preserve_hierarchy
+
+
+def _element() -> Component:
+    element = Component()
+    element.add_polygon([(0, 0), (0.3, 0), (0.3, 0.2), (0, 0.2)], layer=(68, 20))
+    for name, center, orientation in (("pin_E", (0.3, 0.1), 0), ("pin_N", (0.15, 0.2), 90), ("pin_W", (0, 0.1), 180), ("pin_S", (0.15, 0), 270)):
+        element.add_port(name=name, center=center, width=0.1, orientation=orientation, layer=(68, 20))
+    return element
+
+
+def _geometry(comp: Component) -> list:
+    return sorted(tuple(np.round(polygon, 4).ravel()) for polygon in comp.get_polygons())
+
+
+def _ports(comp: Component) -> list:
+    return [(name, tuple(np.round(port.center, 4)), port.orientation) for name, port in comp.ports.items()]
+
+
+class PrecArrayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if sky130 is not None:
+            sky130.activate()
+
+    def tearDown(self) -> None:
+        set_preserve_hierarchy(False)
+        set_port_visibility("all")
+        # cells built while preserving hierarchy are cached
+        clear_cache()
+        clear_component_cache()
+
+    def test_aref_matches_one_reference_per_element(self) -> None:
+        element = _element()
+        for absolute_spacing in (False, True):
+            aref = prec_array(element, rows=3, columns=4, spacing=(0.17, 0.23), absolute_spacing=absolute_spacing)
+            single = prec_array(element, rows=3, columns=4, spacing=(0.17, 0.23), absolute_spacing=absolute_spacing, aref=False)
+            self.assertEqual(_geometry(aref), _geometry(single))
+            self.assertEqual(_ports(aref), _ports(single))
+            self.assertEqual(len(aref.ports), 3 * 4 * 4)
+
+    @unittest.skipUnless(sky130 is not None, "needs PDK_ROOT")
+    def test_preserve_hierarchy_keeps_one_array_reference(self) -> None:
+        set_preserve_hierarchy(True)
+        element = _element()
+        array = prec_array(element, rows=20, columns=30, spacing=(0.1, 0.1))
+        self.assertEqual(len(array.references), 1)
+        self.assertEqual((array.references[0].columns, array.references[0].rows), (30, 20))
+        # off grid pitch (1 dbu on the 5 dbu grid) falls back to snapped references
+        off_grid = prec_array(element, rows=2, columns=3, spacing=(0.001, 0.001), absolute_spacing=True)
+        self.assertEqual(len(off_grid.references), 6)
+        set_preserve_hierarchy(False)
+        self.assertEqual(_geometry(array), _geometry(prec_array(element, rows=20, columns=30, spacing=(0.1, 0.1))))
+
+    def test_private_element_ports_resolve_from_the_index(self) -> None:
+        element = _element()
+        full = prec_array(element, rows=3, columns=2, spacing=(0.1, 0.1), private_ports=True)
+        set_port_visibility("public")
+        lazy = prec_array(element, rows=3, columns=2, spacing=(0.1, 0.1), private_ports=True)
+        self.assertEqual(len(lazy.ports), 0)
+        self.assertEqual(sorted(lazy_port_names(lazy)), sorted(full.ports))
+        for name, port in full.ports.items():
+            self.assertTrue(np.allclose(get_port(lazy, name).center, port.center), name)
+        with self.assertRaises(KeyError):
+            get_port(lazy, "row3_col0_pin_E")
+        self.assertEqual(list(materialize_ports(keep_lazy_ports(lazy, lazy.copy())).ports), list(full.ports))
+
+    @unittest.skipUnless(sky130 is not None, "needs PDK_ROOT")
+    def test_via_field_gds_keeps_the_array(self) -> None:
+        set_preserve_hierarchy(True)
+        field = via_array(sky130, "met1", "met2", num_vias=(40, 30))
+        arrays = [ref for cell in field.get_dependencies(recursive=True) for ref in cell.references if ref.rows > 1]
+        self.assertEqual([(ref.columns, ref.rows) for ref in arrays], [(40, 30)])
+        set_preserve_hierarchy(False)
+        clear_cache()
+        clear_component_cache()
+        self.assertEqual(_geometry(field), _geometry(via_array(sky130, "met1", "met2", num_vias=(40, 30))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from gdsfactory.cell import clear_cache
+from pydantic import ValidationError
+from glayout import nmos, sky130
+from glayout.util.comp_utils import evaluate_bbox, movex
+from glayout.util.component_cache import clear_component_cache
+from glayout.util.validation import get_production_mode, set_production_mode, validate_arguments
+
+
+class ValidateArgumentsTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_production_mode(False)
+
+    def test_decorator_keeps_the_pydantic_interface(self) -> None:
+        @validate_arguments(config=dict(arbitrary_types_allowed=True))
+        def double(value: float) -> float:
+            return 2 * value
+
+        self.assertEqual(double("1.5"), 3.0)
+        self.assertEqual(double.raw_function(2), 4)
+        self.assertEqual(double.__name__, "double")
+        self.assertTrue(hasattr(double, "validate") and hasattr(double, "model"))
+        set_production_mode(True)
+        self.assertEqual(double("ab"), "abab")
+
+
+@unittest.skipUnless(sky130 is not None, "needs PDK_ROOT")
+class ProductionModeTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        set_production_mode(False)
+
+    def test_validation_is_skipped_only_in_production(self) -> None:
+        self.assertFalse(get_production_mode())
+        with self.assertRaises(ValidationError):
+            sky130.snap_to_2xgrid(0.123, return_type="int")
+        with self.assertRaises(ValidationError):
+            evaluate_bbox("not a component")
+        set_production_mode(True)
+        self.assertTrue(get_production_mode())
+        # the raw function is called, no validation error (and no coercion of the return_type)
+        self.assertEqual(sky130.snap_to_2xgrid(0.123, return_type="int"), sky130.snap_to_2xgrid(0.123, return_type="decimal"))
+        with self.assertRaises(AttributeError):
+            evaluate_bbox("not a component")
+
+    def test_same_geometry_and_ports_in_both_modes(self) -> None:
+        cells = dict()
+        for production in (False, True):
+            set_production_mode(production)
+            clear_cache()
+            clear_component_cache()
+            cells[production] = nmos(sky130, fingers=3, multipliers=2, with_substrate_tap=True)
+        self.assertEqual(cells[True].hash_geometry(), cells[False].hash_geometry())
+        self.assertEqual(list(cells[True].ports), list(cells[False].ports))
+        self.assertEqual(movex(cells[True].ports["multiplier_0_gate_E"], 1).center[0], cells[False].ports["multiplier_0_gate_E"].center[0] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
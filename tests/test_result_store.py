@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.result_store import ProgressMeter, ResultStore, parameter_key
+
+
+class ResultStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "results.jsonl"
+        self.parameters = [{"width": [1.0, 2.0], "fingers": [i, 2]} for i in range(4)]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_parameter_key_ignores_dict_order(self) -> None:
+        self.assertEqual(parameter_key({"a": 1, "b": [1, 2]}), parameter_key({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(parameter_key({"a": 1}), parameter_key({"a": 2}))
+
+    def test_restart_skips_stored_parameters(self) -> None:
+        store = ResultStore(self.path)
+        store.add(self.parameters[0], {"success": True})
+        store.add(self.parameters[2], {"success": False})
+        # a crash in the middle of writing a record
+        with open(self.path, "a") as f:
+            f.write('{"key": "trunc')
+        store = ResultStore(self.path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual([index for index, _ in store.pending(self.parameters)], [1, 3])
+        retry = store.pending(self.parameters, retry=lambda result: not result["success"])
+        self.assertEqual([index for index, _ in retry], [1, 2, 3])
+        store.add(self.parameters[2], {"success": True})
+        self.assertEqual(ResultStore(self.path).results(self.parameters), [{"success": True}, {"success": True}])
+        self.assertEqual(len(list(store.records())), 3)
+
+    def test_progress_meter(self) -> None:
+        progress = ProgressMeter(10, done=4)
+        self.assertIsNone(progress.eta)
+        self.assertIn("5/10", progress.update())
+        self.assertGreaterEqual(progress.eta, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+import numpy as np
+from glayout import gf180, sky130
+
+
+def _values(rng: random.Random, count: int) -> list[float]:
+    values = [round(rng.uniform(-100, 100), rng.randint(0, 6)) for _ in range(count)]
+    # sums with float noise, as rule arithmetic produces them (0.17 + 0.12 = 0.29000000000000004)
+    values += [rng.choice((1, -1)) * (0.17 + 0.12 * rng.randint(0, 9) + 0.06 * rng.randint(0, 9)) for _ in range(count)]
+    values += [0.0, -0.0, 0.005, -0.005, 0.01, 1e-7, -1e-7]
+    return values
+
+
+@unittest.skipUnless(sky130 is not None and gf180 is not None, "needs PDK_ROOT")
+class SnapTo2xGridArrayTests(unittest.TestCase):
+    def test_matches_scalar_snap_to_2xgrid(self) -> None:
+        rng = random.Random(0)
+        for pdk in (sky130, gf180):
+            for snap4 in (False, True):
+                values = _values(rng, 1000)
+                expected = [pdk.snap_to_2xgrid(value, snap4=snap4) for value in values]
+                result = pdk.snap_to_2xgrid_array(values, snap4=snap4)
+                self.assertEqual(result.shape, (len(values),))
+                self.assertEqual(result.tolist(), expected, (pdk.name, snap4))
+
+    def test_keeps_the_shape_of_nested_points(self) -> None:
+        rng = random.Random(1)
+        points = [[rng.uniform(-10, 10), rng.uniform(-10, 10)] for _ in range(200)]
+        result = sky130.snap_to_2xgrid_array(points)
+        self.assertEqual(result.shape, (200, 2))
+        self.assertEqual(result.tolist(), [sky130.snap_to_2xgrid(point) for point in points])
+        self.assertTrue(np.array_equal(sky130.snap_to_2xgrid_array(np.asarray(points)), result))
+
+
+if __name__ == "__main__":
+    unittest.main()
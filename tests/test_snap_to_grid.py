@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from gdsfactory.component import Component
+from glayout.util.snap_to_grid import component_snap_to_grid
+from shapes import rectangle
+
+
+class SnapToGridTests(unittest.TestCase):
+    def test_flatten_mode_is_default(self) -> None:
+        top = Component("top_flat")
+        top << rectangle((1, 1))
+        snapped = component_snap_to_grid(top)
+        self.assertEqual(len(snapped.references), 0)
+
+    def test_hierarchy_mode_shares_on_grid_cells(self) -> None:
+        child = rectangle((1, 1), name="shared_child")
+        top = Component("top_hier")
+        for x in range(3):
+            (top << child).movex(x * 2)
+        snapped = component_snap_to_grid(top, preserve_hierarchy=True)
+        self.assertEqual(len(snapped.references), 3)
+        self.assertTrue(all(ref.parent is child for ref in snapped.references))
+
+    def test_hierarchy_mode_snaps_off_grid_geometry(self) -> None:
+        child = rectangle((1.00049, 1), name="off_grid_child")
+        top = Component("top_off_grid")
+        (top << child).movex(0.0004)
+        snapped = component_snap_to_grid(top, preserve_hierarchy=True)
+        ref = snapped.references[0]
+        self.assertIsNot(ref.parent, child)
+        self.assertEqual(tuple(ref.origin), (0, 0))
+        self.assertAlmostEqual(ref.parent.xmax, 1.0, places=9)
+
+    def test_hierarchy_mode_renames_duplicate_cells(self) -> None:
+        top = Component("top_dup")
+        top << rectangle((1, 1), name="dup")
+        (top << rectangle((2, 2), name="dup")).movey(5)
+        snapped = component_snap_to_grid(top, preserve_hierarchy=True)
+        names = [ref.parent.name for ref in snapped.references]
+        self.assertEqual(len(set(names)), 2)
+        self.assertEqual(snapped.bbox.tolist(), top.bbox.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
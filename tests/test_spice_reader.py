@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.spice_reader import iter_spice_statements, parse_value, summarize_parasitics
+
+
+PEX_NETLIST = """* NGSPICE file created from ota.ext - technology: sky130A
+
+.subckt ota VOUT INP
++ AVSS
+X0 VOUT INP a_2# AVSS sky130_fd_pr__nfet_01v8 ad=1.2p pd=4u
++ as=1p ps=3u w=1 l=0.5
+X1 a_2# INP AVSS AVSS sky130_fd_pr__nfet_01v8 w=1 l=0.5
+C0 VOUT AVSS 1.5f $ coupling
+C1 VOUT.n0 INP 2.5F
+R0 VOUT.n0 VOUT.t1 12.5
+R1 a_2# AVSS 1.2k
+.ends
+"""
+
+
+class SpiceReaderTests(unittest.TestCase):
+    def test_statements_join_continuations_and_drop_comments(self) -> None:
+        statements = list(iter_spice_statements(PEX_NETLIST.splitlines()))
+
+        self.assertEqual(statements[0], ".subckt ota VOUT INP AVSS")
+        self.assertEqual(statements[1], "X0 VOUT INP a_2# AVSS sky130_fd_pr__nfet_01v8 ad=1.2p pd=4u as=1p ps=3u w=1 l=0.5")
+        self.assertEqual(statements[3], "C0 VOUT AVSS 1.5f")
+        self.assertEqual(list(iter_spice_statements(["R0 a +", "b 1k", "* note"], keep_comments=True)), ["R0 a b 1k", "* note"])
+
+    def test_values_with_scale_suffixes(self) -> None:
+        self.assertAlmostEqual(parse_value("1.5f"), 1.5e-15)
+        self.assertAlmostEqual(parse_value("2.5F"), 2.5e-15)
+        self.assertAlmostEqual(parse_value("10MEG"), 1e7)
+        self.assertAlmostEqual(parse_value("3m"), 3e-3)
+        self.assertAlmostEqual(parse_value("2.2kohm"), 2200.0)
+        self.assertAlmostEqual(parse_value("r=1e-3"), 1e-3)
+        with self.assertRaises(ValueError):
+            parse_value("abc")
+
+    def test_parasitics_are_summed_per_net(self) -> None:
+        summary = summarize_parasitics(PEX_NETLIST.splitlines(), block_size=64)
+        nets = {net: i for i, net in enumerate(summary["nets"])}
+
+        self.assertAlmostEqual(summary["total_resistance"], 1212.5)
+        self.assertAlmostEqual(summary["total_capacitance"], 4e-15)
+        self.assertEqual((summary["resistor_count"], summary["capacitor_count"]), (2, 2))
+        self.assertEqual(summary["device_counts"], {"sky130_fd_pr__nfet_01v8": 2})
+        self.assertAlmostEqual(summary["capacitance"][nets["VOUT"]], 4e-15)
+        self.assertAlmostEqual(summary["resistance"][nets["VOUT"]], 25.0)
+        self.assertAlmostEqual(summary["resistance"][nets["AVSS"]], 1200.0)
+        self.assertEqual(summary["device_terminals"][nets["AVSS"]], 3)
+        self.assertEqual(summary["device_terminals"][nets["a_2#"]], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
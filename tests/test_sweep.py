@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import tempfile
+import time
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.sweep import SampleLost, SweepRunner, default_worker_count, link_shared_tree, run_sweep
+
+
+_initialized = False
+
+
+def _init_worker() -> None:
+    global _initialized
+    _initialized = True
+
+
+def _sample(x: int, y: int) -> tuple[int, int, bool]:
+    return x * y, os.getpid(), _initialized
+
+
+def _fail(x: int) -> int:
+    raise ValueError(f"sample {x} failed")
+
+
+def _crash_or_hang(x: int) -> int:
+    """sample 2 kills its worker (like a segfault or an out of memory kill), sample 4 hangs"""
+    if x == 2:
+        os.kill(os.getpid(), signal.SIGKILL)
+    if x == 4:
+        time.sleep(60)
+    return x
+
+
+class SweepRunnerTests(unittest.TestCase):
+    def test_results_in_order_and_workers_initialized(self) -> None:
+        with SweepRunner(max_workers=2, max_tasks_per_child=None, initializer=_init_worker) as runner:
+            results = list(runner.starmap(_sample, ((i, 2) for i in range(20))))
+        self.assertEqual([product for product, _, _ in results], [2 * i for i in range(20)])
+        self.assertTrue(all(initialized for _, _, initialized in results))
+        self.assertLessEqual(len({pid for _, pid, _ in results}), 2)
+
+    def test_workers_recycled(self) -> None:
+        results = run_sweep(_sample, [(i, 1) for i in range(6)], star=True, max_workers=1, max_tasks_per_child=2)
+        self.assertEqual(len({pid for _, pid, _ in results}), 3)
+
+    def test_exception_reaches_caller(self) -> None:
+        with self.assertRaises(ValueError):
+            run_sweep(_fail, [1], max_workers=1)
+
+    def test_dead_and_hung_workers_do_not_stall_the_sweep(self) -> None:
+        start = time.monotonic()
+        with SweepRunner(max_workers=2, max_tasks_per_child=None, timeout=2, on_failure=lambda x: -x) as runner:
+            results = list(runner.map(_crash_or_hang, range(8)))
+        self.assertEqual(results, [0, 1, -2, 3, -4, 5, 6, 7])
+        self.assertLess(time.monotonic() - start, 30)
+        with self.assertRaises(SampleLost):
+            run_sweep(_crash_or_hang, [1, 2], max_workers=1)
+
+    def test_default_worker_count(self) -> None:
+        self.assertGreaterEqual(default_worker_count(), 1)
+        self.assertEqual(default_worker_count(memory_per_worker_gb=1e9), 1)
+
+    def test_link_shared_tree(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "sky130A"
+            src.mkdir()
+            (src / "models.spice").write_text("* models")
+            (Path(tmpdir) / "sample0").mkdir()
+            dest = link_shared_tree(src, Path(tmpdir) / "sample0" / "sky130A")
+            self.assertTrue(dest.is_symlink())
+            self.assertEqual((dest / "models.spice").read_text(), "* models")
+
+
+if __name__ == "__main__":
+    unittest.main()
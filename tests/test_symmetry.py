@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+import unittest
+
+import numpy as np
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.symmetry import raster_symmetry
+from shapes import rectangle_points
+
+
+class RasterSymmetryTests(unittest.TestCase):
+    def test_mirrored_rectangles_are_symmetric(self) -> None:
+        scores = raster_symmetry({(68, 20): [rectangle_points(0.3, -1.0, 2.0, 1.0), rectangle_points(-2.0, -1.0, -0.3, 1.0)[::-1]]})
+
+        self.assertEqual(scores["horizontal"], 1.0)
+        self.assertEqual(scores["vertical"], 1.0)
+        self.assertAlmostEqual(scores["area"], 6.8)
+
+    def test_xor_area_is_exact_on_the_grid(self) -> None:
+        # mirrored left to right the rectangle overlaps itself on 0.1 x 1.0 out of 0.6 x 1.0
+        scores = raster_symmetry({(68, 20): [rectangle_points(-0.25, 0.0, 0.35, 1.0)], (69, 20): []})
+
+        self.assertAlmostEqual(scores["horizontal"], 1.0 - 2 * (0.6 - 0.5) / 0.6)
+        self.assertAlmostEqual(scores["vertical"], 1.0 - 2 * 0.6 / 0.6)
+        self.assertEqual(scores["layers"][(69, 20)]["horizontal"], 1.0)
+
+    def test_layers_are_scored_separately(self) -> None:
+        # symmetric as a whole, but each layer only covers one side
+        scores = raster_symmetry({(68, 20): [rectangle_points(0.0, 0.0, 1.0, 1.0)], (69, 20): [rectangle_points(-1.0, 0.0, 0.0, 1.0)]})
+
+        self.assertEqual(scores["horizontal"], 1.0)
+        self.assertEqual(scores["layers"][(68, 20)]["horizontal"], -1.0)
+        self.assertEqual(scores["layers"][(69, 20)]["horizontal"], -1.0)
+
+    def test_non_rectilinear_polygons_are_sampled(self) -> None:
+        diamond = np.array([(1.03, 0.0), (0.0, 1.03), (-1.03, 0.0), (0.0, -1.03)])
+        scores = raster_symmetry({(68, 20): [diamond]}, resolution=0.05)
+        self.assertEqual((scores["horizontal"], scores["vertical"]), (1.0, 1.0))
+
+        # the triangle does not overlap its mirror image, so the exact score is 1 - 2 * area / area
+        triangle = np.array([(0.0, 0.1), (2.0, 0.1), (0.0, 2.1)])
+        coarse = raster_symmetry({(68, 20): [triangle]}, resolution=0.1)["vertical"]
+        fine = raster_symmetry({(68, 20): [triangle]}, resolution=0.005)["vertical"]
+        self.assertLess(abs(fine + 1.0), abs(coarse + 1.0) + 1e-9)
+        self.assertAlmostEqual(fine, -1.0, places=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import os
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.pdk.mappedpdk import magic_lvs_script
+from glayout.verification.batch import VerificationJob, run_verification_batch
+
+
+# stand-in for magic: DRC when given a command file, otherwise reads the lvs script from stdin.
+# designs named slow_* hang, every run sleeps STUB_SLEEP seconds
+STUB_MAGIC = """\
+#!{python}
+import os, re, sys, time
+design = os.environ["DESIGN_NAME"]
+time.sleep(float(os.environ.get("STUB_SLEEP", "0")))
+if design.startswith("slow"):
+    time.sleep(60)
+open(design + ".ext", "w").write(design)
+if sys.argv[-1].endswith(".tcl"):
+    with open(os.path.join(os.environ["REPORTS_DIR"], design + ".rpt"), "w") as f:
+        f.write(design + " count: 0\\n----------------------------------------\\n\\n")
+else:
+    for path in re.findall(r"-o (\\S+)", sys.stdin.read()):
+        open(path, "w").write("* " + design)
+"""
+
+STUB_NETGEN = """\
+#!{python}
+import sys
+open(sys.argv[-1], "w").write("Circuits match uniquely.\\nNetlists match.\\n")
+"""
+
+
+class VerificationBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.magic = self._write_tool("magic", STUB_MAGIC)
+        self.netgen = self._write_tool("netgen", STUB_NETGEN)
+        self.pdk = SimpleNamespace(
+            name="sky130",
+            pdk_files={
+                "pdk_root": str(self.root),
+                "magic_drc_file": str(self.root / "magicrc"),
+                "lvs_setup_tcl_file": str(self.root / "setup.tcl"),
+                "lvs_schematic_ref_file": str(self.root / "ref.spice"),
+            },
+        )
+        self.old_cwd = os.getcwd()
+        os.chdir(self.root)
+        os.environ["GLAYOUT_CACHE_DIR"] = str(self.root / "cache")
+
+    def tearDown(self) -> None:
+        os.chdir(self.old_cwd)
+        os.environ.pop("STUB_SLEEP", None)
+        os.environ.pop("GLAYOUT_CACHE_DIR", None)
+        self.tmp.cleanup()
+
+    def _write_tool(self, name: str, source: str) -> str:
+        path = self.root / name
+        path.write_text(source.format(python=sys.executable))
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        return str(path)
+
+    def _jobs(self, names):
+        for name in names:
+            gds = self.root / f"{name}.gds"
+            gds.write_bytes(b"gds")
+            yield (str(gds), f".subckt {name} A B\n.ends {name}\n", name)
+
+    def _run(self, names, **kwargs):
+        return dict(
+            (job.design_name, result)
+            for job, result in run_verification_batch(
+                self._jobs(names), pdk=self.pdk, magic=self.magic, netgen=self.netgen, **kwargs
+            )
+        )
+
+    def test_jobs_pass_and_stay_isolated(self) -> None:
+        env_before = dict(os.environ)
+        results = self._run(["a", "b", "c"], max_workers=2, output_dir=self.root / "out")
+        self.assertEqual(set(results), {"a", "b", "c"})
+        for name, result in results.items():
+            self.assertEqual(result["drc"]["status"], "pass")
+            self.assertEqual(result["lvs"]["status"], "pass")
+            self.assertTrue(Path(result["lvs"]["report_path"]).is_file())
+            self.assertTrue((self.root / "out" / "drc" / name / f"{name}.rpt").is_file())
+        self.assertEqual(dict(os.environ), env_before)
+        self.assertEqual(list(self.root.glob("*.ext")), [])
+
+    def test_repeated_jobs_hit_cache(self) -> None:
+        first = self._run(["cached"], use_cache=True)
+        # a broken magic would fail every check, so a pass can only come from the cache
+        self.magic = self._write_tool("magic", "#!/bin/sh\nexit 1\n")
+        second = self._run(["cached"], use_cache=True)
+        self.assertEqual(second["cached"]["drc"]["summary"], first["cached"]["drc"]["summary"])
+        self.assertEqual(second["cached"]["lvs"]["status"], "pass")
+        uncached = self._run(["cached"], use_cache=False)
+        self.assertTrue(uncached["cached"]["drc"]["status"].startswith("error"))
+
+    def test_jobs_run_concurrently(self) -> None:
+        os.environ["STUB_SLEEP"] = "0.5"
+        start = time.monotonic()
+        results = self._run(["p0", "p1", "p2", "p3"], max_workers=4)
+        # serially this is 4 jobs * 2 magic runs * 0.5s
+        self.assertLess(time.monotonic() - start, 3.0)
+        self.assertTrue(all(result["drc"]["is_pass"] for result in results.values()))
+
+    def test_timeout_kills_job(self) -> None:
+        start = time.monotonic()
+        results = self._run(["slow_design", "fast_design"], max_workers=2, timeout=1)
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertEqual(results["slow_design"]["drc"]["status"], "timeout")
+        self.assertEqual(results["slow_design"]["lvs"]["status"], "timeout")
+        self.assertEqual(results["fast_design"]["lvs"]["status"], "pass")
+
+    def test_job_timeout_overrides_batch_timeout(self) -> None:
+        gds = self.root / "slow_job.gds"
+        gds.write_bytes(b"gds")
+        job = VerificationJob(str(gds), None, "slow_job", timeout=0.5)
+        [(done, result)] = list(run_verification_batch([job], pdk=self.pdk, magic=self.magic, netgen=self.netgen, timeout=100))
+        self.assertIs(done, job)
+        self.assertEqual(result["drc"]["status"], "timeout")
+        self.assertEqual(result["lvs"]["status"], "not run")
+
+    def test_extraction_level_skips_parasitics(self) -> None:
+        scripts = {level: magic_lvs_script("d", "d.gds", "lvs.spice", "sim.spice", "pex.spice", level) for level in ("lvs", "lvs+sim", "pex")}
+        self.assertNotIn("ext2sim", scripts["lvs"])
+        self.assertNotIn("flatten", scripts["lvs+sim"])
+        self.assertIn("ext2sim -o sim.spice", scripts["pex"])
+        self.assertIn("-o pex.spice", scripts["pex"])
+        with self.assertRaises(ValueError):
+            magic_lvs_script("d", "d.gds", "lvs.spice", "sim.spice", "pex.spice", "full")
+        results = self._run(["level"], extraction_level="lvs+sim", use_cache=False)
+        self.assertEqual(results["level"]["lvs"]["status"], "pass")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_ROOT = REPO_ROOT / "src"
+
+if str(SRC_ROOT) not in sys.path:
+    sys.path.insert(0, str(SRC_ROOT))
+
+from glayout.util.verification_cache import VerificationCache, verification_cache_enabled, verification_cache_key
+
+
+class VerificationCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.gds = self.root / "design.gds"
+        self.gds.write_bytes(b"gds bytes")
+        self.rules = self.root / "magicrc"
+        self.rules.write_text("rules v1")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _key(self, **kwargs) -> str:
+        args = dict(check="drc_magic", pdk_name="sky130", design_name="design", gds=self.gds, rule_files=[self.rules])
+        args.update(kwargs)
+        return verification_cache_key(**args)
+
+    def test_key_tracks_contents(self) -> None:
+        key = self._key()
+        self.assertEqual(key, self._key())
+        self.assertNotEqual(key, self._key(pdk_name="gf180"))
+        self.assertNotEqual(key, self._key(netlist=".subckt design\n.ends"))
+        self.rules.write_text("rules v2")
+        self.assertNotEqual(key, self._key())
+        self.gds.write_bytes(b"other gds bytes")
+        self.assertNotEqual(key, self._key(rule_files=[]))
+
+    def test_put_get_restore(self) -> None:
+        cache = VerificationCache(self.root / "cache")
+        report = self.root / "design.rpt"
+        report.write_text("design count: 0\n")
+        self.assertIsNone(cache.get("ab" * 32))
+        cache.put("ab" * 32, {"is_pass": True}, files=[report])
+        entry = cache.get("ab" * 32)
+        self.assertEqual(entry["result"], {"is_pass": True})
+        dest = self.root / "restored"
+        dest.mkdir()
+        self.assertTrue(cache.restore(entry, dest))
+        self.assertEqual((dest / "design.rpt").read_text(), "design count: 0\n")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_restore_of_an_evicted_entry_is_a_miss(self) -> None:
+        cache = VerificationCache(self.root / "cache")
+        report = self.root / "design.rpt"
+        report.write_text("design count: 0\n")
+        cache.put("ab" * 32, {"is_pass": True}, files=[report])
+        entry = cache.get("ab" * 32)
+        # another process evicts the entry between get and restore
+        VerificationCache(self.root / "cache", max_bytes=0).evict()
+        self.assertFalse(cache.restore(entry, self.root))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_put_scans_the_cache_only_to_evict(self) -> None:
+        cache = VerificationCache(self.root / "cache", max_bytes=20000)
+        scans = list()
+        entries = cache._entries
+        cache._entries = lambda: scans.append(1) or entries()
+        for index in range(120):
+            cache.put(f"{index:03d}"[:2] + f"{index:03d}" * 20, {"n": "x" * 200})
+        # one scan to initialize the size, then one per eviction, which frees room for several entries
+        self.assertLessEqual(len(scans), 120 // 4)
+        self.assertGreater(cache.evictions, 0)
+        self.assertLessEqual(cache.size(), 20000)
+
+    def test_size_eviction_drops_oldest(self) -> None:
+        cache = VerificationCache(self.root / "cache", max_bytes=0)
+        cache.put("cd" * 32, {"n": 1})
+        self.assertIsNone(cache.get("cd" * 32))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_opt_out(self) -> None:
+        self.assertFalse(verification_cache_enabled(False))
+        self.assertTrue(verification_cache_enabled(True))
+
+
+if __name__ == "__main__":
+    unittest.main()